@@ -0,0 +1,71 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+from typing import List, Optional
+
+from UM.Application import Application
+from UM.Job import Job
+from UM.Logger import Logger
+from UM.Message import Message
+from UM.Operations.AddSceneNodeOperation import AddSceneNodeOperation
+from UM.Operations.GroupedOperation import GroupedOperation
+from UM.Scene.SceneNode import SceneNode
+from UM.i18n import i18nCatalog
+from cura.Arranging.Nest2DArrange import createGroupOperationForArrange
+
+i18n_catalog = i18nCatalog("cura")
+
+
+class ArrangeNewObjectsJob(Job):
+    """Finds a place for nodes that are not in the scene yet, without blocking the main thread.
+
+    The convex hulls of the nodes are computed in this job, which can take a while for many or detailed models. The
+    result is a single operation that adds all nodes to the scene in their new place, which is to be pushed on the main
+    thread once the job is finished.
+    """
+
+    def __init__(self, nodes_to_arrange: List[SceneNode], nodes_to_add: List[SceneNode], fixed_nodes: List[SceneNode]) -> None:
+        """
+        :param nodes_to_arrange: The new nodes that need to be placed.
+        :param nodes_to_add: The new nodes that need to be added to the scene without moving them.
+        :param fixed_nodes: The nodes that are in the scene already, which the new nodes should be placed around.
+        """
+        super().__init__()
+        self._nodes_to_arrange = nodes_to_arrange
+        self._nodes_to_add = nodes_to_add
+        self._fixed_nodes = fixed_nodes
+
+    def run(self) -> None:
+        found_solution_for_all = True
+        scene_root = Application.getInstance().getController().getScene().getRoot()
+
+        # Nodes without a hull can't be arranged. Computing the hulls here also caches them for the arrange below.
+        nodes_to_arrange = []  # type: List[SceneNode]
+        nodes_to_add = list(self._nodes_to_add)
+        for node in self._nodes_to_arrange:
+            hull = node.callDecoration("getConvexHull")
+            if hull is not None and hull.getPoints() is not None and len(hull.getPoints()) > 2:
+                nodes_to_arrange.append(node)
+            else:
+                nodes_to_add.append(node)
+
+        operation = None  # type: Optional[GroupedOperation]
+        if nodes_to_arrange:
+            try:
+                operation, not_fit_count = createGroupOperationForArrange(nodes_to_arrange, Application.getInstance().getBuildVolume(), self._fixed_nodes, add_new_nodes_in_scene = True)
+                found_solution_for_all = not_fit_count == 0
+            except:  # If the arrange crashes, the nodes should still be added.
+                Logger.logException("e", "Unable to arrange the new objects on the buildplate. The arrange algorithm has crashed.")
+                nodes_to_add.extend(nodes_to_arrange)
+        if operation is None:
+            operation = GroupedOperation()
+        for node in nodes_to_add:
+            operation.addOperation(AddSceneNodeOperation(node, scene_root))
+        self.setResult(operation)
+
+        if not found_solution_for_all:
+            no_full_solution_message = Message(
+                    i18n_catalog.i18nc("@info:status",
+                                       "Unable to find a location within the build volume for all objects"),
+                    title = i18n_catalog.i18nc("@info:title", "Can't Find Location"),
+                    message_type = Message.MessageType.ERROR)
+            no_full_solution_message.show()
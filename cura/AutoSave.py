@@ -61,5 +61,5 @@ class AutoSave:
 
         save_start_time = time.time()
         self._application.saveSettings()
-        Logger.log("d", "Autosaving preferences, instances and profiles took %s seconds", time.time() - save_start_time)
+        Logger.log("d", "Autosaving preferences, instances and profiles took %s seconds, writing continues in the background", time.time() - save_start_time)
         self._saving = False
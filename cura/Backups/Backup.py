@@ -7,7 +7,7 @@ import re
 import shutil
 from copy import deepcopy
 from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
-from typing import Dict, Optional, TYPE_CHECKING, List
+from typing import cast, Dict, Optional, TYPE_CHECKING, List
 
 from UM import i18nCatalog
 from UM.Logger import Logger
@@ -18,6 +18,7 @@ from UM.Version import Version
 
 if TYPE_CHECKING:
     from cura.CuraApplication import CuraApplication
+    from cura.Settings.CuraContainerRegistry import CuraContainerRegistry
 
 
 class Backup:
@@ -53,8 +54,9 @@ class Backup:
         # obfuscate sensitive secrets
         secrets = self._obfuscate()
 
-        # Ensure all current settings are saved.
+        # Ensure all current settings are saved, and written to disk before they are archived.
         self._application.saveSettings()
+        cast("CuraContainerRegistry", self._application.getContainerRegistry()).waitForSave()
 
         # We copy the preferences file to the user data directory in Linux as it's in a different location there.
         # When restoring a backup on Linux, we move it back.
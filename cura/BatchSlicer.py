@@ -0,0 +1,232 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import time
+from collections import deque
+from typing import Deque, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from PyQt6.QtCore import QCoreApplication, QTimer, QUrl
+
+from UM.Backend.Backend import BackendState
+from UM.Logger import Logger
+from UM.Mesh.MeshWriter import MeshWriter
+from UM.PluginRegistry import PluginRegistry
+
+from cura.Machines.ContainerTree import ContainerTree
+
+if TYPE_CHECKING:
+    from cura.CuraApplication import CuraApplication
+
+
+class BatchSlicer:
+    """Slices a queue of files one after another without the GUI, writing the results to an output directory.
+
+    This is what Cura does when it's started with --slice. All files are sliced by the same application, so that
+    starting the application only has to be done once for the whole queue. Every file is loaded onto an empty build
+    plate and sliced with the active printer, or with the printer and profile that are given.
+    """
+
+    # The formats that the results can be written in, with the plug-in that writes them, their file extension and the
+    # mode to write them in.
+    OUTPUT_FORMATS = {
+        "gcode": ("GCodeWriter", ".gcode", MeshWriter.OutputMode.TextMode),
+        "ufp": ("UFPWriter", ".ufp", MeshWriter.OutputMode.BinaryMode)
+    }
+
+    # How long to wait for a file to be loaded and sliced before skipping it, in milliseconds.
+    JOB_TIMEOUT = 30 * 60 * 1000
+
+    def __init__(self, application: "CuraApplication", file_names: List[str], output_path: str, output_format: str = "gcode",
+                 machine: Optional[str] = None, profile: Optional[str] = None) -> None:
+        """
+        :param application: The application to load, slice and write the files with.
+        :param file_names: The models or projects to slice. Projects are loaded as models.
+        :param output_path: The directory to write the results to.
+        :param output_format: The format to write the results in. One of the keys of OUTPUT_FORMATS.
+        :param machine: The name of a printer that was added before, or the id of the definition of a printer to add.
+        By default, the active printer is used.
+        :param profile: The quality type or the name of a custom profile to slice with. By default, the active profile
+        is used.
+        """
+        self._application = application
+        self._queue = deque(os.path.abspath(file_name) for file_name in file_names)  # type: Deque[str]
+        self._output_path = output_path
+        self._output_format = output_format
+        self._machine = machine
+        self._profile = profile
+
+        self._current_file_name = None  # type: Optional[str]
+        self._slicing = False  # Whether the current file was loaded and is being sliced.
+        self._results = []  # type: List[Tuple[str, Optional[str]]] # For every file, the file that was written or None if it failed.
+        self._output_file_names = set()  # type: Set[str]
+        self._start_time = 0.0
+        self._job_start_time = 0.0
+        self._timeout_timer = None  # type: Optional[QTimer]
+
+    def start(self) -> None:
+        """Start slicing the queue. The application quits when the queue is done."""
+
+        self._start_time = time.time()
+        Logger.info("Batch slicing {count} files to {path}".format(count = len(self._queue), path = self._output_path))
+
+        if self._output_format not in self.OUTPUT_FORMATS:
+            Logger.error("Unknown output format {output_format}. Use one of: {formats}".format(output_format = self._output_format, formats = ", ".join(self.OUTPUT_FORMATS)))
+            self._finish(failed = True)
+            return
+        try:
+            os.makedirs(self._output_path, exist_ok = True)
+        except EnvironmentError as e:
+            Logger.error("Unable to create output directory {path}: {err}".format(path = self._output_path, err = str(e)))
+            self._finish(failed = True)
+            return
+        if not self._setUpMachine():
+            self._finish(failed = True)
+            return
+
+        self._timeout_timer = QTimer()
+        self._timeout_timer.setInterval(self.JOB_TIMEOUT)
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.timeout.connect(self._onTimeout)
+
+        self._application.fileCompleted.connect(self._onFileCompleted)
+        self._application.fileLoadFailed.connect(self._onFileLoadFailed)
+        self._application.getBackend().backendStateChange.connect(self._onBackendStateChange)
+        self._startNextJob()
+
+    def getResults(self) -> List[Tuple[str, Optional[str]]]:
+        """Get the files that were sliced so far, with the file that was written for each, or None if it failed."""
+
+        return self._results
+
+    def _setUpMachine(self) -> bool:
+        machine_manager = self._application.getMachineManager()
+        if self._machine:
+            machines = self._application.getContainerRegistry().findContainerStacks(type = "machine", name = self._machine)
+            machine = machines[0] if machines else machine_manager.getMachine(self._machine)
+            if machine is not None:
+                machine_manager.setActiveMachine(machine.getId())
+            elif not machine_manager.addMachine(self._machine):
+                Logger.error("There is no printer named {machine} and it's not a printer definition either.".format(machine = self._machine))
+                return False
+
+        if self._application.getGlobalContainerStack() is None:
+            Logger.error("There is no printer to slice for. Add one or use --machine.")
+            return False
+
+        if self._profile:
+            container_tree = ContainerTree.getInstance()
+            quality_changes_groups = [group for group in container_tree.getCurrentQualityChangesGroups() if group.name == self._profile]
+            quality_groups = container_tree.getCurrentQualityGroups()
+            if quality_changes_groups:
+                machine_manager.setQualityChangesGroup(quality_changes_groups[0], no_dialog = True)
+            elif self._profile in quality_groups:
+                machine_manager.setQualityGroup(quality_groups[self._profile], no_dialog = True)
+            else:
+                Logger.error("There is no quality type or custom profile named {profile} for this printer.".format(profile = self._profile))
+                return False
+        return True
+
+    def _startNextJob(self) -> None:
+        if not self._queue:
+            self._finish(failed = any(output_file_name is None for _, output_file_name in self._results))
+            return
+
+        self._current_file_name = self._queue.popleft()
+        self._slicing = False
+        self._job_start_time = time.time()
+        Logger.info("Batch slicing {file_name}".format(file_name = self._current_file_name))
+        if self._timeout_timer is not None:
+            self._timeout_timer.start()
+
+        self._application.deleteAll()
+        self._application.readLocalFile(QUrl.fromLocalFile(self._current_file_name), project_mode = "open_as_model", add_to_recent_files = False)
+
+    def _onFileCompleted(self, file_name: str) -> None:
+        if self._slicing or self._current_file_name is None or os.path.normcase(file_name) != os.path.normcase(self._current_file_name):
+            return
+        self._slicing = True
+        self._application.getBackend().forceSlice()
+
+    def _onFileLoadFailed(self, file_name: str) -> None:
+        if self._slicing or self._current_file_name is None or os.path.normcase(file_name) != os.path.normcase(self._current_file_name):
+            return
+        Logger.error("Unable to load {file_name}".format(file_name = self._current_file_name))
+        self._finishJob(None)
+
+    def _onBackendStateChange(self, state: BackendState) -> None:
+        if not self._slicing:
+            return  # The state of slicing something else, or of the file while it was still loading.
+        if state == BackendState.Done:
+            self._finishJob(self._writeOutput())
+        elif state in (BackendState.Error, BackendState.Disabled):
+            Logger.error("Unable to slice {file_name}".format(file_name = self._current_file_name))
+            self._finishJob(None)
+
+    def _onTimeout(self) -> None:
+        Logger.error("Loading or slicing {file_name} took too long, skipping it.".format(file_name = self._current_file_name))
+        self._application.getBackend().stopSlicing()
+        self._finishJob(None)
+
+    def _writeOutput(self) -> Optional[str]:
+        """Write the result of slicing the current file.
+
+        :return: The file that was written, or None if writing failed.
+        """
+        plugin_id, extension, mode = self.OUTPUT_FORMATS[self._output_format]
+        writer = PluginRegistry.getInstance().getPluginObject(plugin_id)
+        if writer is None:
+            Logger.error("Unable to write {output_format} files, the {plugin_id} plug-in is not available.".format(output_format = self._output_format, plugin_id = plugin_id))
+            return None
+
+        # Files with the same name from different directories must not overwrite each other's results.
+        base_name = os.path.splitext(os.path.basename(self._current_file_name or ""))[0]
+        output_file_name = os.path.join(self._output_path, base_name + extension)
+        number = 1
+        while output_file_name in self._output_file_names:
+            number += 1
+            output_file_name = os.path.join(self._output_path, "{base_name}_{number}{extension}".format(base_name = base_name, number = number, extension = extension))
+
+        nodes = [self._application.getController().getScene().getRoot()]
+        try:
+            if mode == MeshWriter.OutputMode.TextMode:
+                with open(output_file_name, "wt", encoding = "utf-8") as f:
+                    success = writer.write(f, nodes, mode)
+            else:
+                with open(output_file_name, "wb") as f:
+                    success = writer.write(f, nodes, mode)
+        except EnvironmentError as e:
+            Logger.error("Unable to write {output_file_name}: {err}".format(output_file_name = output_file_name, err = str(e)))
+            return None
+        if not success:
+            Logger.error("Unable to write {output_file_name}: {err}".format(output_file_name = output_file_name, err = writer.getInformation()))
+            return None
+        self._output_file_names.add(output_file_name)
+        return output_file_name
+
+    def _finishJob(self, output_file_name: Optional[str]) -> None:
+        if self._timeout_timer is not None:
+            self._timeout_timer.stop()
+        self._slicing = False
+        self._results.append((self._current_file_name or "", output_file_name))
+        if output_file_name is not None:
+            Logger.info("Batch sliced {file_name} to {output_file_name} in {duration:.1f}s".format(file_name = self._current_file_name, output_file_name = output_file_name, duration = time.time() - self._job_start_time))
+        self._current_file_name = None
+
+        # Continue from the event loop, so that the backend is done handling the current state first.
+        self._application.callLater(self._startNextJob)
+
+    def _finish(self, failed: bool) -> None:
+        duration = time.time() - self._start_time
+        succeeded_count = len([output_file_name for _, output_file_name in self._results if output_file_name is not None])
+        jobs_per_hour = len(self._results) / duration * 3600 if duration > 0 else 0.0
+        Logger.info("Batch slicing done: {succeeded} of {total} files sliced in {duration:.1f}s, {throughput:.1f} jobs per hour".format(succeeded = succeeded_count, total = len(self._results), duration = duration, throughput = jobs_per_hour))
+        for file_name, output_file_name in self._results:
+            if output_file_name is None:
+                Logger.warning("Failed to slice {file_name}".format(file_name = file_name))
+
+        if self._timeout_timer is not None:  # Only connected if it got to slicing.
+            self._application.fileCompleted.disconnect(self._onFileCompleted)
+            self._application.fileLoadFailed.disconnect(self._onFileLoadFailed)
+            self._application.getBackend().backendStateChange.disconnect(self._onBackendStateChange)
+        QCoreApplication.exit(1 if failed else 0)
@@ -5,7 +5,7 @@ import os
 import sys
 import tempfile
 import time
-from typing import cast, TYPE_CHECKING, Optional, Callable, List, Any, Dict
+from typing import cast, TYPE_CHECKING, Optional, Callable, List, Any, Dict, Set, Tuple
 
 import numpy
 from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal, pyqtProperty, QEvent, pyqtEnum, QCoreApplication
@@ -52,8 +52,10 @@ from UM.i18n import i18nCatalog
 from cura import ApplicationMetadata
 from cura.API import CuraAPI
 from cura.API.Account import Account
+from cura.Arranging.ArrangeNewObjectsJob import ArrangeNewObjectsJob
 from cura.Arranging.ArrangeObjectsJob import ArrangeObjectsJob
 from cura.Arranging.Nest2DArrange import arrange
+from cura.BatchSlicer import BatchSlicer
 from cura.Machines.MachineErrorChecker import MachineErrorChecker
 from cura.Machines.Models.BuildPlateModel import BuildPlateModel
 from cura.Machines.Models.CustomQualityProfilesDropDownMenuModel import CustomQualityProfilesDropDownMenuModel
@@ -98,6 +100,7 @@ from cura.Settings.MaterialSettingsVisibilityHandler import MaterialSettingsVisi
 from cura.Settings.SettingInheritanceManager import SettingInheritanceManager
 from cura.Settings.SidebarCustomMenuItemsModel import SidebarCustomMenuItemsModel
 from cura.Settings.SimpleModeSettingsManager import SimpleModeSettingsManager
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
 from cura.TaskManagement.OnExitCallbackManager import OnExitCallbackManager
 from cura.UI import CuraSplashScreen, MachineActionManager, PrintInformation
 from cura.UI.AddPrinterPagesModel import AddPrinterPagesModel
@@ -109,6 +112,7 @@ from cura.UI.WelcomePagesModel import WelcomePagesModel
 from cura.UI.WhatsNewPagesModel import WhatsNewPagesModel
 from cura.UltimakerCloud import UltimakerCloudConstants
 from cura.Utils.NetworkingUtil import NetworkingUtil
+from cura.Utils.StartupProfiler import StartupProfiler
 from . import BuildVolume
 from . import CameraAnimation
 from . import CuraActions
@@ -173,6 +177,7 @@ class CuraApplication(QtApplication):
         # Variables set from CLI
         self._files_to_open = []
         self._use_single_instance = False
+        self._batch_slicer = None  # type: Optional[BatchSlicer] # Only when started with --slice.
 
         self._single_instance = None
 
@@ -298,7 +303,29 @@ class CuraApplication(QtApplication):
                                       action = "store_true",
                                       default = False,
                                       help = "FOR TESTING ONLY. Trigger an early crash to show the crash dialog.")
-        self._cli_parser.add_argument("file", nargs = "*", help = "Files to load after starting the application.")
+        self._cli_parser.add_argument("--slice",
+                                      action = "store_true",
+                                      default = False,
+                                      help = "Slice the files without the GUI, write the results to the output directory and quit.")
+        self._cli_parser.add_argument("--machine",
+                                      help = "With --slice, the name of a printer to slice for, or the id of a printer definition to add. By default, the active printer.")
+        self._cli_parser.add_argument("--quality",
+                                      help = "With --slice, the quality type or the name of a custom profile to slice with. By default, the active profile.")
+        self._cli_parser.add_argument("--output-dir",
+                                      dest = "output_dir",
+                                      default = ".",
+                                      help = "With --slice, the directory to write the results to.")
+        self._cli_parser.add_argument("--output-format",
+                                      dest = "output_format",
+                                      choices = list(BatchSlicer.OUTPUT_FORMATS),
+                                      default = "gcode",
+                                      help = "With --slice, the format to write the results in.")
+        self._cli_parser.add_argument("--profile-startup",
+                                      dest = "profile_startup",
+                                      action = "store_true",
+                                      default = False,
+                                      help = "Log how long it took to import the slowest modules and every plug-in while starting.")
+        self._cli_parser.add_argument("file", nargs = "*", help = "Files to load after starting the application, or to slice with --slice.")
 
     def getContainerRegistry(self) -> "CuraContainerRegistry":
         return self._container_registry
@@ -315,8 +342,13 @@ class CuraApplication(QtApplication):
         if self._cli_args.trigger_early_crash:
             assert not "This crash is triggered by the trigger_early_crash command line argument."
 
-        for filename in self._cli_args.file:
-            self._files_to_open.append(os.path.abspath(filename))
+        if self._cli_args.slice:
+            self._is_headless = True
+            self._batch_slicer = BatchSlicer(self, self._cli_args.file, os.path.abspath(self._cli_args.output_dir), self._cli_args.output_format,
+                                             self._cli_args.machine, self._cli_args.quality)
+        else:
+            for filename in self._cli_args.file:
+                self._files_to_open.append(os.path.abspath(filename))
 
     def initialize(self) -> None:
         self.__addExpectedResourceDirsAndSearchPaths()  # Must be added before init of super
@@ -324,7 +356,7 @@ class CuraApplication(QtApplication):
         super().initialize(ApplicationMetadata.IsEnterpriseVersion)
 
         self._preferences.addPreference("cura/single_instance", False)
-        self._use_single_instance = self._preferences.getValue("cura/single_instance") or self._cli_args.single_instance
+        self._use_single_instance = (self._preferences.getValue("cura/single_instance") or self._cli_args.single_instance) and self._batch_slicer is None
 
         self.__sendCommandToSingleInstance()
         self._initializeSettingDefinitions()
@@ -491,6 +523,8 @@ class CuraApplication(QtApplication):
         """Runs preparations that needs to be done before the starting process."""
 
         super().startSplashWindowPhase()
+        # The configuration files were upgraded while starting, so the versions of all of them are known now.
+        VersionUpgradeManifest.getInstance().save()
 
         if not self.getIsHeadLess():
             try:
@@ -596,7 +630,7 @@ class CuraApplication(QtApplication):
 
         preferences.setDefault("local_file/last_used_type", "text/x-gcode")
 
-        self.applicationShuttingDown.connect(self.saveSettings)
+        self.applicationShuttingDown.connect(self._saveSettingsOnShutdown)
         self.engineCreatedSignal.connect(self._onEngineCreated)
 
         self.getCuraSceneController().setActiveBuildPlate(0)  # Initialize
@@ -761,6 +795,11 @@ class CuraApplication(QtApplication):
         ContainerRegistry.getInstance().saveDirtyContainers()
         self.savePreferences()
 
+    def _saveSettingsOnShutdown(self) -> None:
+        self.saveSettings()
+        # The application exits without waiting for other threads, so make sure all containers are on disk.
+        cast(CuraContainerRegistry, ContainerRegistry.getInstance()).waitForSave()
+
     def saveStack(self, stack):
         if not self._enable_save:
             return
@@ -820,7 +859,7 @@ class CuraApplication(QtApplication):
         else:
             self.showSplashMessage(hint)
 
-    def run(self):
+    def run(self) -> int:
         super().run()
 
         if len(ApplicationMetadata.DEPENDENCY_INFO) > 0:
@@ -882,6 +921,11 @@ class CuraApplication(QtApplication):
         self.initializationFinished.emit()
         Logger.log("d", "Booting Cura took %s seconds", time.time() - self._boot_loading_time)
 
+        startup_profiler = StartupProfiler.getInstance()
+        if startup_profiler is not None:
+            startup_profiler.stop()
+            Logger.info(startup_profiler.getReport(self._plugin_registry.getActivePlugins()))
+
         # For now use a timer to postpone some things that need to be done after the application and GUI are
         # initialized, for example opening files because they may show dialogs which can be closed due to incomplete
         # GUI initialization.
@@ -894,15 +938,18 @@ class CuraApplication(QtApplication):
         self._auto_save = AutoSave(self)
         self._auto_save.initialize()
 
-        self.exec()
+        return self.exec()  # The exit code, e.g. of --slice.
 
     def __setUpSingleInstanceServer(self):
         if self._use_single_instance:
             self._single_instance.startServer()
 
     def _onPostStart(self):
-        for file_name in self._files_to_open:
-            self.callLater(self._openFile, file_name)
+        if self._batch_slicer is not None:
+            self._batch_slicer.start()
+            return
+        if self._files_to_open:
+            self.callLater(self.readLocalFiles, [QUrl.fromLocalFile(file_name) for file_name in self._files_to_open])
         for file_name in self._open_file_queue:  # Open all the files that were queued up while plug-ins were loading.
             self.callLater(self._openFile, file_name)
 
@@ -1684,6 +1731,7 @@ class CuraApplication(QtApplication):
 
     fileLoaded = pyqtSignal(str)
     fileCompleted = pyqtSignal(str)
+    fileLoadFailed = pyqtSignal(str)  # Emitted when a model file couldn't be loaded, with the name of that file.
 
     def _reloadMeshFinished(self, job) -> None:
         """
@@ -1773,6 +1821,7 @@ class CuraApplication(QtApplication):
         """
         Logger.log("i", "Attempting to read file %s", file.toString())
         if not file.isValid():
+            self.fileLoadFailed.emit(file.toLocalFile())
             return
 
         scene = self.getController().getScene()
@@ -1817,6 +1866,7 @@ class CuraApplication(QtApplication):
                     title = self._i18n_catalog.i18nc("@info:title", "Warning"),
                     message_type = Message.MessageType.WARNING)
                 message.show()
+                self.fileLoadFailed.emit(f)
                 return
             # If file being loaded is non-slicable file, then prevent loading of any other files
             extension = os.path.splitext(self._currently_loading_files[0])[1]
@@ -1829,6 +1879,7 @@ class CuraApplication(QtApplication):
                     title = self._i18n_catalog.i18nc("@info:title", "Error"),
                     message_type = Message.MessageType.ERROR)
                 message.show()
+                self.fileLoadFailed.emit(f)
                 return
 
         self._currently_loading_files.append(f)
@@ -1839,124 +1890,237 @@ class CuraApplication(QtApplication):
         job.finished.connect(self._readMeshFinished)
         job.start()
 
-    def _readMeshFinished(self, job):
-        global_container_stack = self.getGlobalContainerStack()
-        if not global_container_stack:
-            Logger.log("w", "Can't load meshes before a printer is added.")
+    @pyqtSlot("QList<QUrl>", str, bool)
+    @pyqtSlot("QList<QUrl>", str)
+    @pyqtSlot("QList<QUrl>")
+    def readLocalFiles(self, files: List[QUrl], project_mode: Optional[str] = None, add_to_recent_files: bool = True) -> None:
+        """Open a batch of local files at once.
+
+        The model files are read in parallel. Once all of them are read, they are added to the scene together, arranged
+        at once. Project files and files that can't be sliced, like g-code, are opened one by one, like readLocalFile does.
+        :param project_mode: How to handle project files. See readLocalFile.
+        :param add_to_recent_files: Whether or not to add the files as an option to the Recent Files list.
+        """
+        model_files = []  # type: List[str]
+        for file in files:
+            if not file.isValid():
+                continue
+            file_name = file.toLocalFile()
+            if os.path.splitext(file_name)[1].lower() in self._non_sliceable_extensions or self.checkIsValidProjectFile(file):
+                self.readLocalFile(file, project_mode, add_to_recent_files)
+            else:
+                model_files.append(file_name)
+        if len(model_files) == 1:
+            self.readLocalFile(QUrl.fromLocalFile(model_files[0]), project_mode, add_to_recent_files)
+            return
+        if not model_files:
+            return
+        Logger.log("i", "Attempting to read {count} files".format(count = len(model_files)))
+
+        for node in DepthFirstIterator(self.getController().getScene().getRoot()):
+            if node.callDecoration("isBlockSlicing"):
+                self.deleteAll()
+                break
+        if self.getPreferences().getValue("cura/select_models_on_load"):
+            Selection.clear()
+
+        # The jobs run in parallel on the job queue. Their results are kept in the same order as the files.
+        jobs = []  # type: List[ReadMeshJob]
+        pending_jobs = set()  # type: Set[ReadMeshJob] # The jobs of the batch that didn't finish yet.
+        for file_name in model_files:
+            self._currently_loading_files.append(file_name)
+            job = ReadMeshJob(file_name, add_to_recent_files = add_to_recent_files)
+            job.finished.connect(lambda finished_job, batch = jobs, pending = pending_jobs: self._readMeshBatchJobFinished(finished_job, batch, pending))
+            jobs.append(job)
+            pending_jobs.add(job)
+        for job in jobs:
+            job.start()
+
+    def _readMeshBatchJobFinished(self, job: ReadMeshJob, batch: List[ReadMeshJob], pending_jobs: Set[ReadMeshJob]) -> None:
+        """Add the nodes of a batch of files to the scene once the last file of the batch is read.
+
+        :param job: The job that finished reading a file.
+        :param batch: All jobs of the batch, in the order of the files.
+        :param pending_jobs: The jobs of the batch that didn't finish yet, shared by the whole batch.
+        """
+        pending_jobs.discard(job)
+        if pending_jobs:
+            return  # Wait for the rest of the batch.
+        if not self._canAddLoadedNodes():
+            for batch_job in batch:
+                self._currently_loading_files.remove(batch_job.getFileName())
+                self.fileLoadFailed.emit(batch_job.getFileName())
             return
+
+        fixed_nodes = [node for node in DepthFirstIterator(self.getController().getScene().getRoot()) if node.callDecoration("isSliceable")]
+        nodes_to_arrange = []  # type: List[CuraSceneNode]
+        nodes_to_add = []  # type: List[CuraSceneNode]
+        for batch_job in batch:
+            file_name = batch_job.getFileName()
+            self._currently_loading_files.remove(file_name)
+            nodes = batch_job.getResult()
+            if nodes is None:
+                Logger.error("Read mesh job for {file_name} returned None. Mesh loading must have failed.".format(file_name = file_name))
+                self.fileLoadFailed.emit(file_name)
+                continue
+            self.fileLoaded.emit(file_name)
+            for original_node in nodes:
+                node, should_arrange = self._createLoadedNode(original_node, file_name)
+                (nodes_to_arrange if should_arrange else nodes_to_add).append(node)
+
+        # Find a place for all nodes at once, and add them to the scene with a single operation.
+        arrange_job = ArrangeNewObjectsJob(nodes_to_arrange, nodes_to_add, fixed_nodes)
+        arrange_job.finished.connect(lambda finished_job: self._onLoadedNodesArranged(finished_job, nodes_to_arrange, nodes_to_add, [batch_job.getFileName() for batch_job in batch if batch_job.getResult() is not None]))
+        arrange_job.start()
+
+    def _onLoadedNodesArranged(self, job: ArrangeNewObjectsJob, nodes_to_arrange: List[CuraSceneNode], nodes_to_add: List[CuraSceneNode], file_names: List[str]) -> None:
+        job.getResult().push()
+
+        # Ensure that we don't have any weird floaty objects (CURA-7855)
+        for node in nodes_to_arrange:
+            node.translate(Vector(0, -node.getBoundingBox().bottom, 0), SceneNode.TransformSpace.World)
+
+        self._onLoadedNodesAdded(nodes_to_arrange + nodes_to_add)
+        for file_name in file_names:
+            self.fileCompleted.emit(file_name)
+
+    def _canAddLoadedNodes(self) -> bool:
+        if not self.getGlobalContainerStack():
+            Logger.log("w", "Can't load meshes before a printer is added.")
+            return False
         if not self._volume:
             Logger.log("w", "Can't load meshes before the build volume is initialized")
+            return False
+        return True
+
+    def _readMeshFinished(self, job):
+        file_name = job.getFileName()
+        self._currently_loading_files.remove(file_name)
+        if not self._canAddLoadedNodes():
+            self.fileLoadFailed.emit(file_name)
             return
 
         nodes = job.getResult()
         if nodes is None:
             Logger.error("Read mesh job returned None. Mesh loading must have failed.")
+            self.fileLoadFailed.emit(file_name)
             return
-        file_name = job.getFileName()
-        file_name_lower = file_name.lower()
-        file_extension = file_name_lower.split(".")[-1]
-        self._currently_loading_files.remove(file_name)
 
         self.fileLoaded.emit(file_name)
-        target_build_plate = self.getMultiBuildPlateModel().activeBuildPlate
-
-        root = self.getController().getScene().getRoot()
-        fixed_nodes = []
-        for node_ in DepthFirstIterator(root):
-            if node_.callDecoration("isSliceable") and node_.callDecoration("getBuildPlateNumber") == target_build_plate:
-                fixed_nodes.append(node_)
-
-        default_extruder_position = self.getMachineManager().defaultExtruderPosition
-        default_extruder_id = self._global_container_stack.extruderList[int(default_extruder_position)].getId()
-
-        select_models_on_load = self.getPreferences().getValue("cura/select_models_on_load")
 
         nodes_to_arrange = []  # type: List[CuraSceneNode]
-        
+
         fixed_nodes = []
         for node_ in DepthFirstIterator(self.getController().getScene().getRoot()):
             # Only count sliceable objects
             if node_.callDecoration("isSliceable"):
                 fixed_nodes.append(node_)
 
+        scene = self.getController().getScene()
+        new_nodes = []  # type: List[CuraSceneNode]
         for original_node in nodes:
-            # Create a CuraSceneNode just if the original node is not that type
-            if isinstance(original_node, CuraSceneNode):
-                node = original_node
-            else:
-                node = CuraSceneNode()
-                node.setMeshData(original_node.getMeshData())
-                node.source_mime_type = original_node.source_mime_type
+            node, should_arrange = self._createLoadedNode(original_node, file_name)
+            if should_arrange:
+                nodes_to_arrange.append(node)
+
+            operation = AddSceneNodeOperation(node, scene.getRoot())
+            operation.push()
+            new_nodes.append(node)
+        self._onLoadedNodesAdded(new_nodes)
+        try:
+            arrange(nodes_to_arrange, self.getBuildVolume(), fixed_nodes)
+        except:
+            Logger.logException("e", "Failed to arrange the models")
 
-                # Setting meshdata does not apply scaling.
-                if original_node.getScale() != Vector(1.0, 1.0, 1.0):
-                    node.scale(original_node.getScale())
+        # Ensure that we don't have any weird floaty objects (CURA-7855)
+        for node in nodes_to_arrange:
+            node.translate(Vector(0, -node.getBoundingBox().bottom, 0), SceneNode.TransformSpace.World)
 
-            node.setSelectable(True)
-            node.setName(os.path.basename(file_name))
-            self.getBuildVolume().checkBoundsAndUpdate(node)
+        self.fileCompleted.emit(file_name)
 
-            is_non_sliceable = "." + file_extension in self._non_sliceable_extensions
+    def _createLoadedNode(self, original_node: SceneNode, file_name: str) -> Tuple[CuraSceneNode, bool]:
+        """Prepare a node that was read from a file to be added to the scene.
 
-            if is_non_sliceable:
-                # Need to switch first to the preview stage and then to layer view
-                self.callLater(lambda: (self.getController().setActiveStage("PreviewStage"),
-                                        self.getController().setActiveView("SimulationView")))
+        :param original_node: The node as the reader created it.
+        :param file_name: The file that the node was read from.
+        :return: The node to add to the scene, and whether it should be arranged.
+        """
+        file_extension = file_name.lower().split(".")[-1]
+        target_build_plate = self.getMultiBuildPlateModel().activeBuildPlate
+        should_arrange = False
 
-                block_slicing_decorator = BlockSlicingDecorator()
-                node.addDecorator(block_slicing_decorator)
-            else:
-                sliceable_decorator = SliceableObjectDecorator()
-                node.addDecorator(sliceable_decorator)
-
-            scene = self.getController().getScene()
-
-            # If there is no convex hull for the node, start calculating it and continue.
-            if not node.getDecorator(ConvexHullDecorator):
-                node.addDecorator(ConvexHullDecorator())
-            for child in node.getAllChildren():
-                if not child.getDecorator(ConvexHullDecorator):
-                    child.addDecorator(ConvexHullDecorator())
-
-            if file_extension != "3mf":
-                if node.callDecoration("isSliceable"):
-                    # Ensure that the bottom of the bounding box is on the build plate
-                    if node.getBoundingBox():
-                        center_y = node.getWorldPosition().y - node.getBoundingBox().bottom
-                    else:
-                        center_y = 0
+        # Create a CuraSceneNode just if the original node is not that type
+        if isinstance(original_node, CuraSceneNode):
+            node = original_node
+        else:
+            node = CuraSceneNode()
+            node.setMeshData(original_node.getMeshData())
+            node.source_mime_type = original_node.source_mime_type
 
-                    node.translate(Vector(0, center_y, 0))
+            # Setting meshdata does not apply scaling.
+            if original_node.getScale() != Vector(1.0, 1.0, 1.0):
+                node.scale(original_node.getScale())
 
-                    nodes_to_arrange.append(node)
+        node.setSelectable(True)
+        node.setName(os.path.basename(file_name))
+        self.getBuildVolume().checkBoundsAndUpdate(node)
 
-            # This node is deep copied from some other node which already has a BuildPlateDecorator, but the deepcopy
-            # of BuildPlateDecorator produces one that's associated with build plate -1. So, here we need to check if
-            # the BuildPlateDecorator exists or not and always set the correct build plate number.
-            build_plate_decorator = node.getDecorator(BuildPlateDecorator)
-            if build_plate_decorator is None:
-                build_plate_decorator = BuildPlateDecorator(target_build_plate)
-                node.addDecorator(build_plate_decorator)
-            build_plate_decorator.setBuildPlateNumber(target_build_plate)
+        is_non_sliceable = "." + file_extension in self._non_sliceable_extensions
 
-            operation = AddSceneNodeOperation(node, scene.getRoot())
-            operation.push()
+        if is_non_sliceable:
+            # Need to switch first to the preview stage and then to layer view
+            self.callLater(lambda: (self.getController().setActiveStage("PreviewStage"),
+                                    self.getController().setActiveView("SimulationView")))
 
+            block_slicing_decorator = BlockSlicingDecorator()
+            node.addDecorator(block_slicing_decorator)
+        else:
+            sliceable_decorator = SliceableObjectDecorator()
+            node.addDecorator(sliceable_decorator)
+
+        # If there is no convex hull for the node, start calculating it and continue.
+        if not node.getDecorator(ConvexHullDecorator):
+            node.addDecorator(ConvexHullDecorator())
+        for child in node.getAllChildren():
+            if not child.getDecorator(ConvexHullDecorator):
+                child.addDecorator(ConvexHullDecorator())
+
+        if file_extension != "3mf":
+            if node.callDecoration("isSliceable"):
+                # Ensure that the bottom of the bounding box is on the build plate
+                if node.getBoundingBox():
+                    center_y = node.getWorldPosition().y - node.getBoundingBox().bottom
+                else:
+                    center_y = 0
+
+                node.translate(Vector(0, center_y, 0))
+
+                should_arrange = True
+
+        # This node is deep copied from some other node which already has a BuildPlateDecorator, but the deepcopy
+        # of BuildPlateDecorator produces one that's associated with build plate -1. So, here we need to check if
+        # the BuildPlateDecorator exists or not and always set the correct build plate number.
+        build_plate_decorator = node.getDecorator(BuildPlateDecorator)
+        if build_plate_decorator is None:
+            build_plate_decorator = BuildPlateDecorator(target_build_plate)
+            node.addDecorator(build_plate_decorator)
+        build_plate_decorator.setBuildPlateNumber(target_build_plate)
+
+        return node, should_arrange
+
+    def _onLoadedNodesAdded(self, nodes: List[CuraSceneNode]) -> None:
+        """Finish up nodes that were read from a file, after they were added to the scene."""
+
+        scene = self.getController().getScene()
+        default_extruder_position = self.getMachineManager().defaultExtruderPosition
+        default_extruder_id = self._global_container_stack.extruderList[int(default_extruder_position)].getId()
+        select_models_on_load = self.getPreferences().getValue("cura/select_models_on_load")
+        for node in nodes:
             node.callDecoration("setActiveExtruder", default_extruder_id)
             scene.sceneChanged.emit(node)
 
             if select_models_on_load:
                 Selection.add(node)
-        try:
-            arrange(nodes_to_arrange, self.getBuildVolume(), fixed_nodes)
-        except:
-            Logger.logException("e", "Failed to arrange the models")
-
-        # Ensure that we don't have any weird floaty objects (CURA-7855)
-        for node in nodes_to_arrange:
-            node.translate(Vector(0, -node.getBoundingBox().bottom, 0), SceneNode.TransformSpace.World)
-
-        self.fileCompleted.emit(file_name)
 
     def addNonSliceableExtension(self, extension):
         self._non_sliceable_extensions.append(extension)
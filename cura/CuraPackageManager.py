@@ -3,7 +3,6 @@
 import glob
 import os
 
-from pathlib import Path
 from typing import Any, cast, Dict, List, Set, Tuple, TYPE_CHECKING, Optional
 
 from UM.Logger import Logger
@@ -30,6 +29,11 @@ class CuraPackageManager(PackageManager):
         self._local_packages_ids: Optional[Set[str]] = None
         self.installedPackagesChanged.connect(self._updateLocalPackages)
 
+        # The bundled and installed material files by file name, with the id of the package they are in (None if bundled).
+        self._material_file_index: Optional[Dict[str, List[Tuple[str, Optional[str]]]]] = None
+        self._material_file_guids: Dict[str, str] = {}  # The GUIDs of the material files that were read, by path.
+        self.installedPackagesChanged.connect(self._clearMaterialFileIndex)
+
     def _updateLocalPackages(self) -> None:
         self._local_packages = self.getAllLocalPackages()
         self._local_packages_ids = set(pkg["package_id"] for pkg in self._local_packages)
@@ -68,49 +72,66 @@ class CuraPackageManager(PackageManager):
 
     def isMaterialBundled(self, file_name: str, guid: str):
         """ Check if there is a bundled material name with file_name and guid """
-        for path in Resources.getSecureSearchPaths():
-            # Secure search paths are install directory paths, if a material is in here it must be bundled.
-
-            paths = [Path(p) for p in glob.glob(path + '/**/*.xml.fdm_material', recursive=True)]
-            for material in paths:
-                if material.name == file_name:
-                    Logger.info(f"Found bundled material: {material.name}. Located in path: {str(material)}")
-                    with open(material, encoding="utf-8") as f:
-                        # Make sure the file we found has the same guid as our material
-                        # Parsing this xml would be better but the namespace is needed to search it.
-                        parsed_guid = PluginRegistry.getInstance().getPluginObject(
-                            "XmlMaterialProfile").getMetadataFromSerialized(
-                            f.read(), "GUID")
-                        if guid == parsed_guid:
-                            # The material we found matches both filename and GUID
-                            return True
+        for material_path, package_id in self._getMaterialFileIndex().get(file_name, []):
+            if package_id is not None:
+                continue
+            Logger.info(f"Found bundled material: {file_name}. Located in path: {material_path}")
+            if guid == self._getMaterialFileGuid(material_path):
+                # The material we found matches both filename and GUID
+                return True
 
         return False
 
     def getMaterialFilePackageId(self, file_name: str, guid: str) -> str:
         """Get the id of the installed material package that contains file_name"""
         file_name = unquote_plus(file_name)
-        for material_package in [f for f in os.scandir(self._installation_dirs_dict["materials"]) if f.is_dir()]:
-            package_id = material_package.name
-
-            for root, _, file_names in os.walk(material_package.path):
-                if file_name not in file_names:
-                    # File with the name we are looking for is not in this directory
-                    continue
-
-                with open(os.path.join(root, file_name), encoding="utf-8") as f:
-                    # Make sure the file we found has the same guid as our material
-                    # Parsing this xml would be better but the namespace is needed to search it.
-                    parsed_guid = PluginRegistry.getInstance().getPluginObject("XmlMaterialProfile").getMetadataFromSerialized(
-                        f.read(), "GUID")
-
-                    if guid == parsed_guid:
-                        return package_id
+        for material_path, package_id in self._getMaterialFileIndex().get(file_name, []):
+            if package_id is not None and guid == self._getMaterialFileGuid(material_path):
+                return package_id
 
         Logger.error("Could not find package_id for file: {} with GUID: {} ".format(file_name, guid))
         Logger.error(f"Bundled paths searched: {list(Resources.getSecureSearchPaths())}")
         return ""
 
+    def _getMaterialFileIndex(self) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """Get the bundled and installed material files by file name.
+
+        The material files are only searched for once, until packages are installed or removed.
+
+        :return: For each file name, the paths of the files with that name and the id of the package they are in, or
+        None if they are bundled.
+        """
+        if self._material_file_index is None:
+            index: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+            for path in Resources.getSecureSearchPaths():
+                # Secure search paths are install directory paths, if a material is in here it must be bundled.
+                for material_path in glob.glob(path + '/**/*.xml.fdm_material', recursive=True):
+                    index.setdefault(os.path.basename(material_path), []).append((material_path, None))
+
+            materials_path = self._installation_dirs_dict["materials"]
+            if os.path.isdir(materials_path):
+                for material_package in [f for f in os.scandir(materials_path) if f.is_dir()]:
+                    for root, _, file_names in os.walk(material_package.path):
+                        for file_name in file_names:
+                            index.setdefault(file_name, []).append((os.path.join(root, file_name), material_package.name))
+
+            self._material_file_index = index
+        return self._material_file_index
+
+    def _getMaterialFileGuid(self, material_path: str) -> str:
+        """Get the GUID of a material file, reading it only the first time."""
+
+        if material_path not in self._material_file_guids:
+            with open(material_path, encoding="utf-8") as f:
+                # Parsing this xml would be better but the namespace is needed to search it.
+                self._material_file_guids[material_path] = PluginRegistry.getInstance().getPluginObject(
+                    "XmlMaterialProfile").getMetadataFromSerialized(f.read(), "GUID")
+        return self._material_file_guids[material_path]
+
+    def _clearMaterialFileIndex(self) -> None:
+        self._material_file_index = None
+        self._material_file_guids = {}
+
     def getMachinesUsingPackage(self, package_id: str) -> Tuple[List[Tuple[GlobalStack, str, str]], List[Tuple[GlobalStack, str, str]]]:
         """Returns a list of where the package is used
 
@@ -4,7 +4,6 @@
 from typing import List
 import numpy
 
-from UM.Mesh.MeshBuilder import MeshBuilder
 from UM.Mesh.MeshData import MeshData
 from cura.LayerPolygon import LayerPolygon
 
@@ -75,48 +74,51 @@ class Layer:
     __index_pattern = numpy.array([[0, 3, 2, 0, 1, 3]], dtype = numpy.int32 )
 
     def createMeshOrJumps(self, make_mesh: bool) -> MeshData:
-        builder = MeshBuilder()
-
-        line_count = 0
+        if not self._polygons:
+            return MeshData()
+
+        # Concatenate all polygons, so that the lines of the whole layer can be processed at once.
+        # The last point of each polygon doesn't start a line, or it would connect the polygon to the next one.
+        points = numpy.concatenate([polygon.data for polygon in self._polygons])
+        is_line_start = numpy.ones(len(points), dtype = bool)
+        is_line_start[numpy.cumsum([len(polygon.data) for polygon in self._polygons]) - 1] = False
+        line_types = numpy.concatenate([polygon.types.reshape(-1) for polygon in self._polygons])
+        line_widths = numpy.concatenate([polygon.lineWidths.reshape(-1) for polygon in self._polygons])
+        jump_mask = numpy.concatenate([polygon.jumpMask.reshape(-1) for polygon in self._polygons])
+
+        # Filter out the types of lines we are not interested in depending on whether we are drawing the mesh or the jumps.
+        index_mask = numpy.logical_not(jump_mask) if make_mesh else jump_mask
+        if not index_mask.any():
+            return MeshData()
+        start_indices = numpy.flatnonzero(is_line_start)[index_mask]
+        starts = points[start_indices]
+        ends = points[start_indices + 1]
+        line_types = line_types[index_mask]
+
+        # The 2D normals of the lines, scaled by half the line width so we can easily offset.
+        directions = ends - starts
+        offsets = (line_widths[index_mask] / 2) / numpy.sqrt(directions[:, 0] ** 2 + directions[:, 2] ** 2)
+        normals = numpy.zeros_like(directions)
+        normals[:, 0] = -directions[:, 2] * offsets
+        normals[:, 2] = directions[:, 0] * offsets
+
+        # The maps from line types to colours and to whether they are infill or skin are the same for all polygons.
+        polygon = self._polygons[0]
+
+        # Shift the z-axis according to previous implementation.
+        shift = numpy.zeros(len(line_types), dtype = points.dtype)
         if make_mesh:
-            for polygon in self._polygons:
-                line_count += polygon.meshLineCount
+            shift[polygon.isInfillOrSkinType(line_types)] = -0.01
         else:
-            for polygon in self._polygons:
-                line_count += polygon.jumpCount
-
-        # Reserve the necessary space for the data upfront
-        builder.reserveFaceAndVertexCount(2 * line_count, 4 * line_count)
-
-        for polygon in self._polygons:
-            # Filter out the types of lines we are not interested in depending on whether we are drawing the mesh or the jumps.
-            index_mask = numpy.logical_not(polygon.jumpMask) if make_mesh else polygon.jumpMask
-
-            # Create an array with rows [p p+1] and only keep those we want to draw based on make_mesh
-            points = numpy.concatenate((polygon.data[:-1], polygon.data[1:]), 1)[index_mask.ravel()]
-            # Line types of the points we want to draw
-            line_types = polygon.types[index_mask]
-
-            # Shift the z-axis according to previous implementation.
-            if make_mesh:
-                points[polygon.isInfillOrSkinType(line_types), 1::3] -= 0.01
-            else:
-                points[:, 1::3] += 0.01
-
-            # Create an array with normals and tile 2 copies to match size of points variable
-            normals = numpy.tile( polygon.getNormals()[index_mask.ravel()], (1, 2))
-
-            # Scale all normals by the line width of the current line so we can easily offset.
-            normals *= (polygon.lineWidths[index_mask.ravel()] / 2)
-
-            # Create 4 points to draw each line segment, points +- normals results in 2 points each.
-            # After this we reshape to one point per line.
-            f_points = numpy.concatenate((points-normals, points+normals), 1).reshape((-1, 3))
+            shift[:] = 0.01
+        starts[:, 1] += shift
+        ends[:, 1] += shift
 
-            # __index_pattern defines which points to use to draw the two faces for each lines egment, the following linesegment is offset by 4
-            f_indices = ( self.__index_pattern + numpy.arange(0, 4 * len(normals), 4, dtype=numpy.int32).reshape((-1, 1)) ).reshape((-1, 3))
-            f_colors = numpy.repeat(polygon.mapLineTypeToColor(line_types), 4, 0)
+        # Create 4 points to draw each line segment, points +- normals results in 2 points each.
+        f_points = numpy.stack((starts - normals, ends - normals, starts + normals, ends + normals), axis = 1).reshape((-1, 3))
 
-            builder.addFacesWithColor(f_points, f_indices, f_colors)
+        # __index_pattern defines which points to use to draw the two faces for each lines egment, the following linesegment is offset by 4
+        f_indices = (self.__index_pattern + numpy.arange(0, 4 * len(line_types), 4, dtype = numpy.int32).reshape((-1, 1))).reshape((-1, 3))
+        f_colors = numpy.repeat(polygon.mapLineTypeToColor(line_types), 4, 0)
 
-        return builder.build()
\ No newline at end of file
+        return MeshData(vertices = f_points.astype(numpy.float32, copy = False), indices = f_indices, colors = f_colors.astype(numpy.float32, copy = False))
@@ -10,11 +10,12 @@ class LayerData(MeshData):
     """
 
     def __init__(self, vertices = None, normals = None, indices = None, colors = None, uvs = None, file_name = None,
-                 center_position = None, layers=None, element_counts=None, attributes=None):
+                 center_position = None, layers=None, element_counts=None, attributes=None, line_type_statistics=None):
         super().__init__(vertices=vertices, normals=normals, indices=indices, colors=colors, uvs=uvs,
                          file_name=file_name, center_position=center_position, attributes=attributes)
         self._layers = layers
         self._element_counts = element_counts
+        self._line_type_statistics = line_type_statistics
 
     def getLayer(self, layer):
         if layer in self._layers:
@@ -26,3 +27,8 @@ class LayerData(MeshData):
 
     def getElementCounts(self):
         return self._element_counts
+
+    def getLineTypeStatistics(self):
+        """The limits of the properties of the lines per line type, as :py:class:`cura.LineTypeStatistics.LineTypeStatistics`."""
+
+        return self._line_type_statistics
@@ -5,6 +5,7 @@ from .Layer import Layer
 from .LayerPolygon import LayerPolygon
 from UM.Mesh.MeshBuilder import MeshBuilder
 from .LayerData import LayerData
+from .LineTypeStatistics import LineTypeStatistics
 
 import numpy
 from typing import Dict, Optional
@@ -115,4 +116,5 @@ class LayerDataBuilder(MeshBuilder):
         return LayerData(vertices=self.getVertices(), normals=self.getNormals(), indices=self.getIndices(),
                         colors=self.getColors(), uvs=self.getUVCoordinates(), file_name=self.getFileName(),
                         center_position=self.getCenterPosition(), layers=self._layers,
-                        element_counts=self._element_counts, attributes=attributes)
+                        element_counts=self._element_counts, attributes=attributes,
+                        line_type_statistics=LineTypeStatistics(polygon for layer in self._layers.values() for polygon in layer.polygons))
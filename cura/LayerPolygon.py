@@ -22,11 +22,11 @@ class LayerPolygon:
     MoveRetractionType = 9
     SupportInterfaceType = 10
     PrimeTowerType = 11
-    __number_of_types = 12
+    NumberOfTypes = 12
 
-    __jump_map = numpy.logical_or(numpy.logical_or(numpy.arange(__number_of_types) == NoneType,
-                                                   numpy.arange(__number_of_types) == MoveCombingType),
-                                                   numpy.arange(__number_of_types) == MoveRetractionType)
+    __jump_map = numpy.logical_or(numpy.logical_or(numpy.arange(NumberOfTypes) == NoneType,
+                                                   numpy.arange(NumberOfTypes) == MoveCombingType),
+                                                   numpy.arange(NumberOfTypes) == MoveRetractionType)
 
     def __init__(self, extruder: int, line_types: numpy.ndarray, data: numpy.ndarray,
                  line_widths: numpy.ndarray, line_thicknesses: numpy.ndarray, line_feedrates: numpy.ndarray) -> None:
@@ -42,7 +42,7 @@ class LayerPolygon:
 
         self._extruder = extruder
         self._types = line_types
-        unknown_types = numpy.where(self._types >= self.__number_of_types, self._types, None)
+        unknown_types = numpy.where(self._types >= self.NumberOfTypes, self._types, None)
         if unknown_types.any():
             # Got faulty line data from the engine.
             for idx in unknown_types:
@@ -0,0 +1,64 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from typing import Iterable, List, Tuple
+
+import numpy
+
+from .LayerPolygon import LayerPolygon
+
+
+class LineTypeStatistics:
+    """The minimum and maximum feedrate, width, thickness and flow rate of the lines in layer data, per line type.
+
+    These are computed once when the layer data is built, so that the limits of the colour schemes of the layer view
+    can be found for any combination of visible line types without going through all lines again.
+    """
+
+    def __init__(self, polygons: Iterable[LayerPolygon]) -> None:
+        """Computes the statistics of all lines in a number of polygons.
+
+        :param polygons: The polygons of all layers.
+        """
+        polygons = list(polygons)
+        line_types = self._concatenate([polygon.types for polygon in polygons], numpy.uint8)
+        feedrates = self._concatenate([polygon.lineFeedrates for polygon in polygons], numpy.float32)
+        line_widths = self._concatenate([polygon.lineWidths for polygon in polygons], numpy.float32)
+        thicknesses = self._concatenate([polygon.lineThicknesses for polygon in polygons], numpy.float32)
+
+        # Sort the lines by type, so that every type is a consecutive range that can be reduced at once.
+        order = numpy.argsort(line_types, kind = "stable")
+        self.line_counts = numpy.bincount(line_types, minlength = LayerPolygon.NumberOfTypes)
+        self._present_types = numpy.flatnonzero(self.line_counts)
+        self._type_starts = numpy.searchsorted(line_types[order], self._present_types)
+
+        self.min_feedrates, self.max_feedrates = self._reduce(feedrates[order])
+        self.min_line_widths, self.max_line_widths = self._reduce(line_widths[order])
+        sorted_thicknesses = thicknesses[order]
+        _, self.max_thicknesses = self._reduce(sorted_thicknesses)
+        # Lines without thickness don't count for the minimum thickness. They can occur in g-code from other slicers.
+        self.min_thicknesses, _ = self._reduce(numpy.where(sorted_thicknesses != 0, sorted_thicknesses, numpy.inf))
+        self.min_flow_rates, self.max_flow_rates = self._reduce((feedrates * line_widths * thicknesses)[order])
+
+    def getUsedLineTypes(self, line_types: Iterable[int]) -> List[int]:
+        """Get which of a number of line types have any lines."""
+
+        return [line_type for line_type in line_types if self.line_counts[line_type] > 0]
+
+    @staticmethod
+    def _concatenate(arrays: List[numpy.ndarray], dtype: type) -> numpy.ndarray:
+        if not arrays:
+            return numpy.empty(0, dtype = dtype)
+        return numpy.concatenate([array.reshape(-1) for array in arrays]).astype(dtype, copy = False)
+
+    def _reduce(self, sorted_values: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Get the minimum and maximum of the values of every line type. Types without lines get infinite limits.
+
+        :param sorted_values: The values of all lines, sorted by line type.
+        """
+        minimums = numpy.full(LayerPolygon.NumberOfTypes, numpy.inf)
+        maximums = numpy.full(LayerPolygon.NumberOfTypes, -numpy.inf)
+        if len(self._present_types) > 0:
+            minimums[self._present_types] = numpy.minimum.reduceat(sorted_values, self._type_starts)
+            maximums[self._present_types] = numpy.maximum.reduceat(sorted_values, self._type_starts)
+        return minimums, maximums
@@ -5,6 +5,8 @@ from PyQt6.QtCore import QSize
 from UM.Application import Application
 from typing import Tuple
 
+from cura.PrinterOutput.PrintJobPreviewImageCache import PrintJobPreviewImageCache
+
 
 class PrintJobPreviewImageProvider(QQuickImageProvider):
     def __init__(self):
@@ -21,6 +23,10 @@ class PrintJobPreviewImageProvider(QQuickImageProvider):
         # The id will have an uuid and an increment separated by a slash. As we don't care about the value of the
         # increment, we need to strip that first.
         uuid = id[id.find("/") + 1:]
+        cached_image = PrintJobPreviewImageCache.getInstance().get(uuid)
+        if cached_image is not None:
+            return cached_image, QSize(15, 15)
+
         for output_device in Application.getInstance().getOutputDeviceManager().getOutputDevices():
             if not hasattr(output_device, "printJobs"):
                 continue
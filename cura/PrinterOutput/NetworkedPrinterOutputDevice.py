@@ -2,6 +2,7 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 from UM.FileHandler.FileHandler import FileHandler #For typing.
+from UM.Job import Job
 from UM.Logger import Logger
 from UM.Scene.SceneNode import SceneNode #For typing.
 from cura.API import Account
@@ -10,11 +11,13 @@ from cura.CuraApplication import CuraApplication
 from cura.PrinterOutput.PrinterOutputDevice import PrinterOutputDevice, ConnectionState, ConnectionType
 
 from PyQt6.QtNetwork import QHttpMultiPart, QHttpPart, QNetworkRequest, QNetworkAccessManager, QNetworkReply, QAuthenticator
-from PyQt6.QtCore import pyqtProperty, pyqtSignal, pyqtSlot, QObject, QUrl, QCoreApplication
+from PyQt6.QtCore import pyqtProperty, pyqtSignal, pyqtSlot, QObject, QUrl
+from concurrent.futures import Future, ThreadPoolExecutor
 from time import time
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
 from enum import IntEnum
 
+import collections
 import os  # To get the username
 import gzip
 
@@ -32,6 +35,11 @@ class AuthState(IntEnum):
 class NetworkedPrinterOutputDevice(PrinterOutputDevice):
     authenticationStateChanged = pyqtSignal()
 
+    # Emitted from the job that compresses the g-code, with the progress in percent and with the gzipped g-code (or None
+    # if it was aborted). The device handles them on the Qt thread.
+    gcodeCompressionProgress = pyqtSignal(float)
+    gcodeCompressed = pyqtSignal(object)
+
     def __init__(self, device_id, address: str, properties: Dict[bytes, bytes], connection_type: ConnectionType = ConnectionType.NetworkConnection, parent: QObject = None) -> None:
         super().__init__(device_id = device_id, connection_type = connection_type, parent = parent)
         self._manager = None    # type: Optional[QNetworkAccessManager]
@@ -56,6 +64,8 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
         self._sending_gcode = False
         self._compressing_gcode = False
         self._gcode = []                    # type: List[str]
+        self.gcodeCompressionProgress.connect(self._onGCodeCompressionProgress)
+        self.gcodeCompressed.connect(self._onGCodeCompressed)
         self._connection_state_before_timeout = None    # type: Optional[ConnectionState]
 
     def requestWrite(self, nodes: List["SceneNode"], file_name: Optional[str] = None, limit_mimetypes: bool = False,
@@ -71,47 +81,83 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
     def authenticationState(self) -> AuthState:
         return self._authentication_state
 
-    def _compressDataAndNotifyQt(self, data_to_append: str) -> bytes:
-        compressed_data = gzip.compress(data_to_append.encode("utf-8"))
+    def _startCompressingGCode(self) -> None:
+        """Start compressing the g-code in a background job.
+
+        ``gcodeCompressionProgress`` is emitted after every batch and ``gcodeCompressed`` when it's done. To abort, set
+        ``_compressing_gcode`` to False.
+        """
+        self._compressing_gcode = True
+        _CompressGCodeJob(self).start()
+
+    def _onGCodeCompressionProgress(self, progress: float) -> None:
         self._progress_message.setProgress(-1)  # Tickle the message so that it's clear that it's still being used.
-        QCoreApplication.processEvents()  # Ensure that the GUI does not freeze.
 
         # Pretend that this is a response, as zipping might take a bit of time.
         # If we don't do this, the device might trigger a timeout.
         self._last_response_time = time()
-        return compressed_data
+
+    def _onGCodeCompressed(self, compressed_gcode: Optional[bytes]) -> None:
+        if compressed_gcode is None:
+            self._progress_message.hide()
 
     def _compressGCode(self) -> Optional[bytes]:
-        self._compressing_gcode = True
+        """Compress the g-code. This blocks, so it's run in a background job by ``_startCompressingGCode``.
 
+        Every batch of g-code is compressed on a thread pool into a separate gzip member. Concatenated, these form a valid
+        gzip file of the whole g-code. Since zlib releases the GIL while compressing, the batches are compressed in
+        parallel.
+        :return: The gzipped g-code, or None if the compression was aborted by setting ``_compressing_gcode`` to False.
+        """
+        total_size = sum(len(line) for line in self._gcode)
+        compressed_size = 0
+        worker_count = min(os.cpu_count() or 1, 8)
+        file_data_bytes_list = []  # type: List[bytes]
+        pending = collections.deque()  # type: Deque[Tuple[int, Future]]
+        with ThreadPoolExecutor(max_workers = worker_count, thread_name_prefix = "CompressGCode") as executor:
+            for batch in self._batchGCode():
+                if not self._compressing_gcode:
+                    break  # Stop trying to zip / send as abort was called.
+                # Limit the number of batches in flight, so that not all of the g-code is duplicated in memory at once.
+                while len(pending) >= 2 * worker_count:
+                    batch_size, future = pending.popleft()
+                    file_data_bytes_list.append(future.result())
+                    compressed_size += batch_size
+                    self.gcodeCompressionProgress.emit(100 * compressed_size / total_size)
+                pending.append((len(batch), executor.submit(gzip.compress, batch.encode("utf-8"))))
+            while pending and self._compressing_gcode:
+                batch_size, future = pending.popleft()
+                file_data_bytes_list.append(future.result())
+                compressed_size += batch_size
+                self.gcodeCompressionProgress.emit(100 * compressed_size / total_size)
+            for _, future in pending:
+                future.cancel()
+
+        if not self._compressing_gcode:
+            return None
+        self._compressing_gcode = False
+        return b"".join(file_data_bytes_list)
+
+    def _batchGCode(self) -> Iterator[str]:
+        """Mash the g-code lines into strings of about a quarter MB each."""
         max_chars_per_line = int(1024 * 1024 / 4)  # 1/4 MB per line.
-        """Mash the data into single string"""
-        file_data_bytes_list = []
-        batched_lines = []
+        batched_lines = []  # type: List[str]
         batched_lines_count = 0
 
         for line in self._gcode:
-            if not self._compressing_gcode:
-                self._progress_message.hide()
-                # Stop trying to zip / send as abort was called.
-                return None
-
             # if the gcode was read from a gcode file, self._gcode will be a list of all lines in that file.
             # Compressing line by line in this case is extremely slow, so we need to batch them.
             batched_lines.append(line)
             batched_lines_count += len(line)
 
             if batched_lines_count >= max_chars_per_line:
-                file_data_bytes_list.append(self._compressDataAndNotifyQt("".join(batched_lines)))
+                yield "".join(batched_lines)
                 batched_lines = []
                 batched_lines_count = 0
 
         # Don't miss the last batch (If any)
         if len(batched_lines) != 0:
-            file_data_bytes_list.append(self._compressDataAndNotifyQt("".join(batched_lines)))
-
-        self._compressing_gcode = False
-        return b"".join(file_data_bytes_list)
+            yield "".join(batched_lines)
 
     def _update(self) -> None:
         """
@@ -422,3 +468,16 @@ class NetworkedPrinterOutputDevice(PrinterOutputDevice):
         """IP address of this printer"""
 
         return self._address
+
+
+class _CompressGCodeJob(Job):
+    """Compresses the g-code of a networked printer, off the Qt thread."""
+
+    def __init__(self, device: NetworkedPrinterOutputDevice) -> None:
+        super().__init__()
+        self._device = device
+
+    def run(self) -> None:
+        compressed_gcode = self._device._compressGCode()
+        self.setResult(compressed_gcode)
+        self._device.gcodeCompressed.emit(compressed_gcode)
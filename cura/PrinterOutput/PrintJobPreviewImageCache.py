@@ -0,0 +1,124 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from PyQt6.QtGui import QImage
+
+from UM.Logger import Logger
+from UM.Resources import Resources
+
+
+class PrintJobPreviewImageCache:
+    """Bounded cache of the preview images of print jobs, keyed by the UUID of the print job.
+
+    The decoded images of the most recently used print jobs are kept in memory. The encoded image data of a larger
+    number of print jobs is kept on disk, so that the images don't need to be downloaded again when the print job models
+    are re-created, for instance after reconnecting to a printer. Both are evicted in least recently used order.
+    """
+
+    MAX_MEMORY_ENTRIES = 100
+    MAX_DISK_ENTRIES = 1000
+
+    # Only UUID-like keys are stored on disk, so that they are always valid file names.
+    _key_regex = re.compile(r"^[0-9A-Za-z\-]+$")
+
+    __instance = None  # type: Optional["PrintJobPreviewImageCache"]
+
+    @classmethod
+    def getInstance(cls) -> "PrintJobPreviewImageCache":
+        if cls.__instance is None:
+            cls.__instance = PrintJobPreviewImageCache()
+        return cls.__instance
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        """Creates a new cache.
+
+        :param cache_path: The directory to store the images in. By default, a directory in the cache storage path.
+        """
+        self._cache_path = cache_path if cache_path is not None else os.path.join(Resources.getCacheStoragePath(), "print_job_previews")
+        self._images = OrderedDict()  # type: OrderedDict[str, QImage]
+        self._lock = threading.Lock()  # The image provider may request images from a different thread.
+
+    def get(self, key: str) -> Optional[QImage]:
+        """Get the preview image of a print job from memory, or from disk if it is no longer in memory.
+
+        :param key: The UUID of the print job.
+        :return: The image, or None if it is not in the cache.
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        file_path = self._getFilePath(key)
+        if file_path is None or not os.path.isfile(file_path):
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            os.utime(file_path)  # Mark it as recently used.
+        except EnvironmentError as e:
+            Logger.warning("Unable to read cached preview image {file_path}: {err}".format(file_path = file_path, err = str(e)))
+            return None
+        image = QImage()
+        if not image.loadFromData(data):
+            return None
+        self._storeInMemory(key, image)
+        return image
+
+    def put(self, key: str, data: bytes) -> QImage:
+        """Store the encoded preview image of a print job in the cache.
+
+        :param key: The UUID of the print job.
+        :param data: The encoded image, as it was downloaded.
+        :return: The decoded image, which is empty if the data could not be decoded.
+        """
+        image = QImage()
+        if not image.loadFromData(data):
+            return image
+        self._storeInMemory(key, image)
+
+        file_path = self._getFilePath(key)
+        if file_path is None:
+            return image
+        try:
+            os.makedirs(self._cache_path, exist_ok = True)
+            temporary_path = file_path + ".tmp"
+            with open(temporary_path, "wb") as f:
+                f.write(data)
+            os.replace(temporary_path, file_path)  # Never leave a partially written image in the cache.
+            self._pruneDisk()
+        except EnvironmentError as e:
+            Logger.warning("Unable to cache preview image in {file_path}: {err}".format(file_path = file_path, err = str(e)))
+        return image
+
+    def _storeInMemory(self, key: str, image: QImage) -> None:
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.MAX_MEMORY_ENTRIES:
+                self._images.popitem(last = False)
+
+    def _getFilePath(self, key: str) -> Optional[str]:
+        if not self._key_regex.match(key):
+            return None
+        return os.path.join(self._cache_path, key)
+
+    def _pruneDisk(self) -> None:
+        """Remove the least recently used images from disk, if there are more than the maximum."""
+
+        file_names = os.listdir(self._cache_path)
+        if len(file_names) <= self.MAX_DISK_ENTRIES:
+            return
+        file_paths = sorted((os.path.join(self._cache_path, file_name) for file_name in file_names), key = os.path.getmtime)
+        for file_path in file_paths[:len(file_paths) - self.MAX_DISK_ENTRIES]:
+            try:
+                os.remove(file_path)
+            except EnvironmentError:
+                pass  # Maybe it was removed already. Try again next time.
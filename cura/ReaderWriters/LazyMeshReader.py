@@ -0,0 +1,53 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import importlib
+import time
+from typing import Any, List, Optional
+
+from UM.Logger import Logger
+from UM.Mesh.MeshReader import MeshReader
+
+
+class LazyMeshReader(MeshReader):
+    """A mesh reader that only imports and creates the actual reader of a plug-in when a file is read with it.
+
+    Plug-ins with readers for file types that are rarely opened register one of these instead of their reader. Then
+    importing the reader and the libraries it needs doesn't slow down starting the application.
+    """
+
+    def __init__(self, module_name: str, class_name: str, extensions: List[str]) -> None:
+        """
+        :param module_name: The full name of the module with the actual reader.
+        :param class_name: The name of the class of the actual reader.
+        :param extensions: The extensions of the files that the actual reader supports, including the period.
+        """
+        super().__init__()
+        self._module_name = module_name
+        self._class_name = class_name
+        self._reader = None  # type: Optional[MeshReader]
+        self._supported_extensions = extensions
+
+    def getReader(self) -> MeshReader:
+        """Get the actual reader, importing and creating it the first time."""
+
+        if self._reader is None:
+            start_time = time.time()
+            reader = getattr(importlib.import_module(self._module_name), self._class_name)()
+            reader.setPluginId(self.getPluginId())
+            reader.setVersion(self.getVersion())
+            self._reader = reader
+            Logger.debug("Loading the mesh reader of {plugin_id} took {duration:.3f}s".format(plugin_id = self.getPluginId(), duration = time.time() - start_time))
+        return self._reader
+
+    def preRead(self, file_name: str, *args: Any, **kwargs: Any) -> MeshReader.PreReadResult:
+        return self.getReader().preRead(file_name, *args, **kwargs)
+
+    def read(self, file_name: str) -> Any:
+        return self.getReader().read(file_name)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else that the actual reader has is used from the actual reader.
+        if name.startswith("__") or name in ("_module_name", "_class_name", "_reader"):
+            raise AttributeError(name)
+        return getattr(self.getReader(), name)
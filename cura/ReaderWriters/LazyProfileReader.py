@@ -0,0 +1,49 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import importlib
+import time
+from typing import Any, Optional
+
+from UM.Logger import Logger
+
+from cura.ReaderWriters.ProfileReader import ProfileReader
+
+
+class LazyProfileReader(ProfileReader):
+    """A profile reader that only imports and creates the actual reader of a plug-in when a profile is read with it.
+
+    Which files a profile reader is tried on follows from the metadata of its plug-in, so the actual reader isn't needed
+    until then.
+    """
+
+    def __init__(self, module_name: str, class_name: str) -> None:
+        """
+        :param module_name: The full name of the module with the actual reader.
+        :param class_name: The name of the class of the actual reader.
+        """
+        super().__init__()
+        self._module_name = module_name
+        self._class_name = class_name
+        self._reader = None  # type: Optional[ProfileReader]
+
+    def getReader(self) -> ProfileReader:
+        """Get the actual reader, importing and creating it the first time."""
+
+        if self._reader is None:
+            start_time = time.time()
+            reader = getattr(importlib.import_module(self._module_name), self._class_name)()
+            reader.setPluginId(self.getPluginId())
+            reader.setVersion(self.getVersion())
+            self._reader = reader
+            Logger.debug("Loading the profile reader of {plugin_id} took {duration:.3f}s".format(plugin_id = self.getPluginId(), duration = time.time() - start_time))
+        return self._reader
+
+    def read(self, file_name):
+        return self.getReader().read(file_name)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else that the actual reader has is used from the actual reader.
+        if name.startswith("__") or name in ("_module_name", "_class_name", "_reader"):
+            raise AttributeError(name)
+        return getattr(self.getReader(), name)
@@ -4,6 +4,9 @@
 import os
 import re
 import configparser
+import time
+import urllib.parse
+from threading import Thread
 
 from typing import Any, cast, Dict, Optional, List, Union, Tuple
 from PyQt6.QtWidgets import QMessageBox
@@ -20,6 +23,7 @@ from UM.Message import Message
 from UM.Platform import Platform
 from UM.PluginRegistry import PluginRegistry  # For getting the possible profile writers to write with.
 from UM.Resources import Resources
+from UM.SaveFile import SaveFile
 from UM.Util import parseBool
 from cura.ReaderWriters.ProfileWriter import ProfileWriter
 
@@ -52,6 +56,8 @@ class CuraContainerRegistry(ContainerRegistry):
         self._database_handlers["quality"] = QualityDatabaseHandler()
         self._database_handlers["intent"] = IntentDatabaseHandler()
 
+        self._save_thread = None  # type: Optional[Thread]  # Writes the containers of the last save to disk.
+
     @override(ContainerRegistry)
     def addContainer(self, container: ContainerInterface) -> bool:
         """Overridden from ContainerRegistry
@@ -492,22 +498,89 @@ class CuraContainerRegistry(ContainerRegistry):
 
     @override(ContainerRegistry)
     def saveDirtyContainers(self) -> None:
+        """Save the containers that changed since they were last saved, and all container stacks.
+
+        Like in Uranium, every stack is saved, since changing the containers of a stack doesn't mark it as dirty.
+        Containers that were saved before are only serialized here. Writing them to disk is done on a background thread,
+        one file at a time, each replacing the old file atomically. If writing a container fails, it is marked as dirty
+        again so that the next save tries again. New containers are saved right away, since the container provider needs
+        to register where they are stored.
+        """
+        dirty_instances = [container for container in self.findDirtyContainers(container_type = InstanceContainer) if not container.getMetaDataEntry("removed")]
+        # Save base files first
+        dirty_instances.sort(key = lambda instance: instance.getId() != instance.getMetaData().get("base_file"))
+        stacks = self.findContainerStacks()
+
+        files_to_write = []  # type: List[Tuple[ContainerInterface, str, str]]
+        saved_file_count = 0
         # Lock file for "more" atomically loading and saving to/from config dir.
         with self.lockFile():
-            # Save base files first
-            for instance in self.findDirtyContainers(container_type=InstanceContainer):
-                if instance.getMetaDataEntry("removed"):
+            for container in dirty_instances + stacks:
+                path = self._getSavedPath(container)
+                if path is None:
+                    self.saveContainer(container)
+                    saved_file_count += 1
                     continue
-                if instance.getId() == instance.getMetaData().get("base_file"):
-                    self.saveContainer(instance)
-
-            for instance in self.findDirtyContainers(container_type=InstanceContainer):
-                if instance.getMetaDataEntry("removed"):
+                try:
+                    data = container.serialize()
+                except Exception:
+                    Logger.logException("e", "An exception occurred when serializing container %s", container.getId())
                     continue
-                self.saveContainer(instance)
+                files_to_write.append((container, path, data))
+                container.setDirty(False)  # Changes made while the file is written make it dirty again.
+
+        if saved_file_count:
+            Logger.log("d", "Saved %s new containers", saved_file_count)
+        if files_to_write:
+            previous_save_thread = self._save_thread
+            # Every file is replaced atomically, so the thread doesn't need to keep the application from exiting.
+            self._save_thread = Thread(target = self._writeFiles, args = (files_to_write, previous_save_thread), name = "SaveContainersThread", daemon = True)
+            self._save_thread.start()
+
+    def waitForSave(self) -> None:
+        """Wait until the containers of the last save are written to disk, e.g. before exiting the application."""
 
-            for stack in self.findContainerStacks():
-                self.saveContainer(stack)
+        if self._save_thread is not None:
+            self._save_thread.join()
+
+    def _getSavedPath(self, container: ContainerInterface) -> Optional[str]:
+        """Get the file that a container is saved to, if it was saved to the storage path before.
+
+        :return: The path of the file, or None if the container wasn't saved yet or is saved elsewhere.
+        """
+        mime_type = self.getMimeTypeForContainer(type(container))
+        resource_type = self.getResourceTypes().get(container.getMetaDataEntry("type"))
+        if mime_type is None or resource_type is None:
+            return None
+        path = Resources.getStoragePath(resource_type, urllib.parse.quote_plus(container.getId()) + "." + mime_type.preferredSuffix)
+        if container.getPath() != path or not os.path.isfile(path):
+            return None
+        return path
+
+    def _writeFiles(self, files: List[Tuple[ContainerInterface, str, str]], previous_save_thread: Optional[Thread]) -> None:
+        """Write serialized containers to disk, after the previous save is done, so that the latest data is written last.
+
+        :param files: The containers to write, with the paths of their files and the data to write to them.
+        :param previous_save_thread: The thread that writes the previous save, if any.
+        """
+        if previous_save_thread is not None:
+            previous_save_thread.join()
+        write_start_time = time.time()
+        written_count = 0
+        byte_count = 0
+        with self.lockFile():
+            for container, path, data in files:
+                try:
+                    with SaveFile(path, "wt") as f:
+                        f.write(data)
+                except EnvironmentError as e:
+                    Logger.log("e", "Unable to save container to {path}: {err}".format(path = path, err = str(e)))
+                    # Try again at the next save. Containers may only be changed on the main thread.
+                    cura.CuraApplication.CuraApplication.getInstance().callLater(container.setDirty, True)
+                    continue
+                written_count += 1
+                byte_count += len(data.encode("utf-8"))
+        Logger.log("d", "Wrote %s containers (%s bytes) in %s seconds", written_count, byte_count, time.time() - write_start_time)
 
     def _getIOPlugins(self, io_type):
         """Gets a list of profile writer plugins
@@ -0,0 +1,113 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Optional, Set
+
+from UM.Logger import Logger
+from UM.Resources import Resources
+
+from cura import ApplicationMetadata
+
+
+class VersionUpgradeManifest:
+    """Remembers the versions of the configuration files, so that they don't need to be parsed at every start-up.
+
+    At every start-up, the version of every configuration file is checked to see whether it needs to be upgraded. The
+    version upgrade plug-ins let the version of a file be looked up here. Files are identified by a hash of their
+    contents, so any file that changed since it was last seen gets parsed again. The versions are stored in a manifest in
+    the configuration directory when the start-up upgrade is done.
+    """
+
+    FILE_NAME = "version_upgrade_manifest.json"
+
+    # Increase this when the format of the manifest changes, to discard the manifests in the old format.
+    MANIFEST_VERSION = 1
+
+    __instance = None  # type: Optional[VersionUpgradeManifest]
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        :param path: The file to store the manifest in. By default, a file in the configuration directory.
+        """
+        self._path = path
+        self._versions = None  # type: Optional[Dict[str, int]] # The version of every file, by the hash of its contents. Loaded on first use.
+        self._used_keys = set()  # type: Set[str] # The files that were seen since the manifest was loaded.
+        self._changed = False
+
+    @classmethod
+    def getInstance(cls) -> "VersionUpgradeManifest":
+        if cls.__instance is None:
+            cls.__instance = VersionUpgradeManifest()
+        return cls.__instance
+
+    def cacheVersionFunction(self, get_version: Callable[[str], int]) -> Callable[[str], int]:
+        """Get a function that gets the version of a file like the given function, but looks it up in the manifest first.
+
+        This is what the version upgrade plug-ins give as get_version function of their sources.
+        :param get_version: The function that parses the version of the serialised contents of a file.
+        """
+        # Different plug-ins may parse the versions differently, so they get different entries.
+        function_name = "{module}.{name}".format(module = get_version.__module__, name = get_version.__qualname__)
+        return lambda serialized: self.getVersion(serialized, function_name, get_version)
+
+    def getVersion(self, serialized: str, function_name: str, get_version: Callable[[str], int]) -> int:
+        """Get the version of a file, parsing it only if its version isn't in the manifest yet.
+
+        :param serialized: The contents of the file.
+        :param function_name: A name for the function that parses the version.
+        :param get_version: The function that parses the version. Any exception it raises is passed on.
+        :return: The version of the file.
+        """
+        versions = self._getVersions()
+        key = function_name + ":" + hashlib.sha1(serialized.encode("utf-8", errors = "replace")).hexdigest()
+        self._used_keys.add(key)
+        if key not in versions:
+            versions[key] = get_version(serialized)
+            self._changed = True
+        return versions[key]
+
+    def save(self) -> None:
+        """Store the versions of the files that were seen since the manifest was loaded.
+
+        Files that weren't seen were removed or changed, so they are left out of the manifest.
+        """
+        if self._versions is None:
+            return  # Not used.
+        if not self._changed and len(self._used_keys) == len(self._versions):
+            return  # The manifest on disk is still up to date.
+
+        versions = {key: version for key, version in self._versions.items() if key in self._used_keys}
+        try:
+            with open(self._getPath(), "w", encoding = "utf-8") as f:
+                json.dump({"manifest_version": self.MANIFEST_VERSION, "cura_version": ApplicationMetadata.CuraVersion, "versions": versions}, f)
+        except EnvironmentError as e:
+            Logger.warning("Unable to save the version upgrade manifest: {err}".format(err = str(e)))
+            return
+        self._versions = versions
+        self._changed = False
+
+    def _getPath(self) -> str:
+        if self._path is None:
+            self._path = os.path.join(Resources.getConfigStoragePath(), self.FILE_NAME)
+        return self._path
+
+    def _getVersions(self) -> Dict[str, int]:
+        if self._versions is not None:
+            return self._versions
+
+        self._versions = {}
+        path = self._getPath()
+        if not os.path.exists(path):
+            return self._versions
+        try:
+            with open(path, encoding = "utf-8") as f:
+                manifest = json.load(f)
+            # The version upgrade plug-ins may have changed in another version of Cura, so its manifest can't be used.
+            if manifest.get("manifest_version") == self.MANIFEST_VERSION and manifest.get("cura_version") == ApplicationMetadata.CuraVersion:
+                self._versions = {str(key): int(version) for key, version in manifest["versions"].items()}
+        except (EnvironmentError, ValueError, KeyError, TypeError, AttributeError) as e:
+            Logger.warning("Unable to load the version upgrade manifest, all configuration files will be checked: {err}".format(err = str(e)))
+        return self._versions
@@ -0,0 +1,65 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import concurrent.futures
+import importlib.util
+import multiprocessing
+import sys
+from types import ModuleType
+from typing import Dict, Iterable, List, Tuple
+
+
+def createProcessPool(max_workers: int, modules: Iterable[ModuleType]) -> concurrent.futures.ProcessPoolExecutor:
+    """Create a pool of worker processes, to run functions of the given modules in.
+
+    The worker processes are spawned as new processes, since forking Cura while it runs Qt and other threads is unsafe.
+    Plug-ins are loaded from their folders, so a new process can't import their modules by name. The workers load the
+    given modules from their files instead, before any functions or objects of them are sent to the workers. The
+    packages that contain them are only given their search path, without running their ``__init__``.
+
+    :param max_workers: The maximum amount of worker processes.
+    :param modules: The modules of the functions that are run in the workers, and of the classes (including base
+    classes) of the objects that are sent to the workers.
+    :return: The pool. Use it as a context manager to stop the workers afterwards.
+    """
+    module_files = []  # type: List[Tuple[str, str]]
+    package_paths = {}  # type: Dict[str, List[str]]
+    for module in modules:
+        file_path = getattr(module, "__file__", None)
+        if file_path is None or (module.__name__, file_path) in module_files:
+            continue  # Built-in modules can be imported anyway.
+        module_files.append((module.__name__, file_path))
+        package_name = module.__name__
+        while "." in package_name:
+            package_name = package_name.rsplit(".", 1)[0]
+            package = sys.modules.get(package_name)
+            if package is not None and hasattr(package, "__path__"):
+                package_paths[package_name] = list(package.__path__)
+
+    return concurrent.futures.ProcessPoolExecutor(max_workers = max_workers,
+                                                  mp_context = multiprocessing.get_context("spawn"),
+                                                  initializer = _loadModules,
+                                                  initargs = (module_files, package_paths))
+
+
+def _loadModules(module_files: List[Tuple[str, str]], package_paths: Dict[str, List[str]]) -> None:
+    """Load modules from their files in a worker process, under the same names as in the main process.
+
+    :param module_files: The names of the modules and the files to load them from, in the order to load them.
+    :param package_paths: The search paths of the packages that contain these modules.
+    """
+    for package_name, paths in sorted(package_paths.items()):  # Parent packages sort before their sub-packages.
+        if package_name not in sys.modules:
+            package = ModuleType(package_name)
+            package.__path__ = paths
+            sys.modules[package_name] = package
+
+    for module_name, file_path in module_files:
+        if module_name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        if spec is None or spec.loader is None:
+            raise ImportError("Unable to load module {module_name} from {file_path}".format(module_name = module_name, file_path = file_path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
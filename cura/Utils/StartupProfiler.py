@@ -0,0 +1,127 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import importlib.machinery
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class ImportRecord(NamedTuple):
+    """How long it took to import a module."""
+
+    name: str
+    own_time: float  # Without the modules that it imported, in seconds.
+    total_time: float  # Including the modules that it imported, in seconds.
+    importers: Tuple[str, ...]  # The modules that were being imported when this module was imported, outermost first.
+
+
+class StartupProfiler:
+    """Measures how long it takes to import every module while the application starts.
+
+    It hooks into the import system, so it has to be started before the modules that it should measure are imported.
+    This is done when Cura is started with --profile-startup. Plug-ins are imported as a package with their ID as name,
+    so the time of a plug-in is the time that it took to import the modules in that package.
+    """
+
+    # How many of the slowest modules to list in the report.
+    REPORT_MODULE_COUNT = 40
+
+    __instance = None  # type: Optional[StartupProfiler]
+
+    def __init__(self) -> None:
+        self._records = []  # type: List[ImportRecord]
+        self._stack = []  # type: List[List[Any]] # The name, start time and time in imported modules of the modules being imported.
+        self._start_time = time.perf_counter()
+        self._stop_time = None  # type: Optional[float]
+
+    @classmethod
+    def getInstance(cls) -> Optional["StartupProfiler"]:
+        """Get the profiler that was started, if any."""
+
+        return cls.__instance
+
+    @classmethod
+    def start(cls) -> "StartupProfiler":
+        """Start measuring the imports of modules."""
+
+        if cls.__instance is None:
+            cls.__instance = StartupProfiler()
+            sys.meta_path.insert(0, cls.__instance)  # type: ignore
+        return cls.__instance
+
+    def stop(self) -> None:
+        """Stop measuring. The records of the modules that were imported so far are kept."""
+
+        if self in sys.meta_path:  # type: ignore
+            sys.meta_path.remove(self)  # type: ignore
+        self._stop_time = time.perf_counter()
+
+    def find_spec(self, name: str, path: Optional[Sequence[str]], target: Any = None) -> Optional[importlib.machinery.ModuleSpec]:
+        """Find a module with the other finders, and time the execution of the module once it's found."""
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        # Built-in and frozen modules are loaded by a class instead of a loader per module. They're fast anyway.
+        if isinstance(spec.loader, (importlib.machinery.SourceFileLoader, importlib.machinery.SourcelessFileLoader, importlib.machinery.ExtensionFileLoader)):
+            exec_module = spec.loader.exec_module
+
+            def timedExecModule(module: Any) -> None:
+                self._stack.append([name, time.perf_counter(), 0.0])
+                try:
+                    exec_module(module)
+                finally:
+                    _, start_time, imported_time = self._stack.pop()
+                    total_time = time.perf_counter() - start_time
+                    if self._stack:
+                        self._stack[-1][2] += total_time
+                    self._records.append(ImportRecord(name, total_time - imported_time, total_time, tuple(importer[0] for importer in self._stack)))
+            spec.loader.exec_module = timedExecModule  # type: ignore
+        return spec
+
+    def getRecords(self) -> List[ImportRecord]:
+        return self._records
+
+    def getPluginTimes(self, plugin_ids: Sequence[str]) -> Dict[str, float]:
+        """Get how long it took to import the modules of each plug-in, including the modules that they imported.
+
+        :param plugin_ids: The plug-ins to get the times of.
+        :return: The time per plug-in, in seconds.
+        """
+        plugin_times = {plugin_id: 0.0 for plugin_id in plugin_ids}
+        for record in self._records:
+            plugin_id = record.name.split(".")[0]
+            if plugin_id not in plugin_times:
+                continue
+            # Only count the outermost modules of the plug-in, since they include the time of the others.
+            if any(importer.split(".")[0] == plugin_id for importer in record.importers):
+                continue
+            plugin_times[plugin_id] += record.total_time
+        return plugin_times
+
+    def getReport(self, plugin_ids: Sequence[str]) -> str:
+        """Get a report of the slowest modules to import and the time that every plug-in took to import.
+
+        :param plugin_ids: The plug-ins to report the times of.
+        """
+        stop_time = self._stop_time if self._stop_time is not None else time.perf_counter()
+        lines = ["Startup profile: {count} modules imported in {import_time:.3f}s of {total_time:.3f}s".format(
+            count = len(self._records),
+            import_time = sum(record.own_time for record in self._records),
+            total_time = stop_time - self._start_time)]
+
+        lines.append("Slowest modules to import (own time, including imported modules):")
+        for record in sorted(self._records, key = lambda record: record.own_time, reverse = True)[:self.REPORT_MODULE_COUNT]:
+            lines.append("    {own_time:8.1f} ms {total_time:8.1f} ms  {name}".format(own_time = record.own_time * 1000, total_time = record.total_time * 1000, name = record.name))
+
+        lines.append("Import time per plug-in:")
+        for plugin_id, plugin_time in sorted(self.getPluginTimes(plugin_ids).items(), key = lambda item: item[1], reverse = True):
+            lines.append("    {plugin_time:8.1f} ms  {plugin_id}".format(plugin_time = plugin_time * 1000, plugin_id = plugin_id))
+        return "\n".join(lines)
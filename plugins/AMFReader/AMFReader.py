@@ -85,36 +85,24 @@ class AMFReader(MeshReader):
         nodes = []
         for amf_object in amf_document.iter("object"):
             for amf_mesh in amf_object.iter("mesh"):
-                amf_mesh_vertices = []
-                for vertices in amf_mesh.iter("vertices"):
-                    for vertex in vertices.iter("vertex"):
-                        for coordinates in vertex.iter("coordinates"):
-                            v = [0.0, 0.0, 0.0]
-                            for t in coordinates:
-                                if t.tag == "x":
-                                    v[0] = float(t.text) * scale
-                                elif t.tag == "y":
-                                    v[2] = -float(t.text) * scale
-                                elif t.tag == "z":
-                                    v[1] = float(t.text) * scale
-                            amf_mesh_vertices.append(v)
-                if not amf_mesh_vertices:
+                # Collect the text of all coordinates first, to convert them to numbers all at once.
+                coordinates_text = [(coordinates.findtext("x", "0"), coordinates.findtext("z", "0"), coordinates.findtext("y", "0"))
+                                    for vertices in amf_mesh.iter("vertices")
+                                    for vertex in vertices.iter("vertex")
+                                    for coordinates in vertex.iter("coordinates")]
+                if not coordinates_text:
                     continue
+                # Swap Y and Z, and mirror the new Z, to go from the Z-up coordinates of AMF to the Y-up coordinates of Cura.
+                amf_mesh_vertices = (numpy.array(coordinates_text, dtype = numpy.float64) * [scale, scale, -scale]).astype(numpy.float32)
 
-                indices = []
+                indices = numpy.zeros((0, 3), dtype = numpy.int32)
                 for volume in amf_mesh.iter("volume"):
-                    for triangle in volume.iter("triangle"):
-                        f = [0, 0, 0]
-                        for t in triangle:
-                            if t.tag == "v1":
-                                f[0] = int(t.text)
-                            elif t.tag == "v2":
-                                f[1] = int(t.text)
-                            elif t.tag == "v3":
-                                f[2] = int(t.text)
-                        indices.append(f)
-
-                    mesh = trimesh.base.Trimesh(vertices = numpy.array(amf_mesh_vertices, dtype = numpy.float32), faces = numpy.array(indices, dtype = numpy.int32))
+                    triangles_text = [(triangle.findtext("v1", "0"), triangle.findtext("v2", "0"), triangle.findtext("v3", "0"))
+                                      for triangle in volume.iter("triangle")]
+                    if triangles_text:
+                        indices = numpy.concatenate((indices, numpy.array(triangles_text, dtype = numpy.int32)))
+
+                    mesh = trimesh.base.Trimesh(vertices = amf_mesh_vertices, faces = indices)
                     mesh.merge_vertices()
                     mesh.remove_unreferenced_vertices()
                     mesh.fix_normals()
@@ -157,23 +145,10 @@ class AMFReader(MeshReader):
         tri_faces = tri_node.faces
         tri_vertices = tri_node.vertices
 
-        indices_list = []
-        vertices_list = []
-
-        index_count = 0
-        face_count = 0
-        for tri_face in tri_faces:
-            face = []
-            for tri_index in tri_face:
-                vertices_list.append(tri_vertices[tri_index])
-                face.append(index_count)
-                index_count += 1
-            indices_list.append(face)
-            face_count += 1
-
-        vertices = numpy.asarray(vertices_list, dtype = numpy.float32)
-        indices = numpy.asarray(indices_list, dtype = numpy.int32)
-        normals = calculateNormalsFromIndexedVertices(vertices, indices, face_count)
+        # Every face gets its own three vertices, in order.
+        vertices = numpy.asarray(tri_vertices, dtype = numpy.float32)[tri_faces].reshape((-1, 3))
+        indices = numpy.arange(len(vertices), dtype = numpy.int32).reshape((-1, 3))
+        normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
 
         mesh_data = MeshData(vertices = vertices, indices = indices, normals = normals,file_name = file_name)
         return mesh_data
@@ -1,7 +1,7 @@
 # Copyright (c) 2019 fieldOfView
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import AMFReader
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
 
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("uranium")
@@ -18,4 +18,5 @@ def getMetaData():
     }
 
 def register(app):
-    return {"mesh_reader": AMFReader.AMFReader()}
+    # The reader is only imported when a file is read with it, to start the application faster.
+    return {"mesh_reader": LazyMeshReader(__name__ + ".AMFReader", "AMFReader", [".amf"])}
@@ -4,8 +4,10 @@
 import argparse #To run the engine in debug mode if the front-end is in debug mode.
 from collections import defaultdict
 import os
+import re
 from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSlot
 import sys
+import threading
 from time import time
 from typing import Any, cast, Dict, List, Optional, Set, TYPE_CHECKING
 
@@ -29,6 +31,7 @@ from cura.Settings.ExtruderManager import ExtruderManager
 from cura.Snapshot import Snapshot
 from cura.Utils.Threading import call_on_qt_thread
 from .ProcessSlicedLayersJob import ProcessSlicedLayersJob
+from .SliceResultCache import SliceResult, SliceResultCache
 from .StartSliceJob import StartSliceJob, StartJobResult
 
 import pyArcus as Arcus
@@ -46,6 +49,9 @@ catalog = i18nCatalog("cura")
 class CuraEngineBackend(QObject, Backend):
     backendError = Signal()
 
+    # Tokens in the g-code that are replaced by the print information once slicing is finished.
+    _end_of_slice_token_regex = re.compile(r"\{(?:print_time|filament_amount|filament_weight|filament_cost|jobname)\}")
+
     def __init__(self) -> None:
         """Starts the back-end plug-in.
 
@@ -103,8 +109,16 @@ class CuraEngineBackend(QObject, Backend):
         self._onActiveViewChanged()
 
         self._stored_layer_data = []  # type: List[Arcus.PythonMessage]
+        self._gcode_chunks_with_tokens = []  # type: List[int] # Indices in the g-code list of the slice of the chunks with end-of-slice tokens.
         self._stored_optimized_layer_data = {}  # type: Dict[int, List[Arcus.PythonMessage]] # key is build plate number, then arrays are stored until they go to the ProcessSlicesLayersJob
 
+        # Results of earlier slices, to restore when exactly the same slice is started again.
+        self._slice_result_cache = SliceResultCache()
+        self._slice_hash = None  # type: Optional[str] # Hash of the slice message that was sent to the engine, to store the results with.
+        self._slice_print_times = {}  # type: Dict[str, float] # The estimates of the slice, as sent by the engine.
+        self._slice_material_amounts = []  # type: List[float]
+        self._slice_uuid = ""
+
         self._scene = application.getController().getScene() #type: Scene
         self._scene.sceneChanged.connect(self._onSceneChanged)
 
@@ -331,13 +345,22 @@ class CuraEngineBackend(QObject, Backend):
         self.backendStateChange.emit(BackendState.NotStarted)
 
         self._scene.gcode_dict[build_plate_to_be_sliced] = [] #type: ignore #[] indexed by build plate number
+        self._gcode_chunks_with_tokens = []
+        self._slice_hash = None
+        self._slice_print_times = {}
+        self._slice_material_amounts = []
+        self._slice_uuid = ""
         self._slicing = True
         self.slicingStarted.emit()
 
         self.determineAutoSlicing()  # Switch timer on or off if appropriate
 
         slice_message = self._socket.createMessage("cura.proto.Slice")
-        self._start_slice_job = StartSliceJob(slice_message)
+        slice_result_cache = None
+        if not application.getUseExternalBackend():  # The results of an external engine may differ every time.
+            self._slice_result_cache.setEngineVersion(self._getEngineVersion())
+            slice_result_cache = self._slice_result_cache
+        self._start_slice_job = StartSliceJob(slice_message, slice_result_cache)
         self._start_slice_job_build_plate = build_plate_to_be_sliced
         self._start_slice_job.setBuildPlate(self._start_slice_job_build_plate)
         self._start_slice_job.start()
@@ -349,6 +372,7 @@ class CuraEngineBackend(QObject, Backend):
         Start the engine process by calling _createSocket()
         """
         self._slicing = False
+        self._slice_hash = None
         self._stored_layer_data = []
         if self._start_slice_job_build_plate in self._stored_optimized_layer_data:
             del self._stored_optimized_layer_data[self._start_slice_job_build_plate]
@@ -506,7 +530,13 @@ class CuraEngineBackend(QObject, Backend):
             self._invokeSlice()
             return
 
+        cached_slice_result = job.getCachedSliceResult()
+        if cached_slice_result is not None:
+            self._restoreSliceResult(cached_slice_result)
+            return
+
         # Preparation completed, send it to the backend.
+        self._slice_hash = job.getSliceHash()
         self._socket.sendMessage(job.getSliceMessage())
 
         # Notify the user that it's now up to the backend to do it's job
@@ -748,6 +778,57 @@ class CuraEngineBackend(QObject, Backend):
         :param message: The protobuf message signalling that slicing is finished.
         """
 
+        self._storeSliceResult()
+        self._finishSlicing()
+
+    def _storeSliceResult(self) -> None:
+        """Store the results that the engine sent for the current slice in the cache, on a background thread."""
+
+        if self._slice_hash is None:
+            return
+        try:
+            gcode_list = self._scene.gcode_dict[self._start_slice_job_build_plate] #type: ignore #Because we generate this attribute dynamically.
+        except KeyError:  # The g-code has been cleared, so the results are incomplete.
+            return
+        slice_hash = self._slice_hash
+        self._slice_hash = None
+        layer_messages = list(self._stored_optimized_layer_data.get(cast(int, self._start_slice_job_build_plate), []))
+        # The g-code is copied before the end-of-slice tokens are replaced, since the print information may change.
+        slice_result = SliceResult(list(gcode_list), list(self._gcode_chunks_with_tokens), [], self._slice_print_times, self._slice_material_amounts, self._slice_uuid)
+
+        def storeSliceResult() -> None:
+            slice_result.layers = SliceResult.layersFromMessages(layer_messages)
+            self._slice_result_cache.put(slice_hash, slice_result)
+        threading.Thread(target = storeSliceResult, name = "StoreSliceResultThread", daemon = True).start()
+
+    def _restoreSliceResult(self, slice_result: SliceResult) -> None:
+        """Restore the results of a slice from the cache, as if the engine sent them.
+
+        :param slice_result: The results of an earlier slice of exactly the same slice message.
+        """
+
+        build_plate_number = cast(int, self._start_slice_job_build_plate)
+        Logger.log("i", "Restoring the results of an earlier slice of build plate %s", build_plate_number)
+        self._stored_optimized_layer_data[build_plate_number] = slice_result.getLayerMessages()  # type: ignore # They can be read like messages.
+        self._scene.gcode_dict[build_plate_number] = list(slice_result.gcode) #type: ignore #Because we generate this attribute dynamically.
+        self._gcode_chunks_with_tokens = list(slice_result.gcode_chunks_with_tokens)
+        CuraApplication.getInstance().getPrintInformation().slice_uuid = slice_result.slice_uuid
+        self.printDurationMessage.emit(build_plate_number, dict(slice_result.print_times), list(slice_result.material_amounts))
+        self._finishSlicing()
+
+    def _getEngineVersion(self) -> str:
+        """Get something that identifies the engine that is used, to not restore the results of other engines."""
+
+        engine_location = self.getEngineCommand()[0]
+        try:
+            engine_stat = os.stat(engine_location)
+        except EnvironmentError:
+            return engine_location
+        return "{location} {size} {modified}".format(location = engine_location, size = engine_stat.st_size, modified = engine_stat.st_mtime)
+
+    def _finishSlicing(self) -> None:
+        """Process the results of a slice once they are all there."""
+
         self.setState(BackendState.Done)
         self.processingProgress.emit(1.0)
 
@@ -756,14 +837,19 @@ class CuraEngineBackend(QObject, Backend):
         except KeyError:  # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
             gcode_list = []
         application = CuraApplication.getInstance()
-        for index, line in enumerate(gcode_list):
-            replaced = line.replace("{print_time}", str(application.getPrintInformation().currentPrintTime.getDisplayString(DurationFormat.Format.ISO8601)))
-            replaced = replaced.replace("{filament_amount}", str(application.getPrintInformation().materialLengths))
-            replaced = replaced.replace("{filament_weight}", str(application.getPrintInformation().materialWeights))
-            replaced = replaced.replace("{filament_cost}", str(application.getPrintInformation().materialCosts))
-            replaced = replaced.replace("{jobname}", str(application.getPrintInformation().jobName))
-
-            gcode_list[index] = replaced
+        if self._gcode_chunks_with_tokens:
+            print_information = application.getPrintInformation()
+            replacements = {
+                "{print_time}": str(print_information.currentPrintTime.getDisplayString(DurationFormat.Format.ISO8601)),
+                "{filament_amount}": str(print_information.materialLengths),
+                "{filament_weight}": str(print_information.materialWeights),
+                "{filament_cost}": str(print_information.materialCosts),
+                "{jobname}": str(print_information.jobName)
+            }
+            for index in self._gcode_chunks_with_tokens:
+                if index < len(gcode_list):
+                    gcode_list[index] = self._end_of_slice_token_regex.sub(lambda match: replacements[match.group(0)], gcode_list[index])
+            self._gcode_chunks_with_tokens = []
 
         self._slicing = False
         if self._slice_start_time:
@@ -797,9 +883,13 @@ class CuraEngineBackend(QObject, Backend):
         """
 
         try:
-            self._scene.gcode_dict[self._start_slice_job_build_plate].append(message.data.decode("utf-8", "replace")) #type: ignore #Because we generate this attribute dynamically.
+            gcode_list = self._scene.gcode_dict[self._start_slice_job_build_plate] #type: ignore #Because we generate this attribute dynamically.
         except KeyError:  # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
-            pass  # Throw the message away.
+            return  # Throw the message away.
+        chunk = message.data.decode("utf-8", "replace")
+        if self._end_of_slice_token_regex.search(chunk):
+            self._gcode_chunks_with_tokens.append(len(gcode_list))
+        gcode_list.append(chunk)
 
     def _onGCodePrefixMessage(self, message: Arcus.PythonMessage) -> None:
         """Called when a g-code prefix message is received from the engine.
@@ -809,13 +899,20 @@ class CuraEngineBackend(QObject, Backend):
         """
 
         try:
-            self._scene.gcode_dict[self._start_slice_job_build_plate].insert(0, message.data.decode("utf-8", "replace")) #type: ignore #Because we generate this attribute dynamically.
+            gcode_list = self._scene.gcode_dict[self._start_slice_job_build_plate] #type: ignore #Because we generate this attribute dynamically.
         except KeyError:  # Can occur if the g-code has been cleared while a slice message is still arriving from the other end.
-            pass  # Throw the message away.
+            return  # Throw the message away.
+        chunk = message.data.decode("utf-8", "replace")
+        # The prefix goes in front of all other chunks, so they all move one place.
+        self._gcode_chunks_with_tokens = [index + 1 for index in self._gcode_chunks_with_tokens]
+        if self._end_of_slice_token_regex.search(chunk):
+            self._gcode_chunks_with_tokens.insert(0, 0)
+        gcode_list.insert(0, chunk)
 
     def _onSliceUUIDMessage(self, message: Arcus.PythonMessage) -> None:
         application = CuraApplication.getInstance()
         application.getPrintInformation().slice_uuid = message.slice_uuid
+        self._slice_uuid = message.slice_uuid
 
     def _createSocket(self, protocol_file: str = None) -> None:
         """Creates a new socket connection."""
@@ -863,6 +960,8 @@ class CuraEngineBackend(QObject, Backend):
             material_amounts.append(message.getRepeatedMessage("materialEstimates", index).material_amount)
 
         times = self._parseMessagePrintTimes(message)
+        self._slice_print_times = times
+        self._slice_material_amounts = material_amounts
         self.printDurationMessage.emit(self._start_slice_job_build_plate, times, material_amounts)
 
     def _parseMessagePrintTimes(self, message: Arcus.PythonMessage) -> Dict[str, float]:
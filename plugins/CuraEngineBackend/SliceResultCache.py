@@ -0,0 +1,265 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+
+from UM.Logger import Logger
+from UM.Resources import Resources
+
+if TYPE_CHECKING:
+    import pyArcus as Arcus
+
+
+class CachedMessage:
+    """A message from CuraEngine that was restored from the cache.
+
+    It has the part of the interface of a message from Arcus that is used to read the fields and repeated messages.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def repeatedMessageCount(self, field_name: str) -> int:
+        return len(self._data[field_name])
+
+    def getRepeatedMessage(self, field_name: str, index: int) -> "CachedMessage":
+        return CachedMessage(self._data[field_name][index])
+
+
+class SliceResult:
+    """The results of a slice, as sent by CuraEngine."""
+
+    # The fields of the optimized layer messages and their path segments that are stored.
+    LAYER_FIELDS = ("id", "height", "thickness")
+    PATH_SEGMENT_FIELDS = ("extruder", "point_type", "points", "line_type", "line_width", "line_thickness", "line_feedrate")
+    # The fields of the path segments that are arrays of raw bytes. The other fields are numbers.
+    BINARY_PATH_SEGMENT_FIELDS = ("points", "line_type", "line_width", "line_thickness", "line_feedrate")
+
+    def __init__(self, gcode: List[str], gcode_chunks_with_tokens: List[int], layers: List[Dict[str, Any]],
+                 print_times: Dict[str, float], material_amounts: List[float], slice_uuid: str) -> None:
+        """
+        :param gcode: The chunks of g-code, before the end-of-slice tokens are replaced.
+        :param gcode_chunks_with_tokens: The indices of the chunks of g-code that contain end-of-slice tokens.
+        :param layers: The fields of the optimized layer messages.
+        :param print_times: The estimated print time per feature.
+        :param material_amounts: The estimated amount of material per extruder.
+        :param slice_uuid: The UUID that CuraEngine gave to the slice.
+        """
+        self.gcode = gcode
+        self.gcode_chunks_with_tokens = gcode_chunks_with_tokens
+        self.layers = layers
+        self.print_times = print_times
+        self.material_amounts = material_amounts
+        self.slice_uuid = slice_uuid
+
+    @classmethod
+    def layersFromMessages(cls, layer_messages: Sequence["Arcus.PythonMessage"]) -> List[Dict[str, Any]]:
+        """Copy the fields of optimized layer messages, to be able to store them.
+
+        :param layer_messages: The LayerOptimized messages from CuraEngine.
+        """
+        layers = []
+        for layer_message in layer_messages:
+            layer = {field: getattr(layer_message, field) for field in cls.LAYER_FIELDS}
+            path_segments = []
+            for index in range(layer_message.repeatedMessageCount("path_segment")):
+                path_segment_message = layer_message.getRepeatedMessage("path_segment", index)
+                path_segments.append({field: getattr(path_segment_message, field) for field in cls.PATH_SEGMENT_FIELDS})
+            layer["path_segment"] = path_segments
+            layers.append(layer)
+        return layers
+
+    def getLayerMessages(self) -> List[CachedMessage]:
+        """Get the optimized layers, in a form that can be read like the messages from CuraEngine."""
+
+        return [CachedMessage(layer) for layer in self.layers]
+
+
+class SliceResultCache:
+    """Bounded cache on disk of the results of slices, keyed by a hash of the slice message that was sent to CuraEngine.
+
+    When the same scene is sliced with the same settings as before, the results can be restored from the cache without
+    starting CuraEngine. The least recently used results are evicted when the cache grows larger than its maximum size.
+
+    Every result is stored in a file with only data, so that a damaged or tampered file can't do more than fail to load.
+    The file starts with FILE_MAGIC, then the length of a JSON header as 64-bit little-endian number and the header. The
+    header has the numbers and strings of the result, and the offsets and lengths of the g-code and the binary fields of
+    the layers, which follow the header as raw bytes.
+    """
+
+    MAX_SIZE = 2 * 1024 * 1024 * 1024  # In bytes.
+
+    # The version of the format of the cached results. Results stored in a different format are ignored.
+    FORMAT_VERSION = 2
+
+    FILE_EXTENSION = ".slice"
+    FILE_MAGIC = b"CURA_SLICE_RESULT\n"
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        """Creates a new cache.
+
+        :param cache_path: The directory to store the slice results in. By default, a directory in the cache storage
+        path.
+        """
+        self._cache_path = cache_path if cache_path is not None else os.path.join(Resources.getCacheStoragePath(), "slice_results")
+        self._engine_version = ""
+        self._hit_count = 0
+        self._miss_count = 0
+        self._lock = threading.Lock()  # Results are stored and loaded from different threads.
+
+    def setEngineVersion(self, engine_version: str) -> None:
+        """Set something that identifies the version of CuraEngine, so that results from other versions aren't used.
+
+        :param engine_version: Anything that changes when CuraEngine is changed.
+        """
+        self._engine_version = engine_version
+
+    def get(self, slice_hash: str) -> Optional[SliceResult]:
+        """Get the results of a slice that was done before.
+
+        :param slice_hash: The hash of the slice message.
+        :return: The results of the slice, or None if they are not in the cache.
+        """
+        file_path = self._getFilePath(slice_hash)
+        result = None
+        if os.path.isfile(file_path):
+            try:
+                result = self._readResult(file_path)
+                os.utime(file_path)  # Mark it as recently used.
+            except EnvironmentError as e:
+                Logger.warning("Unable to read cached slice result {file_path}: {err}".format(file_path = file_path, err = str(e)))
+            except (ValueError, KeyError, TypeError, IndexError, AttributeError, struct.error) as e:
+                Logger.warning("Removing damaged cached slice result {file_path}: {err}".format(file_path = file_path, err = str(e)))
+                try:
+                    os.remove(file_path)
+                except EnvironmentError:
+                    pass  # Try again next time.
+
+        with self._lock:
+            if result is not None:
+                self._hit_count += 1
+            else:
+                self._miss_count += 1
+            Logger.log("d", "Slice result cache {outcome} ({hits} hits, {misses} misses)".format(outcome = "hit" if result is not None else "miss", hits = self._hit_count, misses = self._miss_count))
+        return result
+
+    def put(self, slice_hash: str, result: SliceResult) -> None:
+        """Store the results of a slice in the cache.
+
+        :param slice_hash: The hash of the slice message.
+        :param result: The results of the slice.
+        """
+        file_path = self._getFilePath(slice_hash)
+        with self._lock:
+            try:
+                os.makedirs(self._cache_path, exist_ok = True)
+                temporary_path = file_path + ".tmp"
+                with open(temporary_path, "wb") as f:
+                    f.writelines(self._serializeResult(result))
+                os.replace(temporary_path, file_path)  # Never leave a partially written result in the cache.
+                self._pruneDisk()
+            except EnvironmentError as e:
+                Logger.warning("Unable to cache slice result in {file_path}: {err}".format(file_path = file_path, err = str(e)))
+
+    def _serializeResult(self, result: SliceResult) -> List[bytes]:
+        """Convert the results of a slice to the parts of the file to store them in.
+
+        :param result: The results of the slice.
+        :return: The parts of the file, in order.
+        """
+        blobs = []  # type: List[bytes]
+        blobs_size = 0
+
+        def addBlob(data: bytes) -> List[int]:
+            nonlocal blobs_size
+            blobs.append(data)
+            position = [blobs_size, len(data)]
+            blobs_size += len(data)
+            return position
+
+        gcode = [addBlob(chunk.encode("utf-8")) for chunk in result.gcode]
+        layers = []
+        for layer in result.layers:
+            stored_layer = {field: layer[field] for field in SliceResult.LAYER_FIELDS}  # type: Dict[str, Any]
+            stored_layer["path_segment"] = [
+                {field: addBlob(bytes(path_segment[field])) if field in SliceResult.BINARY_PATH_SEGMENT_FIELDS else path_segment[field] for field in SliceResult.PATH_SEGMENT_FIELDS}
+                for path_segment in layer["path_segment"]
+            ]
+            layers.append(stored_layer)
+
+        header = json.dumps({
+            "format_version": self.FORMAT_VERSION,
+            "gcode": gcode,
+            "gcode_chunks_with_tokens": result.gcode_chunks_with_tokens,
+            "layers": layers,
+            "print_times": result.print_times,
+            "material_amounts": result.material_amounts,
+            "slice_uuid": result.slice_uuid
+        }).encode("utf-8")
+        return [self.FILE_MAGIC, struct.pack("<Q", len(header)), header] + blobs
+
+    def _readResult(self, file_path: str) -> Optional[SliceResult]:
+        """Read the results of a slice from a file in the cache.
+
+        :param file_path: The file to read.
+        :return: The results of the slice, or None if they were stored in another format.
+        :raise ValueError: The file is damaged. Other errors that damaged files can cause are KeyError, TypeError,
+        IndexError, AttributeError and struct.error.
+        """
+        with open(file_path, "rb") as f:
+            if f.read(len(self.FILE_MAGIC)) != self.FILE_MAGIC:
+                raise ValueError("Not a slice result.")
+            header_length = struct.unpack("<Q", f.read(8))[0]
+            header = json.loads(f.read(header_length).decode("utf-8"))
+            if header.get("format_version") != self.FORMAT_VERSION:
+                return None
+            blobs = f.read()
+
+        def getBlob(position: List[int]) -> bytes:
+            offset, length = int(position[0]), int(position[1])
+            if offset < 0 or length < 0 or offset + length > len(blobs):
+                raise ValueError("Data out of range.")
+            return blobs[offset:offset + length]
+
+        gcode = [getBlob(position).decode("utf-8") for position in header["gcode"]]
+        layers = []
+        for stored_layer in header["layers"]:
+            layer = {field: stored_layer[field] for field in SliceResult.LAYER_FIELDS}  # type: Dict[str, Any]
+            layer["path_segment"] = [
+                {field: getBlob(path_segment[field]) if field in SliceResult.BINARY_PATH_SEGMENT_FIELDS else path_segment[field] for field in SliceResult.PATH_SEGMENT_FIELDS}
+                for path_segment in stored_layer["path_segment"]
+            ]
+            layers.append(layer)
+        return SliceResult(gcode, [int(index) for index in header["gcode_chunks_with_tokens"]], layers,
+                           {str(feature): float(time) for feature, time in header["print_times"].items()},
+                           [float(amount) for amount in header["material_amounts"]], str(header["slice_uuid"]))
+
+    def _getFilePath(self, slice_hash: str) -> str:
+        key = hashlib.sha256((self._engine_version + "\n" + slice_hash).encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_path, key + self.FILE_EXTENSION)
+
+    def _pruneDisk(self) -> None:
+        """Remove the least recently used results from disk, if they take more than the maximum size together."""
+
+        file_paths = [os.path.join(self._cache_path, file_name) for file_name in os.listdir(self._cache_path) if file_name.endswith(self.FILE_EXTENSION)]
+        file_sizes = {file_path: os.path.getsize(file_path) for file_path in file_paths}
+        total_size = sum(file_sizes.values())
+        for file_path in sorted(file_paths, key = os.path.getmtime):
+            if total_size <= self.MAX_SIZE:
+                break
+            try:
+                os.remove(file_path)
+                total_size -= file_sizes[file_path]
+            except EnvironmentError:
+                pass  # Maybe it was removed already. Try again next time.
@@ -1,17 +1,20 @@
 #  Copyright (c) 2021-2022 Ultimaker B.V.
 #  Cura is released under the terms of the LGPLv3 or higher.
 
+import hashlib
 import numpy
 from string import Formatter
 from enum import IntEnum
 import time
-from typing import Any, cast, Dict, List, Optional, Set
+from typing import Any, cast, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 import re
 import pyArcus as Arcus  # For typing.
 from PyQt6.QtCore import QCoreApplication
 
 from UM.Job import Job
 from UM.Logger import Logger
+from UM.Math.Matrix import Matrix
+from UM.Mesh.MeshData import MeshData
 from UM.Scene.SceneNode import SceneNode
 from UM.Settings.ContainerStack import ContainerStack #For typing.
 from UM.Settings.InstanceContainer import InstanceContainer
@@ -29,6 +32,9 @@ from cura.Scene.CuraSceneNode import CuraSceneNode
 from cura.OneAtATimeIterator import OneAtATimeIterator
 from cura.Settings.ExtruderManager import ExtruderManager
 
+if TYPE_CHECKING:
+    from .SliceResultCache import SliceResult, SliceResultCache
+
 
 NON_PRINTING_MESH_SETTINGS = ["anti_overhang_mesh", "infill_mesh", "cutting_mesh"]
 
@@ -90,7 +96,11 @@ class GcodeStartEndFormatter(Formatter):
 class StartSliceJob(Job):
     """Job class that builds up the message of scene data to send to CuraEngine."""
 
-    def __init__(self, slice_message: Arcus.PythonMessage) -> None:
+    def __init__(self, slice_message: Arcus.PythonMessage, slice_result_cache: Optional["SliceResultCache"] = None) -> None:
+        """
+        :param slice_message: The message to fill with the scene data.
+        :param slice_result_cache: The cache to look up the results of the slice in, once the message is built.
+        """
         super().__init__()
 
         self._scene = CuraApplication.getInstance().getController().getScene() #type: Scene
@@ -98,11 +108,28 @@ class StartSliceJob(Job):
         self._is_cancelled = False #type: bool
         self._build_plate_number = None #type: Optional[int]
 
+        self._slice_hash = hashlib.sha256()  # Hash of everything that is put in the slice message.
+        self._slice_result_cache = slice_result_cache
+        self._cached_slice_result = None #type: Optional[SliceResult]
+
         self._all_extruders_settings = None #type: Optional[Dict[str, Any]] # cache for all setting values from all stacks (global & extruder) for the current machine
 
     def getSliceMessage(self) -> Arcus.PythonMessage:
         return self._slice_message
 
+    def getSliceHash(self) -> str:
+        """Get a hash of the contents of the slice message, to recognise slices that were done before.
+
+        The IDs of the objects are left out, since they differ every time the objects are loaded. The order of settings
+        in a list doesn't matter to CuraEngine, so they are hashed in sorted order.
+        """
+        return self._slice_hash.hexdigest()
+
+    def getCachedSliceResult(self) -> Optional["SliceResult"]:
+        """Get the results of the same slice done before, if they were in the cache."""
+
+        return self._cached_slice_result
+
     def setBuildPlate(self, build_plate_number: int) -> None:
         self._build_plate_number = build_plate_number
 
@@ -303,6 +330,7 @@ class StartSliceJob(Job):
 
         for group in filtered_object_groups:
             group_message = self._slice_message.addRepeatedMessage("object_lists")
+            self._hashData(("object_list", ))
             parent = group[0].getParent()
             if parent is not None and parent.callDecoration("isGroup"):
                 self._handlePerObjectSettings(cast(CuraSceneNode, parent), group_message)
@@ -311,33 +339,20 @@ class StartSliceJob(Job):
                 mesh_data = object.getMeshData()
                 if mesh_data is None:
                     continue
-                rot_scale = object.getWorldTransformation().getTransposed().getData()[0:3, 0:3]
-                translate = object.getWorldTransformation().getData()[:3, 3]
-
-                # This effectively performs a limited form of MeshData.getTransformed that ignores normals.
-                verts = mesh_data.getVertices()
-                verts = verts.dot(rot_scale)
-                verts += translate
-
-                # Convert from Y up axes to Z up axes. Equals a 90 degree rotation.
-                verts[:, [1, 2]] = verts[:, [2, 1]]
-                verts[:, 1] *= -1
-
                 obj = group_message.addRepeatedMessage("objects")
                 obj.id = id(object)
                 obj.name = object.getName()
-                indices = mesh_data.getIndices()
-                if indices is not None:
-                    flat_verts = numpy.take(verts, indices.flatten(), axis=0)
-                else:
-                    flat_verts = numpy.array(verts)
-
-                obj.vertices = flat_verts
+                vertices = self._buildMeshVertices(mesh_data, object.getWorldTransformation())
+                obj.vertices = vertices
+                self._hashData(("object", object.getName()), vertices)
 
                 self._handlePerObjectSettings(cast(CuraSceneNode, object), obj)
 
                 Job.yieldThread()
 
+        if self._slice_result_cache is not None:
+            self._cached_slice_result = self._slice_result_cache.get(self.getSliceHash())
+
         self.setResult(StartJobResult.Finished)
 
     def cancel(self) -> None:
@@ -350,6 +365,60 @@ class StartSliceJob(Job):
     def setIsCancelled(self, value: bool):
         self._is_cancelled = value
 
+    @staticmethod
+    def _buildMeshVertices(mesh_data: MeshData, transformation: Matrix) -> numpy.ndarray:
+        """Get the vertices of a mesh in the format that CuraEngine reads them.
+
+        CuraEngine only reads the vertices of a mesh message, as three single-precision vertices per face. So the
+        vertices of an indexed mesh are duplicated for every face they are in. Only the unique vertices are
+        transformed though, and they are converted to single precision before they are duplicated, so that the
+        largest array is created only once, and directly in the size that is sent.
+        :param mesh_data: The mesh to send.
+        :param transformation: The world transformation of the scene node of the mesh.
+        :return: The vertices of every face, in CuraEngine's coordinate system.
+        """
+
+        rot_scale = transformation.getTransposed().getData()[0:3, 0:3]
+        translate = transformation.getData()[:3, 3]
+
+        # This effectively performs a limited form of MeshData.getTransformed that ignores normals.
+        verts = mesh_data.getVertices()
+        verts = verts.dot(rot_scale)
+        verts += translate
+
+        # Convert from Y up axes to Z up axes. Equals a 90 degree rotation.
+        verts[:, [1, 2]] = verts[:, [2, 1]]
+        verts[:, 1] *= -1
+        verts = verts.astype(numpy.float32, copy = False)
+
+        indices = mesh_data.getIndices()
+        if indices is not None:
+            return numpy.take(verts, indices.reshape(-1), axis = 0)
+        return verts
+
+    def _hashData(self, header: Tuple[str, ...], data: Any = b"") -> None:
+        """Add a part of the slice message to the slice hash.
+
+        :param header: The strings that describe the part.
+        :param data: The bytes of the part, or any object that exposes its bytes, like a numpy array.
+        """
+        for string in header:
+            encoded = string.encode("utf-8")
+            self._slice_hash.update(b"%d:" % len(encoded))
+            self._slice_hash.update(encoded)
+        self._slice_hash.update(b"%d:" % memoryview(data).nbytes)
+        self._slice_hash.update(data)
+
+    def _hashSettings(self, header: Tuple[str, ...], settings: Iterable[Tuple[str, bytes]]) -> None:
+        """Add a list of settings in the slice message to the slice hash.
+
+        :param header: The strings that describe the list.
+        :param settings: The keys of the settings and their values, as they are put in the message.
+        """
+        self._hashData(header)
+        for key, value in sorted(settings):
+            self._hashData((key, ), value)
+
     def _buildReplacementTokens(self, stack: ContainerStack) -> Dict[str, Any]:
         """Creates a dictionary of tokens to replace in g-code pieces.
 
@@ -444,6 +513,7 @@ class StartSliceJob(Job):
         global_definition = cast(ContainerInterface, cast(ContainerStack, stack.getNextStack()).getBottom())
         own_definition = cast(ContainerInterface, stack.getBottom())
 
+        sent_settings = []  # type: List[Tuple[str, bytes]]
         for key, value in settings.items():
             # Do not send settings that are not settable_per_extruder.
             # Since these can only be set in definition files, we only have to ask there.
@@ -452,8 +522,11 @@ class StartSliceJob(Job):
                     continue
             setting = message.getMessage("settings").addRepeatedMessage("settings")
             setting.name = key
-            setting.value = str(value).encode("utf-8")
+            encoded_value = str(value).encode("utf-8")
+            setting.value = encoded_value
+            sent_settings.append((key, encoded_value))
             Job.yieldThread()
+        self._hashSettings(("extruder", str(message.id)), sent_settings)
 
     def _buildGlobalSettingsMessage(self, stack: ContainerStack) -> None:
         """Sends all global settings to the engine.
@@ -488,11 +561,15 @@ class StartSliceJob(Job):
         settings["machine_end_gcode"] = self._expandGcodeTokens(settings["machine_end_gcode"], initial_extruder_nr)
 
         # Add all sub-messages for each individual setting.
+        sent_settings = []  # type: List[Tuple[str, bytes]]
         for key, value in settings.items():
             setting_message = self._slice_message.getMessage("global_settings").addRepeatedMessage("settings")
             setting_message.name = key
-            setting_message.value = str(value).encode("utf-8")
+            encoded_value = str(value).encode("utf-8")
+            setting_message.value = encoded_value
+            sent_settings.append((key, encoded_value))
             Job.yieldThread()
+        self._hashSettings(("global_settings", ), sent_settings)
 
     def _buildGlobalInheritsStackMessage(self, stack: ContainerStack) -> None:
         """Sends for some settings which extruder they should fallback to if not set.
@@ -504,13 +581,16 @@ class StartSliceJob(Job):
             limit_to_extruder property.
         """
 
+        sent_settings = []  # type: List[Tuple[str, bytes]]
         for key in stack.getAllKeys():
             extruder_position = int(round(float(stack.getProperty(key, "limit_to_extruder"))))
             if extruder_position >= 0:  # Set to a specific extruder.
                 setting_extruder = self._slice_message.addRepeatedMessage("limit_to_extruder")
                 setting_extruder.name = key
                 setting_extruder.extruder = extruder_position
+                sent_settings.append((key, str(extruder_position).encode("utf-8")))
             Job.yieldThread()
+        self._hashSettings(("limit_to_extruder", ), sent_settings)
 
     def _handlePerObjectSettings(self, node: CuraSceneNode, message: Arcus.PythonMessage):
         """Check if a node has per object settings and ensure that they are set correctly in the message
@@ -539,6 +619,7 @@ class StartSliceJob(Job):
         changed_setting_keys.add("extruder_nr")
 
         # Get values for all changed settings
+        sent_settings = []  # type: List[Tuple[str, bytes]]
         for key in changed_setting_keys:
             setting = message.addRepeatedMessage("settings")
             setting.name = key
@@ -550,9 +631,12 @@ class StartSliceJob(Job):
             else:
                 limited_stack = stack
 
-            setting.value = str(limited_stack.getProperty(key, "value")).encode("utf-8")
+            encoded_value = str(limited_stack.getProperty(key, "value")).encode("utf-8")
+            setting.value = encoded_value
+            sent_settings.append((key, encoded_value))
 
             Job.yieldThread()
+        self._hashSettings(("settings", ), sent_settings)
 
     def _addRelations(self, relations_set: Set[str], relations: List[SettingRelation]):
         """Recursive function to put all settings that require each other for value changes in a list
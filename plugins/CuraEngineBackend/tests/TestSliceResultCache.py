@@ -0,0 +1,99 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import struct
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SliceResultCache import CachedMessage, SliceResult, SliceResultCache
+
+test_layer = {"id": 0, "height": 200.0, "thickness": 200.0, "path_segment": [
+    {"extruder": 0, "point_type": 0, "points": b"\x00" * 16, "line_type": b"\x01", "line_width": b"\x00" * 4, "line_thickness": b"\x00" * 4, "line_feedrate": b"\x00" * 4}
+]}
+
+
+def createSliceResult(gcode = ";LAYER:0\n"):
+    return SliceResult([";TIME:{print_time}\n", gcode], [0], [test_layer], {"infill": 12.5}, [1.5], "a-slice-uuid")
+
+
+def test_putAndGet(tmp_path):
+    cache = SliceResultCache(str(tmp_path))
+    assert cache.get("hash") is None
+    cache.put("hash", createSliceResult())
+
+    result = SliceResultCache(str(tmp_path)).get("hash")  # Like after restarting.
+    assert result.gcode == [";TIME:{print_time}\n", ";LAYER:0\n"]
+    assert result.gcode_chunks_with_tokens == [0]
+    assert result.print_times == {"infill": 12.5}
+    assert result.material_amounts == [1.5]
+    assert result.slice_uuid == "a-slice-uuid"
+    assert result.layers == [test_layer]
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x80\x04\x95 not a slice result",  # E.g. a pickle. It must never be run.
+    SliceResultCache.FILE_MAGIC + b"\xff\xff",
+    SliceResultCache.FILE_MAGIC + struct.pack("<Q", 21) + b"{\"format_version\": 2}",
+    SliceResultCache.FILE_MAGIC + struct.pack("<Q", 5) + b"[1,2]",
+    SliceResultCache.FILE_MAGIC + struct.pack("<Q", 1000) + b"{\"format_version\": 2"
+])
+def test_damagedFile(tmp_path, data):
+    cache = SliceResultCache(str(tmp_path))
+    cache.put("hash", createSliceResult())
+    with open(cache._getFilePath("hash"), "wb") as f:
+        f.write(data)
+
+    assert cache.get("hash") is None
+    assert not os.path.exists(cache._getFilePath("hash"))  # Removed, so that it gets replaced by a proper result.
+
+
+def test_blobOutOfRange(tmp_path):
+    cache = SliceResultCache(str(tmp_path))
+    cache.put("hash", createSliceResult())
+    file_path = cache._getFilePath("hash")
+    with open(file_path, "rb") as f:
+        data = f.read()
+    with open(file_path, "wb") as f:
+        f.write(data[:-4])  # The last binary field is cut short.
+
+    assert cache.get("hash") is None
+
+
+def test_otherEngineVersion(tmp_path):
+    cache = SliceResultCache(str(tmp_path))
+    cache.setEngineVersion("5.0")
+    cache.put("hash", createSliceResult())
+    cache.setEngineVersion("5.1")
+    assert cache.get("hash") is None
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    cache = SliceResultCache(str(tmp_path))
+    for index in range(3):
+        cache.put("hash {index}".format(index = index), createSliceResult(";" * 1000))
+        os.utime(cache._getFilePath("hash {index}".format(index = index)), (index, index))  # Make the order unambiguous.
+    cache.get("hash 0")  # Use the oldest one again.
+
+    with patch.object(SliceResultCache, "MAX_SIZE", 2 * os.path.getsize(cache._getFilePath("hash 0")) + 100):
+        cache.put("hash 3", createSliceResult(";" * 1000))
+
+    assert cache.get("hash 0") is not None
+    assert cache.get("hash 1") is None
+    assert cache.get("hash 2") is None
+    assert cache.get("hash 3") is not None
+
+
+def test_layerMessages():
+    layers = SliceResult.layersFromMessages([CachedMessage(test_layer)])
+    assert layers == [test_layer]
+
+    layer_message = SliceResult([], [], layers, {}, [], "").getLayerMessages()[0]
+    assert layer_message.id == 0
+    assert layer_message.repeatedMessageCount("path_segment") == 1
+    assert layer_message.getRepeatedMessage("path_segment", 0).line_type == b"\x01"
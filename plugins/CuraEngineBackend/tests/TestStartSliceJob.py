@@ -0,0 +1,50 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import numpy
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from StartSliceJob import StartSliceJob
+
+cube_vertices = numpy.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], dtype = numpy.float32)
+
+
+def hashScene(global_settings, objects):
+    """Hash a scene like StartSliceJob.run does, and get the resulting slice hash.
+
+    :param global_settings: The global settings as they are put in the slice message.
+    :param objects: The names of the objects and their vertices.
+    """
+    with patch("cura.CuraApplication.CuraApplication.getInstance", MagicMock()):
+        job = StartSliceJob(MagicMock())
+    job._hashSettings(("global_settings", ), global_settings)
+    job._hashData(("object_list", ))
+    for name, vertices in objects:
+        job._hashData(("object", name), vertices)
+    return job.getSliceHash()
+
+
+def test_sliceHashStable():
+    settings = [("layer_height", b"0.1"), ("infill_sparse_density", b"20")]
+    first_hash = hashScene(settings, [("cube.stl", cube_vertices)])
+
+    assert hashScene(list(settings), [("cube.stl", cube_vertices.copy())]) == first_hash
+    assert hashScene(list(reversed(settings)), [("cube.stl", cube_vertices)]) == first_hash  # The order of settings doesn't matter.
+
+
+@pytest.mark.parametrize("settings, objects", [
+    ([("layer_height", b"0.2"), ("infill_sparse_density", b"20")], [("cube.stl", cube_vertices)]),  # Other setting value.
+    ([("layer_height", b"0.1")], [("cube.stl", cube_vertices)]),  # Setting left out.
+    ([("layer_height", b"0.1"), ("infill_sparse_density", b"20")], [("cube.stl", cube_vertices + numpy.array([0, 0, 0.01], dtype = numpy.float32))]),  # Moved vertex.
+    ([("layer_height", b"0.1"), ("infill_sparse_density", b"20")], [("other.stl", cube_vertices)]),  # Other object name.
+    ([("layer_height", b"0.1"), ("infill_sparse_density", b"20")], [("cube.stl", cube_vertices), ("cube.stl", cube_vertices)])  # Extra object.
+])
+def test_sliceHashChanges(settings, objects):
+    original_hash = hashScene([("layer_height", b"0.1"), ("infill_sparse_density", b"20")], [("cube.stl", cube_vertices)])
+    assert hashScene(settings, objects) != original_hash
@@ -2,7 +2,7 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 import gzip
-from io import StringIO, BufferedIOBase #To write the g-code to a temporary buffer, and for typing.
+from io import TextIOWrapper, BufferedIOBase #To encode the g-code while writing it, and for typing.
 from typing import cast, List
 
 from UM.Logger import Logger
@@ -43,14 +43,16 @@ class GCodeGzWriter(MeshWriter):
             self.setInformation(catalog.i18nc("@error:not supported", "GCodeGzWriter does not support text mode."))
             return False
 
-        #Get the g-code from the g-code writer.
-        gcode_textio = StringIO() #We have to convert the g-code into bytes.
+        #Let the g-code writer write straight into the gzip stream, so that only one chunk of g-code is encoded and compressed at a time.
+        gzip_stream = gzip.GzipFile(filename = "", mode = "wb", fileobj = stream)
+        gcode_textio = TextIOWrapper(gzip_stream, encoding = "utf-8", newline = "", write_through = True) #We have to convert the g-code into bytes.
         gcode_writer = cast(MeshWriter, PluginRegistry.getInstance().getPluginObject("GCodeWriter"))
-        success = gcode_writer.write(gcode_textio, None)
+        try:
+            success = gcode_writer.write(gcode_textio, None)
+        finally: #Also if writing the g-code fails with an exception.
+            gcode_textio.detach() #Don't close the gzip stream along with the text wrapper.
+            gzip_stream.close() #Flushes the remaining compressed data. This doesn't close the stream we're writing to.
         if not success: #Writing the g-code failed. Then I can also not write the gzipped g-code.
             self.setInformation(gcode_writer.getInformation())
             return False
-
-        result = gzip.compress(gcode_textio.getvalue().encode("utf-8"))
-        stream.write(result)
         return True
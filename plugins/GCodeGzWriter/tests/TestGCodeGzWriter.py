@@ -0,0 +1,56 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import gzip
+import io
+import tracemalloc
+import unittest.mock
+
+import pytest
+
+import UM.PluginRegistry  # To mock the plug-in registry out.
+
+from tests.FakeGCodeWriter import CHUNK_SIZE, CountingStream, FailingGCodeWriter, FakeGCodeWriter, createLargeGCodeList
+from ..GCodeGzWriter import GCodeGzWriter
+
+
+def _writeGz(gcode_list, stream, gcode_writer = None):
+    plugin_registry = unittest.mock.MagicMock()
+    plugin_registry.getPluginObject = unittest.mock.MagicMock(return_value = gcode_writer or FakeGCodeWriter(gcode_list))
+    with unittest.mock.patch.object(UM.PluginRegistry.PluginRegistry, "getInstance", unittest.mock.MagicMock(return_value = plugin_registry)):
+        return GCodeGzWriter().write(stream, None)
+
+
+def test_writeRoundTrip():
+    gcode_list = [";FLAVOR:Marlin\n", ";LAYER:0\nG1 X10 Y10 E1 ;Ünicode comment\r\n", ";LAYER:1\nG1 X20 Y20 E2\n"]
+    stream = io.BytesIO()
+    assert _writeGz(gcode_list, stream)
+    assert gzip.decompress(stream.getvalue()).decode("utf-8") == "".join(gcode_list)
+
+
+def test_writeFailure():
+    gcode_writer = FailingGCodeWriter([";FLAVOR:Marlin\n"])
+    stream = io.BytesIO()
+    with pytest.raises(OSError):
+        _writeGz([], stream, gcode_writer)
+
+    with pytest.raises(ValueError):
+        gcode_writer.stream.write("")  # The text wrapper was detached, so it won't close the gzip stream later on.
+    assert gcode_writer.buffer.closed  # But the gzip stream was finished right away.
+    assert not stream.closed
+    assert gzip.decompress(stream.getvalue()) == b";FLAVOR:Marlin\n"
+
+
+def test_writeMemory():
+    gcode_list = createLargeGCodeList()
+    stream = CountingStream()
+
+    tracemalloc.start()
+    try:
+        assert _writeGz(gcode_list, stream)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stream.size > 0
+    assert peak < 8 * CHUNK_SIZE  # Only about one chunk at a time is encoded and compressed, never the whole g-code.
@@ -1,7 +1,7 @@
 # Copyright (c) 2015 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import GCodeProfileReader
+from cura.ReaderWriters.LazyProfileReader import LazyProfileReader
 
 from UM.i18n import i18nCatalog
 catalog = i18nCatalog("cura")
@@ -17,4 +17,5 @@ def getMetaData():
     }
 
 def register(app):
-    return { "profile_reader": GCodeProfileReader.GCodeProfileReader() }
+    # The reader is only imported when a profile is read with it, to start the application faster.
+    return {"profile_reader": LazyProfileReader(__name__ + ".GCodeProfileReader", "GCodeProfileReader")}
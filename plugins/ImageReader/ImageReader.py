@@ -5,7 +5,7 @@ import numpy
 
 import math
 
-from PyQt6.QtGui import QImage, qRed, qGreen, qBlue, qAlpha
+from PyQt6.QtGui import QImage
 from PyQt6.QtCore import Qt
 
 from UM.Mesh.MeshReader import MeshReader
@@ -94,15 +94,21 @@ class ImageReader(MeshReader):
         texel_width = 1.0 / width_minus_one * scale_vector.x
         texel_height = 1.0 / height_minus_one * scale_vector.z
 
-        height_data = numpy.zeros((height, width), dtype = numpy.float32)
+        # Read all pixels at once, through a view on the bits of the image. In this format every pixel is a 0xAARRGGBB integer.
+        has_alpha_channel = img.hasAlphaChannel()
+        img = img.convertToFormat(QImage.Format.Format_ARGB32)
+        bits = img.constBits()
+        bits.setsize(img.sizeInBytes())
+        pixels = numpy.frombuffer(bits, dtype = numpy.uint32).reshape((height, img.bytesPerLine() // 4))[:, :width]
+        red = (pixels >> 16) & 0xFF
+        green = (pixels >> 8) & 0xFF
+        blue = pixels & 0xFF
 
-        for x in range(0, width):
-            for y in range(0, height):
-                qrgb = img.pixel(x, y)
-                if use_transparency_model:
-                    height_data[y, x] = (0.299 * math.pow(qRed(qrgb) / 255.0, 2.2) + 0.587 * math.pow(qGreen(qrgb) / 255.0, 2.2) + 0.114 * math.pow(qBlue(qrgb) / 255.0, 2.2))
-                else:
-                    height_data[y, x] = (0.212655 * qRed(qrgb) + 0.715158 * qGreen(qrgb) + 0.072187 * qBlue(qrgb)) / 255 # fast computation ignoring gamma and degamma
+        if use_transparency_model:
+            degamma = numpy.array([math.pow(value / 255.0, 2.2) for value in range(256)])  # For every possible value of a channel.
+            height_data = (0.299 * degamma[red] + 0.587 * degamma[green] + 0.114 * degamma[blue]).astype(numpy.float32)
+        else:
+            height_data = ((0.212655 * red + 0.715158 * green + 0.072187 * blue) / 255).astype(numpy.float32) # fast computation ignoring gamma and degamma
 
         Job.yieldThread()
 
@@ -129,20 +135,17 @@ class ImageReader(MeshReader):
         if use_transparency_model:
             divisor = 1.0 / math.log(transmittance_1mm / 100.0) # log-base doesn't matter here. Precompute this value for faster computation of each pixel.
             min_luminance = (transmittance_1mm / 100.0) ** height_from_base
-            for (y, x) in numpy.ndindex(height_data.shape):
-                mapped_luminance = min_luminance + (1.0 - min_luminance) * height_data[y, x]
-                height_data[y, x] = base_height + divisor * math.log(mapped_luminance) # use same base as a couple lines above this
+            mapped_luminance = min_luminance + (1.0 - min_luminance) * height_data.astype(numpy.float64)
+            height_data = (base_height + divisor * numpy.log(mapped_luminance)).astype(numpy.float32) # use same base as a couple lines above this
         else:
             height_data *= scale_vector.y
             height_data += base_height
 
-        if img.hasAlphaChannel():
-            for x in range(0, width):
-                for y in range(0, height):
-                    height_data[y, x] *= qAlpha(img.pixel(x, y)) / 255.0
+        if has_alpha_channel:
+            height_data *= (pixels >> 24) / 255.0
 
         heightmap_face_count = 2 * height_minus_one * width_minus_one
-        total_face_count = heightmap_face_count + (width_minus_one * 2) * (height_minus_one * 2) + 2
+        total_face_count = heightmap_face_count + 2 + 4 * width_minus_one + 4 * height_minus_one  # The heightmap, bottom and walls.
 
         mesh.reserveFaceCount(total_face_count)
 
@@ -172,54 +175,53 @@ class ImageReader(MeshReader):
         heightmap_vertices[:, 2, 1] = heightmap_vertices[:, 3, 1] = height_data[1:, 1:].reshape(-1)
         heightmap_vertices[:, 4, 1] = height_data[:-1, 1:].reshape(-1)
 
-        heightmap_indices = numpy.array(numpy.mgrid[0:heightmap_face_count * 3], dtype = numpy.int32).reshape(-1, 3)
-
-        mesh._vertices[0:(heightmap_vertices.size // 3), :] = heightmap_vertices.reshape(-1, 3)
-        mesh._indices[0:(heightmap_indices.size // 3), :] = heightmap_indices
-
-        mesh._vertex_count = heightmap_vertices.size // 3
-        mesh._face_count = heightmap_indices.size // 3
-
         geo_width = width_minus_one * texel_width
         geo_height = height_minus_one * texel_height
 
         # bottom
-        mesh.addFaceByPoints(0, 0, 0, 0, 0, geo_height, geo_width, 0, geo_height)
-        mesh.addFaceByPoints(geo_width, 0, geo_height, geo_width, 0, 0, 0, 0, 0)
-
-        # north and south walls
-        for n in range(0, width_minus_one):
-            x = n * texel_width
-            nx = (n + 1) * texel_width
-
-            hn0 = height_data[0, n]
-            hn1 = height_data[0, n + 1]
-
-            hs0 = height_data[height_minus_one, n]
-            hs1 = height_data[height_minus_one, n + 1]
-
-            mesh.addFaceByPoints(x, 0, 0, nx, 0, 0, nx, hn1, 0)
-            mesh.addFaceByPoints(nx, hn1, 0, x, hn0, 0, x, 0, 0)
-
-            mesh.addFaceByPoints(x, 0, geo_height, nx, 0, geo_height, nx, hs1, geo_height)
-            mesh.addFaceByPoints(nx, hs1, geo_height, x, hs0, geo_height, x, 0, geo_height)
+        bottom_vertices = numpy.array([
+            [0, 0, 0], [0, 0, geo_height], [geo_width, 0, geo_height],
+            [geo_width, 0, geo_height], [geo_width, 0, 0], [0, 0, 0]
+        ])
+
+        # north and south walls, with two faces for each texel along both walls
+        x = numpy.arange(0, width_minus_one) * texel_width
+        nx = numpy.arange(1, width) * texel_width
+        hn0 = height_data[0, :-1]
+        hn1 = height_data[0, 1:]
+        hs0 = height_data[height_minus_one, :-1]
+        hs1 = height_data[height_minus_one, 1:]
+        zero = numpy.zeros(width_minus_one)
+        south = numpy.full(width_minus_one, geo_height)
+        north_south_vertices = numpy.stack([
+            x, zero, zero, nx, zero, zero, nx, hn1, zero,
+            nx, hn1, zero, x, hn0, zero, x, zero, zero,
+            x, zero, south, nx, zero, south, nx, hs1, south,
+            nx, hs1, south, x, hs0, south, x, zero, south
+        ], axis = 1).reshape(-1, 3)
 
         # west and east walls
-        for n in range(0, height_minus_one):
-            y = n * texel_height
-            ny = (n + 1) * texel_height
-
-            hw0 = height_data[n, 0]
-            hw1 = height_data[n + 1, 0]
-
-            he0 = height_data[n, width_minus_one]
-            he1 = height_data[n + 1, width_minus_one]
-
-            mesh.addFaceByPoints(0, 0, y, 0, 0, ny, 0, hw1, ny)
-            mesh.addFaceByPoints(0, hw1, ny, 0, hw0, y, 0, 0, y)
-
-            mesh.addFaceByPoints(geo_width, 0, y, geo_width, 0, ny, geo_width, he1, ny)
-            mesh.addFaceByPoints(geo_width, he1, ny, geo_width, he0, y, geo_width, 0, y)
+        y = numpy.arange(0, height_minus_one) * texel_height
+        ny = numpy.arange(1, height) * texel_height
+        hw0 = height_data[:-1, 0]
+        hw1 = height_data[1:, 0]
+        he0 = height_data[:-1, width_minus_one]
+        he1 = height_data[1:, width_minus_one]
+        zero = numpy.zeros(height_minus_one)
+        east = numpy.full(height_minus_one, geo_width)
+        west_east_vertices = numpy.stack([
+            zero, zero, y, zero, zero, ny, zero, hw1, ny,
+            zero, hw1, ny, zero, hw0, y, zero, zero, y,
+            east, zero, y, east, zero, ny, east, he1, ny,
+            east, he1, ny, east, he0, y, east, zero, y
+        ], axis = 1).reshape(-1, 3)
+
+        vertices = numpy.concatenate([heightmap_vertices.reshape(-1, 3), bottom_vertices, north_south_vertices, west_east_vertices])
+        mesh._vertices[0:len(vertices), :] = vertices
+        mesh._indices[0:total_face_count, :] = numpy.arange(total_face_count * 3, dtype = numpy.int32).reshape(-1, 3)
+
+        mesh._vertex_count = len(vertices)
+        mesh._face_count = total_face_count
 
         mesh.calculateNormals(fast = True)
 
@@ -0,0 +1,106 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import math
+from unittest.mock import patch
+
+import numpy
+import pytest
+from PyQt6.QtGui import QImage, qAlpha, qBlue, qGreen, qRed, qRgba
+
+from UM.Qt.QtApplication import QtApplication  # QtApplication import is required, even though it isn't used.
+
+import ImageReader
+
+WIDTH = 5
+HEIGHT = 4
+XZ_SIZE = 120.0
+PEAK_HEIGHT = 5.0
+BASE_HEIGHT = 1.0
+TRANSMITTANCE_1MM = 50.0
+
+
+def createImageReader():
+    module = ImageReader.ImageReader if hasattr(ImageReader.ImageReader, "ImageReaderUI") else ImageReader
+    with patch.object(module, "ImageReaderUI"):  # Don't create the dialog.
+        return module.ImageReader()
+
+
+def createImage(file_path, has_alpha_channel):
+    """Writes a fixed image with a different color in every pixel."""
+
+    image = QImage(WIDTH, HEIGHT, QImage.Format.Format_ARGB32 if has_alpha_channel else QImage.Format.Format_RGB32)
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            alpha = 255 - 40 * y if has_alpha_channel else 255
+            image.setPixel(x, y, qRgba((x * 61 + y * 17) % 256, (x * 23 + y * 97) % 256, (x * 11 + y * 53 + 128) % 256, alpha))
+    image.save(file_path)
+
+
+def referenceHeights(file_path, lighter_is_higher, use_transparency_model):
+    """The height of every pixel, computed for each pixel separately."""
+
+    image = QImage(file_path)
+    heights = numpy.zeros((HEIGHT, WIDTH), dtype = numpy.float32)
+    min_luminance = (TRANSMITTANCE_1MM / 100.0) ** PEAK_HEIGHT
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            qrgb = image.pixel(x, y)
+            if use_transparency_model:
+                height = 0.299 * math.pow(qRed(qrgb) / 255.0, 2.2) + 0.587 * math.pow(qGreen(qrgb) / 255.0, 2.2) + 0.114 * math.pow(qBlue(qrgb) / 255.0, 2.2)
+            else:
+                height = (0.212655 * qRed(qrgb) + 0.715158 * qGreen(qrgb) + 0.072187 * qBlue(qrgb)) / 255
+            height = float(numpy.float32(height))
+            if lighter_is_higher == use_transparency_model:
+                height = float(1 - numpy.float32(height))
+            if use_transparency_model:
+                height = BASE_HEIGHT + 1.0 / math.log(TRANSMITTANCE_1MM / 100.0) * math.log(min_luminance + (1.0 - min_luminance) * height)
+            else:
+                height = numpy.float32(height) * numpy.float32(PEAK_HEIGHT) + numpy.float32(BASE_HEIGHT)
+            height = float(numpy.float32(height))
+            if image.hasAlphaChannel():
+                height *= qAlpha(qrgb) / 255.0
+            heights[y, x] = height
+    return heights
+
+
+def referenceBorder(heights, texel_width, texel_height):
+    """The vertices of the bottom and the walls, added one face at a time."""
+
+    geo_width = (WIDTH - 1) * texel_width
+    geo_height = (HEIGHT - 1) * texel_height
+    faces = [(0, 0, 0, 0, 0, geo_height, geo_width, 0, geo_height), (geo_width, 0, geo_height, geo_width, 0, 0, 0, 0, 0)]
+    for n in range(WIDTH - 1):
+        x, nx = n * texel_width, (n + 1) * texel_width
+        hn0, hn1, hs0, hs1 = heights[0, n], heights[0, n + 1], heights[HEIGHT - 1, n], heights[HEIGHT - 1, n + 1]
+        faces += [(x, 0, 0, nx, 0, 0, nx, hn1, 0), (nx, hn1, 0, x, hn0, 0, x, 0, 0),
+                  (x, 0, geo_height, nx, 0, geo_height, nx, hs1, geo_height), (nx, hs1, geo_height, x, hs0, geo_height, x, 0, geo_height)]
+    for n in range(HEIGHT - 1):
+        y, ny = n * texel_height, (n + 1) * texel_height
+        hw0, hw1, he0, he1 = heights[n, 0], heights[n + 1, 0], heights[n, WIDTH - 1], heights[n + 1, WIDTH - 1]
+        faces += [(0, 0, y, 0, 0, ny, 0, hw1, ny), (0, hw1, ny, 0, hw0, y, 0, 0, y),
+                  (geo_width, 0, y, geo_width, 0, ny, geo_width, he1, ny), (geo_width, he1, ny, geo_width, he0, y, geo_width, 0, y)]
+    return numpy.array(faces, dtype = numpy.float32).reshape(-1, 3)
+
+
+@pytest.mark.parametrize("has_alpha_channel", [False, True])
+@pytest.mark.parametrize("lighter_is_higher", [False, True])
+@pytest.mark.parametrize("use_transparency_model", [False, True])
+def test_generateSceneNode(tmp_path, has_alpha_channel, lighter_is_higher, use_transparency_model):
+    file_path = str(tmp_path / "image.png")
+    createImage(file_path, has_alpha_channel)
+
+    reader = createImageReader()
+    scene_node = reader._generateSceneNode(file_path, XZ_SIZE, PEAK_HEIGHT, BASE_HEIGHT, 0, 512, lighter_is_higher, use_transparency_model, TRANSMITTANCE_1MM)
+    vertices = scene_node.getMeshData().getVertices()
+
+    heights = referenceHeights(file_path, lighter_is_higher, use_transparency_model)
+    heightmap_vertex_count = 6 * (WIDTH - 1) * (HEIGHT - 1)
+    assert len(vertices) == heightmap_vertex_count + 6 + 12 * (WIDTH - 1) + 12 * (HEIGHT - 1)
+
+    # Every texel quad starts at the height of its pixel.
+    numpy.testing.assert_array_equal(vertices[0:heightmap_vertex_count:6, 1], heights[:-1, :-1].reshape(-1))
+
+    texel_width = 1.0 / (WIDTH - 1) * XZ_SIZE
+    texel_height = 1.0 / (HEIGHT - 1) * (XZ_SIZE * (HEIGHT / WIDTH))
+    numpy.testing.assert_array_equal(vertices[heightmap_vertex_count:], referenceBorder(heights, texel_width, texel_height))
@@ -0,0 +1,140 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
+
+import re
+import string
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class GCodeLine:
+    """A line of g-code that is parsed into its words once.
+
+    The line is split into the code part and the comment (starting at the first ``;``). The code part is split on
+    spaces into words, each consisting of a letter and its value (like ``X100``). Values can be read with typed
+    accessors and replaced in place, after which ``toString`` produces the modified line.
+    """
+
+    _number_regex = re.compile(r"-?[0-9]+\.?[0-9]*")
+    _letter_regex = re.compile(r"([A-Za-z])(-?[0-9]+\.?[0-9]*)?")
+    _letters = frozenset(string.ascii_letters)
+
+    def __init__(self, line: str) -> None:
+        self._line = line  # type: Optional[str]  # The serialised line, or None if it was modified.
+        self._code = None  # type: Optional[str]
+        self._comment = None  # type: Optional[str]
+        self._words = None  # type: Optional[List[Tuple[str, str]]]
+        self._values = None  # type: Optional[Dict[str, str]]
+
+    def getComment(self) -> str:
+        """Get the comment of this line, including the ``;``, or an empty string if there is none."""
+        self._split()
+        return self._comment
+
+    def getCommand(self) -> Optional[str]:
+        """Get the first word of this line, like ``G1`` or ``M104``."""
+        self._parseWords()
+        if not self._words:
+            return None
+        return self._words[0][0] + self._words[0][1]
+
+    def getWords(self) -> List[Tuple[str, str]]:
+        """Get the letter and the unparsed value of every word in the code part of this line, in order."""
+        self._parseWords()
+        return list(self._words)
+
+    def hasValue(self, key: str) -> bool:
+        return self.getValue(key) is not None
+
+    def getValue(self, key: str, default: Any = None) -> Any:
+        """Get the value of a parameter as an ``int`` if it is integral, or as a ``float`` otherwise.
+
+        Like ``Script.getValue``, the number directly following the first occurrence of the key in the code part of the
+        line is used, so parameters don't need to be separated by spaces.
+        """
+        if key in self._letters:
+            if self._values is None:
+                self._split()
+                # Reversed, so that the first occurrence of each letter ends up in the dictionary.
+                self._values = dict(reversed(self._letter_regex.findall(self._code)))
+            value = self._values.get(key)
+        else:  # Multi-character keys, like ";LAYER:", may be part of the comment.
+            line = self.toString()
+            if key not in line or (";" in line and line.find(key) > line.find(";")):
+                return default
+            match = self._number_regex.match(line, line.find(key) + 1)
+            value = match.group(0) if match is not None else None
+        if not value:  # Missing, or a letter without a number.
+            return default
+        if "." in value:
+            return float(value)
+        return int(value)
+
+    def getInt(self, key: str, default: Optional[int] = None) -> Optional[int]:
+        value = self.getValue(key)
+        if value is None:
+            return default
+        return int(value)
+
+    def getFloat(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        value = self.getValue(key)
+        if value is None:
+            return default
+        return float(value)
+
+    def setValue(self, key: str, value: Union[str, int, float]) -> None:
+        """Replace the value of the first word with this letter, or add the word at the end of the code."""
+        self._parseWords()
+        for index, (letter, _) in enumerate(self._words):
+            if letter == key:
+                self._words[index] = (key, str(value))
+                break
+        else:
+            self._words.append((key, str(value)))
+        self._modified()
+
+    def removeValue(self, key: str) -> None:
+        """Remove all words with this letter from the line."""
+        self._parseWords()
+        self._words = [word for word in self._words if word[0] != key]
+        self._modified()
+
+    def setComment(self, comment: str) -> None:
+        """Replace the comment of this line. The comment should start with ``;``, or be empty to remove it."""
+        self._parseWords()
+        self._comment = comment
+        self._modified()
+
+    def toString(self) -> str:
+        """Serialise the line. If it wasn't modified, the original line is returned unchanged."""
+        if self._line is None:
+            parts = [letter + value for letter, value in self._words]
+            if self._comment != "":
+                parts.append(self._comment)
+            self._line = " ".join(parts)
+        return self._line
+
+    def __str__(self) -> str:
+        return self.toString()
+
+    def _split(self) -> None:
+        """Split the line in the code part and the comment."""
+        if self._code is not None:
+            return
+        comment_start = self._line.find(";")
+        if comment_start >= 0:
+            self._code = self._line[:comment_start]
+            self._comment = self._line[comment_start:]
+        else:
+            self._code = self._line
+            self._comment = ""
+
+    def _parseWords(self) -> None:
+        if self._words is not None:
+            return
+        self._split()
+        self._words = [(part[0], part[1:]) for part in self._code.split(" ") if part != ""]
+
+    def _modified(self) -> None:
+        self._line = None
+        self._code = " ".join(letter + value for letter, value in self._words)
+        self._values = None
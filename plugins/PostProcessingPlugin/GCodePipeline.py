@@ -0,0 +1,265 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
+
+import os
+import pickle
+import re
+import sys
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING, Union
+
+from UM.Logger import Logger
+
+from cura.Utils.ProcessPool import createProcessPool
+
+if TYPE_CHECKING:
+    from .Script import Script
+
+
+class ParsedGCode:
+    """G-code that is split into lines once, shared by all scripts in a pipeline pass.
+
+    Each entry of the original g-code list (one "layer" as produced by the engine, the first two being the header and
+    the start g-code) is split into a list of lines when it is first requested. The engine layer number (as in
+    ``;LAYER:n``) and the first Z height of each entry are read lazily on first use and then cached, until the entry is
+    replaced.
+    """
+
+    _z_regex = re.compile(r"^G[01]\s[^;]*?Z(-?[0-9]*\.?[0-9]+)")
+
+    def __init__(self, gcode_list: Sequence[str]) -> None:
+        self._layers = list(gcode_list)  # type: List[Union[str, List[str]]]  # Entries that were not split yet are strings.
+        self._layer_numbers = {}  # type: Dict[int, Optional[int]]  # Per index, for the entries that were read.
+        self._layer_indices = None  # type: Optional[Dict[int, int]]
+        self._layer_z_moves = {}  # type: Dict[int, Optional[float]]  # Per index, the first Z that the entry moves to.
+
+    def getLayerCount(self) -> int:
+        return len(self._layers)
+
+    def getLines(self, index: int) -> List[str]:
+        """Get the lines of the g-code list entry at the given index.
+
+        The list is shared, so modifications in place are seen by the scripts that come after. Call ``setLines``
+        afterwards, so that the layer number and Z lookups see them too.
+        """
+        layer = self._layers[index]
+        if isinstance(layer, str):
+            layer = layer.split("\n")
+            self._layers[index] = layer
+        return layer
+
+    def setLines(self, index: int, lines: List[str]) -> None:
+        self._layers[index] = lines
+        self._invalidateEntry(index)
+
+    def getLayerNumber(self, index: int) -> Optional[int]:
+        """Get the engine layer number (``;LAYER:n``) of the g-code list entry at the given index.
+
+        :return: The layer number, or ``None`` if this entry doesn't contain a layer (like the start g-code).
+        """
+        if index not in self._layer_numbers:
+            self._layer_numbers[index] = self._readLayerNumber(self.getLines(index))
+        return self._layer_numbers[index]
+
+    def getIndexOfLayer(self, layer_number: int) -> Optional[int]:
+        """Get the index in the g-code list of the first entry that contains the given engine layer number."""
+        if self._layer_indices is None:
+            self._layer_indices = {}
+            for index in range(len(self._layers)):
+                entry_layer_number = self.getLayerNumber(index)
+                if entry_layer_number is not None and entry_layer_number not in self._layer_indices:
+                    self._layer_indices[entry_layer_number] = index
+        return self._layer_indices.get(layer_number)
+
+    def getLayerZ(self, index: int) -> Optional[float]:
+        """Get the first Z height that is moved to in the g-code list entry at the given index.
+
+        If the entry doesn't move in Z, the height carried over from the entries before it is returned.
+        """
+        for entry_index in range(index, -1, -1):
+            if entry_index not in self._layer_z_moves:
+                self._layer_z_moves[entry_index] = self._readZMove(self.getLines(entry_index))
+            if self._layer_z_moves[entry_index] is not None:
+                return self._layer_z_moves[entry_index]
+        return None
+
+    def getIndexAtZ(self, z: float) -> Optional[int]:
+        """Get the index of the first layer that is printed at or above the given Z height."""
+        for index in range(len(self._layers)):
+            if self.getLayerNumber(index) is None:
+                continue
+            layer_z = self.getLayerZ(index)
+            if layer_z is not None and layer_z >= z:
+                return index
+        return None
+
+    def getLayerString(self, index: int) -> str:
+        """Get the g-code list entry at the given index as a single string."""
+        layer = self._layers[index]
+        if isinstance(layer, str):
+            return layer
+        return "\n".join(layer)
+
+    def setLayerString(self, index: int, layer: str) -> None:
+        self._layers[index] = layer
+        self._invalidateEntry(index)
+
+    def toGCodeList(self) -> List[str]:
+        return [self.getLayerString(index) for index in range(len(self._layers))]
+
+    def _invalidateEntry(self, index: int) -> None:
+        """Forget the layer number and Z of an entry that was replaced, so that they're read again when they're needed."""
+        self._layer_numbers.pop(index, None)
+        self._layer_indices = None  # The first entry with a layer number may have changed.
+        self._layer_z_moves.pop(index, None)
+
+    @staticmethod
+    def _readLayerNumber(lines: List[str]) -> Optional[int]:
+        for line in lines:
+            if line.startswith(";LAYER:"):
+                try:
+                    return int(line[len(";LAYER:"):])
+                except ValueError:
+                    continue
+        return None
+
+    @classmethod
+    def _readZMove(cls, lines: List[str]) -> Optional[float]:
+        for line in lines:
+            match = cls._z_regex.match(line)
+            if match is not None:
+                return float(match.group(1))
+        return None
+
+
+MINIMUM_PARALLEL_SIZE = 50 * 1024 * 1024  # Characters of g-code from which scripts run in parallel, if they can.
+
+
+def executeScripts(scripts: Sequence["Script"], gcode_list: List[str], minimum_parallel_size: int = MINIMUM_PARALLEL_SIZE) -> List[str]:
+    """Execute a sequence of post-processing scripts on a g-code list.
+
+    Consecutive scripts that support the pipeline (see ``Script.supportsPipeline``) are fused: the g-code is split into
+    lines once and each layer is passed through all of these scripts in order before moving on to the next layer.
+    Scripts that only implement ``execute`` get the joined g-code list, as they always did.
+
+    Consecutive layer-independent scripts (see ``Script.isLayerIndependent``) are executed on the layers in parallel in
+    a process pool, if the g-code is at least ``minimum_parallel_size`` characters long and there are multiple CPUs. So
+    are scripts that hand over the state they carry between layers (see ``Script.supportsCarriedState``), each followed
+    by any layer-independent scripts. The result is the same as when executing them serially.
+    """
+    parallel = len(scripts) > 0 and _canRunInParallel() and sum(len(layer) for layer in gcode_list) >= minimum_parallel_size
+    gcode = None  # type: Optional[ParsedGCode]
+    fused = []  # type: List[Script]
+    for script in scripts:
+        if script.supportsPipeline():
+            # In parallel, the carried state is scanned from the layers as they are before the pass, so a script that
+            # carries state must be the first of its pass.
+            if fused and parallel and (_canTransformInParallel(script) != _canTransformInParallel(fused[0]) or
+                                       (_canTransformInParallel(script) and not script.isLayerIndependent())):
+                gcode = _executeFused(fused, gcode if gcode is not None else ParsedGCode(gcode_list), parallel)
+                fused = []
+            fused.append(script)
+            continue
+        if fused:
+            gcode = _executeFused(fused, gcode if gcode is not None else ParsedGCode(gcode_list), parallel)
+            fused = []
+        if gcode is not None:
+            gcode_list = gcode.toGCodeList()
+            gcode = None
+        try:
+            gcode_list = script.execute(gcode_list)
+        except Exception:
+            Logger.logException("e", "Exception in post-processing script.")
+    if fused:
+        gcode = _executeFused(fused, gcode if gcode is not None else ParsedGCode(gcode_list), parallel)
+    if gcode is not None:
+        gcode_list = gcode.toGCodeList()
+    return gcode_list
+
+
+def _executeFused(scripts: List["Script"], gcode: ParsedGCode, parallel: bool = False) -> ParsedGCode:
+    active_scripts = []  # type: List[Script]
+    for script in scripts:
+        try:
+            script.prepareTransform(gcode)
+        except Exception:
+            Logger.logException("e", "Exception in post-processing script.")
+            continue
+        active_scripts.append(script)
+
+    if parallel and active_scripts and _canTransformInParallel(active_scripts[0]) and all(script.isLayerIndependent() for script in active_scripts[1:]):
+        try:
+            _executeParallel(active_scripts, gcode)
+            return gcode
+        except Exception:
+            # The g-code is only changed once all layers are done, so the serial pass below starts from scratch.
+            Logger.logException("w", "Executing post-processing scripts in parallel failed. Executing them serially.")
+
+    for index in range(gcode.getLayerCount()):
+        for script in list(active_scripts):
+            try:
+                gcode.setLines(index, script.transformLayer(index, gcode.getLines(index), gcode))
+            except Exception:
+                # Like a failing legacy script, the layers that were already transformed stay transformed.
+                Logger.logException("e", "Exception in post-processing script.")
+                active_scripts.remove(script)
+    return gcode
+
+
+def _canRunInParallel() -> bool:
+    return (os.cpu_count() or 1) > 1
+
+
+def _canTransformInParallel(script: "Script") -> bool:
+    return script.isLayerIndependent() or script.supportsCarriedState()
+
+
+def _transformLayers(scripts_data: bytes, carried_states: List[Any], start: int, layers: List[str]) -> List[str]:
+    """Transform a range of layers with all scripts, in a worker process.
+
+    :param scripts_data: The pickled scripts.
+    :param carried_states: The states that the scripts that aren't layer independent carry into the first layer.
+    :param start: The index in the g-code list of the first layer.
+    :param layers: The layers to transform.
+    :return: The transformed layers.
+    """
+    scripts = pickle.loads(scripts_data)  # type: List[Script]
+    for script, carried_state in zip([script for script in scripts if not script.isLayerIndependent()], carried_states):
+        script.setCarriedState(carried_state)
+    gcode = ParsedGCode([""] * start + layers)  # Only the layers to transform are sent to this process.
+    result = []
+    for index in range(start, start + len(layers)):
+        lines = gcode.getLines(index)
+        for script in scripts:
+            lines = script.transformLayer(index, lines, gcode)
+        result.append("\n".join(lines))
+    return result
+
+
+def _executeParallel(scripts: List["Script"], gcode: ParsedGCode) -> None:
+    worker_count = os.cpu_count() or 1
+    layer_count = gcode.getLayerCount()
+    chunk_size = max(1, -(-layer_count // (worker_count * 4)))  # A few chunks per worker, to balance the load.
+    scripts_data = pickle.dumps(scripts)
+    stateful_scripts = [script for script in scripts if not script.isLayerIndependent()]
+    initial_states = [script.getCarriedState() for script in stateful_scripts]
+    modules = [sys.modules[__name__]] + [sys.modules[script_class.__module__] for script in scripts for script_class in reversed(type(script).__mro__)]
+    try:
+        with createProcessPool(worker_count, modules) as executor:
+            futures = []
+            for start in range(0, layer_count, chunk_size):
+                end = min(start + chunk_size, layer_count)
+                carried_states = [script.getCarriedState() for script in stateful_scripts]
+                # Carry the state over the layers of this chunk, to hand it over to the next chunk.
+                for index in range(start, end):
+                    for script in stateful_scripts:
+                        script.scanLayer(index, gcode.getLines(index), gcode)
+                layers = [gcode.getLayerString(index) for index in range(start, end)]
+                futures.append((start, executor.submit(_transformLayers, scripts_data, carried_states, start, layers)))
+            results = [(start, future.result()) for start, future in futures]
+    except Exception:
+        for script, initial_state in zip(stateful_scripts, initial_states):
+            script.setCarriedState(initial_state)  # For the serial pass that follows.
+        raise
+    for start, layers in results:
+        for offset, layer in enumerate(layers):
+            gcode.setLayerString(start + offset, layer)
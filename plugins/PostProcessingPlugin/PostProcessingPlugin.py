@@ -21,6 +21,8 @@ from UM.i18n import i18nCatalog
 from cura import ApplicationMetadata
 from cura.CuraApplication import CuraApplication
 
+from .GCodePipeline import executeScripts
+
 i18n_catalog = i18nCatalog("cura")
 
 if TYPE_CHECKING:
@@ -86,11 +88,7 @@ class PostProcessingPlugin(QObject, Extension):
             return
 
         if ";POSTPROCESSED" not in gcode_list[0]:
-            for script in self._script_list:
-                try:
-                    gcode_list = script.execute(gcode_list)
-                except Exception:
-                    Logger.logException("e", "Exception in post-processing script.")
+            gcode_list = executeScripts(self._script_list, gcode_list)
             if len(self._script_list):  # Add comment to g-code if any changes were made.
                 gcode_list[0] += ";POSTPROCESSED\n"
             gcode_dict[active_build_plate_id] = gcode_list
@@ -198,6 +196,7 @@ class PostProcessingPlugin(QObject, Extension):
                     loaded_script = importlib.util.module_from_spec(spec)
                     if spec.loader is None:
                         continue
+                    sys.modules[spec.name] = loaded_script  # Under the name of its classes, so that scripts can be pickled to run them in worker processes.
                     spec.loader.exec_module(loaded_script)  # type: ignore
                     sys.modules[script_name] = loaded_script #TODO: This could be a security risk. Overwrite any module with a user-provided name?
 
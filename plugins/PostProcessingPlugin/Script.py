@@ -1,7 +1,7 @@
 # Copyright (c) 2015 Jaime van Kessel
 # Copyright (c) 2018 Ultimaker B.V.
 # The PostProcessingPlugin is released under the terms of the AGPLv3 or higher.
-from typing import Optional, Any, Dict, TYPE_CHECKING, List
+from typing import Optional, Any, Dict, TYPE_CHECKING, List, Union
 
 from UM.Signal import Signal, signalemitter
 from UM.i18n import i18nCatalog
@@ -14,9 +14,12 @@ from UM.Settings.InstanceContainer import InstanceContainer
 from UM.Settings.DefinitionContainer import DefinitionContainer
 from UM.Settings.ContainerRegistry import ContainerRegistry
 
-import re
 import json
 import collections
+
+from .GCodeLine import GCodeLine
+from .GCodePipeline import ParsedGCode, executeScripts
+
 i18n_catalog = i18nCatalog("cura")
 
 if TYPE_CHECKING:
@@ -32,6 +35,8 @@ class Script:
         self._stack = None  # type: Optional[ContainerStack]
         self._definition = None  # type: Optional[DefinitionContainerInterface]
         self._instance = None  # type: Optional[InstanceContainer]
+        self._parsed_line = None  # type: Optional[GCodeLine]  # Scripts tend to request several values of the same line.
+        self._setting_values = {}  # type: Dict[str, Any]  # The settings of copies of this script in worker processes, which have no stack.
 
     def initialize(self) -> None:
         setting_data = self.getSettingData()
@@ -112,26 +117,42 @@ class Script:
 
         if self._stack is not None:
             return self._stack.getProperty(key, "value")
-        return None
+        return self._setting_values.get(key)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Get the state of this script, to copy it to a worker process.
+
+        The values of the settings are copied instead of the stack, which can only be used in this process.
+        """
+        state = {key: value for key, value in self.__dict__.items() if not isinstance(value, Signal)}
+        if self._stack is not None:
+            state["_setting_values"] = {key: self._stack.getProperty(key, "value") for key in self._stack.getAllKeys()}
+        state["_stack"] = None
+        state["_definition"] = None
+        state["_instance"] = None
+        state["_parsed_line"] = None
+        return state
+
+    def parseLine(self, line: str) -> GCodeLine:
+        """Parse a line of g-code into its words, to read and replace values in it.
+
+        For instance, ``self.parseLine("G1 X100 Y50").getFloat("X")`` gives ``100.0``, and after
+        ``setValue("Y", 60)`` on that object, its ``toString()`` gives ``"G1 X100 Y60"``.
+        """
+        return GCodeLine(line)
+
+    def _getParsedLine(self, line: str) -> GCodeLine:
+        """Get the cached parse of a line. This object must not be modified, since it's shared between calls."""
+        if self._parsed_line is None or self._parsed_line.toString() != line:
+            self._parsed_line = GCodeLine(line)
+        return self._parsed_line
 
     def getValue(self, line: str, key: str, default = None) -> Any:
         """Convenience function that finds the value in a line of g-code.
 
         When requesting key = x from line "G1 X100" the value 100 is returned.
         """
-        if not key in line or (';' in line and line.find(key) > line.find(';')):
-            return default
-        sub_part = line[line.find(key) + 1:]
-        m = re.search('^-?[0-9]+\.?[0-9]*', sub_part)
-        if m is None:
-            return default
-        try:
-            return int(m.group(0))
-        except ValueError: #Not an integer.
-            try:
-                return float(m.group(0))
-            except ValueError: #Not a number at all.
-                return default
+        return self._getParsedLine(line).getValue(key, default)
 
     def putValue(self, line: str = "", **kwargs) -> str:
         """Convenience function to produce a line of g-code.
@@ -148,29 +169,18 @@ class Script:
             provided, an entirely new g-code line will be produced.
         :return: A line of g-code with the desired parameters filled in.
         """
-        # Strip the comment.
-        if ";" in line:
-            comment = line[line.find(";"):]
-            line = line[:line.find(";")]
-        else:
-            comment = ""
-
-        # Parse the original g-code line and add them to kwargs.
-        for part in line.split(" "):
-            if part == "":
-                continue
-            parameter = part[0]
-            if parameter not in kwargs:
-                value = part[1:]
-                kwargs[parameter] = value
+        # Add the parameters of the original g-code line to kwargs.
+        comment = ""
+        if line != "":
+            parsed_line = self._getParsedLine(line)
+            for parameter, value in parsed_line.getWords():
+                if parameter not in kwargs:
+                    kwargs[parameter] = value
+            comment = parsed_line.getComment()
 
         # Start writing the new g-code line.
-        line_parts = list()
-        # First add these parameters in order
-        for parameter in ["G", "M", "T", "S", "F", "X", "Y", "Z", "E"]:
-            if parameter in kwargs:
-                value = kwargs.pop(parameter)  # get the corresponding value and remove the parameter from kwargs
-                line_parts.append(parameter + str(value))
+        # First add these parameters in order, removing them from kwargs
+        line_parts = [parameter + str(kwargs.pop(parameter)) for parameter in ("G", "M", "T", "S", "F", "X", "Y", "Z", "E") if parameter in kwargs]
         # Then add the rest of the parameters
         for parameter, value in kwargs.items():
             line_parts.append(parameter + str(value))
@@ -186,5 +196,91 @@ class Script:
         """This is called when the script is executed. 
 
         It gets a list of g-code strings and needs to return a (modified) list.
+        Scripts that implement ``transformLayer`` or ``transformLine`` instead don't need to override this.
         """
+        if self.supportsPipeline():
+            return executeScripts([self], data)
         raise NotImplementedError()
+
+    def supportsPipeline(self) -> bool:
+        """Whether this script can run in the fused post-processing pipeline.
+
+        That is the case if it overrides ``transformLayer`` or ``transformLine``. Such scripts get the g-code split into
+        lines once, together with the other pipeline scripts, instead of every script splitting and joining it again.
+        """
+        return type(self).transformLayer is not Script.transformLayer or type(self).transformLine is not Script.transformLine
+
+    def isLayerIndependent(self) -> bool:
+        """Whether this pipeline script transforms each layer independently of the other layers.
+
+        The layers of such scripts may be transformed in any order, in parallel in other processes. Any state that
+        ``transformLayer`` needs from other layers must then be computed beforehand in ``prepareTransform``, and changes
+        to the script object made in ``transformLayer`` are not kept. The ``gcode`` that is given to ``transformLayer``
+        in another process only has the layers that that process transforms.
+        """
+        return False
+
+    def supportsCarriedState(self) -> bool:
+        """Whether this pipeline script can hand over the state it carries from one layer to the next.
+
+        That is the case if it overrides ``getCarriedState``, ``setCarriedState`` and ``scanLayer``. Its layers can then
+        be transformed in parallel in other processes too. The state at the start of each range of layers is found by
+        scanning the layers before it in order, and is handed to the process that transforms that range.
+        """
+        return type(self).getCarriedState is not Script.getCarriedState
+
+    def getCarriedState(self) -> Any:
+        """Get the state that is carried from one layer to the next. It must be picklable."""
+        return None
+
+    def setCarriedState(self, state: Any) -> None:
+        """Continue from a state that was carried from one layer to the next, as given by ``getCarriedState``."""
+        pass
+
+    def scanLayer(self, index: int, lines: List[str], gcode: ParsedGCode) -> None:
+        """Update the carried state as if a layer was transformed, without transforming it.
+
+        All layers are scanned in order before they can be transformed in parallel, so this should be much faster than
+        ``transformLayer``. By default, a copy of the layer is transformed.
+
+        :param index: The index of this entry in the g-code list.
+        :param lines: The lines of this entry. These must not be modified.
+        :param gcode: The g-code that is being processed, for layer number lookups.
+        """
+        self.transformLayer(index, list(lines), gcode)
+
+    def prepareTransform(self, gcode: ParsedGCode) -> None:
+        """Called once before the pipeline pass, to read settings or reset the state carried between layers."""
+        pass
+
+    def transformLayer(self, index: int, lines: List[str], gcode: ParsedGCode) -> List[str]:
+        """Transform one entry of the g-code list in the pipeline.
+
+        The layers are passed in order, so state may be carried from one layer to the next.
+        By default this calls ``transformLine`` for every line.
+
+        :param index: The index of this entry in the g-code list.
+        :param lines: The lines of this entry. These may be modified in place.
+        :param gcode: The g-code that is being processed, for layer number lookups.
+        :return: The new lines of this entry.
+        """
+        result = []  # type: List[str]
+        for line in lines:
+            new_line = self.transformLine(line, index, gcode)
+            if new_line is None:
+                continue
+            if isinstance(new_line, str):
+                result.append(new_line)
+            else:
+                result.extend(new_line)
+        return result
+
+    def transformLine(self, line: str, index: int, gcode: ParsedGCode) -> Union[None, str, List[str]]:
+        """Transform one line of g-code in the pipeline.
+
+        :param line: The line of g-code, without line ending.
+        :param index: The index in the g-code list of the entry that this line is in.
+        :param gcode: The g-code that is being processed, for layer number lookups.
+        :return: The replacement line, a list of lines to insert instead of this line, or ``None`` to remove it.
+        """
+        return line
@@ -355,7 +355,7 @@ class ChangeAtZ(Script):
     def __init__(self):
         super().__init__()
 
-    def execute(self, data):
+    def prepareTransform(self, gcode):
 
         caz_instance = ChangeAtZProcessor()
 
@@ -394,8 +394,17 @@ class ChangeAtZ(Script):
         caz_instance.targetLayer = self.getIntSettingByKey("b_targetL", None)
         caz_instance.targetZ = self.getFloatSettingByKey("b_targetZ", None)
 
-        # run our script
-        return caz_instance.execute(data)
+        # the processor carries its state from one layer to the next
+        self._caz_instance = caz_instance
+
+    # Modifies one layer in the post-processing pipeline, in order
+    def transformLayer(self, index, lines, gcode):
+
+        # short cut the whole thing if we're not enabled
+        if not self._caz_instance.enabled:
+            return lines
+
+        return self._caz_instance.processLayer("\n".join(lines)).split("\n")
 
     # Sets the given TargetValue in the ChangeAtZ instance if the trigger is specified
     def setIntSettingIfEnabled(self, caz_instance, trigger, target, setting):
@@ -724,47 +733,50 @@ class ChangeAtZProcessor:
 
         for active_layer in data:
 
-            # will hold our updated gcode
-            modified_gcode = ""
+            # append our modified line
+            data[index] = self.processLayer(active_layer)
+
+            index += 1
 
-            # mark all the defaults for deletion
-            active_layer = self.markChangesForDeletion(active_layer)
+        # return our modified gcode
+        return data
 
-            # break apart the layer into commands
-            lines = active_layer.split("\n")
+    # Modifies the given layer of GCODE, continuing from the state of the layers before it
+    def processLayer(self, active_layer: str) -> str:
 
-            # evaluate each command individually
-            for line in lines:
+        # will hold our updated gcode
+        modified_gcode = ""
 
-                # trim or command
-                line = line.strip()
+        # mark all the defaults for deletion
+        active_layer = self.markChangesForDeletion(active_layer)
 
-                # skip empty lines
-                if len(line) == 0:
-                    continue
+        # break apart the layer into commands
+        lines = active_layer.split("\n")
 
-                # update our layer number if applicable
-                self.processLayerNumber(line)
+        # evaluate each command individually
+        for line in lines:
 
-                # update our layer height if applicable
-                self.processLayerHeight(line)
+            # trim or command
+            line = line.strip()
 
-                # check if we're at the target layer or not
-                self.processTargetLayer()
+            # skip empty lines
+            if len(line) == 0:
+                continue
 
-                # process any changes to the gcode
-                modified_gcode += self.processLine(line)
+            # update our layer number if applicable
+            self.processLayerNumber(line)
 
-            # remove any marked defaults
-            modified_gcode = self.removeMarkedChanges(modified_gcode)
+            # update our layer height if applicable
+            self.processLayerHeight(line)
 
-            # append our modified line
-            data[index] = modified_gcode
+            # check if we're at the target layer or not
+            self.processTargetLayer()
 
-            index += 1
+            # process any changes to the gcode
+            modified_gcode += self.processLine(line)
 
-        # return our modified gcode
-        return data
+        # remove any marked defaults
+        return self.removeMarkedChanges(modified_gcode)
 
     # Builds the restored layer settings based on the previous settings and returns the relevant GCODE lines
     def getChangedLastValues(self) -> Dict[str, any]:
@@ -27,6 +27,13 @@ from ..Script import Script
 class ColorMix(Script):
     def __init__(self):
         super().__init__()
+        self._first_mix = 0
+        self._model_of_interest = 0
+        self._start_layer = 0
+        self._end_layer = 0
+        self._first_extruder_increments = 0
+        self._layer = -1
+        self._model_number = 0
 
     def getSettingDataString(self):
         return """{
@@ -120,19 +127,17 @@ class ColorMix(Script):
         except:
             return default
 
-    def execute(self, data):
-
+    def prepareTransform(self, gcode):
         firstHeight = self.getSettingValueByKey("start_height")
         secondHeight = self.getSettingValueByKey("finish_height")
-        firstMix = self.getSettingValueByKey("mix_start")
+        self._first_mix = self.getSettingValueByKey("mix_start")
         secondMix = self.getSettingValueByKey("mix_finish")
-        modelOfInterest = self.getSettingValueByKey("object_number")
+        self._model_of_interest = self.getSettingValueByKey("object_number")
 
         #get layer height
         layerHeight = 0
-        for active_layer in data:
-            lines = active_layer.split("\n")
-            for line in lines:
+        for index in range(gcode.getLayerCount()):
+            for line in gcode.getLines(index):
                 if ";Layer height: " in line:
                     layerHeight = self.getValue(line, ";Layer height: ", layerHeight)
                     break
@@ -144,65 +149,82 @@ class ColorMix(Script):
             layerHeight = .2
 
         #get layers to use
-        startLayer = 0
-        endLayer = 0
         if self.getSettingValueByKey("units_of_measurement") == "mm":
-            startLayer = round(firstHeight / layerHeight)
-            endLayer = round(secondHeight / layerHeight)
+            self._start_layer = round(firstHeight / layerHeight)
+            self._end_layer = round(secondHeight / layerHeight)
         else:  #layer height shifts down by one for g-code
             if firstHeight <= 0:
                 firstHeight = 1
             if secondHeight <= 0:
-                secondHeight = 1   
-            startLayer = firstHeight - 1
-            endLayer = secondHeight - 1
+                secondHeight = 1
+            self._start_layer = firstHeight - 1
+            self._end_layer = secondHeight - 1
         #see if one-shot
         if self.getSettingValueByKey("behavior") == "fixed_value":
-            endLayer = startLayer
-            firstExtruderIncrements = 0
+            self._end_layer = self._start_layer
+            self._first_extruder_increments = 0
         else:  #blend
-            firstExtruderIncrements = (secondMix - firstMix) / (endLayer - startLayer)
-        firstExtruderValue = 0
-        index = 0
-
-        #start scanning
-        layer = -1
-        modelNumber = 0
-        for active_layer in data:
-            modified_gcode = ""
-            lineIndex = 0
-            lines = active_layer.split("\n")
-            for line in lines:
-                #dont leave blanks 
-                if line != "":
-                    modified_gcode += line + "\n"
-                # find current layer
-                if ";LAYER:" in line:
-                    layer = self.getValue(line, ";LAYER:", layer)
-                    #get model number by layer 0 repeats
-                    if layer == 0:
-                        modelNumber = modelNumber + 1
-                    #search for layers to manipulate
-                    if (layer >= startLayer) and (layer <= endLayer):
-                        #make sure correct model is selected
-                        if (modelOfInterest == 0) or (modelOfInterest == modelNumber):
-                            #Delete old data if required
-                            if lines[lineIndex + 4] == "T2":  
-                                del lines[(lineIndex + 1):(lineIndex + 5)]
-                            #add mixing commands
-                            firstExtruderValue = int(((layer - startLayer) * firstExtruderIncrements) + firstMix)
-                            if firstExtruderValue == 100:
-                                modified_gcode += "M163 S0 P1\n"
-                                modified_gcode += "M163 S1 P0\n"
-                            elif firstExtruderValue == 0:
-                                modified_gcode += "M163 S0 P0\n"
-                                modified_gcode += "M163 S1 P1\n"
-                            else:
-                                modified_gcode += "M163 S0 P0.{:02d}\n".format(firstExtruderValue)
-                                modified_gcode += "M163 S1 P0.{:02d}\n".format(100 - firstExtruderValue)
-                            modified_gcode += "M164 S2\n"
-                            modified_gcode += "T2\n"
-                lineIndex += 1  #for deleting index
-            data[index] = modified_gcode
-            index += 1
-        return data
\ No newline at end of file
+            self._first_extruder_increments = (secondMix - self._first_mix) / (self._end_layer - self._start_layer)
+
+        self._layer = -1
+        self._model_number = 0
+
+    def getCarriedState(self):
+        return self._layer, self._model_number
+
+    def setCarriedState(self, state):
+        self._layer, self._model_number = state
+
+    def scanLayer(self, index, lines, gcode):
+        line_index = 0
+        while line_index < len(lines):
+            if ";LAYER:" in lines[line_index]:
+                self._readLayer(lines[line_index])
+                if self._isMixedLayer() and lines[line_index + 4:line_index + 5] == ["T2"]:
+                    line_index += 4  #these old mixing commands are removed
+            line_index += 1
+
+    def transformLayer(self, index, lines, gcode):
+        modified_lines = []
+        line_index = 0
+        while line_index < len(lines):
+            line = lines[line_index]
+            #dont leave blanks
+            if line != "":
+                modified_lines.append(line)
+            # find current layer
+            if ";LAYER:" in line:
+                self._readLayer(line)
+                #search for layers to manipulate, of the correct model
+                if self._isMixedLayer():
+                    #Delete old data if required
+                    if lines[line_index + 4:line_index + 5] == ["T2"]:
+                        line_index += 4
+                    #add mixing commands
+                    firstExtruderValue = int(((self._layer - self._start_layer) * self._first_extruder_increments) + self._first_mix)
+                    if firstExtruderValue == 100:
+                        modified_lines.append("M163 S0 P1")
+                        modified_lines.append("M163 S1 P0")
+                    elif firstExtruderValue == 0:
+                        modified_lines.append("M163 S0 P0")
+                        modified_lines.append("M163 S1 P1")
+                    else:
+                        modified_lines.append("M163 S0 P0.{:02d}".format(firstExtruderValue))
+                        modified_lines.append("M163 S1 P0.{:02d}".format(100 - firstExtruderValue))
+                    modified_lines.append("M164 S2")
+                    modified_lines.append("T2")
+            line_index += 1
+        modified_lines.append("")  #every line ends with a newline
+        return modified_lines
+
+    def _readLayer(self, line):
+        self._layer = self.getValue(line, ";LAYER:", self._layer)
+        #get model number by layer 0 repeats
+        if self._layer == 0:
+            self._model_number += 1
+
+    def _isMixedLayer(self):
+        if self._layer < self._start_layer or self._layer > self._end_layer:
+            return False
+        #make sure correct model is selected
+        return self._model_of_interest == 0 or self._model_of_interest == self._model_number
@@ -15,6 +15,10 @@ from UM.Application import Application
 class DisplayFilenameAndLayerOnLCD(Script):
     def __init__(self):
         super().__init__()
+        self._name = ""
+        self._lcd_text = ""
+        self._layer_number = 0
+        self._max_layer = 0
 
     def getSettingDataString(self):
         return """{
@@ -57,44 +61,53 @@ class DisplayFilenameAndLayerOnLCD(Script):
             }
         }"""
 
-    def execute(self, data):
-        max_layer = 0
+    def prepareTransform(self, gcode):
+        self._max_layer = 0
         if self.getSettingValueByKey("name") != "":
-            name = self.getSettingValueByKey("name")
+            self._name = self.getSettingValueByKey("name")
         else:
-            name = Application.getInstance().getPrintInformation().jobName
+            self._name = Application.getInstance().getPrintInformation().jobName
         if not self.getSettingValueByKey("scroll"):
             if self.getSettingValueByKey("maxlayer"):
-                lcd_text = "M117 Layer "
+                self._lcd_text = "M117 Layer "
             else:
-                lcd_text = "M117 Printing Layer "
+                self._lcd_text = "M117 Printing Layer "
         else:
-            lcd_text = "M117 Printing " + name + " - Layer "
-        i = self.getSettingValueByKey("startNum")
-        for layer in data:
-            display_text = lcd_text + str(i)
-            layer_index = data.index(layer)
-            lines = layer.split("\n")
-            for line in lines:
-                if line.startswith(";LAYER_COUNT:"):
-                    max_layer = line
-                    max_layer = max_layer.split(":")[1]
-                    if self.getSettingValueByKey("startNum") == 0:
-                        max_layer = str(int(max_layer) - 1)
-                if line.startswith(";LAYER:"):
-                    if self.getSettingValueByKey("maxlayer"):
-                        display_text = display_text + " of " + max_layer
-                        if not self.getSettingValueByKey("scroll"):
-                            display_text = display_text + " " + name
-                    else:
-                        if not self.getSettingValueByKey("scroll"):
-                            display_text = display_text + " " + name + "!"
-                        else:
-                            display_text = display_text + "!"
-                    line_index = lines.index(line)
-                    lines.insert(line_index + 1, display_text)
-                    i += 1
-            final_lines = "\n".join(lines)
-            data[layer_index] = final_lines
+            self._lcd_text = "M117 Printing " + self._name + " - Layer "
+        self._layer_number = self.getSettingValueByKey("startNum")
 
-        return data
+    def getCarriedState(self):
+        return self._layer_number, self._max_layer
+
+    def setCarriedState(self, state):
+        self._layer_number, self._max_layer = state
+
+    def scanLayer(self, index, lines, gcode):
+        for line in lines:
+            if line.startswith(";LAYER_COUNT:"):
+                self._readLayerCount(line)
+            elif line.startswith(";LAYER:"):
+                self._layer_number += 1
+
+    def _readLayerCount(self, line):
+        self._max_layer = line.split(":")[1]
+        if self.getSettingValueByKey("startNum") == 0:
+            self._max_layer = str(int(self._max_layer) - 1)
+
+    def transformLine(self, line, index, gcode):
+        if line.startswith(";LAYER_COUNT:"):
+            self._readLayerCount(line)
+        if line.startswith(";LAYER:"):
+            display_text = self._lcd_text + str(self._layer_number)
+            if self.getSettingValueByKey("maxlayer"):
+                display_text = display_text + " of " + self._max_layer
+                if not self.getSettingValueByKey("scroll"):
+                    display_text = display_text + " " + self._name
+            else:
+                if not self.getSettingValueByKey("scroll"):
+                    display_text = display_text + " " + self._name + "!"
+                else:
+                    display_text = display_text + "!"
+            self._layer_number += 1
+            return [line, display_text]
+        return line
@@ -7,6 +7,8 @@ from ..Script import Script
 class InsertAtLayerChange(Script):
     def __init__(self):
         super().__init__()
+        self._gcode_to_add = ""
+        self._insert_before = True
 
     def getSettingDataString(self):
         return """{
@@ -34,19 +36,17 @@ class InsertAtLayerChange(Script):
             }
         }"""
 
-    def execute(self, data):
-        gcode_to_add = self.getSettingValueByKey("gcode_to_add") + "\n"
-        for layer in data:
-            # Check that a layer is being printed
-            lines = layer.split("\n")
-            for line in lines:
-                if ";LAYER:" in line:
-                    index = data.index(layer)
-                    if self.getSettingValueByKey("insert_location") == "before":
-                        layer = gcode_to_add + layer
-                    else:
-                        layer = layer + gcode_to_add
+    def isLayerIndependent(self):
+        return True
 
-                    data[index] = layer
-                    break
-        return data
+    def prepareTransform(self, gcode):
+        self._gcode_to_add = self.getSettingValueByKey("gcode_to_add") + "\n"
+        self._insert_before = self.getSettingValueByKey("insert_location") == "before"
+
+    def transformLayer(self, index, lines, gcode):
+        # Check that a layer is being printed
+        if not any(";LAYER:" in line for line in lines):
+            return lines
+        if self._insert_before:
+            return (self._gcode_to_add + lines[0]).split("\n") + lines[1:]
+        return lines[:-1] + (lines[-1] + self._gcode_to_add).split("\n")
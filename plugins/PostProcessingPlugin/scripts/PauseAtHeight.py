@@ -1,6 +1,7 @@
 # Copyright (c) 2021 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+from ..GCodePipeline import ParsedGCode
 from ..Script import Script
 
 from UM.Application import Application #To get the current printer's settings.
@@ -233,15 +234,111 @@ class PauseAtHeight(Script):
                     return x, y
         return 0, 0
 
-    def execute(self, data: List[str]) -> List[str]:
-        """Inserts the pause commands.
+    def prepareTransform(self, gcode: ParsedGCode) -> None:
+        self._pause_at = self.getSettingValueByKey("pause_at")
+        self._pause_height = self.getSettingValueByKey("pause_height")
+        self._pause_layer = self.getSettingValueByKey("pause_layer")
+        self._layers_started = False
+        self._initial_layer_height = Application.getInstance().getGlobalContainerStack().getProperty("layer_height_0", "value")
 
-        :param data: List of layers.
-        :return: New list of layers.
+        # use offset to calculate the current height: <current_height> = <current_z> - <layer_0_z>
+        self._layer_0_z = 0
+        self._current_z = 0
+        self._current_height = 0
+        self._current_layer = 0
+        self._current_extrusion_f = 0
+        self._got_first_g_cmd_on_layer_0 = False
+        self._current_t = 0 #Tracks the current extruder for tracking the target temperature.
+        self._target_temperature = {} #Tracks the current target temperature for each extruder.
+
+        self._nbr_negative_layers = 0
+
+        self._previous_lines = [""]  # type: List[str]  # The layer before this one, as it was before the pause was inserted.
+        self._paused = False
+
+    def transformLayer(self, index: int, lines: List[str], gcode: ParsedGCode) -> List[str]:
+        """Inserts the pause commands, in front of the layer at which to pause.
+
+        :param index: The index of this layer in the g-code list.
+        :param lines: The lines of this layer.
+        :param gcode: The g-code that is being processed.
+        :return: The new lines of this layer.
+        """
+        if self._paused:
+            return lines  # Only pause once.
+
+        # Scroll each line of instruction for each layer in the G-code
+        for line in lines:
+            # Fist positive layer reached
+            if ";LAYER:0" in line:
+                self._layers_started = True
+            # Count nbr of negative layers (raft)
+            elif ";LAYER:-" in line:
+                self._nbr_negative_layers += 1
+
+            #Track the latest printing temperature in order to resume at the correct temperature.
+            if line.startswith("T"):
+                self._current_t = self.getValue(line, "T")
+            m = self.getValue(line, "M")
+            if m is not None and (m == 104 or m == 109) and self.getValue(line, "S") is not None:
+                extruder = self._current_t
+                if self.getValue(line, "T") is not None:
+                    extruder = self.getValue(line, "T")
+                self._target_temperature[extruder] = self.getValue(line, "S")
+
+            if not self._layers_started:
+                continue
+
+            # Look for the feed rate of an extrusion instruction
+            if self.getValue(line, "F") is not None and self.getValue(line, "E") is not None:
+                self._current_extrusion_f = self.getValue(line, "F")
+
+            # If a Z instruction is in the line, read the current Z
+            if self.getValue(line, "Z") is not None:
+                self._current_z = self.getValue(line, "Z")
+
+            if self._pause_at == "height":
+                # Ignore if the line is not G1 or G0
+                if self.getValue(line, "G") != 1 and self.getValue(line, "G") != 0:
+                    continue
+
+                # This block is executed once, the first time there is a G
+                # command, to get the z offset (z for first positive layer)
+                if not self._got_first_g_cmd_on_layer_0:
+                    self._layer_0_z = self._current_z - self._initial_layer_height
+                    self._got_first_g_cmd_on_layer_0 = True
+
+                self._current_height = self._current_z - self._layer_0_z
+                if self._current_height < self._pause_height:
+                    continue  # Scan the entire layer, z-changes are not always on the same/first line.
+
+            # Pause at layer
+            else:
+                if not line.startswith(";LAYER:"):
+                    continue
+                self._current_layer = line[len(";LAYER:"):]
+                try:
+                    self._current_layer = int(self._current_layer)
+
+                # Couldn't cast to int. Something is wrong with this
+                # g-code data
+                except ValueError:
+                    continue
+                if self._current_layer < self._pause_layer - self._nbr_negative_layers:
+                    continue
+
+            self._paused = True
+            return self._getLayerWithPause(lines).split("\n")
+
+        self._previous_lines = list(lines)  # Later scripts in the pipeline may change the lines in place.
+        return lines
+
+    def _getLayerWithPause(self, lines: List[str]) -> str:
+        """Get the layer at which to pause, with the pause commands inserted.
+
+        :param lines: The lines of this layer.
+        :return: The new layer.
         """
-        pause_at = self.getSettingValueByKey("pause_at")
-        pause_height = self.getSettingValueByKey("pause_height")
-        pause_layer = self.getSettingValueByKey("pause_layer")
         disarm_timeout = self.getSettingValueByKey("disarm_timeout")
         retraction_amount = self.getSettingValueByKey("retraction_amount")
         retraction_speed = self.getSettingValueByKey("retraction_speed")
@@ -251,12 +348,10 @@ class PauseAtHeight(Script):
         park_x = self.getSettingValueByKey("head_park_x")
         park_y = self.getSettingValueByKey("head_park_y")
         move_z = self.getSettingValueByKey("head_move_z")
-        layers_started = False
         redo_layer = self.getSettingValueByKey("redo_layer")
         standby_temperature = self.getSettingValueByKey("standby_temperature")
         firmware_retract = Application.getInstance().getGlobalContainerStack().getProperty("machine_firmware_retract", "value")
         control_temperatures = Application.getInstance().getGlobalContainerStack().getProperty("machine_nozzle_temp_enabled", "value")
-        initial_layer_height = Application.getInstance().getGlobalContainerStack().getProperty("layer_height_0", "value")
         display_text = self.getSettingValueByKey("display_text")
         gcode_before = self.getSettingValueByKey("custom_gcode_before_pause")
         gcode_after = self.getSettingValueByKey("custom_gcode_after_pause")
@@ -270,287 +365,204 @@ class PauseAtHeight(Script):
             "repetier": self.putValue("@pause now change filament and press continue printing")
         }[pause_method]
 
-        # T = ExtruderManager.getInstance().getActiveExtruderStack().getProperty("material_print_temperature", "value")
+        layer = "\n".join(lines)
+        prev_layer = "\n".join(self._previous_lines)
+        prev_lines = self._previous_lines
+        current_e = 0.
+
+        # Access last layer, browse it backwards to find
+        # last extruder absolute position
+        for prevLine in reversed(prev_lines):
+            current_e = self.getValue(prevLine, "E", -1)
+            if current_e >= 0:
+                break
+        # and also find last X,Y
+        for prevLine in reversed(prev_lines):
+            if prevLine.startswith(("G0", "G1", "G2", "G3")):
+                if self.getValue(prevLine, "X") is not None and self.getValue(prevLine, "Y") is not None:
+                    x = self.getValue(prevLine, "X")
+                    y = self.getValue(prevLine, "Y")
+                    break
+
+        # Maybe redo the last layer.
+        if redo_layer:
+            layer = prev_layer + layer
+
+            # Get extruder's absolute position at the
+            # beginning of the redone layer.
+            # see https://github.com/nallath/PostProcessingPlugin/issues/55
+            # Get X and Y from the next layer (better position for
+            # the nozzle)
+            x, y = self.getNextXY(layer)
+            prev_lines = prev_layer.split("\n")
+            for lin in prev_lines:
+                new_e = self.getValue(lin, "E", current_e)
+                if new_e != current_e:
+                    current_e = new_e
+                    break
+
+        prepend_gcode = ";TYPE:CUSTOM\n"
+        prepend_gcode += ";added code by post processing\n"
+        prepend_gcode += ";script: PauseAtHeight.py\n"
+        if self._pause_at == "height":
+            prepend_gcode += ";current z: {z}\n".format(z = self._current_z)
+            prepend_gcode += ";current height: {height}\n".format(height = self._current_height)
+        else:
+            prepend_gcode += ";current layer: {layer}\n".format(layer = self._current_layer)
+
+        if pause_method == "repetier":
+            #Retraction
+            prepend_gcode += self.putValue(M = 83) + " ; switch to relative E values for any needed retraction\n"
+            if retraction_amount != 0:
+                prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = 6000) + "\n"
+
+            if park_enabled:
+                #Move the head away
+                prepend_gcode += self.putValue(G = 1, Z = self._current_z + 1, F = 300) + " ; move up a millimeter to get out of the way\n"
+                prepend_gcode += self.putValue(G = 1, X = park_x, Y = park_y, F = 9000) + "\n"
+                if self._current_z < move_z:
+                    prepend_gcode += self.putValue(G = 1, Z = self._current_z + move_z, F = 300) + "\n"
+
+            #Disable the E steppers
+            prepend_gcode += self.putValue(M = 84, E = 0) + "\n"
+
+        elif pause_method != "griffin":
+            # Retraction
+            prepend_gcode += self.putValue(M = 83) + " ; switch to relative E values for any needed retraction\n"
+            if retraction_amount != 0:
+                if firmware_retract: #Can't set the distance directly to what the user wants. We have to choose ourselves.
+                    retraction_count = 1 if control_temperatures else 3 #Retract more if we don't control the temperature.
+                    for i in range(retraction_count):
+                        prepend_gcode += self.putValue(G = 10) + "\n"
+                else:
+                    prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = retraction_speed * 60) + "\n"
 
-        # use offset to calculate the current height: <current_height> = <current_z> - <layer_0_z>
-        layer_0_z = 0
-        current_z = 0
-        current_height = 0
-        current_layer = 0
-        current_extrusion_f = 0
-        got_first_g_cmd_on_layer_0 = False
-        current_t = 0 #Tracks the current extruder for tracking the target temperature.
-        target_temperature = {} #Tracks the current target temperature for each extruder.
-
-        nbr_negative_layers = 0
-
-        for index, layer in enumerate(data):
-            lines = layer.split("\n")
-
-            # Scroll each line of instruction for each layer in the G-code
-            for line in lines:
-                # Fist positive layer reached
-                if ";LAYER:0" in line:
-                    layers_started = True
-                # Count nbr of negative layers (raft)
-                elif ";LAYER:-" in line:
-                    nbr_negative_layers += 1
-
-                #Track the latest printing temperature in order to resume at the correct temperature.
-                if line.startswith("T"):
-                    current_t = self.getValue(line, "T")
-                m = self.getValue(line, "M")
-                if m is not None and (m == 104 or m == 109) and self.getValue(line, "S") is not None:
-                    extruder = current_t
-                    if self.getValue(line, "T") is not None:
-                        extruder = self.getValue(line, "T")
-                    target_temperature[extruder] = self.getValue(line, "S")
-
-                if not layers_started:
-                    continue
+            if park_enabled:
+                # Move the head away
+                prepend_gcode += self.putValue(G = 1, Z = self._current_z + 1, F = 300) + " ; move up a millimeter to get out of the way\n"
+
+                # This line should be ok
+                prepend_gcode += self.putValue(G = 1, X = park_x, Y = park_y, F = 9000) + "\n"
+
+                if self._current_z < 15:
+                    prepend_gcode += self.putValue(G = 1, Z = 15, F = 300) + " ; too close to bed--move to at least 15mm\n"
+
+            if control_temperatures:
+                # Set extruder standby temperature
+                prepend_gcode += self.putValue(M = 104, S = standby_temperature) + " ; standby temperature\n"
+
+        if display_text:
+            prepend_gcode += "M117 " + display_text + "\n"
+
+        # Set the disarm timeout
+        if disarm_timeout > 0:
+            prepend_gcode += self.putValue(M = 18, S = disarm_timeout) + " ; Set the disarm timeout\n"
+
+        # Set a custom GCODE section before pause
+        if gcode_before:
+            prepend_gcode += gcode_before + "\n"
+
+        # Wait till the user continues printing
+        prepend_gcode += pause_command + " ; Do the actual pause\n"
+
+        # Set a custom GCODE section before pause
+        if gcode_after:
+            prepend_gcode += gcode_after + "\n"
+
+        if pause_method == "repetier":
+            #Push the filament back,
+            if retraction_amount != 0:
+                prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = 6000) + "\n"
+
+            # Optionally extrude material
+            if extrude_amount != 0:
+                prepend_gcode += self.putValue(G = 1, E = extrude_amount, F = 200) + "; Extra extrude after the unpause\n"
+                prepend_gcode += self.putValue("@info wait for cleaning nozzle from previous filament") + "\n"
+                prepend_gcode += self.putValue("@pause remove the waste filament from parking area and press continue printing") + "\n"
+
+            # and retract again, the properly primes the nozzle when changing filament.
+            if retraction_amount != 0:
+                prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = 6000) + "\n"
+
+            #Move the head back
+            if park_enabled:
+                prepend_gcode += self.putValue(G = 1, X = x, Y = y, F = 9000) + "\n"
+                prepend_gcode += self.putValue(G = 1, Z = self._current_z, F = 300) + "\n"
+
+            if retraction_amount != 0:
+                prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = 6000) + "\n"
+
+            if self._current_extrusion_f != 0:
+                prepend_gcode += self.putValue(G = 1, F = self._current_extrusion_f) + " ; restore extrusion feedrate\n"
+            else:
+                Logger.log("w", "No previous feedrate found in gcode, feedrate for next layer(s) might be incorrect")
+
+            extrusion_mode_string = "absolute"
+            extrusion_mode_numeric = 82
+
+            relative_extrusion = Application.getInstance().getGlobalContainerStack().getProperty("relative_extrusion", "value")
+            if relative_extrusion:
+                extrusion_mode_string = "relative"
+                extrusion_mode_numeric = 83
+
+            prepend_gcode += self.putValue(M = extrusion_mode_numeric) + " ; switch back to " + extrusion_mode_string + " E values\n"
+
+            # reset extrude value to pre pause value
+            prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
+
+        elif pause_method != "griffin":
+            if control_temperatures:
+                # Set extruder resume temperature
+                prepend_gcode += self.putValue(M = 109, S = int(self._target_temperature.get(self._current_t, 0))) + " ; resume temperature\n"
+
+            if extrude_amount != 0:  # Need to prime after the pause.
+                # Push the filament back.
+                if retraction_amount != 0:
+                    prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = retraction_speed * 60) + "\n"
+
+                # Prime the material.
+                prepend_gcode += self.putValue(G = 1, E = extrude_amount, F = extrude_speed * 60) + "; Extra extrude after the unpause\n"
+
+                # And retract again to make the movements back to the starting position.
+                if retraction_amount != 0:
+                    prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = retraction_speed * 60) + "\n"
+
+            # Move the head back
+            if park_enabled:
+                if self._current_z < 15:
+                    prepend_gcode += self.putValue(G = 1, Z = self._current_z, F = 300) + "\n"
+                prepend_gcode += self.putValue(G = 1, X = x, Y = y, F = 9000) + "\n"
+                prepend_gcode += self.putValue(G = 1, Z = self._current_z, F = 300) + " ; move back down to resume height\n"
+
+            if retraction_amount != 0:
+                if firmware_retract: #Can't set the distance directly to what the user wants. We have to choose ourselves.
+                    retraction_count = 1 if control_temperatures else 3 #Retract more if we don't control the temperature.
+                    for i in range(retraction_count):
+                        prepend_gcode += self.putValue(G = 11) + "\n"
+                else:
+                    prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = retraction_speed * 60) + "\n"
 
-                # Look for the feed rate of an extrusion instruction
-                if self.getValue(line, "F") is not None and self.getValue(line, "E") is not None:
-                    current_extrusion_f = self.getValue(line, "F")
+            if self._current_extrusion_f != 0:
+                prepend_gcode += self.putValue(G = 1, F = self._current_extrusion_f) + " ; restore extrusion feedrate\n"
+            else:
+                Logger.log("w", "No previous feedrate found in gcode, feedrate for next layer(s) might be incorrect")
 
-                # If a Z instruction is in the line, read the current Z
-                if self.getValue(line, "Z") is not None:
-                    current_z = self.getValue(line, "Z")
+            extrusion_mode_string = "absolute"
+            extrusion_mode_numeric = 82
 
-                if pause_at == "height":
-                    # Ignore if the line is not G1 or G0
-                    if self.getValue(line, "G") != 1 and self.getValue(line, "G") != 0:
-                        continue
+            relative_extrusion = Application.getInstance().getGlobalContainerStack().getProperty("relative_extrusion", "value")
+            if relative_extrusion:
+                extrusion_mode_string = "relative"
+                extrusion_mode_numeric = 83
 
-                    # This block is executed once, the first time there is a G
-                    # command, to get the z offset (z for first positive layer)
-                    if not got_first_g_cmd_on_layer_0:
-                        layer_0_z = current_z - initial_layer_height
-                        got_first_g_cmd_on_layer_0 = True
+            prepend_gcode += self.putValue(M = extrusion_mode_numeric) + " ; switch back to " + extrusion_mode_string + " E values\n"
 
-                    current_height = current_z - layer_0_z
-                    if current_height < pause_height:
-                        continue  # Scan the entire layer, z-changes are not always on the same/first line.
+            # reset extrude value to pre pause value
+            prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
 
-                # Pause at layer
-                else:
-                    if not line.startswith(";LAYER:"):
-                        continue
-                    current_layer = line[len(";LAYER:"):]
-                    try:
-                        current_layer = int(current_layer)
-
-                    # Couldn't cast to int. Something is wrong with this
-                    # g-code data
-                    except ValueError:
-                        continue
-                    if current_layer < pause_layer - nbr_negative_layers:
-                        continue
-
-                prev_layer = data[index - 1]
-                prev_lines = prev_layer.split("\n")
-                current_e = 0.
-
-                # Access last layer, browse it backwards to find
-                # last extruder absolute position
-                for prevLine in reversed(prev_lines):
-                    current_e = self.getValue(prevLine, "E", -1)
-                    if current_e >= 0:
-                        break
-                # and also find last X,Y
-                for prevLine in reversed(prev_lines):
-                    if prevLine.startswith(("G0", "G1", "G2", "G3")):
-                        if self.getValue(prevLine, "X") is not None and self.getValue(prevLine, "Y") is not None:
-                            x = self.getValue(prevLine, "X")
-                            y = self.getValue(prevLine, "Y")
-                            break
-
-                # Maybe redo the last layer.
-                if redo_layer:
-                    prev_layer = data[index - 1]
-                    layer = prev_layer + layer
-
-                    # Get extruder's absolute position at the
-                    # beginning of the redone layer.
-                    # see https://github.com/nallath/PostProcessingPlugin/issues/55
-                    # Get X and Y from the next layer (better position for
-                    # the nozzle)
-                    x, y = self.getNextXY(layer)
-                    prev_lines = prev_layer.split("\n")
-                    for lin in prev_lines:
-                        new_e = self.getValue(lin, "E", current_e)
-                        if new_e != current_e:
-                            current_e = new_e
-                            break
-
-                prepend_gcode = ";TYPE:CUSTOM\n"
-                prepend_gcode += ";added code by post processing\n"
-                prepend_gcode += ";script: PauseAtHeight.py\n"
-                if pause_at == "height":
-                    prepend_gcode += ";current z: {z}\n".format(z = current_z)
-                    prepend_gcode += ";current height: {height}\n".format(height = current_height)
-                else:
-                    prepend_gcode += ";current layer: {layer}\n".format(layer = current_layer)
-
-                if pause_method == "repetier":
-                    #Retraction
-                    prepend_gcode += self.putValue(M = 83) + " ; switch to relative E values for any needed retraction\n"
-                    if retraction_amount != 0:
-                        prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = 6000) + "\n"
-
-                    if park_enabled:
-                        #Move the head away
-                        prepend_gcode += self.putValue(G = 1, Z = current_z + 1, F = 300) + " ; move up a millimeter to get out of the way\n"
-                        prepend_gcode += self.putValue(G = 1, X = park_x, Y = park_y, F = 9000) + "\n"
-                        if current_z < move_z:
-                            prepend_gcode += self.putValue(G = 1, Z = current_z + move_z, F = 300) + "\n"
-
-                    #Disable the E steppers
-                    prepend_gcode += self.putValue(M = 84, E = 0) + "\n"
-
-                elif pause_method != "griffin":
-                    # Retraction
-                    prepend_gcode += self.putValue(M = 83) + " ; switch to relative E values for any needed retraction\n"
-                    if retraction_amount != 0:
-                        if firmware_retract: #Can't set the distance directly to what the user wants. We have to choose ourselves.
-                            retraction_count = 1 if control_temperatures else 3 #Retract more if we don't control the temperature.
-                            for i in range(retraction_count):
-                                prepend_gcode += self.putValue(G = 10) + "\n"
-                        else:
-                            prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = retraction_speed * 60) + "\n"
-
-                    if park_enabled:
-                        # Move the head away
-                        prepend_gcode += self.putValue(G = 1, Z = current_z + 1, F = 300) + " ; move up a millimeter to get out of the way\n"
-
-                        # This line should be ok
-                        prepend_gcode += self.putValue(G = 1, X = park_x, Y = park_y, F = 9000) + "\n"
-
-                        if current_z < 15:
-                            prepend_gcode += self.putValue(G = 1, Z = 15, F = 300) + " ; too close to bed--move to at least 15mm\n"
-
-                    if control_temperatures:
-                        # Set extruder standby temperature
-                        prepend_gcode += self.putValue(M = 104, S = standby_temperature) + " ; standby temperature\n"
-
-                if display_text:
-                    prepend_gcode += "M117 " + display_text + "\n"
-
-                # Set the disarm timeout
-                if disarm_timeout > 0:
-                    prepend_gcode += self.putValue(M = 18, S = disarm_timeout) + " ; Set the disarm timeout\n"
-
-                # Set a custom GCODE section before pause
-                if gcode_before:
-                    prepend_gcode += gcode_before + "\n"
-
-                # Wait till the user continues printing
-                prepend_gcode += pause_command + " ; Do the actual pause\n"
-
-                # Set a custom GCODE section before pause
-                if gcode_after:
-                    prepend_gcode += gcode_after + "\n"
-
-                if pause_method == "repetier":
-                    #Push the filament back,
-                    if retraction_amount != 0:
-                        prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = 6000) + "\n"
-
-                    # Optionally extrude material
-                    if extrude_amount != 0:
-                        prepend_gcode += self.putValue(G = 1, E = extrude_amount, F = 200) + "; Extra extrude after the unpause\n"
-                        prepend_gcode += self.putValue("@info wait for cleaning nozzle from previous filament") + "\n"
-                        prepend_gcode += self.putValue("@pause remove the waste filament from parking area and press continue printing") + "\n"
-
-                    # and retract again, the properly primes the nozzle when changing filament.
-                    if retraction_amount != 0:
-                        prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = 6000) + "\n"
-
-                    #Move the head back
-                    if park_enabled:
-                        prepend_gcode += self.putValue(G = 1, X = x, Y = y, F = 9000) + "\n"
-                        prepend_gcode += self.putValue(G = 1, Z = current_z, F = 300) + "\n"
-
-                    if retraction_amount != 0:
-                        prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = 6000) + "\n"
-
-                    if current_extrusion_f != 0:
-                        prepend_gcode += self.putValue(G = 1, F = current_extrusion_f) + " ; restore extrusion feedrate\n"
-                    else:
-                        Logger.log("w", "No previous feedrate found in gcode, feedrate for next layer(s) might be incorrect")
-
-                    extrusion_mode_string = "absolute"
-                    extrusion_mode_numeric = 82
-
-                    relative_extrusion = Application.getInstance().getGlobalContainerStack().getProperty("relative_extrusion", "value")
-                    if relative_extrusion:
-                        extrusion_mode_string = "relative"
-                        extrusion_mode_numeric = 83
-
-                    prepend_gcode += self.putValue(M = extrusion_mode_numeric) + " ; switch back to " + extrusion_mode_string + " E values\n"
-
-                    # reset extrude value to pre pause value
-                    prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
-
-                elif pause_method != "griffin":
-                    if control_temperatures:
-                        # Set extruder resume temperature
-                        prepend_gcode += self.putValue(M = 109, S = int(target_temperature.get(current_t, 0))) + " ; resume temperature\n"
-
-                    if extrude_amount != 0:  # Need to prime after the pause.
-                        # Push the filament back.
-                        if retraction_amount != 0:
-                            prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = retraction_speed * 60) + "\n"
-
-                        # Prime the material.
-                        prepend_gcode += self.putValue(G = 1, E = extrude_amount, F = extrude_speed * 60) + "; Extra extrude after the unpause\n"
-
-                        # And retract again to make the movements back to the starting position.
-                        if retraction_amount != 0:
-                            prepend_gcode += self.putValue(G = 1, E = -retraction_amount, F = retraction_speed * 60) + "\n"
-
-                    # Move the head back
-                    if park_enabled:
-                        if current_z < 15:
-                            prepend_gcode += self.putValue(G = 1, Z = current_z, F = 300) + "\n"
-                        prepend_gcode += self.putValue(G = 1, X = x, Y = y, F = 9000) + "\n"
-                        prepend_gcode += self.putValue(G = 1, Z = current_z, F = 300) + " ; move back down to resume height\n"
-
-                    if retraction_amount != 0:
-                        if firmware_retract: #Can't set the distance directly to what the user wants. We have to choose ourselves.
-                            retraction_count = 1 if control_temperatures else 3 #Retract more if we don't control the temperature.
-                            for i in range(retraction_count):
-                                prepend_gcode += self.putValue(G = 11) + "\n"
-                        else:
-                            prepend_gcode += self.putValue(G = 1, E = retraction_amount, F = retraction_speed * 60) + "\n"
-
-                    if current_extrusion_f != 0:
-                        prepend_gcode += self.putValue(G = 1, F = current_extrusion_f) + " ; restore extrusion feedrate\n"
-                    else:
-                        Logger.log("w", "No previous feedrate found in gcode, feedrate for next layer(s) might be incorrect")
-
-                    extrusion_mode_string = "absolute"
-                    extrusion_mode_numeric = 82
-
-                    relative_extrusion = Application.getInstance().getGlobalContainerStack().getProperty("relative_extrusion", "value")
-                    if relative_extrusion:
-                        extrusion_mode_string = "relative"
-                        extrusion_mode_numeric = 83
-
-                    prepend_gcode += self.putValue(M = extrusion_mode_numeric) + " ; switch back to " + extrusion_mode_string + " E values\n"
-
-                    # reset extrude value to pre pause value
-                    prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
-
-                elif redo_layer:
-                    # All other options reset the E value to what it was before the pause because E things were added.
-                    # If it's not yet reset, it still needs to be reset if there were any redo layers.
-                    prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
-
-                layer = prepend_gcode + layer
-
-                # Override the data of this layer with the
-                # modified data
-                data[index] = layer
-                return data
-        return data
+        elif redo_layer:
+            # All other options reset the E value to what it was before the pause because E things were added.
+            # If it's not yet reset, it still needs to be reset if there were any redo layers.
+            prepend_gcode += self.putValue(G = 92, E = current_e) + "\n"
+
+        return prepend_gcode + layer
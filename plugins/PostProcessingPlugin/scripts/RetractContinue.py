@@ -9,6 +9,14 @@ from ..Script import Script
 class RetractContinue(Script):
     """Continues retracting during all travel moves."""
 
+    def __init__(self):
+        super().__init__()
+        self._current_e = 0
+        self._current_x = 0
+        self._current_y = 0
+        self._current_z = 0
+        self._extra_retraction_speed = 0
+
     def getSettingDataString(self):
         return """{
             "name": "Retract Continue",
@@ -27,58 +35,107 @@ class RetractContinue(Script):
             }
         }"""
 
-    def execute(self, data):
-        current_e = 0
-        current_x = 0
-        current_y = 0
-        current_z = 0
-        extra_retraction_speed = self.getSettingValueByKey("extra_retraction_speed")
-
-        for layer_number, layer in enumerate(data):
-            lines = layer.split("\n")
-            for line_number, line in enumerate(lines):
-                if self.getValue(line, "G") in {0, 1}:  # Track X,Y,Z location.
-                    current_x = self.getValue(line, "X", current_x)
-                    current_y = self.getValue(line, "Y", current_y)
-                    current_z = self.getValue(line, "Z", current_z)
-                if self.getValue(line, "G") == 1:
-                    if not self.getValue(line, "E"):  # Either None or 0: Not a retraction then.
-                        continue
-                    new_e = self.getValue(line, "E")
-                    if new_e - current_e >= -0.0001:  # Not a retraction. Account for floating point rounding errors.
-                        current_e = new_e
-                        continue
-                    # A retracted travel move may consist of multiple commands, due to combing.
-                    # This continues retracting over all of these moves and only unretracts at the end.
-                    delta_line = 1
-                    dx = current_x  # Track the difference in X for this move only to compute the length of the travel.
-                    dy = current_y
-                    dz = current_z
-                    while line_number + delta_line < len(lines) and self.getValue(lines[line_number + delta_line], "G") != 1:
-                        travel_move = lines[line_number + delta_line]
-                        if self.getValue(travel_move, "G") != 0:
-                            delta_line += 1
-                            continue
-                        travel_x = self.getValue(travel_move, "X", dx)
-                        travel_y = self.getValue(travel_move, "Y", dy)
-                        travel_z = self.getValue(travel_move, "Z", dz)
-                        f = self.getValue(travel_move, "F", "no f")
-                        length = math.sqrt((travel_x - dx) * (travel_x - dx) + (travel_y - dy) * (travel_y - dy) + (travel_z - dz) * (travel_z - dz))  # Length of the travel move.
-                        new_e -= length * extra_retraction_speed  # New retraction is by ratio of this travel move.
-                        if f == "no f":
-                            new_travel_move = "G1 X{travel_x} Y{travel_y} Z{travel_z} E{new_e}".format(travel_x = travel_x, travel_y = travel_y, travel_z = travel_z, new_e = new_e)
-                        else:
-                            new_travel_move = "G1 F{f} X{travel_x} Y{travel_y} Z{travel_z} E{new_e}".format(f = f, travel_x = travel_x, travel_y = travel_y, travel_z = travel_z, new_e = new_e)
-                        lines[line_number + delta_line] = new_travel_move
+    def prepareTransform(self, gcode):
+        self._current_e = 0
+        self._current_x = 0
+        self._current_y = 0
+        self._current_z = 0
+        self._extra_retraction_speed = self.getSettingValueByKey("extra_retraction_speed")
 
-                        delta_line += 1
-                        dx = travel_x
-                        dy = travel_y
-                        dz = travel_z
+    def getCarriedState(self):
+        return self._current_e, self._current_x, self._current_y, self._current_z
+
+    def setCarriedState(self, state):
+        self._current_e, self._current_x, self._current_y, self._current_z = state
+
+    def scanLayer(self, index, lines, gcode):
+        # The E value that is carried over is that of the last extrusion or retraction, unless retracting continues over
+        # travel moves after it. Only then the layer has to be transformed to know it.
+        last_extrusion = None
+        for line_number in range(len(lines) - 1, -1, -1):
+            if self.getValue(lines[line_number], "G") == 1 and self.getValue(lines[line_number], "E"):
+                last_extrusion = line_number
+                break
+        if last_extrusion is not None:
+            for line in lines[last_extrusion + 1:]:
+                g = self.getValue(line, "G")
+                if g == 1:
+                    break
+                if g == 0:
+                    super().scanLayer(index, lines, gcode)
+                    return
+            self._current_e = self.getValue(lines[last_extrusion], "E")
 
+        # The travel moves that are changed keep their X, Y and Z, so the last ones of the layer are carried over.
+        current_x = current_y = current_z = None
+        for line in reversed(lines):
+            if current_x is not None and current_y is not None and current_z is not None:
+                break
+            if current_x is not None and current_y is not None and "Z" not in line:
+                continue  # Quickly skip to the Z, which is usually at the start of the layer.
+            if self.getValue(line, "G") not in {0, 1}:
+                continue
+            if current_x is None:
+                current_x = self.getValue(line, "X")
+            if current_y is None:
+                current_y = self.getValue(line, "Y")
+            if current_z is None:
+                current_z = self.getValue(line, "Z")
+        self._current_x = current_x if current_x is not None else self._current_x
+        self._current_y = current_y if current_y is not None else self._current_y
+        self._current_z = current_z if current_z is not None else self._current_z
+
+    def transformLayer(self, index, lines, gcode):
+        current_e = self._current_e
+        current_x = self._current_x
+        current_y = self._current_y
+        current_z = self._current_z
+        extra_retraction_speed = self._extra_retraction_speed
+
+        for line_number, line in enumerate(lines):
+            if self.getValue(line, "G") in {0, 1}:  # Track X,Y,Z location.
+                current_x = self.getValue(line, "X", current_x)
+                current_y = self.getValue(line, "Y", current_y)
+                current_z = self.getValue(line, "Z", current_z)
+            if self.getValue(line, "G") == 1:
+                if not self.getValue(line, "E"):  # Either None or 0: Not a retraction then.
+                    continue
+                new_e = self.getValue(line, "E")
+                if new_e - current_e >= -0.0001:  # Not a retraction. Account for floating point rounding errors.
                     current_e = new_e
+                    continue
+                # A retracted travel move may consist of multiple commands, due to combing.
+                # This continues retracting over all of these moves and only unretracts at the end.
+                delta_line = 1
+                dx = current_x  # Track the difference in X for this move only to compute the length of the travel.
+                dy = current_y
+                dz = current_z
+                while line_number + delta_line < len(lines) and self.getValue(lines[line_number + delta_line], "G") != 1:
+                    travel_move = lines[line_number + delta_line]
+                    if self.getValue(travel_move, "G") != 0:
+                        delta_line += 1
+                        continue
+                    travel_x = self.getValue(travel_move, "X", dx)
+                    travel_y = self.getValue(travel_move, "Y", dy)
+                    travel_z = self.getValue(travel_move, "Z", dz)
+                    f = self.getValue(travel_move, "F", "no f")
+                    length = math.sqrt((travel_x - dx) * (travel_x - dx) + (travel_y - dy) * (travel_y - dy) + (travel_z - dz) * (travel_z - dz))  # Length of the travel move.
+                    new_e -= length * extra_retraction_speed  # New retraction is by ratio of this travel move.
+                    if f == "no f":
+                        new_travel_move = "G1 X{travel_x} Y{travel_y} Z{travel_z} E{new_e}".format(travel_x = travel_x, travel_y = travel_y, travel_z = travel_z, new_e = new_e)
+                    else:
+                        new_travel_move = "G1 F{f} X{travel_x} Y{travel_y} Z{travel_z} E{new_e}".format(f = f, travel_x = travel_x, travel_y = travel_y, travel_z = travel_z, new_e = new_e)
+                    lines[line_number + delta_line] = new_travel_move
+
+                    delta_line += 1
+                    dx = travel_x
+                    dy = travel_y
+                    dz = travel_z
 
-            new_layer = "\n".join(lines)
-            data[layer_number] = new_layer
+                current_e = new_e
 
-        return data
\ No newline at end of file
+        self._current_e = current_e
+        self._current_x = current_x
+        self._current_y = current_y
+        self._current_z = current_z
+        return lines
@@ -13,6 +13,11 @@ class SearchAndReplace(Script):
     layers.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._search_regex = None
+        self._replace_string = ""
+
     def getSettingDataString(self):
         return """{
             "name": "Search and Replace",
@@ -45,15 +50,16 @@ class SearchAndReplace(Script):
             }
         }"""
 
-    def execute(self, data):
+    def isLayerIndependent(self):
+        return True
+
+    def prepareTransform(self, gcode):
         search_string = self.getSettingValueByKey("search")
         if not self.getSettingValueByKey("is_regex"):
             search_string = re.escape(search_string) #Need to search for the actual string, not as a regex.
-        search_regex = re.compile(search_string)
-
-        replace_string = self.getSettingValueByKey("replace")
+        self._search_regex = re.compile(search_string)
 
-        for layer_number, layer in enumerate(data):
-            data[layer_number] = re.sub(search_regex, replace_string, layer) #Replace all.
+        self._replace_string = self.getSettingValueByKey("replace")
 
-        return data
\ No newline at end of file
+    def transformLayer(self, index, lines, gcode):
+        return re.sub(self._search_regex, self._replace_string, "\n".join(lines)).split("\n") #Replace all.
@@ -0,0 +1,61 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import pytest
+
+from ..GCodeLine import GCodeLine
+from ..Script import Script
+
+get_value_data = [
+    ("G1 X100 Y50", "X", 100),
+    ("G1 X100.5 Y50", "X", 100.5),
+    ("G1 X-3.2", "X", -3.2),
+    ("G1X10Y20", "Y", 20),  # Parameters without spaces between them.
+    ("G1 X10 ;Y20", "Y", None),  # In the comment.
+    ("G1 X", "X", None),  # No number.
+    ("M117 Hello", "E", None),
+    ("", "G", None),
+]
+
+
+@pytest.mark.parametrize("line, key, expected", get_value_data)
+def test_getValue(line, key, expected):
+    assert GCodeLine(line).getValue(key) == expected
+    assert Script().getValue(line, key) == expected
+
+
+def test_typedAccessors():
+    line = GCodeLine("G1 F1500 X10 E2.5")
+    assert line.getCommand() == "G1"
+    assert line.getInt("F") == 1500
+    assert isinstance(line.getFloat("X"), float)
+    assert line.getFloat("Z", 0.3) == 0.3
+    assert line.hasValue("E")
+    assert not line.hasValue("Y")
+
+
+def test_unmodifiedRoundTrip():
+    line = "G1  X10   Y20 ; Some   comment"
+    assert GCodeLine(line).toString() == line
+
+
+def test_setValue():
+    line = GCodeLine("G1 X10 Y20 ;comment")
+    line.setValue("Y", 25.5)
+    line.setValue("E", 3)
+    assert line.toString() == "G1 X10 Y25.5 E3 ;comment"
+    assert line.getValue("Y") == 25.5
+
+
+def test_removeValue():
+    line = GCodeLine("G1 F1500 X10 E2")
+    line.removeValue("F")
+    line.setComment(";travel")
+    assert line.toString() == "G1 X10 E2 ;travel"
+    assert line.getValue("F") is None
+
+
+def test_putValue():
+    script = Script()
+    assert script.putValue(G = 1, X = 100) == "G1 X100"
+    assert script.putValue("G1 X10 Y20 F300 ;comment", Y = 30) == "G1 F300 X10 Y30 ;comment"
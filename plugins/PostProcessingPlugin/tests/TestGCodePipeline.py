@@ -0,0 +1,265 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os.path
+import shutil
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from .. import GCodePipeline
+from ..GCodePipeline import ParsedGCode, executeScripts
+from ..PostProcessingPlugin import PostProcessingPlugin
+from ..Script import Script
+from ..scripts.ChangeAtZ import ChangeAtZ
+from ..scripts.ColorMix import ColorMix
+from ..scripts.DisplayFilenameAndLayerOnLCD import DisplayFilenameAndLayerOnLCD
+from ..scripts.PauseAtHeight import PauseAtHeight
+from ..scripts.RetractContinue import RetractContinue
+
+test_gcode = [
+    ";FLAVOR:Marlin\n;LAYER_COUNT:2\n",
+    "G28\nG1 Z5 F3000\n",
+    ";LAYER:0\nG0 F3000 X10 Y10 Z0.3\nG1 X20 E1\n",
+    ";LAYER:1\nG0 X10 Y10 Z0.5 ;Z0.9 is a comment\nG1 X20 E2\n",
+    "M104 S0\n"
+]
+
+
+class LowercaseLayerScript(Script):
+    def transformLayer(self, index, lines, gcode):
+        return [line.lower() for line in lines]
+
+
+class DuplicateExtrusionScript(Script):
+    def transformLine(self, line, index, gcode):
+        if line.startswith("G1 X"):
+            return [line, line]
+        if line.startswith("G28"):
+            return None
+        return line
+
+
+class NumberLayerScript(Script):
+    def isLayerIndependent(self):
+        return True
+
+    def prepareTransform(self, gcode):
+        self._layer_numbers = [gcode.getLayerNumber(index) for index in range(gcode.getLayerCount())]
+
+    def transformLayer(self, index, lines, gcode):
+        return lines + [";INDEX:{index} LAYER:{layer}".format(index = index, layer = self._layer_numbers[index])]
+
+
+class CountLayersScript(Script):
+    def prepareTransform(self, gcode):
+        self._count = 0
+
+    def getCarriedState(self):
+        return self._count
+
+    def setCarriedState(self, state):
+        self._count = state
+
+    def scanLayer(self, index, lines, gcode):
+        self._count += sum(1 for line in lines if line.startswith(";LAYER:"))
+
+    def transformLine(self, line, index, gcode):
+        if line.startswith(";LAYER:"):
+            self._count += 1
+            return [line, ";COUNT:{count}".format(count = self._count)]
+        return line
+
+
+class AppendLegacyScript(Script):
+    def execute(self, data):
+        return [layer + ";LEGACY\n" for layer in data]
+
+
+class BrokenScript(Script):
+    def transformLine(self, line, index, gcode):
+        raise ValueError("Broken script.")
+
+
+def test_layerLookup():
+    gcode = ParsedGCode(test_gcode)
+    assert gcode.getLayerCount() == 5
+    assert gcode.getLayerNumber(0) is None
+    assert gcode.getLayerNumber(3) == 1
+    assert gcode.getIndexOfLayer(0) == 2
+    assert gcode.getIndexOfLayer(5) is None
+
+
+def test_layerLookupAfterChange():
+    gcode = ParsedGCode(test_gcode)
+    assert gcode.getIndexOfLayer(1) == 3
+    gcode.setLines(2, [";LAYER:1", "G1 X20 E1"])
+    assert gcode.getLayerNumber(2) == 1
+    assert gcode.getIndexOfLayer(1) == 2
+    assert gcode.getIndexOfLayer(0) is None
+    gcode.setLayerString(2, ";LAYER:0\nG1 X20 E1\n")
+    assert gcode.getLayerNumber(2) == 0
+    assert gcode.getIndexOfLayer(1) == 3
+
+
+def test_zLookup():
+    gcode = ParsedGCode(test_gcode)
+    assert gcode.getLayerZ(0) is None
+    assert gcode.getLayerZ(1) == 5
+    assert gcode.getLayerZ(4) == 0.5  # Carried over from the layer before it.
+    assert gcode.getIndexAtZ(0.4) == 3
+    assert gcode.getIndexAtZ(1) is None
+
+
+def test_zLookupAfterChange():
+    gcode = ParsedGCode(test_gcode)
+    assert gcode.getIndexAtZ(0.4) == 3
+    gcode.setLines(2, [";LAYER:0", "G0 X10 Y10 Z0.4", "G1 X20 E1"])
+    assert gcode.getLayerZ(2) == 0.4
+    assert gcode.getIndexAtZ(0.4) == 2
+    gcode.setLayerString(3, ";LAYER:1\nG1 X20 E2\n")
+    assert gcode.getLayerZ(3) == 0.4
+
+
+def test_roundTrip():
+    assert ParsedGCode(test_gcode).toGCodeList() == test_gcode
+
+
+def test_supportsPipeline():
+    assert LowercaseLayerScript().supportsPipeline()
+    assert DuplicateExtrusionScript().supportsPipeline()
+    assert not AppendLegacyScript().supportsPipeline()
+
+
+def test_fusedEqualsSequential():
+    scripts = [DuplicateExtrusionScript(), LowercaseLayerScript(), AppendLegacyScript(), DuplicateExtrusionScript()]
+    sequential = list(test_gcode)
+    for script in scripts:
+        sequential = script.execute(sequential)  # Pipeline scripts still work on their own via the adapter.
+    assert executeScripts(scripts, list(test_gcode)) == sequential
+    assert sequential[2] == ";layer:0\ng0 f3000 x10 y10 z0.3\ng1 x20 e1\ng1 x20 e1\n;LEGACY\n"
+
+
+def test_brokenScriptIsSkipped():
+    result = executeScripts([BrokenScript(), DuplicateExtrusionScript()], list(test_gcode))
+    assert result == DuplicateExtrusionScript().execute(list(test_gcode))
+
+
+def test_isLayerIndependent():
+    assert NumberLayerScript().isLayerIndependent()
+    assert not DuplicateExtrusionScript().isLayerIndependent()
+
+
+def test_supportsCarriedState():
+    assert CountLayersScript().supportsCarriedState()
+    assert not NumberLayerScript().supportsCarriedState()
+
+
+def executeInParallel(scripts, gcode_list):
+    """Execute scripts in parallel, even on a single CPU, and check that they didn't fall back to executing serially."""
+    with patch("os.cpu_count", return_value = 2):
+        with patch.object(GCodePipeline, "Logger") as logger:
+            result = executeScripts(scripts, gcode_list, minimum_parallel_size = 0)
+    logger.logException.assert_not_called()
+    return result
+
+
+def test_parallelEqualsSerial():
+    large_gcode = test_gcode[:2] + [";LAYER:{layer_nr}\nG0 X10 Y10 Z{z}\nG1 X20 E{layer_nr}\n".format(layer_nr = layer_nr, z = layer_nr * 0.2) for layer_nr in range(500)]
+    scripts = [NumberLayerScript(), DuplicateExtrusionScript(), AppendLegacyScript(), CountLayersScript(), NumberLayerScript(), CountLayersScript()]
+    serial = executeScripts(scripts, list(large_gcode), minimum_parallel_size = len("".join(large_gcode)) + 1)
+    parallel = executeInParallel(scripts, list(large_gcode))
+    assert parallel == serial
+    assert serial[-1].count(";INDEX:501 LAYER:499") == 2
+    assert serial[-1].count(";COUNT:500") == 2  # The carried state was handed over to every chunk of layers.
+
+
+def createScript(script_class, settings):
+    script = script_class()
+    script._setting_values = settings  # Like in a worker process, without a stack.
+    return script
+
+
+def createPrintGCode():
+    gcode_list = [";FLAVOR:Marlin\n;Layer height: 0.2\n;LAYER_COUNT:400\n", "G28\nG92 E0\n"]
+    e = 0
+    for layer_nr in range(400):
+        lines = [";LAYER:{layer_nr}".format(layer_nr = layer_nr), "G0 F3000 X10 Y10 Z{z}".format(z = round((layer_nr + 1) * 0.2, 1)), "G1 F1500 E{e}".format(e = e)]
+        for move in range(5):
+            e += 1
+            lines.append("G1 X{x} Y{y} E{e}".format(x = 20 + move, y = 10 + layer_nr % 7, e = e))
+            lines.append("G1 F2700 E{e}".format(e = e - 5))  # Retract.
+            lines.append("G0 X{x} Y30".format(x = 10 + move))  # Travel.
+            lines.append("G0 X{x} Y40".format(x = 10 + move))
+            lines.append("G1 F2700 E{e}".format(e = e))  # Unretract.
+        if layer_nr % 3 == 0:  # Travel at the end of the layer, after retracting.
+            lines.append("G1 F2700 E{e}".format(e = e - 5))
+            lines.append("G0 X5 Y5")
+        gcode_list.append("\n".join(lines) + "\n")
+    gcode_list.append("M104 S0\n")
+    return gcode_list
+
+
+@pytest.mark.parametrize("script_class, settings", [
+    (DisplayFilenameAndLayerOnLCD, {"name": "test", "scroll": False, "startNum": 1, "maxlayer": True}),
+    (RetractContinue, {"extra_retraction_speed": 0.05}),
+    (ColorMix, {"units_of_measurement": "layer", "object_number": 0, "start_height": 10, "behavior": "blend_value", "finish_height": 300, "mix_start": 100, "mix_finish": 0})
+])
+def test_scriptsParallelEqualsSerial(script_class, settings):
+    gcode_list = createPrintGCode()
+    serial = executeScripts([createScript(script_class, settings)], list(gcode_list), minimum_parallel_size = len("".join(gcode_list)) + 1)
+    assert serial != gcode_list
+    assert executeInParallel([createScript(script_class, settings)], list(gcode_list)) == serial
+
+
+def test_loadedScriptParallelEqualsSerial(tmp_path):
+    """Scripts that the plug-in loaded from a folder can be sent to the worker processes too."""
+    shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts", "RetractContinue.py"), str(tmp_path))
+    with patch("UM.Application.Application.getInstance"), patch("cura.CuraApplication.CuraApplication.getInstance"):
+        plugin = PostProcessingPlugin()
+    with patch.dict(sys.modules), patch("cura.ApplicationMetadata.IsEnterpriseVersion", False):
+        plugin.loadScripts(str(tmp_path))
+        script_class = plugin._loaded_scripts["RetractContinue"]
+        assert script_class is not RetractContinue  # Not the one imported by the tests.
+
+        gcode_list = createPrintGCode()
+        settings = {"extra_retraction_speed": 0.05}
+        serial = executeScripts([createScript(script_class, settings)], list(gcode_list), minimum_parallel_size = len("".join(gcode_list)) + 1)
+        assert executeInParallel([createScript(script_class, settings)], list(gcode_list)) == serial
+
+
+def test_colorMix():
+    script = createScript(ColorMix, {"units_of_measurement": "mm", "object_number": 0, "start_height": 0.4, "behavior": "fixed_value", "finish_height": 0, "mix_start": 25, "mix_finish": 0})
+    gcode_list = test_gcode[:2] + [";LAYER:{layer_nr}\n\nG1 X20 E{layer_nr}\n".format(layer_nr = layer_nr) for layer_nr in range(4)]
+    result = script.execute(list(gcode_list))
+    assert result[3] == ";LAYER:1\nG1 X20 E1\n"  # Blank lines are left out.
+    assert result[4] == ";LAYER:2\nM163 S0 P0.25\nM163 S1 P0.75\nM164 S2\nT2\nG1 X20 E2\n"
+    assert script.execute(list(result)) == result  # The old mixing commands are replaced.
+
+
+def test_changeAtZ():
+    script = createScript(ChangeAtZ, {"caz_enabled": True, "a_trigger": "height", "b_targetZ": 5.0, "c_behavior": "single_layer", "caz_output_to_display": False, "caz_retractstyle": "linear", "h1_Change_bedTemp": True, "h2_bedTemp": 50})
+    assert script.supportsPipeline()
+    result = script.execute(createPrintGCode())
+    changed_layers = [layer for layer in result if "M140 S50" in layer]
+    assert len(changed_layers) == 1
+    assert ";LAYER:24\n" in changed_layers[0]  # At Z 5.0.
+
+
+@pytest.mark.parametrize("pause_at", ["height", "layer_no"])
+def test_pauseAtHeight(pause_at):
+    script = createScript(PauseAtHeight, {"pause_at": pause_at, "pause_height": 5.0, "pause_layer": 24, "pause_method": "marlin", "disarm_timeout": 0, "head_park_enabled": True, "head_park_x": 190, "head_park_y": 190, "head_move_z": 15, "retraction_amount": 1, "retraction_speed": 25, "extrude_amount": 0, "extrude_speed": 3.3, "redo_layer": False, "standby_temperature": 0, "display_text": "", "custom_gcode_before_pause": "", "custom_gcode_after_pause": ""})
+    assert script.supportsPipeline()
+    global_stack = MagicMock()
+    global_stack.getProperty = lambda key, property_name: {"machine_firmware_retract": False, "machine_nozzle_temp_enabled": False, "layer_height_0": 0.2, "relative_extrusion": False}[key]
+    with patch(PauseAtHeight.__module__ + ".Application") as application:
+        application.getInstance.return_value.getGlobalContainerStack.return_value = global_stack
+        gcode_list = createPrintGCode()
+        result = executeScripts([script, DuplicateExtrusionScript()], list(gcode_list))
+
+    paused_layers = [index for index, layer in enumerate(result) if "M0 ; Do the actual pause" in layer]
+    assert paused_layers == [2 + 24]  # Only once, before layer 24.
+    assert result[2 + 24].endswith(DuplicateExtrusionScript().execute(gcode_list)[2 + 24])
+    assert "G1 F9000 X14 Y40\nG1 F300 Z" in result[2 + 24]  # Back to where the previous layer ended.
+    assert "G92 E120\n;LAYER:24" in result[2 + 24]
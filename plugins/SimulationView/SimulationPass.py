@@ -63,6 +63,7 @@ class SimulationPass(RenderPass):
             self._current_shader = self._layer_shader
         # Use extruder 0 if the extruder manager reports extruder index -1 (for single extrusion printers)
         self._layer_shader.setUniformValue("u_active_extruder", float(max(0, self._extruder_manager.activeExtruderIndex)))
+        self._layer_shader.setUniformValue("u_brightness", 1.0)
         if not self._compatibility_mode:
             self._layer_shader.setUniformValue("u_starts_color", Color(*Application.getInstance().getTheme().getColor("layerview_starts").getRgb()))
 
@@ -199,11 +200,12 @@ class SimulationPass(RenderPass):
                 # Create a new batch that is not range-limited
                 batch = RenderBatch(self._layer_shader, type = RenderBatch.RenderType.Solid)
 
-                if self._layer_view.getCurrentLayerMesh():
-                    batch.addItem(node.getWorldTransformation(), self._layer_view.getCurrentLayerMesh())
+                # The meshes of the layers are cached, so the lower layers are darkened by the shader instead of in the meshes.
+                for layer_mesh, brightness in self._layer_view.getCurrentLayerMeshes():
+                    batch.addItem(node.getWorldTransformation(), layer_mesh, uniforms = {"brightness": brightness})
 
                 if self._layer_view.getCurrentLayerJumps():
-                    batch.addItem(node.getWorldTransformation(), self._layer_view.getCurrentLayerJumps())
+                    batch.addItem(node.getWorldTransformation(), self._layer_view.getCurrentLayerJumps(), uniforms = {"brightness": 1.0})
 
                 if len(batch.items) > 0:
                     batch.render(self._scene.getActiveCamera())
@@ -2,6 +2,9 @@
 # Cura is released under the terms of the LGPLv3 or higher.
 
 import sys
+import threading
+import weakref
+from collections import OrderedDict
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QOpenGLContext
@@ -13,7 +16,7 @@ from UM.Job import Job
 from UM.Logger import Logger
 from UM.Math.Color import Color
 from UM.Math.Matrix import Matrix
-from UM.Mesh.MeshBuilder import MeshBuilder
+from UM.Mesh.MeshData import MeshData
 from UM.Message import Message
 from UM.Platform import Platform
 from UM.PluginRegistry import PluginRegistry
@@ -37,15 +40,15 @@ from cura.CuraApplication import CuraApplication
 from .NozzleNode import NozzleNode
 from .SimulationPass import SimulationPass
 from .SimulationViewProxy import SimulationViewProxy
-import numpy
 import os.path
 
-from typing import Optional, TYPE_CHECKING, List, cast
+from typing import Dict, Optional, TYPE_CHECKING, List, Tuple, cast
 
 if TYPE_CHECKING:
     from UM.Scene.SceneNode import SceneNode
     from UM.Scene.Scene import Scene
     from UM.Settings.ContainerStack import ContainerStack
+    from cura.LayerData import LayerData
 
 catalog = i18nCatalog("cura")
 
@@ -67,9 +70,11 @@ class SimulationView(CuraView):
         self._max_layers = 0
         self._current_layer_num = 0
         self._minimum_layer_num = 0
-        self._current_layer_mesh = None
-        self._current_layer_jumps = None
+        self._current_layer_meshes = []  # type: List[Tuple[MeshData, float]] # The meshes of the top layers, with the brightness to draw them with.
+        self._current_layer_jumps = None  # type: Optional[MeshData]
         self._top_layers_job = None  # type: Optional["_CreateTopLayersJob"]
+        self._prefetch_layers_job = None  # type: Optional["_PrefetchLayerMeshesJob"]
+        self._layer_mesh_cache = _LayerMeshCache()
         self._activity = False
         self._old_max_layers = 0
 
@@ -228,8 +233,9 @@ class SimulationView(CuraView):
         self._simulation_running = running
 
     def resetLayerData(self) -> None:
-        self._current_layer_mesh = None
+        self._current_layer_meshes = []
         self._current_layer_jumps = None
+        self._layer_mesh_cache.clear()
 
     def beginRendering(self) -> None:
         scene = self.getController().getScene()
@@ -521,33 +527,26 @@ class SimulationView(CuraView):
             if not layer_data:
                 continue
 
-            for layer_index in layer_data.getLayers():
-                for polyline in layer_data.getLayer(layer_index).polygons:
-                    is_visible = numpy.isin(polyline.types, visible_line_types)
-                    visible_indices = numpy.where(is_visible)[0]
-                    visible_indicies_with_extrusion = numpy.where(numpy.isin(polyline.types, visible_line_types_with_extrusion))[0]
-                    if visible_indices.size == 0:  # No items to take maximum or minimum of.
-                        continue
-                    visible_feedrates = numpy.take(polyline.lineFeedrates, visible_indices)
-                    visible_feedrates_with_extrusion = numpy.take(polyline.lineFeedrates, visible_indicies_with_extrusion)
-                    visible_linewidths = numpy.take(polyline.lineWidths, visible_indices)
-                    visible_linewidths_with_extrusion = numpy.take(polyline.lineWidths, visible_indicies_with_extrusion)
-                    visible_thicknesses = numpy.take(polyline.lineThicknesses, visible_indices)
-                    visible_thicknesses_with_extrusion = numpy.take(polyline.lineThicknesses, visible_indicies_with_extrusion)
-                    self._max_feedrate = max(float(visible_feedrates.max()), self._max_feedrate)
-                    if visible_feedrates_with_extrusion.size != 0:
-                        flow_rates = visible_feedrates_with_extrusion * visible_linewidths_with_extrusion * visible_thicknesses_with_extrusion
-                        self._min_flow_rate = min(float(flow_rates.min()), self._min_flow_rate)
-                        self._max_flow_rate = max(float(flow_rates.max()), self._max_flow_rate)
-                    self._min_feedrate = min(float(visible_feedrates.min()), self._min_feedrate)
-                    self._max_line_width = max(float(visible_linewidths.max()), self._max_line_width)
-                    self._min_line_width = min(float(visible_linewidths.min()), self._min_line_width)
-                    self._max_thickness = max(float(visible_thicknesses.max()), self._max_thickness)
-                    try:
-                        self._min_thickness = min(float(visible_thicknesses[numpy.nonzero(visible_thicknesses)].min()), self._min_thickness)
-                    except ValueError:
-                        # Sometimes, when importing a GCode the line thicknesses are zero and so the minimum (avoiding the zero) can't be calculated.
-                        Logger.log("w", "Min thickness can't be calculated because all the values are zero")
+            # The limits per line type are computed when the layer data is built, so only combine those here.
+            statistics = layer_data.getLineTypeStatistics()
+            used_line_types = statistics.getUsedLineTypes(visible_line_types)
+            if not used_line_types:  # No items to take maximum or minimum of.
+                continue
+            used_line_types_with_extrusion = statistics.getUsedLineTypes(visible_line_types_with_extrusion)
+            self._max_feedrate = max(float(statistics.max_feedrates[used_line_types].max()), self._max_feedrate)
+            if used_line_types_with_extrusion:
+                self._min_flow_rate = min(float(statistics.min_flow_rates[used_line_types_with_extrusion].min()), self._min_flow_rate)
+                self._max_flow_rate = max(float(statistics.max_flow_rates[used_line_types_with_extrusion].max()), self._max_flow_rate)
+            self._min_feedrate = min(float(statistics.min_feedrates[used_line_types].min()), self._min_feedrate)
+            self._max_line_width = max(float(statistics.max_line_widths[used_line_types].max()), self._max_line_width)
+            self._min_line_width = min(float(statistics.min_line_widths[used_line_types].min()), self._min_line_width)
+            self._max_thickness = max(float(statistics.max_thicknesses[used_line_types].max()), self._max_thickness)
+            min_thickness = float(statistics.min_thicknesses[used_line_types].min())
+            if min_thickness != float("inf"):
+                self._min_thickness = min(min_thickness, self._min_thickness)
+            else:
+                # Sometimes, when importing a GCode the line thicknesses are zero and so the minimum (avoiding the zero) can't be calculated.
+                Logger.log("w", "Min thickness can't be calculated because all the values are zero")
 
         if old_min_feedrate != self._min_feedrate or old_max_feedrate != self._max_feedrate \
                 or old_min_linewidth != self._min_line_width or old_max_linewidth != self._max_line_width \
@@ -691,8 +690,10 @@ class SimulationView(CuraView):
 
         return False
 
-    def getCurrentLayerMesh(self):
-        return self._current_layer_mesh
+    def getCurrentLayerMeshes(self) -> List[Tuple[MeshData, float]]:
+        """Get the meshes of the top layers in compatibility mode, with the brightness to draw each of them with."""
+
+        return self._current_layer_meshes
 
     def getCurrentLayerJumps(self):
         return self._current_layer_jumps
@@ -727,10 +728,13 @@ class SimulationView(CuraView):
         if self._top_layers_job:
             self._top_layers_job.finished.disconnect(self._updateCurrentLayerMesh)
             self._top_layers_job.cancel()
+        if self._prefetch_layers_job:
+            self._prefetch_layers_job.cancel()
+            self._prefetch_layers_job = None
 
         self.setBusy(True)
 
-        self._top_layers_job = _CreateTopLayersJob(self._controller.getScene(), self._current_layer_num, self._solid_layers)
+        self._top_layers_job = _CreateTopLayersJob(self._controller.getScene(), self._current_layer_num, self._solid_layers, self._layer_mesh_cache)
         self._top_layers_job.finished.connect(self._updateCurrentLayerMesh)  # type: ignore  # mypy doesn't understand the whole private class thing that's going on here.
         self._top_layers_job.start()  # type: ignore
 
@@ -739,14 +743,22 @@ class SimulationView(CuraView):
 
         if not job.getResult():
             return
-        self.resetLayerData()  # Reset the layer data only when job is done. Doing it now prevents "blinking" data.
-        self._current_layer_mesh = job.getResult().get("layers")
-        if self._show_travel_moves:
-            self._current_layer_jumps = job.getResult().get("jumps")
+        # Replace the layer meshes only when job is done. Doing it earlier causes "blinking" data.
+        self._current_layer_meshes = job.getResult().get("layers")
+        self._current_layer_jumps = job.getResult().get("jumps") if self._show_travel_moves else None
         self._controller.getScene().sceneChanged.emit(self._controller.getScene().getRoot())
 
         self._top_layers_job = None
 
+        # Build the layers that the slider is likely to move to next, while the user is looking at these.
+        layer_numbers = []  # type: List[int]
+        for distance in range(1, _PrefetchLayerMeshesJob.PREFETCH_LAYER_COUNT + 1):
+            layer_numbers.append(self._current_layer_num + distance)  # The new top layer when moving up.
+            layer_numbers.append(self._current_layer_num - self._solid_layers - distance + 1)  # The new bottom layer when moving down.
+            layer_numbers.append(self._current_layer_num - distance)  # For the jumps when moving down.
+        self._prefetch_layers_job = _PrefetchLayerMeshesJob(self._controller.getScene(), [layer_number for layer_number in layer_numbers if layer_number >= 0], self._layer_mesh_cache)
+        self._prefetch_layers_job.start()
+
     def _updateWithPreferences(self) -> None:
         self._solid_layers = int(Application.getInstance().getPreferences().getValue("view/top_layer_count"))
         self._only_show_top_layers = bool(Application.getInstance().getPreferences().getValue("view/only_show_top_layers"))
@@ -798,48 +810,120 @@ class SimulationView(CuraView):
     def _onDontAskMeAgain(self, checked: bool) -> None:
         CuraApplication.getInstance().getPreferences().setValue(self._no_layers_warning_preference, not checked)
 
+def _findLayerData(scene: "Scene") -> Optional["LayerData"]:
+    for node in DepthFirstIterator(scene.getRoot()):  # type: ignore
+        layer_data = node.callDecoration("getLayerData")
+        if layer_data:
+            return layer_data
+    return None
+
+
+class _LayerMeshCache:
+    """Bounded cache of the meshes of single layers and their travel moves, as shown in compatibility mode.
+
+    Moving the layer slider mostly shows layers that were shown just before, so their meshes are kept. The least
+    recently used meshes are evicted when they take more memory than the maximum together. All meshes are evicted when
+    the layer data changes. The layer data itself is not kept alive by the cache.
+    """
+
+    MAX_SIZE = 256 * 1024 * 1024  # In bytes.
+
+    def __init__(self) -> None:
+        self._layer_data = None  # type: Optional[weakref.ReferenceType] # The layer data that the meshes are of.
+        self._meshes = OrderedDict()  # type: OrderedDict[Tuple[int, bool], Optional[MeshData]]
+        self._sizes = {}  # type: Dict[Tuple[int, bool], int]
+        self._total_size = 0
+        self._lock = threading.Lock()  # The meshes are built by jobs on different threads.
+
+    def getMesh(self, layer_data: "LayerData", layer_number: int, jumps: bool) -> Optional[MeshData]:
+        """Get the mesh of a layer, building it if it is not in the cache.
+
+        :param layer_data: The layer data that the layer is in.
+        :param layer_number: The number of the layer.
+        :param jumps: Whether to get the travel moves of the layer instead of the lines.
+        :return: The mesh, or None if the layer has nothing to show.
+        """
+        key = (layer_number, jumps)
+        with self._lock:
+            if not self._isOf(layer_data):
+                self._clear()
+                self._layer_data = weakref.ref(layer_data)
+            elif key in self._meshes:
+                self._meshes.move_to_end(key)
+                return self._meshes[key]
+
+        layer = layer_data.getLayer(layer_number)
+        if layer is None:
+            return None
+        mesh = layer.createJumps() if jumps else layer.createMesh()  # type: Optional[MeshData]
+        if mesh is None or mesh.getVertices() is None:
+            mesh = None
+
+        with self._lock:
+            if not self._isOf(layer_data) or key in self._meshes:  # Changed while building the mesh.
+                return mesh
+            size = 0
+            if mesh is not None:
+                size = sum(data.nbytes for data in (mesh.getVertices(), mesh.getColors(), mesh.getIndices()) if data is not None)
+            self._meshes[key] = mesh
+            self._sizes[key] = size
+            self._total_size += size
+            while self._total_size > self.MAX_SIZE and len(self._meshes) > 1:
+                evicted_key, _ = self._meshes.popitem(last = False)
+                self._total_size -= self._sizes.pop(evicted_key)
+        return mesh
+
+    def clear(self) -> None:
+        """Evict all meshes, e.g. when the layer data is replaced or removed."""
+
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._layer_data = None
+        self._meshes.clear()
+        self._sizes.clear()
+        self._total_size = 0
+
+    def _isOf(self, layer_data: "LayerData") -> bool:
+        """Whether the meshes in the cache are of the given layer data."""
+
+        return self._layer_data is not None and self._layer_data() is layer_data
+
+
 class _CreateTopLayersJob(Job):
-    def __init__(self, scene: "Scene", layer_number: int, solid_layers: int) -> None:
+    def __init__(self, scene: "Scene", layer_number: int, solid_layers: int, layer_mesh_cache: _LayerMeshCache) -> None:
         super().__init__()
 
         self._scene = scene
         self._layer_number = layer_number
         self._solid_layers = solid_layers
+        self._layer_mesh_cache = layer_mesh_cache
         self._cancel = False
 
     def run(self) -> None:
-        layer_data = None
-        for node in DepthFirstIterator(self._scene.getRoot()):  # type: ignore
-            layer_data = node.callDecoration("getLayerData")
-            if layer_data:
-                break
-
+        layer_data = _findLayerData(self._scene)
         if self._cancel or not layer_data:
             return
 
-        layer_mesh = MeshBuilder()
+        layer_meshes = []  # type: List[Tuple[MeshData, float]]
         for i in range(self._solid_layers):
             layer_number = self._layer_number - i
             if layer_number < 0:
                 continue
 
             try:
-                layer = layer_data.getLayer(layer_number).createMesh()
+                layer_mesh = self._layer_mesh_cache.getMesh(layer_data, layer_number, jumps = False)
             except Exception:
                 Logger.logException("w", "An exception occurred while creating layer mesh.")
                 return
 
-            if not layer or layer.getVertices() is None:
+            if layer_mesh is None:
                 continue
 
-            layer_mesh.addIndices(layer_mesh.getVertexCount() + layer.getIndices())
-            layer_mesh.addVertices(layer.getVertices())
-
             # Scale layer color by a brightness factor based on the current layer number
             # This will result in a range of 0.5 - 1.0 to multiply colors by.
-            brightness = numpy.ones((1, 4), dtype=numpy.float32) * (2.0 - (i / self._solid_layers)) / 2.0
-            brightness[0, 3] = 1.0
-            layer_mesh.addColors(layer.getColors() * brightness)
+            layer_meshes.append((layer_mesh, (2.0 - (i / self._solid_layers)) / 2.0))
 
             if self._cancel:
                 return
@@ -850,11 +934,44 @@ class _CreateTopLayersJob(Job):
             return
 
         Job.yieldThread()
-        jump_mesh = layer_data.getLayer(self._layer_number).createJumps()
-        if not jump_mesh or jump_mesh.getVertices() is None:
-            jump_mesh = None
+        jump_mesh = self._layer_mesh_cache.getMesh(layer_data, self._layer_number, jumps = True)
+
+        self.setResult({"layers": layer_meshes, "jumps": jump_mesh})
 
-        self.setResult({"layers": layer_mesh.build(), "jumps": jump_mesh})
+    def cancel(self) -> None:
+        self._cancel = True
+        super().cancel()
+
+
+class _PrefetchLayerMeshesJob(Job):
+    """Builds the meshes of layers in the background, so that they are in the cache when they are shown."""
+
+    # The number of layers above and below the current layer to build.
+    PREFETCH_LAYER_COUNT = 3
+
+    def __init__(self, scene: "Scene", layer_numbers: List[int], layer_mesh_cache: _LayerMeshCache) -> None:
+        super().__init__()
+
+        self._scene = scene
+        self._layer_numbers = layer_numbers
+        self._layer_mesh_cache = layer_mesh_cache
+        self._cancel = False
+
+    def run(self) -> None:
+        layer_data = _findLayerData(self._scene)
+        if not layer_data:
+            return
+
+        for layer_number in self._layer_numbers:
+            if self._cancel:
+                return
+            try:
+                self._layer_mesh_cache.getMesh(layer_data, layer_number, jumps = False)
+                self._layer_mesh_cache.getMesh(layer_data, layer_number, jumps = True)
+            except Exception:
+                Logger.logException("w", "An exception occurred while creating layer mesh.")
+                return
+            Job.yieldThread()
 
     def cancel(self) -> None:
         self._cancel = True
@@ -6,6 +6,7 @@ vertex =
 
     uniform lowp float u_active_extruder;
     uniform lowp float u_shade_factor;
+    uniform lowp float u_brightness;
     uniform highp int u_layer_view_type;
 
     attribute highp float a_extruder;
@@ -21,7 +22,7 @@ vertex =
     {
         gl_Position = u_projectionMatrix * u_viewMatrix * u_modelMatrix * a_vertex;
         // shade the color depending on the extruder index
-        v_color = a_color;
+        v_color = vec4(a_color.rgb * u_brightness, a_color.a);
         // 8 and 9 are travel moves
         if ((a_line_type != 8.0) && (a_line_type != 9.0)) {
             v_color = (a_extruder == u_active_extruder) ? v_color : vec4(u_shade_factor * v_color.rgb, v_color.a);
@@ -85,6 +86,7 @@ vertex41core =
 
     uniform lowp float u_active_extruder;
     uniform lowp float u_shade_factor;
+    uniform lowp float u_brightness;
     uniform highp int u_layer_view_type;
 
     in highp float a_extruder;
@@ -99,7 +101,7 @@ vertex41core =
     void main()
     {
         gl_Position = u_projectionMatrix * u_viewMatrix * u_modelMatrix * a_vertex;
-        v_color = a_color;
+        v_color = vec4(a_color.rgb * u_brightness, a_color.a);
         if ((a_line_type != 8) && (a_line_type != 9)) {
             v_color = (a_extruder == u_active_extruder) ? v_color : vec4(u_shade_factor * v_color.rgb, v_color.a);
         }
@@ -151,6 +153,7 @@ fragment41core =
 [defaults]
 u_active_extruder = 0.0
 u_shade_factor = 0.60
+u_brightness = 1.0
 u_layer_view_type = 0
 u_extruder_opacity = [[1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0]]
 
@@ -163,6 +166,7 @@ u_show_infill = 1
 u_modelMatrix = model_matrix
 u_viewMatrix = view_matrix
 u_projectionMatrix = projection_matrix
+u_brightness = brightness
 
 [attributes]
 a_vertex = vertex
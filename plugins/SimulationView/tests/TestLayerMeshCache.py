@@ -0,0 +1,112 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import gc
+import weakref
+from unittest.mock import MagicMock, patch
+
+import numpy
+
+from .. import SimulationView as simulation_view_module
+from ..SimulationView import _CreateTopLayersJob, _LayerMeshCache
+
+
+class FakeMesh:
+    """A mesh of 100 vertices, taking 1200 bytes."""
+
+    def getVertices(self):
+        return numpy.zeros((100, 3), dtype = numpy.float32)
+
+    def getColors(self):
+        return None
+
+    def getIndices(self):
+        return None
+
+
+class FakeLayer:
+    def __init__(self, layer_data: "FakeLayerData") -> None:
+        self._layer_data = layer_data
+
+    def createMesh(self):
+        self._layer_data.build_count += 1
+        return FakeMesh()
+
+    def createJumps(self):
+        self._layer_data.build_count += 1
+        return FakeMesh()
+
+
+class FakeLayerData:
+    """Layer data with ten layers, counting how often the mesh of a layer is built."""
+
+    def __init__(self) -> None:
+        self.build_count = 0
+
+    def getLayer(self, layer_number: int):
+        return FakeLayer(self) if 0 <= layer_number < 10 else None
+
+
+def test_getMeshCached():
+    cache = _LayerMeshCache()
+    layer_data = FakeLayerData()
+
+    mesh = cache.getMesh(layer_data, 3, jumps = False)
+    assert cache.getMesh(layer_data, 3, jumps = False) is mesh
+    assert cache.getMesh(layer_data, 3, jumps = True) is not mesh  # The jumps are a different mesh.
+    assert cache.getMesh(layer_data, 42, jumps = False) is None  # There is no such layer.
+    assert layer_data.build_count == 2
+
+
+def test_evictLeastRecentlyUsed():
+    cache = _LayerMeshCache()
+    layer_data = FakeLayerData()
+
+    with patch.object(_LayerMeshCache, "MAX_SIZE", 3 * 1200):
+        first_mesh = cache.getMesh(layer_data, 0, jumps = False)
+        cache.getMesh(layer_data, 1, jumps = False)
+        cache.getMesh(layer_data, 2, jumps = False)
+        assert cache.getMesh(layer_data, 0, jumps = False) is first_mesh  # Now layer 1 is the least recently used.
+        cache.getMesh(layer_data, 3, jumps = False)
+        assert layer_data.build_count == 4
+
+        assert cache.getMesh(layer_data, 0, jumps = False) is first_mesh
+        cache.getMesh(layer_data, 1, jumps = False)  # Was evicted, so it's built again.
+        assert layer_data.build_count == 5
+
+
+def test_resetOnNewLayerData():
+    cache = _LayerMeshCache()
+    old_layer_data = FakeLayerData()
+    old_mesh = cache.getMesh(old_layer_data, 0, jumps = False)
+
+    new_layer_data = FakeLayerData()
+    assert cache.getMesh(new_layer_data, 0, jumps = False) is not old_mesh
+    assert new_layer_data.build_count == 1
+
+    cache.clear()
+    cache.getMesh(new_layer_data, 0, jumps = False)
+    assert new_layer_data.build_count == 2
+
+
+def test_layerDataNotKeptAlive():
+    cache = _LayerMeshCache()
+    layer_data = FakeLayerData()
+    cache.getMesh(layer_data, 0, jumps = False)
+
+    layer_data_reference = weakref.ref(layer_data)
+    del layer_data
+    gc.collect()
+    assert layer_data_reference() is None
+
+
+def test_topLayersBrightness():
+    layer_data = FakeLayerData()
+    job = _CreateTopLayersJob(MagicMock(), layer_number = 5, solid_layers = 4, layer_mesh_cache = _LayerMeshCache())
+
+    with patch.object(simulation_view_module, "_findLayerData", MagicMock(return_value = layer_data)):
+        job.run()
+
+    # The top layer is shown at full brightness, the layers below it darker. The jumps are of the top layer only.
+    assert [brightness for _, brightness in job.getResult()["layers"]] == [1.0, 0.875, 0.75, 0.625]
+    assert job.getResult()["jumps"] is not None
@@ -138,23 +138,10 @@ class TrimeshReader(MeshReader):
         tri_faces = tri_node.faces
         tri_vertices = tri_node.vertices
 
-        indices_list = []
-        vertices_list = []
-
-        index_count = 0
-        face_count = 0
-        for tri_face in tri_faces:
-            face = []
-            for tri_index in tri_face:
-                vertices_list.append(tri_vertices[tri_index])
-                face.append(index_count)
-                index_count += 1
-            indices_list.append(face)
-            face_count += 1
-
-        vertices = numpy.asarray(vertices_list, dtype = numpy.float32)
-        indices = numpy.asarray(indices_list, dtype = numpy.int32)
-        normals = calculateNormalsFromIndexedVertices(vertices, indices, face_count)
+        # Every face gets its own three vertices, in order.
+        vertices = numpy.asarray(tri_vertices, dtype = numpy.float32)[tri_faces].reshape((-1, 3))
+        indices = numpy.arange(len(vertices), dtype = numpy.int32).reshape((-1, 3))
+        normals = calculateNormalsFromIndexedVertices(vertices, indices, len(indices))
 
         mesh_data = MeshData(vertices = vertices, indices = indices, normals = normals, file_name = file_name)
         return mesh_data
@@ -1,7 +1,7 @@
 # Copyright (c) 2019 Ultimaker
 # Cura is released under the terms of the LGPLv3 or higher.
 
-from . import TrimeshReader
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
 
 from UM.i18n import i18nCatalog
 i18n_catalog = i18nCatalog("uranium")
@@ -43,4 +43,5 @@ def getMetaData():
     }
 
 def register(app):
-    return {"mesh_reader": TrimeshReader.TrimeshReader()}
+    # The reader is only imported when a file is read with it, to start the application faster.
+    return {"mesh_reader": LazyMeshReader(__name__ + ".TrimeshReader", "TrimeshReader", [".dae", ".gltf", ".glb", ".ply", ".zae"])}
@@ -1,12 +1,12 @@
 # Copyright (c) 2022 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 import json
-from typing import cast, List, Dict
+from typing import BinaryIO, cast, List, Dict
 
 from Charon.VirtualFile import VirtualFile  # To open UFP files.
 from Charon.OpenMode import OpenMode  # To indicate that we want to write to UFP files.
 from Charon.filetypes.OpenPackagingConvention import OPCError
-from io import StringIO  # For converting g-code to bytes.
+from io import StringIO, TextIOWrapper  # For converting g-code to bytes.
 
 from PyQt6.QtCore import QBuffer
 
@@ -63,15 +63,12 @@ class UFPWriter(MeshWriter):
             self.setInformation(error_msg)
             Logger.error(error_msg)
             return False
-        gcode_textio = StringIO()  # We have to convert the g-code into bytes.
         gcode_writer = cast(MeshWriter, PluginRegistry.getInstance().getPluginObject("GCodeWriter"))
-        success = gcode_writer.write(gcode_textio, None)
-        if not success:  # Writing the g-code failed. Then I can also not write the gzipped g-code.
-            self.setInformation(gcode_writer.getInformation())
-            return False
         try:
-            gcode = archive.getStream("/3D/model.gcode")
-            gcode.write(gcode_textio.getvalue().encode("UTF-8"))
+            success = self._writeGCode(gcode_writer, archive.getStream("/3D/model.gcode"))
+            if not success:  # Writing the g-code failed. Then I can also not write the UFP file.
+                self.setInformation(gcode_writer.getInformation())
+                return False
             archive.addRelation(virtual_path = "/3D/model.gcode",
                                 relation_type = "http://schemas.ultimaker.org/package/2018/relationships/gcode")
         except EnvironmentError as e:
@@ -181,6 +178,21 @@ class UFPWriter(MeshWriter):
             return False
         return True
 
+    @staticmethod
+    def _writeGCode(gcode_writer: MeshWriter, stream: BinaryIO) -> bool:
+        """Let the g-code writer write straight into a stream of the archive.
+
+        This way only one chunk of g-code is encoded at a time, instead of the whole g-code.
+        :param gcode_writer: The writer to write the g-code with.
+        :param stream: The binary stream to write the g-code to. It's left open.
+        :return: Whether writing the g-code succeeded.
+        """
+        gcode_textio = TextIOWrapper(stream, encoding = "UTF-8", newline = "", write_through = True)
+        try:
+            return gcode_writer.write(gcode_textio, None)
+        finally:  # Also if writing the g-code fails with an exception.
+            gcode_textio.detach()  # Don't close the archive stream along with the text wrapper.
+
     @staticmethod
     def _writeObjectList(archive):
         """Write a json list of object names to the METADATA_OBJECTS_PATH metadata field
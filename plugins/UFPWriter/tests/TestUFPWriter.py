@@ -0,0 +1,47 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import io
+import tracemalloc
+
+import pytest
+
+from tests.FakeGCodeWriter import CHUNK_SIZE, CountingStream, FailingGCodeWriter, FakeGCodeWriter, createLargeGCodeList
+
+pytest.importorskip("Charon")  # The UFP writer can't be used without libCharon.
+from ..UFPWriter import UFPWriter
+
+
+def test_writeGCode():
+    gcode_list = [";FLAVOR:Marlin\n", ";LAYER:0\nG1 X10 Y10 E1 ;Ünicode comment\r\n", ";LAYER:1\nG1 X20 Y20 E2\n"]
+    stream = io.BytesIO()
+
+    assert UFPWriter._writeGCode(FakeGCodeWriter(gcode_list), stream)
+    assert not stream.closed  # The rest of the archive still needs to be written.
+    assert stream.getvalue().decode("utf-8") == "".join(gcode_list)
+
+
+def test_writeGCodeFailure():
+    gcode_writer = FailingGCodeWriter([";FLAVOR:Marlin\n"])
+    stream = io.BytesIO()
+    with pytest.raises(OSError):
+        UFPWriter._writeGCode(gcode_writer, stream)
+
+    with pytest.raises(ValueError):
+        gcode_writer.stream.write("")  # The text wrapper was detached, so it won't close the archive stream later on.
+    assert not stream.closed
+
+
+def test_writeGCodeMemory():
+    gcode_list = createLargeGCodeList()
+    stream = CountingStream()
+
+    tracemalloc.start()
+    try:
+        assert UFPWriter._writeGCode(FakeGCodeWriter(gcode_list), stream)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stream.size == sum(len(gcode) for gcode in gcode_list)
+    assert peak < 8 * CHUNK_SIZE  # Only about one chunk at a time is encoded, never the whole g-code.
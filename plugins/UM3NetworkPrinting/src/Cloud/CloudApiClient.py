@@ -60,6 +60,10 @@ class CloudApiClient:
         self._on_error = on_error
         self._upload: Optional[ToolPathUploader] = None
 
+        # The conditional request headers for each polled URL, built from the ETag and Last-Modified headers of the
+        # last successful response, so that the cloud can respond with 304 Not Modified if nothing changed.
+        self._validators: Dict[str, Dict[str, str]] = {}
+
     @property
     def account(self) -> Account:
         """Gets the account used for the API."""
@@ -96,17 +100,22 @@ class CloudApiClient:
                        error_callback=failed,
                        timeout=self.DEFAULT_REQUEST_TIMEOUT)
 
-    def getClusterStatus(self, cluster_id: str, on_finished: Callable[[CloudClusterStatus], Any]) -> None:
+    def getClusterStatus(self, cluster_id: str, on_finished: Callable[[CloudClusterStatus], Any],
+                         on_not_modified: Optional[Callable[[], Any]] = None) -> None:
         """Retrieves the status of the given cluster.
 
+        The request is conditional on the previous response, so the status is only downloaded and parsed if it changed.
         :param cluster_id: The ID of the cluster.
         :param on_finished: The function to be called after the result is parsed.
+        :param on_not_modified: The function to be called if the status didn't change since the previous response.
         """
 
         url = f"{self.CLUSTER_API_ROOT}/clusters/{cluster_id}/status"
         self._http.get(url,
+                       headers_dict = self._validators.get(url),
                        scope = self._scope,
-                       callback = self._parseCallback(on_finished, CloudClusterStatus),
+                       callback = self._parseCallback(on_finished, CloudClusterStatus, validated_url = url,
+                                                      on_not_modified = on_not_modified),
                        timeout = self.DEFAULT_REQUEST_TIMEOUT)
 
     def requestUpload(self, request: CloudPrintJobUploadRequest,
@@ -189,6 +198,22 @@ class CloudApiClient:
             request.setRawHeader(b"Authorization", f"Bearer {access_token}".encode())
         return request
 
+    def _storeValidators(self, url: str, reply: QNetworkReply) -> None:
+        """Stores the ETag and Last-Modified headers of a reply, to make the next request for this URL conditional.
+
+        :param url: The URL that was requested.
+        :param reply: The successful reply from the server.
+        """
+
+        validators: Dict[str, str] = {}
+        etag = bytes(reply.rawHeader(b"ETag")).decode()
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = bytes(reply.rawHeader(b"Last-Modified")).decode()
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        self._validators[url] = validators
+
     @staticmethod
     def _parseReply(reply: QNetworkReply) -> Tuple[int, Dict[str, Any]]:
         """Parses the given JSON network reply into a status code and a dictionary, handling unexpected errors as well.
@@ -238,7 +263,9 @@ class CloudApiClient:
                        on_finished: Union[Callable[[CloudApiClientModel], Any],
                                           Callable[[List[CloudApiClientModel]], Any]],
                        model: Type[CloudApiClientModel],
-                       on_error: Optional[Callable] = None) -> Callable[[QNetworkReply], None]:
+                       on_error: Optional[Callable] = None,
+                       validated_url: Optional[str] = None,
+                       on_not_modified: Optional[Callable[[], Any]] = None) -> Callable[[QNetworkReply], None]:
 
         """Creates a callback function so that it includes the parsing of the response into the correct model.
 
@@ -247,6 +274,8 @@ class CloudApiClient:
         :param on_finished: The callback in case the response is successful. Depending on the endpoint it will be either
         a list or a single item.
         :param model: The type of the model to convert the response to.
+        :param validated_url: The URL of a conditional request, of which the validators of the response are stored.
+        :param on_not_modified: The callback in case the response of a conditional request is 304 Not Modified.
         """
 
         def parse(reply: QNetworkReply) -> None:
@@ -254,15 +283,24 @@ class CloudApiClient:
             self._anti_gc_callbacks.remove(parse)
 
             # Don't try to parse the reply if we didn't get one
-            if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) is None:
+            status_code = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+            if status_code is None:
                 if on_error is not None:
                     on_error()
                 return
 
+            # Nothing changed since the previous response, so there is nothing to parse.
+            if status_code == 304 and validated_url is not None:
+                if on_not_modified is not None:
+                    on_not_modified()
+                return
+
             status_code, response = self._parseReply(reply)
             if status_code >= 300 and on_error is not None:
                 on_error()
             else:
+                if validated_url is not None and status_code < 300 and "data" in response:
+                    self._storeValidators(validated_url, reply)
                 self._parseResponse(response, on_finished, model)
 
         self._anti_gc_callbacks.append(parse)
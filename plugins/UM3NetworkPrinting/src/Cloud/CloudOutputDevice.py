@@ -167,13 +167,12 @@ class CloudOutputDevice(UltimakerNetworkedPrinterOutputDevice):
         """Called when the network data should be updated."""
 
         super()._update()
-        if time() - self._time_of_last_request < self.CHECK_CLUSTER_INTERVAL:
+        if not self._shouldCheckCluster():
             return  # avoid calling the cloud too often
-        self._time_of_last_request = time()
         if self._account.isLoggedIn:
             self.setAuthenticationState(AuthState.Authenticated)
             self._last_request_time = time()
-            self._api.getClusterStatus(self.key, self._onStatusCallFinished)
+            self._api.getClusterStatus(self.key, self._onStatusCallFinished, self._responseReceived)
         else:
             self.setAuthenticationState(AuthState.NotAuthenticated)
 
@@ -337,19 +336,23 @@ class CloudOutputDevice(UltimakerNetworkedPrinterOutputDevice):
     def setJobState(self, print_job_uuid: str, state: str) -> None:
         """Set the remote print job state."""
 
+        self._markClusterChanged()
         self._api.doPrintJobAction(self._cluster.cluster_id, print_job_uuid, state)
 
     @pyqtSlot(str, name="sendJobToTop")
     def sendJobToTop(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._api.doPrintJobAction(self._cluster.cluster_id, print_job_uuid, "move",
                                    {"list": "queued", "to_position": 0})
 
     @pyqtSlot(str, name="deleteJobFromQueue")
     def deleteJobFromQueue(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._api.doPrintJobAction(self._cluster.cluster_id, print_job_uuid, "remove")
 
     @pyqtSlot(str, name="forceSendJob")
     def forceSendJob(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._api.doPrintJobAction(self._cluster.cluster_id, print_job_uuid, "force")
 
     @pyqtSlot(name="openPrintJobControlPanel")
@@ -3,12 +3,12 @@
 from typing import List, Optional
 
 from PyQt6.QtCore import pyqtProperty, pyqtSignal
-from PyQt6.QtGui import QImage
 from PyQt6.QtNetwork import QNetworkReply, QNetworkRequest
 
 from UM.Logger import Logger
 from UM.TaskManagement.HttpRequestManager import HttpRequestManager
 from cura.PrinterOutput.Models.PrintJobOutputModel import PrintJobOutputModel
+from cura.PrinterOutput.PrintJobPreviewImageCache import PrintJobPreviewImageCache
 from cura.PrinterOutput.PrinterOutputController import PrinterOutputController
 
 from .ConfigurationChangeModel import ConfigurationChangeModel
@@ -32,11 +32,23 @@ class UM3PrintJobOutputModel(PrintJobOutputModel):
         self.configurationChangesChanged.emit()
 
     def updatePreviewImageData(self, data: bytes) -> None:
-        image = QImage()
-        image.loadFromData(data)
+        image = PrintJobPreviewImageCache.getInstance().put(self.key, bytes(data))
         self.updatePreviewImage(image)
 
+    def loadCachedPreviewImage(self) -> bool:
+        """Use the preview image from the cache, if it is there.
+
+        :return: Whether the preview image was found in the cache.
+        """
+        image = PrintJobPreviewImageCache.getInstance().get(self.key)
+        if image is None:
+            return False
+        self.updatePreviewImage(image)
+        return True
+
     def loadPreviewImageFromUrl(self, url: str) -> None:
+        if self.loadCachedPreviewImage():
+            return
         HttpRequestManager.getInstance().get(url=url, callback=self._onImageLoaded, error_callback=self._onImageLoaded)
 
     def _onImageLoaded(self, reply: QNetworkReply, error: Optional["QNetworkReply.NetworkError"] = None) -> None:
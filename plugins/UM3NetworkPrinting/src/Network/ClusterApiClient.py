@@ -1,8 +1,9 @@
 # Copyright (c) 2019 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 import json
+from collections import deque
 from json import JSONDecodeError
-from typing import Callable, List, Optional, Dict, Union, Any, Type, cast, TypeVar, Tuple
+from typing import Callable, Deque, List, Optional, Dict, Set, Union, Any, Type, cast, TypeVar, Tuple
 
 from PyQt6.QtCore import QUrl
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
@@ -27,6 +28,9 @@ class ClusterApiClient:
     PRINTER_API_PREFIX = "/api/v1"
     CLUSTER_API_PREFIX = "/cluster-api/v1"
 
+    # The maximum number of preview images that are downloaded at the same time.
+    MAX_CONCURRENT_PREVIEW_IMAGE_REQUESTS = 4
+
     # In order to avoid garbage collection we keep the callbacks in this list.
     _anti_gc_callbacks = []  # type: List[Callable[[], None]]
 
@@ -41,6 +45,15 @@ class ClusterApiClient:
         self._address = address
         self._on_error = on_error
 
+        # The conditional request headers for each polled URL, built from the ETag and Last-Modified headers of the
+        # last successful response, so that the cluster can respond with 304 Not Modified if nothing changed.
+        self._validators = {}  # type: Dict[str, Dict[bytes, bytes]]
+
+        # The preview images that still need to be downloaded, and the print jobs they are queued or downloading for.
+        self._preview_image_queue = deque()  # type: Deque[Tuple[str, Callable]]
+        self._pending_preview_images = set()  # type: Set[str]
+        self._preview_image_requests = 0
+
     def getSystem(self, on_finished: Callable) -> None:
         """Get printer system information.
 
@@ -59,23 +72,29 @@ class ClusterApiClient:
         reply = self._manager.get(self._createEmptyRequest(url))
         self._addCallback(reply, on_finished, ClusterMaterial)
 
-    def getPrinters(self, on_finished: Callable[[List[ClusterPrinterStatus]], Any]) -> None:
+    def getPrinters(self, on_finished: Callable[[List[ClusterPrinterStatus]], Any],
+                    on_not_modified: Optional[Callable[[], Any]] = None) -> None:
         """Get the printers in the cluster.
 
         :param on_finished: The callback in case the response is successful.
+        :param on_not_modified: The callback in case the printers didn't change since the previous response.
         """
         url = "{}/printers".format(self.CLUSTER_API_PREFIX)
-        reply = self._manager.get(self._createEmptyRequest(url))
-        self._addCallback(reply, on_finished, ClusterPrinterStatus)
+        reply = self._manager.get(self._createConditionalRequest(url))
+        self._addCallback(reply, on_finished, ClusterPrinterStatus, validated_url = url,
+                          on_not_modified = on_not_modified)
 
-    def getPrintJobs(self, on_finished: Callable[[List[ClusterPrintJobStatus]], Any]) -> None:
+    def getPrintJobs(self, on_finished: Callable[[List[ClusterPrintJobStatus]], Any],
+                     on_not_modified: Optional[Callable[[], Any]] = None) -> None:
         """Get the print jobs in the cluster.
 
         :param on_finished: The callback in case the response is successful.
+        :param on_not_modified: The callback in case the print jobs didn't change since the previous response.
         """
         url = "{}/print_jobs".format(self.CLUSTER_API_PREFIX)
-        reply = self._manager.get(self._createEmptyRequest(url))
-        self._addCallback(reply, on_finished, ClusterPrintJobStatus)
+        reply = self._manager.get(self._createConditionalRequest(url))
+        self._addCallback(reply, on_finished, ClusterPrintJobStatus, validated_url = url,
+                          on_not_modified = on_not_modified)
 
     def movePrintJobToTop(self, print_job_uuid: str) -> None:
         """Move a print job to the top of the queue."""
@@ -104,11 +123,35 @@ class ClusterApiClient:
         self._manager.put(self._createEmptyRequest(url), json.dumps({"action": action}).encode())
 
     def getPrintJobPreviewImage(self, print_job_uuid: str, on_finished: Callable) -> None:
-        """Get the preview image data of a print job."""
+        """Get the preview image data of a print job.
 
-        url = "{}/print_jobs/{}/preview_image".format(self.CLUSTER_API_PREFIX, print_job_uuid)
-        reply = self._manager.get(self._createEmptyRequest(url))
-        self._addCallback(reply, on_finished)
+        Only a limited number of images is downloaded at the same time, and the rest is queued. If the image of this
+        print job is already queued or downloading, the request is ignored.
+        """
+
+        if print_job_uuid in self._pending_preview_images:
+            return
+        self._pending_preview_images.add(print_job_uuid)
+        self._preview_image_queue.append((print_job_uuid, on_finished))
+        self._requestPreviewImages()
+
+    def _requestPreviewImages(self) -> None:
+        """Start downloading queued preview images, up to the maximum number of concurrent downloads."""
+
+        while self._preview_image_queue and self._preview_image_requests < self.MAX_CONCURRENT_PREVIEW_IMAGE_REQUESTS:
+            print_job_uuid, on_finished = self._preview_image_queue.popleft()
+            url = "{}/print_jobs/{}/preview_image".format(self.CLUSTER_API_PREFIX, print_job_uuid)
+            reply = self._manager.get(self._createEmptyRequest(url))
+            self._addCallback(reply, on_finished)
+            self._preview_image_requests += 1
+            reply.finished.connect(lambda print_job_uuid = print_job_uuid: self._onPreviewImageRequestFinished(print_job_uuid))
+
+    def _onPreviewImageRequestFinished(self, print_job_uuid: str) -> None:
+        """Called when a preview image was downloaded, or failed to, to start downloading the next one."""
+
+        self._pending_preview_images.discard(print_job_uuid)
+        self._preview_image_requests -= 1
+        self._requestPreviewImages()
 
     def _createEmptyRequest(self, path: str, content_type: Optional[str] = "application/json") -> QNetworkRequest:
         """We override _createEmptyRequest in order to add the user credentials.
@@ -122,6 +165,31 @@ class ClusterApiClient:
             request.setHeader(QNetworkRequest.KnownHeaders.ContentTypeHeader, content_type)
         return request
 
+    def _createConditionalRequest(self, path: str) -> QNetworkRequest:
+        """Creates a request that only gets a response body if it changed since the previous response for this path.
+
+        :param path: The URL to request.
+        """
+        request = self._createEmptyRequest(path)
+        for header, value in self._validators.get(path, {}).items():
+            request.setRawHeader(header, value)
+        return request
+
+    def _storeValidators(self, path: str, reply: QNetworkReply) -> None:
+        """Stores the ETag and Last-Modified headers of a reply, to make the next request for this path conditional.
+
+        :param path: The URL that was requested.
+        :param reply: The successful reply from the server.
+        """
+        validators = {}  # type: Dict[bytes, bytes]
+        etag = bytes(reply.rawHeader(b"ETag"))
+        if etag:
+            validators[b"If-None-Match"] = etag
+        last_modified = bytes(reply.rawHeader(b"Last-Modified"))
+        if last_modified:
+            validators[b"If-Modified-Since"] = last_modified
+        self._validators[path] = validators
+
     @staticmethod
     def _parseReply(reply: QNetworkReply) -> Tuple[int, Dict[str, Any]]:
         """Parses the given JSON network reply into a status code and a dictionary, handling unexpected errors as well.
@@ -138,12 +206,13 @@ class ClusterApiClient:
             return status_code, {"errors": [err]}
 
     def _parseModels(self, response: Dict[str, Any], on_finished: Union[Callable[[ClusterApiClientModel], Any],
-                     Callable[[List[ClusterApiClientModel]], Any]], model_class: Type[ClusterApiClientModel]) -> None:
+                     Callable[[List[ClusterApiClientModel]], Any]], model_class: Type[ClusterApiClientModel]) -> bool:
         """Parses the given models and calls the correct callback depending on the result.
 
         :param response: The response from the server, after being converted to a dict.
         :param on_finished: The callback in case the response is successful.
         :param model_class: The type of the model to convert the response to. It may either be a single record or a list.
+        :return: Whether the response could be parsed.
         """
 
         try:
@@ -157,15 +226,19 @@ class ClusterApiClient:
                 on_finished_item(result)
         except (JSONDecodeError, TypeError, ValueError):
             Logger.log("e", "Could not parse response from network: %s", str(response))
+            return False
+        return True
 
     def _addCallback(self, reply: QNetworkReply, on_finished: Union[Callable[[ClusterApiClientModel], Any],
                            Callable[[List[ClusterApiClientModel]], Any]], model: Type[ClusterApiClientModel] = None,
-                     ) -> None:
+                     validated_url: Optional[str] = None, on_not_modified: Optional[Callable[[], Any]] = None) -> None:
         """Creates a callback function so that it includes the parsing of the response into the correct model.
 
         The callback is added to the 'finished' signal of the reply.
         :param reply: The reply that should be listened to.
         :param on_finished: The callback in case the response is successful.
+        :param validated_url: The URL of a conditional request, of which the validators of the response are stored.
+        :param on_not_modified: The callback in case the response of a conditional request is 304 Not Modified.
         """
 
         def parse() -> None:
@@ -175,7 +248,14 @@ class ClusterApiClient:
                 return  # Then the rest of the function is also already executed.
 
             # Don't try to parse the reply if we didn't get one
-            if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) is None:
+            status_code = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+            if status_code is None:
+                return
+
+            # Nothing changed since the previous response, so there is nothing to parse.
+            if status_code == 304 and validated_url is not None:
+                if on_not_modified is not None:
+                    on_not_modified()
                 return
 
             if reply.error() != QNetworkReply.NetworkError.NoError:
@@ -189,7 +269,8 @@ class ClusterApiClient:
 
             # Otherwise parse the result and return the formatted data in the callback.
             status_code, response = self._parseReply(reply)
-            self._parseModels(response, on_finished, model)
+            if self._parseModels(response, on_finished, model) and validated_url is not None:
+                self._storeValidators(validated_url, reply)
 
         self._anti_gc_callbacks.append(parse)
         reply.finished.connect(parse)
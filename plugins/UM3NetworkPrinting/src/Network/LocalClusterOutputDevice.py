@@ -3,8 +3,6 @@
 import os
 from typing import Optional, Dict, List, Callable, Any
 
-from time import time
-
 from PyQt6.QtGui import QDesktopServices
 from PyQt6.QtCore import pyqtSlot, QUrl, pyqtSignal, pyqtProperty, QObject
 from PyQt6.QtNetwork import QNetworkReply
@@ -34,7 +32,11 @@ class LocalClusterOutputDevice(UltimakerNetworkedPrinterOutputDevice):
 
     activeCameraUrlChanged = pyqtSignal()
 
-    CHECK_CLUSTER_INTERVAL = 10.0  # seconds
+    # The local cluster is requested on every update tick while it changes or is busy, since those requests are cheap.
+    # Only while it's idle, the time between requests is increased.
+    CHECK_CLUSTER_INTERVAL = 0.0  # seconds
+    IDLE_CHECK_CLUSTER_INTERVAL = 4.0  # seconds
+    MAX_CHECK_CLUSTER_INTERVAL = 10.0  # seconds
 
     def __init__(self, device_id: str, address: str, properties: Dict[bytes, bytes], parent=None) -> None:
 
@@ -90,14 +92,17 @@ class LocalClusterOutputDevice(UltimakerNetworkedPrinterOutputDevice):
 
     @pyqtSlot(str, name="sendJobToTop")
     def sendJobToTop(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._getApiClient().movePrintJobToTop(print_job_uuid)
 
     @pyqtSlot(str, name="deleteJobFromQueue")
     def deleteJobFromQueue(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._getApiClient().deletePrintJob(print_job_uuid)
 
     @pyqtSlot(str, name="forceSendJob")
     def forceSendJob(self, print_job_uuid: str) -> None:
+        self._markClusterChanged()
         self._getApiClient().forcePrintJob(print_job_uuid)
 
     def setJobState(self, print_job_uuid: str, action: str) -> None:
@@ -107,14 +112,15 @@ class LocalClusterOutputDevice(UltimakerNetworkedPrinterOutputDevice):
         :param action: The action to undertake ('pause', 'resume', 'abort').
         """
 
+        self._markClusterChanged()
         self._getApiClient().setPrintJobState(print_job_uuid, action)
 
     def _update(self) -> None:
         super()._update()
-        if time() - self._time_of_last_request < self.CHECK_CLUSTER_INTERVAL:
+        if not self._shouldCheckCluster():
             return  # avoid calling the cluster too often
-        self._getApiClient().getPrinters(self._updatePrinters)
-        self._getApiClient().getPrintJobs(self._updatePrintJobs)
+        self._getApiClient().getPrinters(self._updatePrinters, self._responseReceived)
+        self._getApiClient().getPrintJobs(self._updatePrintJobs, self._responseReceived)
         self._updatePrintJobPreviewImages()
 
     def getMaterials(self, on_finished: Callable[[List[ClusterMaterial]], Any]) -> None:
@@ -223,10 +229,10 @@ class LocalClusterOutputDevice(UltimakerNetworkedPrinterOutputDevice):
         self.writeError.emit()
 
     def _updatePrintJobPreviewImages(self):
-        """Download all the images from the cluster and load their data in the print job models."""
+        """Load the missing preview images of the print jobs from the cache, or download them from the cluster."""
 
         for print_job in self._print_jobs:
-            if print_job.getPreviewImage() is None:
+            if print_job.getPreviewImage() is None and not print_job.loadCachedPreviewImage():
                 self._getApiClient().getPrintJobPreviewImage(print_job.key, print_job.updatePreviewImageData)
 
     def _getApiClient(self) -> ClusterApiClient:
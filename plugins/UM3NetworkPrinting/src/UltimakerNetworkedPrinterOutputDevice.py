@@ -45,6 +45,13 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
     # States indicating if a print job is queued.
     QUEUED_PRINT_JOBS_STATES = {"queued", "error"}
 
+    # The time between requests for the status of the cluster while it changes or is busy. While it's idle and the
+    # status doesn't change, this time is doubled for every request, starting from the idle interval, up to the maximum.
+    # The maximum must stay below the timeout of 30 seconds.
+    CHECK_CLUSTER_INTERVAL = 10.0  # seconds
+    IDLE_CHECK_CLUSTER_INTERVAL = 10.0  # seconds
+    MAX_CHECK_CLUSTER_INTERVAL = 20.0  # seconds
+
     def __init__(self, device_id: str, address: str, properties: Dict[bytes, bytes], connection_type: ConnectionType,
                  parent=None) -> None:
 
@@ -57,6 +64,10 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
         self._time_of_last_response = time()
         self._time_of_last_request = time()
 
+        # Keeps track of whether the cluster changed since the last request, to adapt the time between requests.
+        self._check_cluster_interval = self.CHECK_CLUSTER_INTERVAL
+        self._cluster_changed = True
+
         # Set the display name from the properties.
         self.setName(self.getProperty("name"))
 
@@ -66,10 +77,17 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
 
         # Keeps track of all printers in the cluster.
         self._printers = []  # type: List[PrinterOutputModel]
+        self._printers_by_key = {}  # type: Dict[str, PrinterOutputModel]
         self._has_received_printers = False
 
         # Keeps track of all print jobs in the cluster.
         self._print_jobs = []  # type: List[UM3PrintJobOutputModel]
+        self._print_jobs_by_key = {}  # type: Dict[str, UM3PrintJobOutputModel]
+        self._has_received_print_jobs = False
+
+        # The last status received for each printer and print job, so that models that didn't change are not updated.
+        self._received_printer_status = {}  # type: Dict[str, ClusterPrinterStatus]
+        self._received_print_job_status = {}  # type: Dict[str, ClusterPrintJobStatus]
 
         # Keep track of the printer currently selected in the UI.
         self._active_printer = None  # type: Optional[PrinterOutputModel]
@@ -298,35 +316,72 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
     def _responseReceived(self) -> None:
         self._time_of_last_response = time()
 
+    def _shouldCheckCluster(self) -> bool:
+        """Checks whether it is time to request the status of the cluster again.
+
+        If the status changed since the previous request or the cluster is busy, the cluster is requested at the highest
+        rate. Otherwise the cluster is idle, and the time between requests is doubled, up to the maximum.
+        :return: True if the status should be requested now, in which case this counts as the time of the request.
+        """
+        if time() - self._time_of_last_request < self._check_cluster_interval:
+            return False
+        self._time_of_last_request = time()
+        if self._cluster_changed or self._isClusterBusy():
+            self._check_cluster_interval = self.CHECK_CLUSTER_INTERVAL
+        else:
+            self._check_cluster_interval = min(max(self._check_cluster_interval * 2, self.IDLE_CHECK_CLUSTER_INTERVAL),
+                                               self.MAX_CHECK_CLUSTER_INTERVAL)
+        self._cluster_changed = False
+        return True
+
+    def _isClusterBusy(self) -> bool:
+        """Whether any printer of the cluster has a print job, or print jobs are waiting in the queue."""
+        return any(printer.activePrintJob is not None for printer in self._printers) or len(self.queuedPrintJobs) > 0
+
+    def _markClusterChanged(self) -> None:
+        """Marks that the cluster changed or is about to change, so that it is requested at the highest rate again."""
+        self._cluster_changed = True
+        self._check_cluster_interval = self.CHECK_CLUSTER_INTERVAL
+
     def _updatePrinters(self, remote_printers: List[ClusterPrinterStatus]) -> None:
         self._responseReceived()
 
         # Keep track of the new printers to show.
         # We create a new list instead of changing the existing one to get the correct order.
         new_printers = []  # type: List[PrinterOutputModel]
+        new_printers_by_key = {}  # type: Dict[str, PrinterOutputModel]
+        new_printer_status = {}  # type: Dict[str, ClusterPrinterStatus]
+        changed = not self._has_received_printers
 
-        # Check which printers need to be created or updated.
-        for index, printer_data in enumerate(remote_printers):
-            printer = next(iter(printer for printer in self._printers if printer.key == printer_data.uuid), None)
+        # Check which printers need to be created or updated. Printers of which the status didn't change are skipped.
+        for printer_data in remote_printers:
+            printer = self._printers_by_key.get(printer_data.uuid)
             if printer is None:
                 printer = printer_data.createOutputModel(ClusterOutputController(self))
-            else:
+                changed = True
+            elif self._received_printer_status.get(printer_data.uuid) != printer_data:
                 printer_data.updateOutputModel(printer)
+                changed = True
             new_printers.append(printer)
+            new_printers_by_key[printer_data.uuid] = printer
+            new_printer_status[printer_data.uuid] = printer_data
 
         # Check which printers need to be removed (de-referenced).
-        remote_printers_keys = [printer_data.uuid for printer_data in remote_printers]
-        removed_printers = [printer for printer in self._printers if printer.key not in remote_printers_keys]
-        for removed_printer in removed_printers:
-            if self._active_printer and self._active_printer.key == removed_printer.key:
-                self.setActivePrinter(None)
+        removed_printer_keys = self._printers_by_key.keys() - new_printers_by_key.keys()
+        if self._active_printer and self._active_printer.key in removed_printer_keys:
+            self.setActivePrinter(None)
+        changed = changed or new_printers != self._printers  # Printers were removed or re-ordered.
 
         self._printers = new_printers
+        self._printers_by_key = new_printers_by_key
+        self._received_printer_status = new_printer_status
         self._has_received_printers = True
         if self._printers and not self.activePrinter:
             self.setActivePrinter(self._printers[0])
 
-        self.printersChanged.emit()
+        if changed:
+            self._markClusterChanged()
+            self.printersChanged.emit()
         self._checkIfClusterHost()
 
     def _checkIfClusterHost(self):
@@ -348,37 +403,53 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
     def _updatePrintJobs(self, remote_jobs: List[ClusterPrintJobStatus]) -> None:
         """Updates the local list of print jobs with the list received from the cluster.
 
+        Print jobs of which the status didn't change since the previous update are not updated, and the print jobs
+        changed signal is only emitted if any print job was added, changed, removed or moved in the queue.
+
         :param remote_jobs: The print jobs received from the cluster.
         """
         self._responseReceived()
 
         # Keep track of the new print jobs to show.
         # We create a new list instead of changing the existing one to get the correct order.
-        new_print_jobs = []
+        new_print_jobs = []  # type: List[UM3PrintJobOutputModel]
+        new_print_jobs_by_key = {}  # type: Dict[str, UM3PrintJobOutputModel]
+        new_print_job_status = {}  # type: Dict[str, ClusterPrintJobStatus]
+        changed = not self._has_received_print_jobs
 
         # Check which print jobs need to be created or updated.
         for print_job_data in remote_jobs:
-            print_job = next(
-                iter(print_job for print_job in self._print_jobs if print_job.key == print_job_data.uuid), None)
+            print_job = self._print_jobs_by_key.get(print_job_data.uuid)
             if not print_job:
-                new_print_jobs.append(self._createPrintJobModel(print_job_data))
+                print_job = self._createPrintJobModel(print_job_data)
+                changed = True
             else:
-                print_job_data.updateOutputModel(print_job)
+                if self._received_print_job_status.get(print_job_data.uuid) != print_job_data:
+                    print_job_data.updateOutputModel(print_job)
+                    changed = True
+                # The printers may have been re-created in the meantime, so always check the assignment.
                 if print_job_data.printer_uuid:
                     self._updateAssignedPrinter(print_job, print_job_data.printer_uuid)
                 if print_job_data.assigned_to:
                     self._updateAssignedPrinter(print_job, print_job_data.assigned_to)
-                new_print_jobs.append(print_job)
+            new_print_jobs.append(print_job)
+            new_print_jobs_by_key[print_job_data.uuid] = print_job
+            new_print_job_status[print_job_data.uuid] = print_job_data
 
         # Check which print job need to be removed (de-referenced).
-        remote_job_keys = [print_job_data.uuid for print_job_data in remote_jobs]
-        removed_jobs = [print_job for print_job in self._print_jobs if print_job.key not in remote_job_keys]
-        for removed_job in removed_jobs:
+        for removed_key in self._print_jobs_by_key.keys() - new_print_jobs_by_key.keys():
+            removed_job = self._print_jobs_by_key[removed_key]
             if removed_job.assignedPrinter:
                 removed_job.assignedPrinter.updateActivePrintJob(None)
+        changed = changed or new_print_jobs != self._print_jobs  # Print jobs were removed or re-ordered.
 
         self._print_jobs = new_print_jobs
-        self.printJobsChanged.emit()
+        self._print_jobs_by_key = new_print_jobs_by_key
+        self._received_print_job_status = new_print_job_status
+        self._has_received_print_jobs = True
+        if changed:
+            self._markClusterChanged()
+            self.printJobsChanged.emit()
 
     def _createPrintJobModel(self, remote_job: ClusterPrintJobStatus) -> UM3PrintJobOutputModel:
         """Create a new print job model based on the remote status of the job.
@@ -397,7 +468,7 @@ class UltimakerNetworkedPrinterOutputDevice(NetworkedPrinterOutputDevice):
     def _updateAssignedPrinter(self, model: UM3PrintJobOutputModel, printer_uuid: str) -> None:
         """Updates the printer assignment for the given print job model."""
 
-        printer = next((p for p in self._printers if printer_uuid == p.key), None)
+        printer = self._printers_by_key.get(printer_uuid)
         if not printer:
             return
         printer.updateActivePrintJob(model)
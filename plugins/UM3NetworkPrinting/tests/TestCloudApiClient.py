@@ -0,0 +1,45 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PyQt6.QtNetwork import QNetworkRequest
+
+from src.Cloud.CloudApiClient import CloudApiClient
+
+cluster_status_data = {"generated_time": "2022-01-01T00:00:00.000Z", "printers": [], "print_jobs": []}
+
+
+@pytest.fixture
+def api_client():
+    with patch("UM.TaskManagement.HttpRequestManager.HttpRequestManager.getInstance", MagicMock()):
+        api_client = CloudApiClient(MagicMock(), on_error = MagicMock())
+    return api_client
+
+
+def createReply(status_code, body = b"", headers = None):
+    reply = MagicMock()
+    reply.attribute = MagicMock(side_effect = lambda attribute: status_code if attribute == QNetworkRequest.Attribute.HttpStatusCodeAttribute else None)
+    reply.readAll = MagicMock(return_value = body)
+    reply.rawHeader = MagicMock(side_effect = lambda name: (headers or {}).get(name, b""))
+    return reply
+
+
+def test_getClusterStatusConditional(api_client):
+    on_finished = MagicMock()
+    on_not_modified = MagicMock()
+
+    api_client.getClusterStatus("cluster", on_finished, on_not_modified)
+    assert api_client._http.get.call_args[1]["headers_dict"] is None
+    callback = api_client._http.get.call_args[1]["callback"]
+    callback(createReply(200, json.dumps({"data": cluster_status_data}).encode(), {b"ETag": b"\"1\"", b"Last-Modified": b"Sat, 01 Jan 2022 00:00:00 GMT"}))
+    assert on_finished.call_count == 1
+
+    api_client.getClusterStatus("cluster", on_finished, on_not_modified)
+    assert api_client._http.get.call_args[1]["headers_dict"] == {"If-None-Match": "\"1\"", "If-Modified-Since": "Sat, 01 Jan 2022 00:00:00 GMT"}
+    callback = api_client._http.get.call_args[1]["callback"]
+    callback(createReply(304))
+    assert on_finished.call_count == 1
+    assert on_not_modified.call_count == 1
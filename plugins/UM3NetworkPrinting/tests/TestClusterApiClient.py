@@ -0,0 +1,102 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from src.Network.ClusterApiClient import ClusterApiClient
+
+print_job_data = {
+    "created_at": "2022-01-01T00:00:00.000Z",
+    "force": False,
+    "machine_variant": "Ultimaker S5",
+    "name": "benchy",
+    "started": False,
+    "status": "queued",
+    "time_total": 3600,
+    "uuid": "print-job-1",
+    "configuration": []
+}
+
+
+class StubClusterHandler(BaseHTTPRequestHandler):
+    """Serves the print jobs of a cluster with an ETag, and responds with 304 if the client already has them."""
+
+    def do_GET(self):
+        self.server.received_headers.append(self.headers)
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(self.server.print_jobs).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Don't spam the test output.
+
+
+@pytest.fixture
+def cluster():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubClusterHandler)
+    server.etag = "\"1\""
+    server.print_jobs = [print_job_data]
+    server.received_headers = []
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api_client(cluster):
+    QCoreApplication.instance() or QCoreApplication([])  # The network access manager needs an application.
+    return ClusterApiClient("127.0.0.1:{port}".format(port = cluster.server_address[1]), on_error = MagicMock())
+
+
+def getPrintJobs(api_client):
+    """Requests the print jobs and waits until one of the callbacks is called."""
+
+    loop = QEventLoop()
+    on_finished = MagicMock(side_effect = lambda print_jobs: loop.quit())
+    on_not_modified = MagicMock(side_effect = lambda: loop.quit())
+    QTimer.singleShot(5000, loop.quit)
+    api_client.getPrintJobs(on_finished, on_not_modified)
+    loop.exec()
+    return on_finished, on_not_modified
+
+
+def test_getPrintJobsNotModified(api_client, cluster):
+    on_finished, on_not_modified = getPrintJobs(api_client)
+    assert on_finished.call_args[0][0][0].uuid == "print-job-1"
+    assert on_not_modified.call_count == 0
+    assert cluster.received_headers[0].get("If-None-Match") is None
+
+    on_finished, on_not_modified = getPrintJobs(api_client)
+    assert on_finished.call_count == 0  # Not downloaded and parsed again.
+    assert on_not_modified.call_count == 1
+    assert cluster.received_headers[1].get("If-None-Match") == "\"1\""
+
+
+def test_getPrintJobsModified(api_client, cluster):
+    getPrintJobs(api_client)
+    cluster.etag = "\"2\""
+    cluster.print_jobs = [dict(print_job_data, status = "printing")]
+
+    on_finished, on_not_modified = getPrintJobs(api_client)
+    assert on_finished.call_args[0][0][0].status == "printing"
+    assert on_not_modified.call_count == 0
+
+    on_finished, on_not_modified = getPrintJobs(api_client)
+    assert on_not_modified.call_count == 1
+    assert cluster.received_headers[2].get("If-None-Match") == "\"2\""
@@ -0,0 +1,47 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.Network.LocalClusterOutputDevice import LocalClusterOutputDevice
+
+
+@pytest.fixture
+def output_device():
+    with patch("UM.Qt.QtApplication.QtApplication.getInstance"):
+        with patch("cura.CuraApplication.CuraApplication.getInstance"):
+            with patch("src.UltimakerNetworkedPrinterOutputDevice.PrintJobUploadProgressMessage"):
+                with patch.object(LocalClusterOutputDevice, "_loadMonitorTab"):
+                    output_device = LocalClusterOutputDevice(device_id = "test", address = "127.0.0.1", properties = {})
+    output_device._getApiClient = MagicMock()
+    return output_device
+
+
+def checkClusterAt(output_device, seconds):
+    """Let the update timer tick at the given time, and return whether the status of the cluster was requested."""
+    output_device._getApiClient.reset_mock()
+    with patch("src.UltimakerNetworkedPrinterOutputDevice.time", return_value = seconds):
+        with patch.object(LocalClusterOutputDevice, "_checkStillConnected"):
+            output_device._update()
+    return output_device._getApiClient.return_value.getPrinters.call_count == 1
+
+
+def test_checkClusterWhileBusy(output_device):
+    printer = MagicMock()
+    printer.activePrintJob = MagicMock()
+    output_device._printers = [printer]
+    output_device._time_of_last_request = 0
+    # Every update tick, like when the status doesn't change for a long time.
+    assert all(checkClusterAt(output_device, seconds) for seconds in range(2, 60, 2))
+
+
+def test_checkClusterBackOffWhileIdle(output_device):
+    output_device._time_of_last_request = 0
+    requests = [seconds for seconds in range(2, 60, 2) if checkClusterAt(output_device, seconds)]
+    assert requests[:5] == [2, 4, 8, 16, 26]  # Once more after the first status, then backing off up to the maximum.
+    assert requests[5] - requests[4] == LocalClusterOutputDevice.MAX_CHECK_CLUSTER_INTERVAL
+
+    output_device.setJobState("uuid", "pause")  # The cluster is requested on the next update tick again.
+    assert checkClusterAt(output_device, requests[-1] + 2)
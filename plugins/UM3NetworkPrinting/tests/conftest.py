@@ -0,0 +1,5 @@
+
+# Ensure that the importing for all tests work
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
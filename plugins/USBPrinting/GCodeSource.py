@@ -0,0 +1,111 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import mmap
+import os
+from typing import BinaryIO, List, Sequence, Tuple, Union
+
+import numpy
+
+
+class GCodeSource:
+    """The g-code of a print, as an index of the commands in an encoded g-code buffer.
+
+    The buffer is usually a memory-mapped file, so that even g-code of multiple gigabytes doesn't need to be kept in
+    memory. Comments, surrounding whitespace and empty lines are left out while indexing, so only the position and
+    length of every command in the buffer is stored. A command is only copied out of the buffer when it is requested,
+    which can be any command, to be able to send it again when the printer asks for a resend.
+    """
+
+    # The number of bytes of the buffer that are indexed at once.
+    INDEX_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, data: Union[bytes, mmap.mmap], header: Sequence[bytes] = ()) -> None:
+        """Index the g-code in a buffer.
+
+        :param data: The encoded g-code.
+        :param header: Commands to send before the g-code in the buffer.
+        """
+        self._data = data
+        self._header = list(header)
+        self._starts, self._lengths = self._index()
+
+    @classmethod
+    def fromString(cls, gcode: str, header: Sequence[bytes] = ()) -> "GCodeSource":
+        return cls(gcode.encode("utf-8"), header)
+
+    @classmethod
+    def fromFile(cls, file: BinaryIO, header: Sequence[bytes] = ()) -> "GCodeSource":
+        """Index the g-code in a file, which is memory-mapped. The file may be closed afterwards.
+
+        :param file: A file with encoded g-code, opened for reading.
+        :param header: Commands to send before the g-code in the file.
+        """
+        if os.fstat(file.fileno()).st_size == 0:
+            return cls(b"", header)  # Empty files can't be memory-mapped.
+        return cls(mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ), header)
+
+    def __len__(self) -> int:
+        return len(self._header) + len(self._starts)
+
+    def getLines(self, start: int, count: int) -> List[bytes]:
+        """Get a number of commands, without comments and surrounding whitespace.
+
+        :param start: The index of the first command.
+        :param count: The maximum number of commands to get. Fewer are returned at the end of the g-code.
+        """
+        header_count = len(self._header)
+        lines = self._header[start:start + count]
+        first = max(0, start - header_count)
+        last = max(0, start + count - header_count)
+        for line_start, line_length in zip(self._starts[first:last].tolist(), self._lengths[first:last].tolist()):
+            lines.append(self._data[line_start:line_start + line_length])
+        return lines
+
+    def _index(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the position and length of every command in the buffer.
+
+        This is done in chunks, which always end at the end of a line, so that the temporary arrays stay small.
+        :return: The positions of the commands in the buffer, and their lengths.
+        """
+        all_starts = []  # type: List[numpy.ndarray]
+        all_lengths = []  # type: List[numpy.ndarray]
+        size = len(self._data)
+        chunk_start = 0
+        chunk_size = self.INDEX_CHUNK_SIZE
+        while chunk_start < size:
+            chunk_end = min(chunk_start + chunk_size, size)
+            chunk = numpy.frombuffer(self._data, dtype = numpy.uint8, count = chunk_end - chunk_start, offset = chunk_start)
+            line_ends = numpy.flatnonzero(chunk == ord("\n"))
+            if chunk_end == size:
+                if len(line_ends) == 0 or line_ends[-1] != len(chunk) - 1:
+                    line_ends = numpy.append(line_ends, len(chunk))  # The last line doesn't end with a newline.
+            elif len(line_ends) == 0:
+                chunk_size *= 2  # A very long line. Try again with a bigger chunk.
+                continue
+            next_chunk_start = chunk_start + int(line_ends[-1]) + 1
+            line_starts = numpy.empty(len(line_ends), dtype = numpy.intp)
+            line_starts[0] = 0
+            line_starts[1:] = line_ends[:-1] + 1
+
+            # Cut off the comments, by ending each line at the first semicolon after its start.
+            semicolons = numpy.append(numpy.flatnonzero(chunk == ord(";")), len(chunk))
+            line_ends = numpy.minimum(line_ends, semicolons[numpy.searchsorted(semicolons, line_starts)])
+
+            # Strip the whitespace, by moving the start and end to the first and last non-whitespace character.
+            # Newlines count as non-whitespace, but they are never between the start and end of a line.
+            is_whitespace = (chunk == ord(" ")) | ((chunk >= ord("\t")) & (chunk <= ord("\r")) & (chunk != ord("\n")))
+            non_whitespace = numpy.append(numpy.flatnonzero(~is_whitespace), len(chunk))
+            command_starts = non_whitespace[numpy.searchsorted(non_whitespace, line_starts)]
+            command_ends = non_whitespace[numpy.maximum(numpy.searchsorted(non_whitespace, line_ends) - 1, 0)] + 1
+            is_command = command_starts < line_ends  # Otherwise the line is empty, or only has whitespace or a comment.
+
+            all_starts.append(command_starts[is_command].astype(numpy.int64) + chunk_start)
+            all_lengths.append((command_ends - command_starts)[is_command].astype(numpy.uint32))
+            del chunk  # Don't keep the buffer exported, so that a memory map can be closed.
+            chunk_start = next_chunk_start
+            chunk_size = self.INDEX_CHUNK_SIZE
+
+        if not all_starts:
+            return numpy.empty(0, dtype = numpy.int64), numpy.empty(0, dtype = numpy.uint32)
+        return numpy.concatenate(all_starts), numpy.concatenate(all_lengths)
@@ -18,16 +18,19 @@ from cura.PrinterOutput.GenericOutputController import GenericOutputController
 
 from .AutoDetectBaudJob import AutoDetectBaudJob
 from .AvrFirmwareUpdater import AvrFirmwareUpdater
+from .GCodeSource import GCodeSource
 
-from io import StringIO #To write the g-code output.
+from collections import deque
+from io import TextIOWrapper #To write the g-code output.
 from queue import Queue
 from serial import Serial, SerialException, SerialTimeoutException
-from threading import Thread, Event
+from threading import Thread, Event, Lock
+from tempfile import TemporaryFile #To write the g-code output.
 from time import time
-from typing import Union, Optional, List, cast, TYPE_CHECKING
+from typing import Deque, Union, Optional, List, cast, TYPE_CHECKING
 
+import numpy
 import re
-import functools  # Used for reduce
 
 if TYPE_CHECKING:
     from UM.FileHandler.FileHandler import FileHandler
@@ -37,6 +40,25 @@ catalog = i18nCatalog("cura")
 
 
 class USBPrinterOutputDevice(PrinterOutputDevice):
+    # The number of sent commands that may wait for an "ok" while printing, so that the firmware's command buffer
+    # doesn't run empty while the next line is on its way. Firmware with ADVANCED_OK reports the room left in its
+    # buffer with every "ok", in which case the window follows that instead, up to the maximum.
+    DEFAULT_SEND_WINDOW = 4
+    MAX_SEND_WINDOW = 16
+
+    # Commands sent before the g-code of every print. Reset the line number, otherwise the first line is sometimes ignored.
+    _gcode_header = [b"M110"]
+
+    # The number of g-code lines of which the line number and checksum are computed at once.
+    PREPARE_BATCH_SIZE = 10000
+
+    # Compiled once, because these are matched against every line that the printer sends.
+    _temperature_regex = re.compile(rb"[B|T\d*]: ?\d+\.?\d*")  # 'T:' for extruder and 'B:' for bed.
+    _extruder_temperature_regex = re.compile(rb"T(\d*): ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?")
+    _bed_temperature_regex = re.compile(rb"B: ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?")
+    _advanced_ok_regex = re.compile(rb" B(\d+)")  # Like "ok N10 P15 B3", where B is the room in the command buffer.
+    _firmware_name_regex = re.compile(r"FIRMWARE_NAME:(.*);")
+
     def __init__(self, serial_port: str, baud_rate: Optional[int] = None) -> None:
         super().__init__(serial_port, connection_type = ConnectionType.UsbConnection)
         self.setName(catalog.i18nc("@item:inmenu", "USB printing"))
@@ -50,10 +72,27 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
         self._timeout = 3
 
-        # List of gcode lines to be printed
-        self._gcode = [] # type: List[str]
+        # The g-code to be printed.
+        self._gcode = GCodeSource(b"")
         self._gcode_position = 0
 
+        # The lines of a batch of g-code, numbered and with checksum, ready to be sent.
+        self._prepared_gcode = []  # type: List[bytes]
+        self._prepared_gcode_start = 0
+
+        # For each command that was sent but not acknowledged with an "ok" yet, in the order they were sent, whether it
+        # is a line of the print. Only the print lines count towards the send window. Commands are sent from both the
+        # update thread and the Qt thread, so these are guarded by a lock.
+        self._commands_in_flight = deque()  # type: Deque[bool]
+        self._print_lines_in_flight = 0
+        self._commands_in_flight_lock = Lock()
+        self._send_window = self.DEFAULT_SEND_WINDOW
+
+        # The position of the line that the printer last asked to be sent again, and how many repetitions of that request
+        # to ignore, for the print lines that were in flight after it.
+        self._resend_position = None  # type: Optional[int]
+        self._resend_repetitions = 0
+
         self._use_auto_detect = True
 
         self._baud_rate = baud_rate
@@ -145,32 +184,41 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         CuraApplication.getInstance().getController().setActiveStage("MonitorStage")
 
         #Find the g-code to print.
-        gcode_textio = StringIO()
+        #It's written to a temporary file which is memory-mapped while printing, so that it doesn't need to be kept in memory.
         gcode_writer = cast(MeshWriter, PluginRegistry.getInstance().getPluginObject("GCodeWriter"))
-        success = gcode_writer.write(gcode_textio, None)
-        if not success:
+        try:
+            with TemporaryFile() as gcode_file:
+                gcode_textio = TextIOWrapper(gcode_file, encoding = "utf-8", newline = "")
+                success = gcode_writer.write(gcode_textio, None)
+                gcode_textio.flush()
+                gcode_textio.detach()  # Don't close the file along with the text wrapper yet.
+                if not success:
+                    return
+                gcode = GCodeSource.fromFile(gcode_file, header = self._gcode_header)
+        except EnvironmentError as e:
+            Logger.error("Unable to write the g-code to a temporary file: {err}".format(err = str(e)))
             return
 
-        self._printGCode(gcode_textio.getvalue())
+        self._printGCode(gcode)
 
-    def _printGCode(self, gcode: str):
+    def _printGCode(self, gcode: Union[str, GCodeSource]):
         """Start a print based on a g-code.
 
         :param gcode: The g-code to print.
         """
-        self._gcode.clear()
+        if isinstance(gcode, str):
+            gcode = GCodeSource.fromString(gcode, header = self._gcode_header)
+        self._gcode = gcode
+        self._prepared_gcode = []
         self._paused = False
+        self._resend_position = None
 
-        self._gcode.extend(gcode.split("\n"))
-
-        # Reset line number. If this is not done, first line is sometimes ignored
-        self._gcode.insert(0, "M110")
         self._gcode_position = 0
         self._print_start_time = time()
 
         self._print_estimated_time = int(CuraApplication.getInstance().getPrintInformation().currentPrintTime.getDisplayString(DurationFormat.Format.Seconds))
 
-        for i in range(0, 4):  # Push first 4 entries before accepting other inputs
+        for i in range(0, self._send_window):  # Fill the send window before accepting other inputs
             self._sendNextGcodeLine()
 
         self._is_printing = True
@@ -240,7 +288,12 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         else:
             self._sendCommand(command)
 
-    def _sendCommand(self, command: Union[str, bytes]):
+    def _sendCommand(self, command: Union[str, bytes], is_print_line: bool = False):
+        """Write a command to the serial port right away.
+
+        :param command: The command to send.
+        :param is_print_line: Whether the command is a line of the print, which counts towards the send window.
+        """
         if self._serial is None or self._connection_state != ConnectionState.Connected:
             return
 
@@ -248,8 +301,12 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         if not new_command.endswith(b"\n"):
             new_command += b"\n"
         try:
-            self._command_received.clear()
-            self._serial.write(new_command)
+            with self._commands_in_flight_lock:  # Keep the commands in flight in the order that they are written.
+                self._command_received.clear()
+                self._serial.write(new_command)
+                self._commands_in_flight.append(is_print_line)
+                if is_print_line:
+                    self._print_lines_in_flight += 1
         except SerialTimeoutException:
             Logger.log("w", "Timeout when sending command to printer via USB.")
             self._command_received.set()
@@ -277,8 +334,8 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                     self.sendCommand("M105")
                     self._last_temperature_request = time()
 
-            if re.search(b"[B|T\d*]: ?\d+\.?\d*", line):  # Temperature message. 'T:' for extruder and 'B:' for bed
-                extruder_temperature_matches = re.findall(b"T(\d*): ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?", line)
+            if self._temperature_regex.search(line):  # Temperature message. 'T:' for extruder and 'B:' for bed
+                extruder_temperature_matches = self._extruder_temperature_regex.findall(line)
                 # Update all temperature values
                 matched_extruder_nrs = []
                 for match in extruder_temperature_matches:
@@ -300,7 +357,7 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                     if match[2]:
                         extruder.updateTargetHotendTemperature(float(match[2]))
 
-                bed_temperature_matches = re.findall(b"B: ?(\d+\.?\d*)\s*\/?(\d+\.?\d*)?", line)
+                bed_temperature_matches = self._bed_temperature_regex.findall(line)
                 if bed_temperature_matches:
                     match = bed_temperature_matches[0]
                     if match[0]:
@@ -318,6 +375,13 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
             if line.startswith(b"ok") or self._firmware_idle_count > 1:
                 self._printer_busy = False
+                if self._firmware_idle_count > 1:
+                    self._clearCommandsInFlight()  # Any "ok" that we were still waiting for got lost.
+                else:
+                    self._acknowledgeCommand()
+                    advanced_ok = self._advanced_ok_regex.search(line)
+                    if advanced_ok:
+                        self._send_window = max(1, min(int(advanced_ok.group(1)), self.MAX_SEND_WINDOW))
 
                 self._command_received.set()
                 if not self._command_queue.empty():
@@ -326,7 +390,7 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                     if self._paused:
                         pass  # Nothing to do!
                     else:
-                        self._sendNextGcodeLine()
+                        self._sendNextGcodeLines()
 
             if line.startswith(b"echo:busy:"):
                 self._printer_busy = True
@@ -338,14 +402,47 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
                 elif line.lower().startswith(b"resend") or line.startswith(b"rs"):
                     # A resend can be requested either by Resend, resend or rs.
                     try:
-                        self._gcode_position = int(line.replace(b"N:", b" ").replace(b"N", b" ").replace(b":", b" ").split()[-1])
+                        self._resendGcodeFrom(int(line.replace(b"N:", b" ").replace(b"N", b" ").replace(b":", b" ").split()[-1]))
                     except:
                         if line.startswith(b"rs"):
                             # In some cases of the RS command it needs to be handled differently.
-                            self._gcode_position = int(line.split()[1])
+                            self._resendGcodeFrom(int(line.split()[1]))
+
+    def _resendGcodeFrom(self, position: int) -> None:
+        """Go back to the line of g-code that the printer asks to be sent again.
+
+        The printer drops the print lines that were sent after it, and asks for the same line again for each of them.
+        Those repeated requests are ignored. Otherwise the same lines would be sent several times, which causes new
+        line number errors.
+        :param position: The position in the g-code of the line to send again.
+        """
+
+        with self._commands_in_flight_lock:
+            if position == self._resend_position and self._resend_repetitions > 0:
+                self._resend_repetitions -= 1
+                return
+            self._resend_position = position
+            self._resend_repetitions = max(0, self._print_lines_in_flight - 1)  # The print lines in flight after this one.
+            # The dropped print lines don't take room in the buffer of the printer any more. They still get an "ok" each,
+            # so they stay in flight as other commands.
+            self._commands_in_flight = deque([False] * len(self._commands_in_flight))
+            self._print_lines_in_flight = 0
+        self._gcode_position = position
+
+    def _acknowledgeCommand(self) -> None:
+        """Process an "ok" from the printer, which acknowledges the oldest command in flight."""
+
+        with self._commands_in_flight_lock:
+            if self._commands_in_flight and self._commands_in_flight.popleft():
+                self._print_lines_in_flight -= 1
+
+    def _clearCommandsInFlight(self) -> None:
+        with self._commands_in_flight_lock:
+            self._commands_in_flight.clear()
+            self._print_lines_in_flight = 0
 
     def _setFirmwareName(self, name):
-        new_name = re.findall(r"FIRMWARE_NAME:(.*);", str(name))
+        new_name = self._firmware_name_regex.findall(str(name))
         if new_name:
             self._firmware_name = new_name[0]
             Logger.log("i", "USB output device Firmware name: %s", self._firmware_name)
@@ -365,7 +462,8 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
     def cancelPrint(self):
         self._gcode_position = 0
-        self._gcode.clear()
+        self._gcode = GCodeSource(b"")
+        self._prepared_gcode = []
         self._printers[0].updateActivePrintJob(None)
         self._is_printing = False
         self._paused = False
@@ -380,6 +478,43 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
         self.printers[0].homeHead()
         self._sendCommand("M84")
 
+    def _sendNextGcodeLines(self):
+        """Send the next lines of g-code while the send window isn't full.
+
+        If an "ok" gets lost, the window is cleared once the firmware is idle, so the print can't stall.
+        """
+
+        while self._is_printing and self._print_lines_in_flight < self._send_window:
+            self._sendNextGcodeLine()
+
+    def _prepareGcodeLines(self, start: int) -> None:
+        """Prepare a batch of g-code lines to be sent, starting at the given position.
+
+        The lines are numbered and given a checksum, which is computed for the whole batch at once. Comments and empty
+        lines were already left out by the g-code source.
+        :param start: The position in the g-code of the first line of the batch.
+        """
+
+        commands = []  # type: List[bytes]
+        for position, line in enumerate(self._gcode.getLines(start, self.PREPARE_BATCH_SIZE), start):
+            # Don't send the M0 or M1 to the machine, as M0 and M1 are handled as an LCD menu pause.
+            # But we do have to send something, so send M105 instead.
+            if line == b"M0" or line == b"M1":
+                line = b"M105"
+            commands.append(b"N%d%s" % (position, line))
+        if not commands:  # End of print, or print got cancelled.
+            self._prepared_gcode = []
+            return
+
+        # The checksum is the XOR of all bytes of the numbered line.
+        lengths = numpy.fromiter(map(len, commands), dtype = numpy.intp, count = len(commands))
+        offsets = numpy.zeros(len(commands), dtype = numpy.intp)
+        numpy.cumsum(lengths[:-1], out = offsets[1:])
+        checksums = numpy.bitwise_xor.reduceat(numpy.frombuffer(b"".join(commands), dtype = numpy.uint8), offsets)
+
+        self._prepared_gcode = [b"%s*%d\n" % (command, checksum) for command, checksum in zip(commands, checksums.tolist())]
+        self._prepared_gcode_start = start
+
     def _sendNextGcodeLine(self):
         """
         Send the next line of g-code, at the current `_gcode_position`, via a
@@ -387,26 +522,19 @@ class USBPrinterOutputDevice(PrinterOutputDevice):
 
         If the print is done, this sets `_is_printing` to `False` as well.
         """
+        # Prepare the next batch when needed. Resends may also go back to before the prepared batch.
+        index = self._gcode_position - self._prepared_gcode_start
+        if not 0 <= index < len(self._prepared_gcode):
+            self._prepareGcodeLines(self._gcode_position)
+            index = 0
         try:
-            line = self._gcode[self._gcode_position]
+            command = self._prepared_gcode[index]
         except IndexError:  # End of print, or print got cancelled.
             self._printers[0].updateActivePrintJob(None)
             self._is_printing = False
             return
 
-        if ";" in line:
-            line = line[:line.find(";")]
-
-        line = line.strip()
- 
-        # Don't send empty lines. But we do have to send something, so send M105 instead.
-        # Don't send the M0 or M1 to the machine, as M0 and M1 are handled as an LCD menu pause.
-        if line == "" or line == "M0" or line == "M1":
-            line = "M105"
-
-        checksum = functools.reduce(lambda x, y: x ^ y, map(ord, "N%d%s" % (self._gcode_position, line)))
-
-        self._sendCommand("N%d%s*%d" % (self._gcode_position, line, checksum))
+        self._sendCommand(command, is_print_line = True)
 
         print_job = self._printers[0].activePrintJob
         try:
@@ -0,0 +1,51 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os.path
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from GCodeSource import GCodeSource
+
+test_gcode = ";FLAVOR:Marlin\n\nG28 ;Home\r\n  G1 X10 Y10 E1  \n\t; Only a comment\n   \nM117 Héllo;World\nG1 X20"
+test_commands = [b"G28", b"G1 X10 Y10 E1", b"M117 H\xc3\xa9llo", b"G1 X20"]
+
+
+def test_index():
+    source = GCodeSource.fromString(test_gcode)
+    assert len(source) == 4
+    assert source.getLines(0, 10) == test_commands
+
+
+def test_header():
+    source = GCodeSource.fromString(test_gcode, header = [b"M110"])
+    assert len(source) == 5
+    assert source.getLines(0, 2) == [b"M110", b"G28"]
+    assert source.getLines(2, 10) == test_commands[1:]
+    assert source.getLines(5, 10) == []
+
+
+def test_empty():
+    assert len(GCodeSource(b"")) == 0
+    assert len(GCodeSource.fromString(";Nothing to print\n\n")) == 0
+
+
+def test_smallChunks():
+    """Lines may span the chunks, and may be longer than a chunk."""
+    gcode = "\n".join("G1 X{index} ;{comment}".format(index = index, comment = "x" * (index % 13)) for index in range(1000))
+    source = GCodeSource.fromString(gcode)
+    source.INDEX_CHUNK_SIZE = 7
+    source._starts, source._lengths = source._index()
+    assert source.getLines(0, 1000) == [b"G1 X%d" % index for index in range(1000)]
+
+
+def test_fromFile():
+    with tempfile.TemporaryFile() as f:
+        f.write(test_gcode.encode("utf-8"))
+        f.flush()
+        source = GCodeSource.fromFile(f)
+    assert source.getLines(0, 10) == test_commands
+    with tempfile.TemporaryFile() as f:
+        assert len(GCodeSource.fromFile(f)) == 0
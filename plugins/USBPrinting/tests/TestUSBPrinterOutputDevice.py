@@ -0,0 +1,180 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os.path
+import sys
+from functools import reduce
+from time import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cura.CuraApplication import CuraApplication  # Import it before the output devices, like Cura does, to prevent circular imports.
+from cura.PrinterOutput.PrinterOutputDevice import ConnectionState
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from USBPrinting.USBPrinterOutputDevice import USBPrinterOutputDevice
+
+
+class FakeSerial:
+    """Records the written commands, and replies with the given lines."""
+
+    def __init__(self, device: USBPrinterOutputDevice) -> None:
+        self._device = device
+        self.written = []
+        self.replies = []
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def readline(self) -> bytes:
+        if not self.replies:
+            self._device._connection_state = ConnectionState.Closed  # Stop the update loop.
+            return b"idle"
+        return self.replies.pop(0)
+
+
+class SimulatedPrinter(FakeSerial):
+    """Answers like Marlin: an "ok" for every command, and a resend request for every line after a bad one."""
+
+    def __init__(self, device: USBPrinterOutputDevice, corrupt_line: int) -> None:
+        super().__init__(device)
+        self._corrupt_line = corrupt_line  # Corrupted once, like by noise on the cable.
+        self._last_line = -1
+        self._received = 0
+        self.executed = []
+
+    def readline(self) -> bytes:
+        if not self.replies and self._received < len(self.written):
+            self._receive(self.written[self._received].strip())
+            self._received += 1
+        return super().readline()
+
+    def _receive(self, line: bytes) -> None:
+        if not line.startswith(b"N"):
+            self.replies.append(b"ok\n")  # Not numbered, like M105.
+            return
+        command, checksum = line.rsplit(b"*", 1)
+        line_number = int(command[1:].split(b"M")[0].split(b"G")[0])
+        if line_number == self._corrupt_line:
+            self._corrupt_line = None
+            checksum = b"0"
+        if line_number != self._last_line + 1 or int(checksum) != reduce(lambda x, y: x ^ y, command):
+            self.replies += [b"Error:Line Number is not Last Line Number+1, Last Line: %d\n" % self._last_line, b"Resend: %d\n" % (self._last_line + 1), b"ok\n"]
+            return
+        self._last_line = line_number
+        self.executed.append(command)
+        self.replies.append(b"ok\n")
+
+
+def createDevice():
+    with patch("UM.PluginRegistry.PluginRegistry.getInstance"), patch("cura.CuraApplication.CuraApplication.getInstance"):
+        device = USBPrinterOutputDevice("test")
+    device._printers = [MagicMock()]
+    device._serial = FakeSerial(device)
+    device._connection_state = ConnectionState.Connected
+    device._firmware_name_requested = True
+    device._last_temperature_request = time() + 1000  # Don't request temperatures during the test.
+    return device
+
+
+def startPrint(device, line_count = 20):
+    with patch("cura.CuraApplication.CuraApplication.getInstance"):
+        device._printGCode("\n".join("G1 X{index}".format(index = index) for index in range(line_count)))
+
+
+def receive(device, *replies):
+    device._connection_state = ConnectionState.Connected
+    device._serial.replies = list(replies)
+    with patch("cura.CuraApplication.CuraApplication.getInstance"):
+        device._update()
+
+
+def printLines(device):
+    return [command for command in device._serial.written if command.startswith(b"N")]
+
+
+@pytest.mark.parametrize("reply, send_window", [
+    (b"ok\n", USBPrinterOutputDevice.DEFAULT_SEND_WINDOW),
+    (b"ok N10 P15 B3\n", 3),
+    (b"ok N10 P15 B0\n", 1),  # Always send something.
+    (b"ok N10 P15 B100\n", USBPrinterOutputDevice.MAX_SEND_WINDOW),
+    (b"ok T:200.0 /200.0 B:60.0 /60.0\n", USBPrinterOutputDevice.DEFAULT_SEND_WINDOW)  # A bed temperature, not ADVANCED_OK.
+])
+def test_advancedOk(reply, send_window):
+    device = createDevice()
+    receive(device, reply)
+    assert device._send_window == send_window
+
+
+def test_sendWindow():
+    device = createDevice()
+    startPrint(device)
+    assert len(printLines(device)) == USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+
+    receive(device, b"ok\n")
+    assert len(printLines(device)) == USBPrinterOutputDevice.DEFAULT_SEND_WINDOW + 1  # One acknowledged, one sent.
+    assert device._print_lines_in_flight == USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+
+    receive(device, b"ok N5 P15 B8\n")
+    assert len(printLines(device)) == 9 + 1
+    assert device._print_lines_in_flight == 8
+
+
+def test_otherCommandsOutsideSendWindow():
+    device = createDevice()
+    startPrint(device)
+    device.sendCommand("M105")
+    assert device._print_lines_in_flight == USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+
+    receive(device, *[b"ok\n"] * USBPrinterOutputDevice.DEFAULT_SEND_WINDOW)  # The window is refilled every time.
+    assert device._print_lines_in_flight == USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+    sent_lines = len(printLines(device))
+
+    receive(device, b"ok T:200.0 /200.0 B:60.0 /60.0\n")  # Acknowledges the M105, so no print line is sent.
+    assert len(printLines(device)) == sent_lines
+    assert list(device._commands_in_flight) == [True] * USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+
+
+def test_lostOk():
+    device = createDevice()
+    startPrint(device)
+    receive(device, b"", b"")  # The firmware is idle, so its "ok" got lost.
+    assert len(printLines(device)) == 2 * USBPrinterOutputDevice.DEFAULT_SEND_WINDOW
+
+
+def test_endOfPrint():
+    device = createDevice()
+    startPrint(device, line_count = 6)
+    receive(device, *[b"ok\n"] * 7)
+    assert len(printLines(device)) == 7  # With the M110 that resets the line numbers.
+    assert not device._is_printing
+
+
+def test_checksums():
+    device = createDevice()
+    with patch.object(USBPrinterOutputDevice, "PREPARE_BATCH_SIZE", 3):  # Checksums over several batches.
+        startPrint(device)
+        receive(device, *[b"ok\n"] * 21)
+    lines = printLines(device)
+    assert len(lines) == 21
+    for position, line in enumerate(lines):
+        assert line.endswith(b"\n")
+        command, checksum = line[:-1].rsplit(b"*", 1)
+        assert command == (b"N0M110" if position == 0 else b"N%dG1 X%d" % (position, position - 1))
+        assert int(checksum) == reduce(lambda x, y: x ^ y, command)
+
+
+@pytest.mark.parametrize("send_window", [4, 8])
+def test_resend(send_window):
+    device = createDevice()
+    device._serial = SimulatedPrinter(device, corrupt_line = 5)
+    device._send_window = send_window
+    startPrint(device)
+    device.sendCommand("M105")
+    receive(device)
+
+    assert device._serial.executed == [b"N0M110"] + [b"N%dG1 X%d" % (index + 1, index) for index in range(20)]  # All lines once, in order.
+    assert len(printLines(device)) == 21 + send_window  # Only the lines from the bad one up to the window were sent twice.
+    assert not device._is_printing
@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade21to22
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade21to22.VersionUpgrade21to22()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -20,19 +23,19 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "profile": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./profiles", "./instance_profiles"}
             },
             "machine_instance": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "preferences": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"."}
             },
             "user": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./user"}
             }
         }
@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade.VersionUpgrade22to24()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -21,11 +24,11 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "machine_stack": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "extruder_train": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./extruders"}
             },
         }
@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade25to26
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade25to26.VersionUpgrade25to26()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -24,23 +27,23 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "quality_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./quality"}
             },
             "preferences": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"."}
             },
             "user": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./user"}
             },
             "definition_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "machine_stack": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             }
         }
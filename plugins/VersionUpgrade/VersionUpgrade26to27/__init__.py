@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade26to27
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade26to27.VersionUpgrade26to27()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -34,31 +37,31 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "machine_stack": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "extruder_train": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./extruders"}
             },
             "preferences": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"."}
             },
             "quality_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./quality"}
             },
             "user": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./user"}
             },
             "definition_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./definition_changes"}
             },
             "variant": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./variants"}
             }
         }
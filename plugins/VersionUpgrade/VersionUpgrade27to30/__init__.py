@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade27to30
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade27to30.VersionUpgrade27to30()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -26,31 +29,31 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "preferences": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"."}
             },
             "machine_stack": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "extruder_train": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./extruders"}
             },
             "quality_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./quality"}
             },
             "user": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./user"}
             },
             "definition_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./definition_changes"}
             },
             "variant": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./variants"}
             }
         }
@@ -3,12 +3,15 @@
 
 from typing import Any, Dict, TYPE_CHECKING
 
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
 from . import VersionUpgrade32to33
 
 if TYPE_CHECKING:
     from UM.Application import Application
 
 upgrade = VersionUpgrade32to33.VersionUpgrade32to33()
+get_version = VersionUpgradeManifest.getInstance().cacheVersionFunction(upgrade.getCfgVersion)
 
 def getMetaData() -> Dict[str, Any]:
     return {
@@ -26,31 +29,31 @@ def getMetaData() -> Dict[str, Any]:
         },
         "sources": {
             "preferences": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"."}
             },
             "machine_stack": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./machine_instances"}
             },
             "extruder_train": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./extruders"}
             },
             "definition_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./definition_changes"}
             },
             "quality_changes": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./quality"}
             },
             "user": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./user", "./materials/*"}
             },
             "variant": {
-                "get_version": upgrade.getCfgVersion,
+                "get_version": get_version,
                 "location": {"./variants"}
             }
         }
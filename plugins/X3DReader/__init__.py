@@ -1,6 +1,6 @@
 # Seva Alekseyev with National Institutes of Health, 2016
 
-from . import X3DReader
+from cura.ReaderWriters.LazyMeshReader import LazyMeshReader
 
 from UM.i18n import i18nCatalog
 catalog = i18nCatalog("cura")
@@ -17,4 +17,5 @@ def getMetaData():
 
 
 def register(app):
-    return {"mesh_reader": X3DReader.X3DReader()}
+    # The reader is only imported when a file is read with it, to start the application faster.
+    return {"mesh_reader": LazyMeshReader(__name__ + ".X3DReader", "X3DReader", [".x3d"])}
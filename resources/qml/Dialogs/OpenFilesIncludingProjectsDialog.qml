@@ -34,10 +34,7 @@ UM.Dialog
 
     function loadModelFiles(fileUrls)
     {
-        for (var i in fileUrls)
-        {
-            CuraApplication.readLocalFile(fileUrls[i], "open_as_model", base.addToRecent);
-        }
+        CuraApplication.readLocalFiles(fileUrls, "open_as_model", base.addToRecent);
     }
 
     onAccepted: loadModelFiles(base.selectedFiles)
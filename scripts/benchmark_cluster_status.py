@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long it takes to process the status of a large printer cluster.
+
+The status is replayed a number of times through the networked output device, like it is received when polling the
+cluster: once to create all models, then unchanged, and then with the progress of the printing jobs changed. If no
+recorded status is given, a synthetic status with 50 printers and 500 print jobs is generated. A recorded status is a
+JSON file with a "printers" and a "print_jobs" list, as returned by the cluster API.
+
+Usage: benchmark_cluster_status.py [status file]
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from cura.PrinterOutput.PrinterOutputDevice import ConnectionType
+from UM3NetworkPrinting.src.Models.Http.ClusterPrinterStatus import ClusterPrinterStatus
+from UM3NetworkPrinting.src.Models.Http.ClusterPrintJobStatus import ClusterPrintJobStatus
+from UM3NetworkPrinting.src.Models.UM3PrintJobOutputModel import UM3PrintJobOutputModel
+from UM3NetworkPrinting.src.UltimakerNetworkedPrinterOutputDevice import UltimakerNetworkedPrinterOutputDevice
+
+NUMBER_OF_PRINTERS = 50
+NUMBER_OF_PRINT_JOBS = 500
+NUMBER_OF_POLLS = 20
+
+
+def generate_status() -> Dict[str, List[Dict[str, Any]]]:
+    """Generates a cluster status, in the same shape as the cluster API returns it."""
+
+    configuration = [{"extruder_index": 0, "print_core_id": "AA 0.4"}, {"extruder_index": 1, "print_core_id": "BB 0.4"}]
+    printers = [{
+        "enabled": True,
+        "firmware_version": "7.0.0",
+        "friendly_name": "Printer {index}".format(index = index),
+        "ip_address": "10.0.0.{index}".format(index = index),
+        "machine_variant": "Ultimaker S5",
+        "status": "printing",
+        "unique_name": "printer{index}".format(index = index),
+        "uuid": "printer-{index}".format(index = index),
+        "configuration": configuration
+    } for index in range(NUMBER_OF_PRINTERS)]
+    print_jobs = [{
+        "created_at": "2022-01-01T00:00:00.000Z",
+        "force": False,
+        "machine_variant": "Ultimaker S5",
+        "name": "Job {index}".format(index = index),
+        "started": index < NUMBER_OF_PRINTERS,
+        "status": "printing" if index < NUMBER_OF_PRINTERS else "queued",
+        "time_elapsed": 0,
+        "time_total": 36000,
+        "uuid": "job-{index}".format(index = index),
+        "printer_uuid": "printer-{index}".format(index = index) if index < NUMBER_OF_PRINTERS else None,
+        "configuration": configuration
+    } for index in range(NUMBER_OF_PRINT_JOBS)]
+    return {"printers": printers, "print_jobs": print_jobs}
+
+
+def parse_status(status: Dict[str, List[Dict[str, Any]]], time_elapsed: int) -> Tuple[List[ClusterPrinterStatus], List[ClusterPrintJobStatus]]:
+    """Parses the status into models, like the API client does for every response."""
+
+    printers = [ClusterPrinterStatus(**printer) for printer in status["printers"]]
+    print_jobs = [ClusterPrintJobStatus(**dict(print_job, time_elapsed = time_elapsed if print_job.get("started") else 0)) for print_job in status["print_jobs"]]
+    return printers, print_jobs
+
+
+def measure(name: str, device: UltimakerNetworkedPrinterOutputDevice, polls: List[Tuple[List[ClusterPrinterStatus], List[ClusterPrintJobStatus]]]) -> None:
+    start_time = time.perf_counter()
+    for printers, print_jobs in polls:
+        device._updatePrinters(printers)
+        device._updatePrintJobs(print_jobs)
+    duration = time.perf_counter() - start_time
+    print("{name}: {duration:.1f}ms per poll".format(name = name, duration = duration * 1000 / NUMBER_OF_POLLS))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: [status file]")
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        with open(sys.argv[1], "r", encoding = "utf-8") as f:
+            status = json.load(f)
+    else:
+        status = generate_status()
+    print("Benchmarking on {printer_count} printers and {print_job_count} print jobs.".format(printer_count = len(status["printers"]), print_job_count = len(status["print_jobs"])))
+
+    with patch("UM.Qt.QtApplication.QtApplication.getInstance"), patch("cura.CuraApplication.CuraApplication.getInstance"), \
+            patch.object(UM3PrintJobOutputModel, "loadPreviewImageFromUrl"):  # Don't download the preview images.
+        with patch.object(UltimakerNetworkedPrinterOutputDevice, "_loadMonitorTab"):
+            device = UltimakerNetworkedPrinterOutputDevice(device_id = "benchmark", address = "127.0.0.1", properties = {}, connection_type = ConnectionType.NetworkConnection)
+
+        printers, print_jobs = parse_status(status, 0)
+        start_time = time.perf_counter()
+        device._updatePrinters(printers)
+        device._updatePrintJobs(print_jobs)
+        print("Creating the models: {duration:.1f}ms".format(duration = (time.perf_counter() - start_time) * 1000))
+
+        measure("Unchanged status", device, [parse_status(status, 0) for _ in range(NUMBER_OF_POLLS)])
+        measure("Changed progress", device, [parse_status(status, poll + 1) for poll in range(NUMBER_OF_POLLS)])
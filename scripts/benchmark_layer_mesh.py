@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long it takes to create the mesh and the travel moves of a layer, like the layer view does in
+compatibility mode.
+
+A layer with the given number of polygons of random lines is generated. Real layers mostly consist of many small
+polygons, so the number of polygons matters more than the number of lines.
+
+Usage: benchmark_layer_mesh.py [number of polygons] [lines per polygon]
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from cura.Layer import Layer
+from cura.LayerPolygon import LayerPolygon
+
+NUMBER_OF_POLYGONS = 20000
+LINES_PER_POLYGON = 10
+
+
+def generate_layer() -> Layer:
+    """Generates a layer of random polygons with random line types."""
+
+    random = numpy.random.RandomState(1337)
+    layer = Layer(0)
+    for _ in range(NUMBER_OF_POLYGONS):
+        line_types = random.randint(0, LayerPolygon.NumberOfTypes, size = (LINES_PER_POLYGON, 1)).astype(numpy.uint8)
+        points = random.uniform(0, 200, size = (LINES_PER_POLYGON + 1, 3)).astype(numpy.float32)
+        line_widths = random.uniform(0.2, 0.6, size = (LINES_PER_POLYGON, 1)).astype(numpy.float32)
+        layer.polygons.append(LayerPolygon(0, line_types, points, line_widths, line_widths, line_widths))
+    return layer
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: [number of polygons] [lines per polygon]")
+        sys.exit(1)
+    if len(sys.argv) >= 2:
+        NUMBER_OF_POLYGONS = int(sys.argv[1])
+    if len(sys.argv) == 3:
+        LINES_PER_POLYGON = int(sys.argv[2])
+
+    # The colours of the line types come from the theme, which is not loaded here.
+    with patch.object(LayerPolygon, "getColorMap", return_value = numpy.random.uniform(size = (LayerPolygon.NumberOfTypes, 4))):
+        layer = generate_layer()
+        print("Benchmarking on a layer of {polygons} polygons of {lines} lines.".format(polygons = NUMBER_OF_POLYGONS, lines = LINES_PER_POLYGON))
+
+        start_time = time.perf_counter()
+        mesh = layer.createMesh()
+        print("Creating the mesh: {duration:.3f}s ({count} vertices)".format(duration = time.perf_counter() - start_time, count = len(mesh.getVertices())))
+
+        start_time = time.perf_counter()
+        jumps = layer.createJumps()
+        print("Creating the travel moves: {duration:.3f}s ({count} vertices)".format(duration = time.perf_counter() - start_time, count = len(jumps.getVertices())))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long it takes to find the material packages that are stored in the metadata of a 3MF file.
+
+A temporary directory is filled with the given number of bundled material files and material packages. Then the metadata
+of the materials of a number of extruders is collected like when a 3MF file is saved, a few times in a row.
+
+Usage: benchmark_material_package_lookup.py [number of material files] [number of extruders]
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from cura.CuraPackageManager import CuraPackageManager
+from XmlMaterialProfile.XmlMaterialProfile import XmlMaterialProfile
+
+NUMBER_OF_MATERIAL_FILES = 500
+NUMBER_OF_EXTRUDERS = 2
+NUMBER_OF_SAVES = 5
+
+MATERIAL_FILE_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<fdmmaterial xmlns="http://www.ultimaker.com/material" version="1.3">
+    <metadata>
+        <name><brand>Generic</brand><material>PLA</material><color>Generic</color></name>
+        <GUID>{guid}</GUID>
+        <version>1</version>
+    </metadata>
+</fdmmaterial>
+"""
+
+
+class Material:
+    """Just the part of a material container that is used to find its package."""
+
+    def __init__(self, file_name: str, guid: str) -> None:
+        self._file_name = file_name
+        self._guid = guid
+
+    def getFileName(self) -> str:
+        return self._file_name
+
+    def getMetaDataEntry(self, key: str) -> str:
+        return self._guid
+
+
+def generate_materials(path: str) -> None:
+    """Writes half of the material files as bundled materials and the other half as packages of one material each."""
+
+    for index in range(NUMBER_OF_MATERIAL_FILES):
+        if index % 2 == 0:
+            directory = os.path.join(path, "bundled", "materials")
+        else:
+            directory = os.path.join(path, "installed", "package_{index}".format(index = index))
+        os.makedirs(directory, exist_ok = True)
+        with open(os.path.join(directory, "material_{index}.xml.fdm_material".format(index = index)), "w", encoding = "utf-8") as f:
+            f.write(MATERIAL_FILE_TEMPLATE.format(guid = "guid-{index}".format(index = index)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: [number of material files] [number of extruders]")
+        sys.exit(1)
+    if len(sys.argv) >= 2:
+        NUMBER_OF_MATERIAL_FILES = int(sys.argv[1])
+    if len(sys.argv) == 3:
+        NUMBER_OF_EXTRUDERS = int(sys.argv[2])
+
+    with tempfile.TemporaryDirectory() as path:
+        generate_materials(path)
+        print("Benchmarking with {count} material files and {extruders} extruders.".format(count = NUMBER_OF_MATERIAL_FILES, extruders = NUMBER_OF_EXTRUDERS))
+
+        package_manager = CuraPackageManager(MagicMock())
+        package_manager._installation_dirs_dict["materials"] = os.path.join(path, "installed")
+        package_manager.getInstalledPackageInfo = lambda package_id: {"display_name": package_id}
+
+        # Use the materials that are last in the directories, half of them bundled and half of them installed.
+        extruders = []
+        for index in range(NUMBER_OF_MATERIAL_FILES - NUMBER_OF_EXTRUDERS, NUMBER_OF_MATERIAL_FILES):
+            extruder = MagicMock()
+            extruder.material = Material("material_{index}.xml.fdm_material".format(index = index), "guid-{index}".format(index = index))
+            extruders.append(extruder)
+
+        application = MagicMock()
+        application.getPackageManager.return_value = package_manager
+        application.getExtruderManager.return_value.getActiveExtruderStacks.return_value = extruders
+        plugin_registry = MagicMock()
+        plugin_registry.getPluginObject.return_value = XmlMaterialProfile
+
+        with patch("cura.CuraApplication.CuraApplication.getInstance", return_value = application), \
+                patch("UM.PluginRegistry.PluginRegistry.getInstance", return_value = plugin_registry), \
+                patch("UM.Resources.Resources.getSecureSearchPaths", return_value = [os.path.join(path, "bundled")]), \
+                patch("UM.Settings.ContainerRegistry.ContainerRegistry.getInstance"):
+            ThreeMFWriter = importlib.import_module("3MFWriter.ThreeMFWriter").ThreeMFWriter
+            for save in range(NUMBER_OF_SAVES):
+                start_time = time.perf_counter()
+                metadata = ThreeMFWriter._getMaterialPackageMetadata()
+                print("Save {number}: {duration:.4f}s ({count} material packages)".format(number = save + 1, duration = time.perf_counter() - start_time, count = len(metadata)))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long it takes to load large meshes with the Trimesh and AMF readers.
+
+A sphere with the given number of triangles is written as a PLY file and as an AMF file in a temporary directory, and
+then read back with the readers, like when it is opened in Cura. The conversion to Uranium's mesh data is also measured
+on its own, since that is the part of loading that the readers do themselves.
+
+Usage: benchmark_mesh_readers.py [number of triangles]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+from unittest.mock import patch
+
+import numpy
+import trimesh
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from AMFReader.AMFReader import AMFReader
+from TrimeshReader.TrimeshReader import TrimeshReader
+
+NUMBER_OF_TRIANGLES = 5000000
+
+
+def generate_mesh() -> trimesh.Trimesh:
+    """Generates a sphere of about the requested number of triangles."""
+
+    segments = max(3, int((NUMBER_OF_TRIANGLES / 2) ** 0.5))
+    latitude, longitude = numpy.meshgrid(numpy.linspace(0, numpy.pi, segments + 1), numpy.linspace(0, 2 * numpy.pi, segments + 1), indexing = "ij")
+    vertices = numpy.stack((numpy.sin(latitude) * numpy.cos(longitude), numpy.sin(latitude) * numpy.sin(longitude), numpy.cos(latitude)), axis = -1).reshape((-1, 3)) * 100
+    corners = (numpy.arange(segments)[:, numpy.newaxis] * (segments + 1) + numpy.arange(segments)).reshape(-1)
+    faces = numpy.concatenate((numpy.stack((corners, corners + segments + 1, corners + 1), axis = -1),
+                               numpy.stack((corners + 1, corners + segments + 1, corners + segments + 2), axis = -1)))
+    return trimesh.Trimesh(vertices = vertices, faces = faces, process = False)
+
+
+def write_amf(mesh: trimesh.Trimesh, file_name: str) -> None:
+    with open(file_name, "w", encoding = "utf-8") as f:
+        f.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<amf unit=\"millimeter\"><object id=\"0\"><mesh><vertices>\n")
+        f.writelines("<vertex><coordinates><x>{0}</x><y>{1}</y><z>{2}</z></coordinates></vertex>\n".format(*vertex) for vertex in mesh.vertices.tolist())
+        f.write("</vertices><volume>\n")
+        f.writelines("<triangle><v1>{0}</v1><v2>{1}</v2><v3>{2}</v3></triangle>\n".format(*face) for face in mesh.faces.tolist())
+        f.write("</volume></mesh></object></amf>\n")
+
+
+def measure(name: str, function: Callable[[], object]) -> None:
+    start_time = time.perf_counter()
+    function()
+    print("{name}: {duration:.2f}s".format(name = name, duration = time.perf_counter() - start_time))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: [number of triangles]")
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        NUMBER_OF_TRIANGLES = int(sys.argv[1])
+
+    mesh = generate_mesh()
+    print("Benchmarking on a mesh of {count} triangles.".format(count = len(mesh.faces)))
+    with tempfile.TemporaryDirectory() as temporary_directory, patch("cura.CuraApplication.CuraApplication.getInstance"):
+        ply_file_name = os.path.join(temporary_directory, "sphere.ply")
+        mesh.export(ply_file_name)
+        amf_file_name = os.path.join(temporary_directory, "sphere.amf")
+        write_amf(mesh, amf_file_name)
+
+        trimesh_reader = TrimeshReader()
+        amf_reader = AMFReader()
+        measure("Converting to mesh data", lambda: trimesh_reader._toMeshData(mesh))
+        measure("Reading PLY", lambda: trimesh_reader.read(ply_file_name))
+        measure("Reading AMF", lambda: amf_reader.read(amf_file_name))
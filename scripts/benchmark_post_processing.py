@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long post-processing scripts take on a large g-code file.
+
+The scripts run with their default settings, apart from a few overrides to make sure that they actually modify the
+g-code. If no g-code file is given, a synthetic file of about 2 million lines is generated.
+
+Usage: benchmark_post_processing.py [g-code file]
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from PostProcessingPlugin.Script import Script
+from PostProcessingPlugin.scripts.ChangeAtZ import ChangeAtZ
+from PostProcessingPlugin.scripts.PauseAtHeight import PauseAtHeight
+
+NUMBER_OF_LAYERS = 1000
+LINES_PER_LAYER = 2000
+LAYER_HEIGHT = 0.2
+
+GLOBAL_STACK_VALUES = {
+    "machine_firmware_retract": False,
+    "machine_nozzle_temp_enabled": True,
+    "layer_height_0": LAYER_HEIGHT,
+}
+
+SCRIPT_SETTINGS = {
+    "PauseAtHeight": {"pause_height": NUMBER_OF_LAYERS * LAYER_HEIGHT / 2},
+    "ChangeAtZ": {"caz_enabled": True, "b_targetZ": NUMBER_OF_LAYERS * LAYER_HEIGHT / 2, "e1_Change_speed": True, "f1_Change_printspeed": True},
+}  # type: Dict[str, Dict[str, Any]]
+
+
+def generate_gcode() -> List[str]:
+    """Generates a g-code list, in the same shape as the engine produces it."""
+
+    random.seed(0)
+    gcode_list = [";FLAVOR:Marlin\n;TIME:100000\n;LAYER_COUNT:{count}\n".format(count = NUMBER_OF_LAYERS),
+                  "M104 S200\nM109 S200\nG28\nG92 E0\n"]
+    e = 0.0
+    for layer_nr in range(NUMBER_OF_LAYERS):
+        lines = [";LAYER:{layer_nr}".format(layer_nr = layer_nr), "G0 F3000 X100 Y100 Z{z:.2f}".format(z = (layer_nr + 1) * LAYER_HEIGHT)]
+        for line_nr in range(LINES_PER_LAYER - 3):
+            x = random.uniform(50, 150)
+            y = random.uniform(50, 150)
+            if line_nr % 20 == 0:
+                lines.append("G0 F3000 X{x:.3f} Y{y:.3f}".format(x = x, y = y))
+            else:
+                e += random.uniform(0.01, 0.1)
+                lines.append("G1 F1500 X{x:.3f} Y{y:.3f} E{e:.5f}".format(x = x, y = y, e = e))
+        lines.append(";TIME_ELAPSED:{time}".format(time = layer_nr * 100))
+        gcode_list.append("\n".join(lines) + "\n")
+    return gcode_list
+
+
+def read_gcode(file_name: str) -> List[str]:
+    """Reads a g-code file and splits it in layers, in the same shape as the engine produces it."""
+
+    with open(file_name, "r", encoding = "utf-8") as f:
+        gcode = f.read()
+    parts = gcode.split("\n;LAYER:")
+    return [parts[0] + "\n"] + [";LAYER:" + part + "\n" for part in parts[1:]]
+
+
+def with_default_settings(script: Script, overrides: Dict[str, Any]) -> Script:
+    """Lets the script read its default settings without a container stack."""
+
+    settings = {key: setting.get("default_value") for key, setting in script.getSettingData()["settings"].items()}
+    settings.update(overrides)
+    script.getSettingValueByKey = settings.get
+    return script
+
+
+def measure(name: str, function: Callable[[], Any], line_count: int) -> None:
+    start_time = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start_time
+    print("{name}: {duration:.2f}s ({speed:.0f} lines/s)".format(name = name, duration = duration, speed = line_count / duration))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: [g-code file]")
+        sys.exit(1)
+    gcode_list = read_gcode(sys.argv[1]) if len(sys.argv) == 2 else generate_gcode()
+    all_lines = [line for layer in gcode_list for line in layer.split("\n")]
+    print("Benchmarking on {line_count} lines in {layer_count} layers.".format(line_count = len(all_lines), layer_count = len(gcode_list)))
+
+    global_stack = MagicMock()
+    global_stack.getProperty = lambda key, property_name: GLOBAL_STACK_VALUES.get(key)
+    application = MagicMock()
+    application.getGlobalContainerStack = MagicMock(return_value = global_stack)
+
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = application)):
+        script = Script()
+        measure("Script.getValue", lambda: [script.getValue(line, key) for line in all_lines for key in "GXYZE"], len(all_lines))
+        measure("Script.putValue", lambda: [script.putValue(line, E = 0) for line in all_lines], len(all_lines))
+        for script_class in [PauseAtHeight, ChangeAtZ]:
+            script = with_default_settings(script_class(), SCRIPT_SETTINGS[script_class.__name__])
+            measure(script_class.__name__, lambda: script.execute(list(gcode_list)), len(all_lines))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how long it takes to convert a large mesh to the vertices that are sent to CuraEngine, and how big they are.
+
+An indexed sphere with the given number of triangles is converted like when a slice is started. For comparison, the size
+that the mesh would have if it were sent as unique vertices with an index buffer is printed too.
+
+Usage: benchmark_start_slice_job.py [number of triangles]
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from UM.Math.Matrix import Matrix
+from UM.Math.Vector import Vector
+from UM.Mesh.MeshData import MeshData
+
+NUMBER_OF_TRIANGLES = 10000000
+
+
+def generate_mesh() -> MeshData:
+    """Generates an indexed sphere of about the requested number of triangles."""
+
+    segments = max(3, int((NUMBER_OF_TRIANGLES / 2) ** 0.5))
+    latitude, longitude = numpy.meshgrid(numpy.linspace(0, numpy.pi, segments + 1), numpy.linspace(0, 2 * numpy.pi, segments + 1), indexing = "ij")
+    vertices = numpy.stack((numpy.sin(latitude) * numpy.cos(longitude), numpy.sin(latitude) * numpy.sin(longitude), numpy.cos(latitude)), axis = -1).reshape((-1, 3)) * 100
+    corners = (numpy.arange(segments)[:, numpy.newaxis] * (segments + 1) + numpy.arange(segments)).reshape(-1)
+    faces = numpy.concatenate((numpy.stack((corners, corners + segments + 1, corners + 1), axis = -1),
+                               numpy.stack((corners + 1, corners + segments + 1, corners + segments + 2), axis = -1)))
+    return MeshData(vertices = vertices.astype(numpy.float32), indices = faces.astype(numpy.int32))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: [number of triangles]")
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        NUMBER_OF_TRIANGLES = int(sys.argv[1])
+
+    with patch("cura.CuraApplication.CuraApplication.getInstance"):
+        from CuraEngineBackend.StartSliceJob import StartSliceJob
+
+        mesh_data = generate_mesh()
+        transformation = Matrix()
+        transformation.setByTranslation(Vector(10, 20, 30))
+        print("Benchmarking on a mesh of {count} triangles.".format(count = mesh_data.getFaceCount()))
+
+        start_time = time.perf_counter()
+        vertices = StartSliceJob._buildMeshVertices(mesh_data, transformation)
+        vertices_data = bytes(vertices)  # Like when it's set in the message.
+        print("Building the mesh message: {duration:.2f}s".format(duration = time.perf_counter() - start_time))
+        print("Vertices of every face: {size:.1f} MiB".format(size = len(vertices_data) / 2 ** 20))
+        indexed_size = mesh_data.getVertexCount() * 3 * 4 + mesh_data.getFaceCount() * 3 * 4
+        print("Unique vertices with an index buffer: {size:.1f} MiB".format(size = indexed_size / 2 ** 20))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+"""Measures how many g-code lines per second are streamed to a printer over USB.
+
+Instead of a real serial port, a simulated printer is used. It takes some time for every line to travel over the
+connection and back, and executes every command in a fixed time, with a limited command buffer like Marlin has. The
+print is streamed with a send window of one line (waiting for an "ok" after every line), with the default send window,
+and with a firmware that reports the room in its buffer with ADVANCED_OK.
+
+Usage: benchmark_usb_printing.py [number of lines]
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from functools import reduce
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plugins"))
+
+from cura.CuraApplication import CuraApplication  # Import it before the output devices, like Cura does, to prevent circular imports.
+from cura.PrinterOutput.PrinterOutputDevice import ConnectionState
+from USBPrinting.USBPrinterOutputDevice import USBPrinterOutputDevice
+
+NUMBER_OF_LINES = 20000
+LATENCY = 0.001  # Time for a line to travel in one direction, in seconds.
+COMMAND_TIME = 0.0002  # Time to execute a command, in seconds.
+BUFFER_SIZE = 8  # The number of commands the firmware can queue.
+
+
+class SimulatedSerial:
+    """A serial port to a simulated printer, which answers every command with "ok" when it fits in its buffer."""
+
+    def __init__(self, advanced_ok: bool) -> None:
+        self._advanced_ok = advanced_ok
+        self._incoming = queue.Queue()  # type: queue.Queue  # Lines on their way to the printer, with their arrival time.
+        self._outgoing = queue.Queue()  # type: queue.Queue  # Responses on their way back, with their arrival time.
+        self._running = True
+        self.checksum_errors = 0
+        self._thread = threading.Thread(target = self._runFirmware, daemon = True)
+        self._thread.start()
+
+    def write(self, data: bytes) -> None:
+        self._incoming.put((time.perf_counter() + LATENCY, data))
+
+    def readline(self) -> bytes:
+        try:
+            arrival_time, response = self._outgoing.get(timeout = 3)
+        except queue.Empty:
+            return b""
+        time.sleep(max(0.0, arrival_time - time.perf_counter()))
+        return response
+
+    def close(self) -> None:
+        self._running = False
+
+    def _runFirmware(self) -> None:
+        command_buffer = deque()  # type: deque
+        next_command_done = 0.0
+        waiting = None  # type: Optional[bytes]  # A line that arrived, but doesn't fit in the buffer yet.
+        while self._running:
+            now = time.perf_counter()
+            if command_buffer and now >= next_command_done:
+                command_buffer.popleft()
+                next_command_done = now + COMMAND_TIME
+            if waiting is None:
+                try:
+                    arrival_time, waiting = self._incoming.get(timeout = COMMAND_TIME)
+                except queue.Empty:
+                    continue
+                time.sleep(max(0.0, arrival_time - time.perf_counter()))
+            if len(command_buffer) < BUFFER_SIZE:
+                self._checkLine(waiting.strip())
+                if not command_buffer:
+                    next_command_done = time.perf_counter() + COMMAND_TIME
+                command_buffer.append(waiting)
+                waiting = None
+                response = b"ok B%d\n" % (BUFFER_SIZE - len(command_buffer)) if self._advanced_ok else b"ok\n"
+                self._outgoing.put((time.perf_counter() + LATENCY, response))
+
+    def _checkLine(self, line: bytes) -> None:
+        if b"*" not in line:
+            return  # Not a numbered line.
+        command, checksum = line.rsplit(b"*", 1)
+        if reduce(lambda x, y: x ^ y, command) != int(checksum):
+            self.checksum_errors += 1
+
+
+def generate_gcode() -> str:
+    return "\n".join("G1 X{x:.3f} Y{y:.3f} E{e:.5f} ;Move {index}".format(x = index % 200, y = index % 150, e = index * 0.01, index = index) for index in range(NUMBER_OF_LINES))
+
+
+def measure(name: str, send_window: int, advanced_ok: bool) -> None:
+    with patch("UM.PluginRegistry.PluginRegistry.getInstance"), patch("cura.CuraApplication.CuraApplication.getInstance"):
+        device = USBPrinterOutputDevice("simulated")
+    device.DEFAULT_SEND_WINDOW = send_window
+    device._send_window = send_window
+    device._printers = [MagicMock()]
+    device._firmware_name_requested = True
+    device._serial = SimulatedSerial(advanced_ok)
+    device._connection_state = ConnectionState.Connected
+
+    gcode = generate_gcode()
+    start_time = time.perf_counter()
+    with patch("cura.CuraApplication.CuraApplication.getInstance"):
+        device._printGCode(gcode)
+        device._update_thread.start()
+        while device._is_printing:
+            time.sleep(0.01)
+    duration = time.perf_counter() - start_time
+    device._connection_state = ConnectionState.Closed
+    device._serial.close()
+    print("{name}: {speed:.0f} lines/s, {errors} checksum errors".format(name = name, speed = NUMBER_OF_LINES / duration, errors = device._serial.checksum_errors))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Usage: [number of lines]")
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        NUMBER_OF_LINES = int(sys.argv[1])
+    print("Benchmarking on {count} lines with {latency}ms latency and {command_time}ms per command.".format(count = NUMBER_OF_LINES, latency = LATENCY * 1000, command_time = COMMAND_TIME * 1000))
+    measure("One line per ok", 1, False)
+    measure("Send window of {window}".format(window = USBPrinterOutputDevice.DEFAULT_SEND_WINDOW), USBPrinterOutputDevice.DEFAULT_SEND_WINDOW, False)
+    measure("ADVANCED_OK", USBPrinterOutputDevice.DEFAULT_SEND_WINDOW, True)
@@ -0,0 +1,61 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import io
+from typing import List
+
+from UM.Mesh.MeshWriter import MeshWriter
+
+CHUNK_SIZE = 256 * 1024
+CHUNK_COUNT = 200  # 50MB of g-code in total.
+
+
+class FakeGCodeWriter:
+    """Writes the chunks of a g-code list to the stream, like GCodeWriter does.
+
+    This allows testing the writers that wrap the g-code writer, without a scene with sliced g-code.
+    """
+
+    def __init__(self, gcode_list: List[str]) -> None:
+        self._gcode_list = gcode_list
+
+    def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode) -> bool:
+        for gcode in self._gcode_list:
+            stream.write(gcode)
+        return True
+
+    def getInformation(self) -> str:
+        return ""
+
+
+class FailingGCodeWriter(FakeGCodeWriter):
+    """Fails with an exception after writing the first chunk, like when the disk is full.
+
+    It keeps the stream that it got to write to, so that tests can check what happened to it.
+    """
+
+    def write(self, stream, nodes, mode = MeshWriter.OutputMode.TextMode) -> bool:
+        self.stream = stream
+        self.buffer = stream.buffer
+        stream.write(self._gcode_list[0])
+        raise OSError("Disk full.")
+
+
+class CountingStream(io.RawIOBase):
+    """Binary stream that only counts the bytes written to it, so that it doesn't use memory itself."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        return len(data)
+
+
+def createLargeGCodeList() -> List[str]:
+    """Create a g-code list of CHUNK_COUNT chunks of CHUNK_SIZE characters each."""
+    return [("G1 X{index} Y{index} E{index}\n".format(index = index) * (CHUNK_SIZE // 20))[:CHUNK_SIZE] for index in range(CHUNK_COUNT)]
@@ -1,12 +1,15 @@
 # Copyright (c) 2021 Ultimaker B.V.
 # Cura is released under the terms of the LGPLv3 or higher.
 
+import gzip
 import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from PyQt6.QtNetwork import QNetworkAccessManager
 from PyQt6.QtCore import QUrl
-from cura.PrinterOutput.NetworkedPrinterOutputDevice import NetworkedPrinterOutputDevice, AuthState
+from cura.PrinterOutput.NetworkedPrinterOutputDevice import NetworkedPrinterOutputDevice, AuthState, _CompressGCodeJob
 from cura.PrinterOutput.PrinterOutputDevice import ConnectionState
 
 
@@ -140,3 +143,57 @@ def test_timeout():
 
     # The connection should now be closed, since it went into timeout.
     assert output_device.connectionState == ConnectionState.Closed
+
+
+def createCompressingDevice(gcode):
+    with patch("UM.Qt.QtApplication.QtApplication.getInstance"):
+        output_device = NetworkedPrinterOutputDevice(device_id = "test", address = "127.0.0.1", properties = {})
+    output_device._progress_message = MagicMock()
+    output_device._gcode = gcode
+    output_device._compressing_gcode = True  # As started by _startCompressingGCode.
+    return output_device
+
+
+def test_compressGCode():
+    output_device = createCompressingDevice(["G1 X{index} Y{index} E{index}\n".format(index = index) for index in range(100000)])
+    progress = []
+    output_device.gcodeCompressionProgress.connect(progress.append)
+    compressed_gcode = []
+    output_device.gcodeCompressed.connect(compressed_gcode.append)
+
+    job = _CompressGCodeJob(output_device)
+    job.run()  # Synchronously, instead of in a background thread.
+
+    # Compressed in multiple batches, which together still form a single valid gzip file.
+    assert len(progress) > 1
+    assert progress == sorted(progress)
+    assert progress[-1] == pytest.approx(100)
+    assert output_device._progress_message.setProgress.call_count == len(progress)
+    assert compressed_gcode == [job.getResult()]
+    assert gzip.decompress(job.getResult()).decode("utf-8") == "".join(output_device._gcode)
+    assert not output_device._compressing_gcode
+    output_device._progress_message.hide.assert_not_called()
+
+
+def test_compressGCodeAborted():
+    output_device = createCompressingDevice(["G1 X{index} Y{index} E{index}\n".format(index = index) for index in range(400000)])
+    compressed_gcode = []
+    output_device.gcodeCompressed.connect(compressed_gcode.append)
+
+    compress = gzip.compress
+    compressed_batches = []
+    def compressAndAbort(data):
+        compressed_batches.append(data)
+        if len(compressed_batches) == 3:
+            output_device._compressing_gcode = False  # Abort while the job is running.
+        return compress(data)
+
+    job = _CompressGCodeJob(output_device)
+    with patch("os.cpu_count", return_value = 2):  # Keep few batches in flight, regardless of the machine.
+        with patch("cura.PrinterOutput.NetworkedPrinterOutputDevice.gzip.compress", compressAndAbort):
+            job.run()
+
+    assert job.getResult() is None
+    assert compressed_gcode == [None]
+    assert len(compressed_batches) < len(list(output_device._batchGCode()))  # It stopped early.
+    output_device._progress_message.hide.assert_called_once_with()
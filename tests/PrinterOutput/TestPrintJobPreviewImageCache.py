@@ -0,0 +1,60 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QImage
+
+from cura.PrinterOutput.PrintJobPreviewImageCache import PrintJobPreviewImageCache
+
+
+def createImageData(width: int) -> bytes:
+    image = QImage(width, 1, QImage.Format.Format_RGB32)
+    image.fill(0xff0000)
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+def test_putAndGet(tmp_path):
+    cache = PrintJobPreviewImageCache(str(tmp_path))
+    assert cache.get("print-job-1") is None
+    image = cache.put("print-job-1", createImageData(3))
+    assert image.width() == 3
+    assert cache.get("print-job-1") is image
+
+
+def test_getFromDisk(tmp_path):
+    PrintJobPreviewImageCache(str(tmp_path)).put("print-job-1", createImageData(3))
+
+    cache = PrintJobPreviewImageCache(str(tmp_path))  # Like after restarting or reconnecting.
+    assert cache.get("print-job-1").width() == 3
+
+
+def test_invalidData(tmp_path):
+    cache = PrintJobPreviewImageCache(str(tmp_path))
+    assert cache.put("print-job-1", b"Not an image").isNull()
+    assert cache.get("print-job-1") is None
+
+
+def test_invalidKeyIsNotStoredOnDisk(tmp_path):
+    cache = PrintJobPreviewImageCache(str(tmp_path))
+    assert cache.put("../print-job-1", createImageData(3)).width() == 3
+    assert cache.get("../print-job-1") is not None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    cache = PrintJobPreviewImageCache(str(tmp_path))
+    cache.MAX_MEMORY_ENTRIES = 2
+    cache.MAX_DISK_ENTRIES = 3
+    for index in range(4):
+        cache.put("print-job-{index}".format(index = index), createImageData(index + 1))
+        os.utime(os.path.join(str(tmp_path), "print-job-{index}".format(index = index)), (index, index))  # Make the order of use unambiguous.
+
+    assert list(cache._images.keys()) == ["print-job-2", "print-job-3"]
+    assert sorted(os.listdir(str(tmp_path))) == ["print-job-1", "print-job-2", "print-job-3"]
+    assert cache.get("print-job-0") is None
+    assert cache.get("print-job-1").width() == 2  # Loaded from disk again.
@@ -325,4 +325,65 @@ def test_getIOPlugins(container_registry):
     plugin_registry.getActivePlugins = unittest.mock.MagicMock(return_value = ["lizard"])
     plugin_registry.getMetaData = unittest.mock.MagicMock(return_value = {"zomg": {"test": "test"}})
     with unittest.mock.patch("UM.PluginRegistry.PluginRegistry.getInstance", unittest.mock.MagicMock(return_value = plugin_registry)):
-        assert container_registry._getIOPlugins("zomg") == [("lizard", {"zomg": {"test": "test"}})]
\ No newline at end of file
+        assert container_registry._getIOPlugins("zomg") == [("lizard", {"zomg": {"test": "test"}})]
+
+def test_saveDirtyContainers(container_registry, tmp_path):
+    saved_instance = unittest.mock.MagicMock(spec = UM.Settings.InstanceContainer.InstanceContainer)
+    saved_instance.getMetaDataEntry = unittest.mock.MagicMock(return_value = None)
+    saved_instance.serialize = unittest.mock.MagicMock(return_value = "instance data")
+    new_instance = unittest.mock.MagicMock(spec = UM.Settings.InstanceContainer.InstanceContainer)
+    new_instance.getMetaDataEntry = unittest.mock.MagicMock(return_value = None)
+    removed_instance = unittest.mock.MagicMock(spec = UM.Settings.InstanceContainer.InstanceContainer)
+    removed_instance.getMetaDataEntry = unittest.mock.MagicMock(return_value = True)
+    saved_stack = unittest.mock.MagicMock(spec = UM.Settings.ContainerStack.ContainerStack)
+    saved_stack.getMetaDataEntry = unittest.mock.MagicMock(return_value = None)
+    saved_stack.serialize = unittest.mock.MagicMock(return_value = "stack data")
+
+    saved_paths = {saved_instance: str(tmp_path / "instance.inst.cfg"), saved_stack: str(tmp_path / "stack.stack.cfg")}
+    container_registry.findDirtyContainers = unittest.mock.MagicMock(return_value = [saved_instance, new_instance, removed_instance])
+    container_registry.findContainerStacks = unittest.mock.MagicMock(return_value = [saved_stack])
+    container_registry._getSavedPath = unittest.mock.MagicMock(side_effect = lambda container: saved_paths.get(container))
+    container_registry.saveContainer = unittest.mock.MagicMock()
+
+    container_registry.saveDirtyContainers()
+    container_registry.waitForSave()
+
+    # New containers are saved by the provider, the others are written in the background. Removed ones aren't saved.
+    container_registry.saveContainer.assert_called_once_with(new_instance)
+    saved_instance.setDirty.assert_called_once_with(False)
+    saved_stack.setDirty.assert_called_once_with(False)
+    assert (tmp_path / "instance.inst.cfg").read_text() == "instance data"
+    assert (tmp_path / "stack.stack.cfg").read_text() == "stack data"
+
+
+def test_saveDirtyContainersWriteFails(container_registry, tmp_path):
+    instance = unittest.mock.MagicMock(spec = UM.Settings.InstanceContainer.InstanceContainer)
+    instance.getMetaDataEntry = unittest.mock.MagicMock(return_value = None)
+    instance.serialize = unittest.mock.MagicMock(return_value = "instance data")
+    container_registry.findDirtyContainers = unittest.mock.MagicMock(return_value = [instance])
+    container_registry.findContainerStacks = unittest.mock.MagicMock(return_value = [])
+    container_registry._getSavedPath = unittest.mock.MagicMock(return_value = str(tmp_path / "missing_directory" / "instance.inst.cfg"))
+
+    application = unittest.mock.MagicMock()
+    application.callLater = unittest.mock.MagicMock(side_effect = lambda function, *args: function(*args))
+    with unittest.mock.patch("cura.CuraApplication.CuraApplication.getInstance", unittest.mock.MagicMock(return_value = application)):
+        container_registry.saveDirtyContainers()
+        container_registry.waitForSave()
+
+    # The container is dirty again after the write failed, so that the next save tries again.
+    assert instance.setDirty.call_args_list == [unittest.mock.call(False), unittest.mock.call(True)]
+
+
+def test_saveDirtyContainersSwitchedMaterial(container_registry, global_stack, tmp_path):
+    """Switching a container of a stack doesn't mark the stack as dirty, but the stack must be saved anyway."""
+    material = UM.Settings.InstanceContainer.InstanceContainer(container_id = "Test Material")
+    material.setMetaDataEntry("type", "material")
+    stack_path = tmp_path / "TestGlobalStack.global.cfg"
+    container_registry.findContainerStacks = unittest.mock.MagicMock(return_value = [global_stack])
+    container_registry._getSavedPath = unittest.mock.MagicMock(side_effect = lambda container: str(stack_path) if container is global_stack else None)
+
+    global_stack.setMaterial(material)
+    container_registry.saveDirtyContainers()
+    container_registry.waitForSave()
+
+    assert "Test Material" in stack_path.read_text()
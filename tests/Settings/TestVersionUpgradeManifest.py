@@ -0,0 +1,74 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import configparser
+import os
+from unittest.mock import patch
+
+from cura.Settings.VersionUpgradeManifest import VersionUpgradeManifest
+
+machine_instance = """[general]
+version = 5
+name = My Printer
+id = my_printer
+
+[metadata]
+type = machine
+setting_version = {setting_version}
+"""
+
+
+class CountingVersionUpgrade:
+    """Parses the version of configuration files like the version upgrade plug-ins do, counting how often it does."""
+
+    def __init__(self) -> None:
+        self.parse_count = 0
+
+    def getCfgVersion(self, serialised: str) -> int:
+        self.parse_count += 1
+        parser = configparser.ConfigParser(interpolation = None)
+        parser.read_string(serialised)
+        return int(parser.get("general", "version")) * 1000000 + int(parser.get("metadata", "setting_version", fallback = "0"))
+
+
+def startUp(manifest_path: str, configuration_files) -> CountingVersionUpgrade:
+    """Gets the versions of the configuration files with a new manifest, as a start-up of the application would."""
+
+    upgrade = CountingVersionUpgrade()
+    manifest = VersionUpgradeManifest(manifest_path)
+    get_version = manifest.cacheVersionFunction(upgrade.getCfgVersion)
+    for serialised, expected_version in configuration_files:
+        assert get_version(serialised) == expected_version
+    manifest.save()
+    return upgrade
+
+
+def test_secondStartUpParsesNothing(tmp_path):
+    manifest_path = os.path.join(str(tmp_path), VersionUpgradeManifest.FILE_NAME)
+    configuration_files = [(machine_instance.format(setting_version = 19), 5000019), (machine_instance.format(setting_version = 20), 5000020)]
+
+    assert startUp(manifest_path, configuration_files).parse_count == 2
+    assert startUp(manifest_path, configuration_files).parse_count == 0
+
+    # Only the file that changed is parsed again.
+    configuration_files[0] = (machine_instance.format(setting_version = 20) + "\n[values]\n", 5000020)
+    assert startUp(manifest_path, configuration_files).parse_count == 1
+    assert startUp(manifest_path, configuration_files).parse_count == 0
+
+
+def test_otherCuraVersion(tmp_path):
+    manifest_path = os.path.join(str(tmp_path), VersionUpgradeManifest.FILE_NAME)
+    configuration_files = [(machine_instance.format(setting_version = 20), 5000020)]
+    startUp(manifest_path, configuration_files)
+
+    # Another version of Cura may have other version upgrades, so the versions need to be parsed again.
+    with patch("cura.ApplicationMetadata.CuraVersion", "0.0.0"):
+        assert startUp(manifest_path, configuration_files).parse_count == 1
+
+
+def test_brokenManifest(tmp_path):
+    manifest_path = os.path.join(str(tmp_path), VersionUpgradeManifest.FILE_NAME)
+    with open(manifest_path, "w") as f:
+        f.write("{\"manifest_version\": 1, \"versions\"")
+
+    assert startUp(manifest_path, [(machine_instance.format(setting_version = 20), 5000020)]).parse_count == 1
@@ -0,0 +1,58 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import patch, MagicMock
+
+import numpy
+
+from UM.Math.Polygon import Polygon
+from UM.Operations.GroupedOperation import GroupedOperation
+from cura.Arranging.ArrangeNewObjectsJob import ArrangeNewObjectsJob
+
+mocked_application = MagicMock()
+
+
+def createNode(has_hull = True):
+    node = MagicMock()
+    hull = Polygon(numpy.array([[0, 0], [10, 0], [10, 10]], numpy.float32)) if has_hull else None
+    node.callDecoration = MagicMock(side_effect = lambda name: hull if name == "getConvexHull" else None)
+    return node
+
+
+def runJob(job, create_operation):
+    with patch("UM.Application.Application.getInstance", MagicMock(return_value = mocked_application)):
+        with patch("cura.Arranging.ArrangeNewObjectsJob.createGroupOperationForArrange", create_operation):
+            with patch("cura.Arranging.ArrangeNewObjectsJob.AddSceneNodeOperation", MagicMock(side_effect = lambda node, parent: ("add", node))):
+                with patch("cura.Arranging.ArrangeNewObjectsJob.Message"):
+                    job.run()
+    return job.getResult()
+
+
+def test_arrangeAndAdd():
+    nodes_to_arrange = [createNode(), createNode(has_hull = False), createNode()]
+    node_to_add = createNode()
+    fixed_node = createNode()
+    arrange_operation = MagicMock(spec = GroupedOperation)
+    create_operation = MagicMock(return_value = (arrange_operation, 0))
+
+    result = runJob(ArrangeNewObjectsJob(nodes_to_arrange, [node_to_add], [fixed_node]), create_operation)
+
+    # Only nodes with a hull are arranged. The rest is added where it is, in the same operation.
+    assert result is arrange_operation
+    arranged_nodes, _, fixed_nodes = create_operation.call_args[0]
+    assert arranged_nodes == [nodes_to_arrange[0], nodes_to_arrange[2]]
+    assert fixed_nodes == [fixed_node]
+    assert create_operation.call_args[1]["add_new_nodes_in_scene"]
+    added_nodes = [call[0][0][1] for call in arrange_operation.addOperation.call_args_list]
+    assert added_nodes == [node_to_add, nodes_to_arrange[1]]
+
+
+def test_arrangeCrashes():
+    nodes_to_arrange = [createNode(), createNode()]
+    create_operation = MagicMock(side_effect = ValueError("The arrange algorithm crashed."))
+
+    result = runJob(ArrangeNewObjectsJob(nodes_to_arrange, [], []), create_operation)
+
+    # The nodes are still added, just not arranged.
+    assert isinstance(result, GroupedOperation)
+    assert [operation[1] for operation in result._children] == nodes_to_arrange
@@ -0,0 +1,108 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import os
+from unittest.mock import MagicMock, patch
+
+from UM.Backend.Backend import BackendState
+from UM.Signal import Signal
+
+from cura.BatchSlicer import BatchSlicer
+
+
+class StubBackend:
+    """Pretends to slice the file that was loaded last. Files with "broken" in their name fail to slice."""
+
+    def __init__(self) -> None:
+        self.backendStateChange = Signal()
+        self.loaded_file_name = ""
+        self.slice_count = 0
+
+    def forceSlice(self) -> None:
+        self.slice_count += 1
+        self.backendStateChange.emit(BackendState.Processing)
+        self.backendStateChange.emit(BackendState.Error if "broken" in self.loaded_file_name else BackendState.Done)
+
+    def stopSlicing(self) -> None:
+        pass
+
+
+def createApplication(backend: StubBackend) -> MagicMock:
+    application = MagicMock()
+    application.fileCompleted = Signal()
+    application.fileLoadFailed = Signal()
+    application.getBackend.return_value = backend
+
+    def readLocalFile(file, **kwargs):
+        if os.path.basename(file.toLocalFile()).startswith("unreadable"):
+            application.fileLoadFailed.emit(file.toLocalFile())
+            return
+        backend.loaded_file_name = file.toLocalFile()
+        application.fileCompleted.emit(file.toLocalFile())
+    application.readLocalFile.side_effect = readLocalFile
+    application.callLater.side_effect = lambda function, *args: function(*args)
+    return application
+
+
+def createWriter() -> MagicMock:
+    writer = MagicMock()
+    writer.write.side_effect = lambda stream, nodes, mode: stream.write(";FLAVOR:Marlin\n") is not None
+    return writer
+
+
+def test_sliceQueue(tmp_path):
+    backend = StubBackend()
+    application = createApplication(backend)
+    output_path = os.path.join(str(tmp_path), "output")
+    file_names = [os.path.join(str(tmp_path), "cube.stl"), os.path.join(str(tmp_path), "broken.stl"), os.path.join(str(tmp_path), "other", "cube.3mf")]
+    batch_slicer = BatchSlicer(application, file_names, output_path)
+
+    with patch("UM.PluginRegistry.PluginRegistry.getInstance") as plugin_registry:
+        plugin_registry.return_value.getPluginObject.return_value = createWriter()
+        with patch("cura.BatchSlicer.QTimer"):
+            with patch("cura.BatchSlicer.QCoreApplication") as core_application:
+                batch_slicer.start()
+
+    assert backend.slice_count == 3
+    assert application.deleteAll.call_count == 3  # Every file is sliced on its own.
+    # Files with the same name get different results. The file that failed to slice has none.
+    assert batch_slicer.getResults() == [(file_names[0], os.path.join(output_path, "cube.gcode")),
+                                         (file_names[1], None),
+                                         (file_names[2], os.path.join(output_path, "cube_2.gcode"))]
+    with open(os.path.join(output_path, "cube_2.gcode")) as f:
+        assert f.read() == ";FLAVOR:Marlin\n"
+    core_application.exit.assert_called_once_with(1)  # Not all files could be sliced.
+
+
+def test_unreadableFile(tmp_path):
+    backend = StubBackend()
+    application = createApplication(backend)
+    output_path = str(tmp_path)
+    file_names = [os.path.join(str(tmp_path), "unreadable.xyz"), os.path.join(str(tmp_path), "cube.stl")]
+    batch_slicer = BatchSlicer(application, file_names, output_path)
+
+    with patch("UM.PluginRegistry.PluginRegistry.getInstance") as plugin_registry:
+        plugin_registry.return_value.getPluginObject.return_value = createWriter()
+        with patch("cura.BatchSlicer.QTimer"):  # The time-out never passes.
+            with patch("cura.BatchSlicer.QCoreApplication") as core_application:
+                batch_slicer.start()
+
+    # The file that couldn't be read fails right away instead of waiting for the time-out, and the queue goes on.
+    assert backend.slice_count == 1
+    assert batch_slicer.getResults() == [(file_names[0], None), (file_names[1], os.path.join(output_path, "cube.gcode"))]
+    core_application.exit.assert_called_once_with(1)
+
+
+def test_unknownMachine(tmp_path):
+    backend = StubBackend()
+    application = createApplication(backend)
+    application.getContainerRegistry.return_value.findContainerStacks.return_value = []
+    application.getMachineManager.return_value.getMachine.return_value = None
+    application.getMachineManager.return_value.addMachine.return_value = False
+    batch_slicer = BatchSlicer(application, [os.path.join(str(tmp_path), "cube.stl")], str(tmp_path), machine = "unknown_printer")
+
+    with patch("cura.BatchSlicer.QCoreApplication") as core_application:
+        batch_slicer.start()
+
+    application.readLocalFile.assert_not_called()
+    core_application.exit.assert_called_once_with(1)
@@ -1,6 +1,9 @@
-from cura.Layer import Layer
 from unittest.mock import MagicMock
 
+import numpy
+
+from cura.Layer import Layer
+
 
 def test_lineMeshVertexCount():
     layer = Layer(1)
@@ -36,4 +39,32 @@ def test_elementCount():
     layer_polygon.elementCount = 12
     layer.polygons.append(layer_polygon)
     assert layer.build(0, 0, [], [], [], [], [] ,[] , []) == (9001, 9002)
-    assert layer.elementCount == 12
\ No newline at end of file
+    assert layer.elementCount == 12
+
+def createPolygon(points, line_types, jump_mask):
+    polygon = MagicMock()
+    polygon.data = numpy.array(points, dtype = numpy.float32)
+    polygon.types = numpy.array(line_types, dtype = numpy.uint8).reshape((-1, 1))
+    polygon.lineWidths = numpy.full((len(line_types), 1), 0.4, dtype = numpy.float32)
+    polygon.jumpMask = numpy.array(jump_mask, dtype = bool).reshape((-1, 1))
+    polygon.mapLineTypeToColor = lambda types: numpy.array([[1, 1, 1, 1], [0.5, 0.5, 0.5, 1]])[types]
+    polygon.isInfillOrSkinType = lambda types: types == 1
+    return polygon
+
+
+def test_createMeshOrJumps():
+    layer = Layer(1)
+    layer.polygons.append(createPolygon([[0, 1, 0], [10, 1, 0], [10, 1, 10]], [0, 1], [True, False]))
+    layer.polygons.append(createPolygon([[20, 1, 0], [20, 1, 10]], [0], [True]))
+
+    mesh = layer.createMesh()
+    # Only the second line of the first polygon is part of the mesh. It's widened to both sides and lowered a bit.
+    assert numpy.allclose(mesh.getVertices(), [[10.2, 0.99, 0], [10.2, 0.99, 10], [9.8, 0.99, 0], [9.8, 0.99, 10]])
+    assert numpy.array_equal(mesh.getIndices(), [[0, 3, 2], [0, 1, 3]])
+    assert numpy.allclose(mesh.getColors(), [[0.5, 0.5, 0.5, 1]] * 4)
+
+    jumps = layer.createJumps()
+    # The polygons are not connected to each other, so there is a jump in each polygon but none between them.
+    assert numpy.allclose(jumps.getVertices(), [[0, 1.01, -0.2], [10, 1.01, -0.2], [0, 1.01, 0.2], [10, 1.01, 0.2],
+                                                [20.2, 1.01, 0], [20.2, 1.01, 10], [19.8, 1.01, 0], [19.8, 1.01, 10]])
+    assert numpy.array_equal(jumps.getIndices(), [[0, 3, 2], [0, 1, 3], [4, 7, 6], [4, 5, 7]])
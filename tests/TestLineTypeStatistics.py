@@ -0,0 +1,62 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+from unittest.mock import MagicMock
+
+import numpy
+
+from cura.LayerPolygon import LayerPolygon
+from cura.LineTypeStatistics import LineTypeStatistics
+
+
+def createPolygon(line_types, feedrates, line_widths, line_thicknesses):
+    polygon = MagicMock()
+    polygon.types = numpy.array(line_types, dtype = numpy.uint8).reshape((-1, 1))
+    polygon.lineFeedrates = numpy.array(feedrates, dtype = numpy.float32).reshape((-1, 1))
+    polygon.lineWidths = numpy.array(line_widths, dtype = numpy.float32).reshape((-1, 1))
+    polygon.lineThicknesses = numpy.array(line_thicknesses, dtype = numpy.float32).reshape((-1, 1))
+    return polygon
+
+
+def test_limitsPerLineType():
+    random = numpy.random.RandomState(1337)
+    polygons = []
+    for _ in range(20):
+        count = random.randint(1, 50)
+        line_types = random.choice([LayerPolygon.Inset0Type, LayerPolygon.InfillType, LayerPolygon.MoveCombingType], count)
+        polygons.append(createPolygon(line_types, random.uniform(10, 100, count), random.uniform(0.2, 0.6, count), random.choice([0, 0.1, 0.2], count)))
+
+    statistics = LineTypeStatistics(polygons)
+
+    line_types = numpy.concatenate([polygon.types.reshape(-1) for polygon in polygons])
+    feedrates = numpy.concatenate([polygon.lineFeedrates.reshape(-1) for polygon in polygons])
+    line_widths = numpy.concatenate([polygon.lineWidths.reshape(-1) for polygon in polygons])
+    thicknesses = numpy.concatenate([polygon.lineThicknesses.reshape(-1) for polygon in polygons])
+    for line_type in range(LayerPolygon.NumberOfTypes):
+        is_type = line_types == line_type
+        assert statistics.line_counts[line_type] == numpy.sum(is_type)
+        if not is_type.any():
+            assert statistics.min_feedrates[line_type] == numpy.inf
+            continue
+        assert statistics.min_feedrates[line_type] == feedrates[is_type].min()
+        assert statistics.max_feedrates[line_type] == feedrates[is_type].max()
+        assert statistics.min_line_widths[line_type] == line_widths[is_type].min()
+        assert statistics.max_line_widths[line_type] == line_widths[is_type].max()
+        assert statistics.min_thicknesses[line_type] == thicknesses[is_type & (thicknesses != 0)].min()
+        assert statistics.max_thicknesses[line_type] == thicknesses[is_type].max()
+        flow_rates = feedrates[is_type] * line_widths[is_type] * thicknesses[is_type]
+        assert statistics.min_flow_rates[line_type] == flow_rates.min()
+        assert statistics.max_flow_rates[line_type] == flow_rates.max()
+
+    assert statistics.getUsedLineTypes([LayerPolygon.SkinType, LayerPolygon.InfillType, LayerPolygon.Inset0Type]) == [LayerPolygon.InfillType, LayerPolygon.Inset0Type]
+
+
+def test_noLines():
+    statistics = LineTypeStatistics([])
+    assert statistics.getUsedLineTypes(range(LayerPolygon.NumberOfTypes)) == []
+
+
+def test_noThickness():
+    statistics = LineTypeStatistics([createPolygon([LayerPolygon.SkinType] * 3, [10, 20, 30], [0.4] * 3, [0] * 3)])
+    assert statistics.min_thicknesses[LayerPolygon.SkinType] == numpy.inf
+    assert statistics.max_thicknesses[LayerPolygon.SkinType] == 0
@@ -0,0 +1,35 @@
+# Copyright (c) 2022 Ultimaker B.V.
+# Cura is released under the terms of the LGPLv3 or higher.
+
+import importlib
+import os
+import sys
+
+from cura.Utils.StartupProfiler import StartupProfiler
+
+
+def test_pluginTimes(tmp_path):
+    plugin_path = os.path.join(str(tmp_path), "ProfiledPlugin")
+    os.makedirs(plugin_path)
+    with open(os.path.join(plugin_path, "__init__.py"), "w") as f:
+        f.write("from . import ProfiledModule\n")
+    with open(os.path.join(plugin_path, "ProfiledModule.py"), "w") as f:
+        f.write("import time\ntime.sleep(0.01)\n")
+
+    profiler = StartupProfiler()
+    sys.path.insert(0, str(tmp_path))
+    sys.meta_path.insert(0, profiler)
+    try:
+        importlib.import_module("ProfiledPlugin")
+    finally:
+        profiler.stop()
+        sys.path.remove(str(tmp_path))
+    assert profiler not in sys.meta_path
+
+    records = {record.name: record for record in profiler.getRecords()}
+    assert records["ProfiledPlugin.ProfiledModule"].importers == ("ProfiledPlugin", )
+    assert records["ProfiledPlugin.ProfiledModule"].own_time >= 0.01
+    assert records["ProfiledPlugin"].own_time < records["ProfiledPlugin"].total_time
+    # The time of the plug-in includes its module only once.
+    assert profiler.getPluginTimes(["ProfiledPlugin", "OtherPlugin"]) == {"ProfiledPlugin": records["ProfiledPlugin"].total_time, "OtherPlugin": 0.0}
+    assert "ProfiledPlugin.ProfiledModule" in profiler.getReport(["ProfiledPlugin"])